@@ -0,0 +1,222 @@
+# app/analytics/evaluations.py
+"""
+Statystyki ewaluacji w przekroju całego sektora (pandas).
+
+Ewaluacje wszystkich instytucji są rozwijane do jednej ramki w układzie
+„długim” – wiersz na (instytucja, okres, dyscyplina) – z kolumnami
+kategorycznymi. Rozkłady kategorii, tabele krzyżowe i porównania okresów
+są liczone wektorowo na tej ramce, zamiast pętli po obiektach
+InstitutionEvaluationSchema (`categories_summary`, `disciplines_by_domain`).
+
+Użycie:
+    frame = await load_evaluations_frame(get_evaluation_repository())
+    category_distribution(frame, by="domain_name", period="2017-2021", normalize=True)
+    period_transitions(frame, "2013-2016", "2017-2021")
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from app.models import InstitutionEvaluationSchema
+
+# Kategorie naukowe od najwyższej; kolejność wyznacza rangę przy porównaniu okresów
+CATEGORY_ORDER: Tuple[str, ...] = ("A+", "A", "B+", "B", "C")
+
+CATEGORY_DTYPE = pd.CategoricalDtype(categories=list(CATEGORY_ORDER), ordered=True)
+
+# Kolumny o małej liczbie unikalnych wartości – trzymane jako kody kategorii
+CATEGORICAL_COLUMNS: Tuple[str, ...] = (
+    "institution_uuid",
+    "institution_name",
+    "evaluation_period",
+    "domain_code",
+    "domain_name",
+    "discipline_code",
+    "discipline_name",
+)
+
+# Para (instytucja, dyscyplina) identyfikuje ocenianą jednostkę między okresami
+UNIT_COLUMNS: Tuple[str, ...] = ("institution_uuid", "discipline_code")
+
+
+def frame_from_evaluations(evaluations: Iterable[InstitutionEvaluationSchema]) -> pd.DataFrame:
+    """
+    Ramka: wiersz na dyscyplinę w ewaluacji instytucji.
+
+    Kategoria spoza CATEGORY_ORDER (np. pusta) jest zapisywana jako brak (NaN).
+    """
+    columns: Dict[str, List[Any]] = {name: [] for name in CATEGORICAL_COLUMNS}
+    starts: List[Optional[int]] = []
+    ends: List[Optional[int]] = []
+    categories: List[Optional[str]] = []
+
+    for evaluation in evaluations:
+        for d in evaluation.disciplines:
+            columns["institution_uuid"].append(evaluation.institution_uuid)
+            columns["institution_name"].append(evaluation.institution_name)
+            columns["evaluation_period"].append(evaluation.evaluation_period)
+            columns["domain_code"].append(d.domain_code)
+            columns["domain_name"].append(d.domain_name)
+            columns["discipline_code"].append(d.discipline_code)
+            columns["discipline_name"].append(d.discipline_name)
+            starts.append(evaluation.period_start)
+            ends.append(evaluation.period_end)
+            categories.append(d.category or None)
+
+    data: Dict[str, Any] = {name: pd.Categorical(values) for name, values in columns.items()}
+    data["period_start"] = pd.array(starts, dtype="Int16")
+    data["period_end"] = pd.array(ends, dtype="Int16")
+    data["category"] = pd.Categorical(categories, dtype=CATEGORY_DTYPE)
+    return pd.DataFrame(data)
+
+
+async def load_evaluations_frame(
+    repo: Any,
+    query: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """Ramka ze wszystkich ewaluacji w magazynie (BaseEvaluationRepository)."""
+    evaluations: List[InstitutionEvaluationSchema] = []
+    stream: AsyncIterator[InstitutionEvaluationSchema] = repo.iter_evaluations(query)
+    async for evaluation in stream:
+        evaluations.append(evaluation)
+    return frame_from_evaluations(evaluations)
+
+
+def periods(frame: pd.DataFrame) -> pd.DataFrame:
+    """Okresy ewaluacji: liczba instytucji i ocenionych dyscyplin, od najstarszego."""
+    grouped = frame.groupby("evaluation_period", observed=True)
+    result = grouped.agg(
+        period_start=("period_start", "min"),
+        period_end=("period_end", "max"),
+        institutions=("institution_uuid", "nunique"),
+        disciplines=("category", "size"),
+    )
+    return result.sort_values(["period_start", "period_end"])
+
+
+# ================== AGREGACJE ==================
+
+
+def category_distribution(
+    frame: pd.DataFrame,
+    by: Union[str, Sequence[str], None] = "domain_name",
+    period: Optional[str] = None,
+    normalize: bool = False,
+) -> Union[pd.DataFrame, pd.Series]:
+    """
+    Rozkład kategorii (liczba ocenionych dyscyplin w każdej kategorii).
+
+    Bez `by` – Series kategoria → liczba; z `by` (kolumna albo lista kolumn,
+    np. ("evaluation_period", "domain_name")) – tabela grupa × kategoria.
+    `normalize=True` daje udziały w wierszu. `period` zawęża do jednego okresu.
+    """
+    if period is not None:
+        frame = frame[frame["evaluation_period"] == period]
+
+    if by is None:
+        counts = frame["category"].value_counts(sort=False)
+        return counts / counts.sum() if normalize and counts.sum() else counts
+
+    keys = [by] if isinstance(by, str) else list(by)
+    table = (
+        frame.groupby(keys + ["category"], observed=True)
+        .size()
+        .unstack("category", fill_value=0)
+        .reindex(columns=list(CATEGORY_ORDER), fill_value=0)
+    )
+    table.columns = pd.Index(list(CATEGORY_ORDER), name="category")
+    if normalize:
+        totals = table.sum(axis=1)
+        table = table.div(totals.where(totals > 0), axis=0)
+    return table
+
+
+def institution_categories(frame: pd.DataFrame, period: Optional[str] = None) -> pd.DataFrame:
+    """
+    `categories_summary` dla wszystkich instytucji naraz: instytucja × kategoria,
+    z kolumną `disciplines` (łączna liczba ocenionych dyscyplin).
+    """
+    table = category_distribution(frame, by=["institution_uuid", "institution_name"], period=period)
+    table["disciplines"] = table.sum(axis=1)
+    return table.sort_values("disciplines", ascending=False)
+
+
+def _period_pairs(frame: pd.DataFrame, before: str, after: str, extra: Sequence[str] = ()) -> pd.DataFrame:
+    """
+    Jednostki (instytucja, dyscyplina) ocenione w obu okresach, z kategoriami
+    `before` i `after`. Przy powtórzeniach w okresie liczy się ostatni wiersz.
+    """
+    columns = list(UNIT_COLUMNS) + list(extra) + ["category"]
+
+    def side(period: str) -> pd.DataFrame:
+        part = frame.loc[(frame["evaluation_period"] == period) & frame["category"].notna(), columns]
+        return part.drop_duplicates(list(UNIT_COLUMNS), keep="last")
+
+    # Obie strony pochodzą z tej samej ramki – klucze mają wspólny słownik kategorii
+    return side(before).merge(
+        side(after).drop(columns=list(extra)),
+        on=list(UNIT_COLUMNS),
+        suffixes=("_before", "_after"),
+    )
+
+
+def period_transitions(
+    frame: pd.DataFrame,
+    before: str,
+    after: str,
+    normalize: bool = False,
+) -> pd.DataFrame:
+    """
+    Macierz przejść kategorii między okresami: wiersze – kategoria w `before`,
+    kolumny – w `after`, liczone po parach (instytucja, dyscyplina) ocenionych
+    w obu okresach. `normalize=True` – udziały w wierszu.
+    """
+    pairs = _period_pairs(frame, before, after)
+    table = pd.crosstab(pairs["category_before"], pairs["category_after"], dropna=False)
+    table = table.reindex(index=list(CATEGORY_ORDER), columns=list(CATEGORY_ORDER), fill_value=0)
+    table.index.name = f"category_{before}"
+    table.columns.name = f"category_{after}"
+    if normalize:
+        totals = table.sum(axis=1)
+        table = table.div(totals.where(totals > 0), axis=0)
+    return table
+
+
+def period_changes(
+    frame: pd.DataFrame,
+    before: str,
+    after: str,
+    by: Optional[str] = "domain_name",
+) -> pd.DataFrame:
+    """
+    Zmiany kategorii między okresami w grupach `by` (wg okresu `before`):
+    liczba par, awanse, bez zmian, spadki i średnia zmiana rangi
+    (dodatnia = poprawa; A+ → A to -1).
+    """
+    extra = [by] if by else []
+    pairs = _period_pairs(frame, before, after, extra)
+
+    # Kody kategorii rosną od A+ do C, więc poprawa to spadek kodu
+    shift = pairs["category_before"].cat.codes.to_numpy() - pairs["category_after"].cat.codes.to_numpy()
+    stats = pd.DataFrame({
+        "pairs": np.ones(len(pairs), dtype=np.int64),
+        "improved": shift > 0,
+        "unchanged": shift == 0,
+        "declined": shift < 0,
+        "mean_shift": shift.astype(float),
+    })
+
+    groups = pairs[by].to_numpy() if by else np.full(len(pairs), "all")
+    result = stats.groupby(groups).agg(
+        pairs=("pairs", "sum"),
+        improved=("improved", "sum"),
+        unchanged=("unchanged", "sum"),
+        declined=("declined", "sum"),
+        mean_shift=("mean_shift", "mean"),
+    )
+    result.index.name = by or "group"
+    return result.sort_values("pairs", ascending=False)
@@ -0,0 +1,355 @@
+# app/analytics/funding_matching.py
+"""
+Dopasowanie naborów finansowania (FundingOpportunitySchema) do podmiotów.
+
+Nabory są indeksowane w indeksie odwróconym: termin → lista (nabór, waga).
+Terminy to:
+- frazy – pełne, znormalizowane obszary badawcze i słowa kluczowe naboru,
+  dopasowywane do dyscyplin, dziedzin i obszarów impactu podmiotu,
+- słowa – z tytułu, opisu, obszarów i słów kluczowych naboru.
+
+Profil podmiotu (`EntityProfile`) to liczności terminów zebrane z jego
+impactów i produktów naukowych. Obie strony są ważone TF-IDF (IDF liczone
+po naborach) i normalizowane L2, więc wynik to kosinus w przedziale 0–1.
+
+Punktowanie jest wektorowe: dla bloku podmiotów listy postingów wszystkich
+ich terminów są rozwijane do płaskich tablic NumPy i sumowane jednym
+`np.bincount` w macierz (podmioty × nabory). Praca jest proporcjonalna do
+liczby wspólnych terminów, a nie do iloczynu podmiotów i naborów.
+
+Użycie:
+    matcher = FundingMatcher(opportunities)
+    profiles = profiles_from_impacts(docs)
+    for profile, suggestions in matcher.recommend(profiles.values(), k=10):
+        ...
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import regex as re
+
+from app.models import EntityType, FundingOpportunitySchema, ScientificProductSchema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_SCORE = 0.05
+# Maks. liczba terminów profilu podmiotu branych do punktowania (najcięższe wg TF-IDF)
+DEFAULT_MAX_TERMS = 256
+# Maks. liczba rozwiniętych postingów w jednym bloku podmiotów (pamięć ~ 16 B / posting)
+DEFAULT_BLOCK_POSTINGS = 4_000_000
+
+# Wagi źródeł terminów naboru
+AREA_WEIGHT = 3.0
+KEYWORD_WEIGHT = 2.0
+TEXT_WEIGHT = 1.0
+
+PHRASE = "phrase"
+WORD = "word"
+
+MIN_WORD_LENGTH = 3
+
+_WORD = re.compile(r"\w+")
+
+# Pola impactu potrzebne do profilu (projekcja dla repozytorium)
+IMPACT_PROFILE_FIELDS: Tuple[str, ...] = (
+    "institution_uuid",
+    "institution_name",
+    "discipline_name",
+    "domain_name",
+    "impact_areas",
+    "other_impact_area",
+    "title_pl",
+    "title_en",
+    "summary_pl",
+    "summary_en",
+    "impact_description_pl",
+    "impact_description_en",
+)
+
+_PHRASE_FIELDS = ("discipline_name", "domain_name", "other_impact_area")
+_TEXT_FIELDS = (
+    "title_pl",
+    "title_en",
+    "summary_pl",
+    "summary_en",
+    "impact_description_pl",
+    "impact_description_en",
+)
+
+
+def _phrase(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in _WORD.findall(text.lower()) if len(w) >= MIN_WORD_LENGTH and not w.isdigit()]
+
+
+def _term(kind: str, value: str) -> str:
+    return f"{kind}:{value}"
+
+
+@dataclass
+class EntityProfile:
+    """Liczności terminów podmiotu (instytucji, zespołu, osoby) z jego impactów i produktów."""
+
+    entity_id: str
+    entity_type: EntityType = EntityType.INSTITUTION
+    label: Optional[str] = None
+    terms: Counter = field(default_factory=Counter)
+
+    def add_phrase(self, text: Optional[str]) -> None:
+        if text and text.strip():
+            self.terms[_term(PHRASE, _phrase(text))] += 1
+            self.add_text(text)
+
+    def add_text(self, text: Optional[str]) -> None:
+        if text:
+            self.terms.update(_term(WORD, w) for w in _words(text))
+
+
+def profiles_from_impacts(
+    docs: Iterable[Dict[str, Any]],
+    profiles: Optional[Dict[str, EntityProfile]] = None,
+) -> Dict[str, EntityProfile]:
+    """
+    Profile instytucji z dokumentów impactów (słowniki z polami IMPACT_PROFILE_FIELDS).
+    Istniejący słownik `profiles` jest uzupełniany.
+    """
+    profiles = {} if profiles is None else profiles
+    for doc in docs:
+        entity_id = doc.get("institution_uuid")
+        if not entity_id:
+            continue
+        profile = profiles.get(entity_id)
+        if profile is None:
+            profile = profiles[entity_id] = EntityProfile(entity_id=entity_id, label=doc.get("institution_name"))
+
+        for name in _PHRASE_FIELDS:
+            profile.add_phrase(doc.get(name))
+        for area in doc.get("impact_areas") or ():
+            profile.add_phrase(area)
+        for name in _TEXT_FIELDS:
+            profile.add_text(doc.get(name))
+    return profiles
+
+
+def profiles_from_products(
+    products: Iterable[ScientificProductSchema],
+    profiles: Optional[Dict[str, EntityProfile]] = None,
+) -> Dict[str, EntityProfile]:
+    """Profile podmiotów z produktów naukowych (tytuł i streszczenie)."""
+    profiles = {} if profiles is None else profiles
+    for product in products:
+        profile = profiles.get(product.entity_id)
+        if profile is None:
+            profile = profiles[product.entity_id] = EntityProfile(
+                entity_id=product.entity_id,
+                entity_type=product.entity_type,
+            )
+        profile.add_text(product.title)
+        profile.add_text(product.summary)
+    return profiles
+
+
+def _opportunity_terms(opportunity: FundingOpportunitySchema) -> Counter:
+    """Ważone terminy naboru (przed IDF i normalizacją)."""
+    weights: Counter = Counter()
+    words: Counter = Counter()
+
+    for area in opportunity.research_areas:
+        if area.strip():
+            weights[_term(PHRASE, _phrase(area))] += AREA_WEIGHT
+            words.update(_words(area))
+    for keyword in opportunity.keywords:
+        if keyword.strip():
+            weights[_term(PHRASE, _phrase(keyword))] += KEYWORD_WEIGHT
+            words.update(_words(keyword))
+    for text in (opportunity.title, opportunity.description):
+        if text:
+            words.update(_words(text))
+
+    for word, count in words.items():
+        weights[_term(WORD, word)] += TEXT_WEIGHT * (1.0 + math.log(count))
+    return weights
+
+
+class FundingMatcher:
+    """Indeks odwrócony naborów i wektorowe punktowanie profili podmiotów."""
+
+    def __init__(self, opportunities: Sequence[FundingOpportunitySchema]) -> None:
+        self.opportunities = list(opportunities)
+        n = len(self.opportunities)
+
+        per_opportunity = [_opportunity_terms(o) for o in self.opportunities]
+
+        self.vocabulary: Dict[str, int] = {}
+        document_frequency: List[int] = []
+        for terms in per_opportunity:
+            for term in terms:
+                col = self.vocabulary.setdefault(term, len(self.vocabulary))
+                if col == len(document_frequency):
+                    document_frequency.append(0)
+                document_frequency[col] += 1
+        self.terms = list(self.vocabulary)
+
+        # Wygładzone IDF po naborach: log((1 + n) / (1 + df)) + 1
+        self.idf = (np.log((1.0 + n) / (1.0 + np.asarray(document_frequency, dtype=np.float64))) + 1.0).astype(np.float32)
+
+        # Wektory naborów (TF-IDF, L2) w postaci {kolumna: waga} – do wyjaśnień
+        self._vectors: List[Dict[int, float]] = []
+        rows: List[np.ndarray] = []
+        cols: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        for row, terms in enumerate(per_opportunity):
+            c = np.fromiter((self.vocabulary[t] for t in terms), dtype=np.int64, count=len(terms))
+            v = np.fromiter(terms.values(), dtype=np.float32, count=len(terms)) * self.idf[c]
+            norm = float(np.linalg.norm(v))
+            if norm > 0:
+                v /= norm
+            self._vectors.append(dict(zip(c.tolist(), v.tolist())))
+            rows.append(np.full(len(c), row, dtype=np.int32))
+            cols.append(c)
+            values.append(v)
+
+        # Postingi posortowane po kolumnie (układ CSR): termin t → [ptr[t], ptr[t + 1])
+        all_cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+        order = np.argsort(all_cols, kind="stable")
+        self._posting_rows = (np.concatenate(rows) if rows else np.empty(0, dtype=np.int32))[order]
+        self._posting_weights = (np.concatenate(values) if values else np.empty(0, dtype=np.float32))[order]
+        self._posting_ptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_cols, minlength=len(self.vocabulary)), out=self._posting_ptr[1:])
+
+        logger.info("Indeks naborów: %d naborów, %d terminów, %d postingów", n, len(self.vocabulary), len(order))
+
+    def __len__(self) -> int:
+        return len(self.opportunities)
+
+    def profile_vector(self, profile: EntityProfile, max_terms: int = DEFAULT_MAX_TERMS) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Wektor profilu w przestrzeni terminów naborów: (kolumny, wagi TF-IDF, L2).
+        Terminy spoza indeksu są pomijane; zostaje `max_terms` najcięższych.
+        """
+        known = [(self.vocabulary[t], c) for t, c in profile.terms.items() if t in self.vocabulary]
+        if not known:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        cols = np.fromiter((c for c, _ in known), dtype=np.int64, count=len(known))
+        counts = np.fromiter((n for _, n in known), dtype=np.float32, count=len(known))
+        weights = (1.0 + np.log(counts)) * self.idf[cols]
+        if len(cols) > max_terms:
+            keep = np.argpartition(weights, -max_terms)[-max_terms:]
+            cols, weights = cols[keep], weights[keep]
+        weights /= np.linalg.norm(weights)
+        return cols, weights
+
+    def _score_block(self, vectors: List[Tuple[np.ndarray, np.ndarray]]) -> np.ndarray:
+        """Macierz wyników (len(vectors), liczba naborów) – jedno `np.bincount` na blok."""
+        n = len(self.opportunities)
+        entity = np.concatenate([np.full(len(c), i, dtype=np.int64) for i, (c, _) in enumerate(vectors)])
+        cols = np.concatenate([c for c, _ in vectors])
+        weights = np.concatenate([w for _, w in vectors])
+
+        starts = self._posting_ptr[cols]
+        lengths = self._posting_ptr[cols + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            return np.zeros((len(vectors), n), dtype=np.float64)
+
+        # Pozycje wszystkich postingów: start terminu + indeks wewnątrz jego listy
+        first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = np.repeat(starts, lengths) + (np.arange(total) - first)
+
+        cells = np.repeat(entity, lengths) * n + self._posting_rows[positions]
+        contributions = np.repeat(weights, lengths) * self._posting_weights[positions]
+        scores = np.bincount(cells, weights=contributions, minlength=len(vectors) * n)
+        return scores.reshape(len(vectors), n)
+
+    def explain(self, cols: np.ndarray, weights: np.ndarray, row: int, limit: int = 6) -> str:
+        """Krótkie wyjaśnienie: wspólne frazy i słowa o największym wkładzie do wyniku."""
+        vector = self._vectors[row]
+        shared = sorted(
+            ((w * vector[c], self.terms[c]) for c, w in zip(cols.tolist(), weights.tolist()) if c in vector),
+            reverse=True,
+        )[:limit]
+
+        phrases = [t.split(":", 1)[1] for _, t in shared if t.startswith(PHRASE + ":")]
+        words = [t.split(":", 1)[1] for _, t in shared if t.startswith(WORD + ":")]
+        parts: List[str] = []
+        if phrases:
+            parts.append("wspólne obszary: " + ", ".join(phrases))
+        if words:
+            parts.append("wspólne słowa: " + ", ".join(words))
+        return ("; ".join(parts) or "brak wspólnych terminów").capitalize()
+
+    def recommend(
+        self,
+        profiles: Iterable[EntityProfile],
+        k: int = DEFAULT_TOP_K,
+        min_score: float = DEFAULT_MIN_SCORE,
+        open_on: Optional[date] = None,
+        max_terms: int = DEFAULT_MAX_TERMS,
+        block_postings: int = DEFAULT_BLOCK_POSTINGS,
+    ) -> Iterator[Tuple[EntityProfile, List[FundingOpportunitySchema]]]:
+        """
+        Generator (profil, top-k naborów) dla kolejnych profili.
+
+        Zwracane nabory to kopie z wypełnionymi `relevance_score` (0–1)
+        i `relevance_explanation`. `open_on` pomija nabory z terminem wcześniejszym
+        niż podana data. Profile są punktowane blokami tak, by liczba rozwiniętych
+        postingów w bloku nie przekraczała `block_postings`.
+        """
+        if not self.opportunities:
+            for profile in profiles:
+                yield profile, []
+            return
+
+        closed: Optional[np.ndarray] = None
+        if open_on is not None:
+            closed = np.fromiter(
+                (o.deadline is not None and o.deadline < open_on for o in self.opportunities),
+                dtype=bool,
+                count=len(self.opportunities),
+            )
+
+        block: List[Tuple[EntityProfile, np.ndarray, np.ndarray]] = []
+        block_size = 0
+
+        def flush() -> Iterator[Tuple[EntityProfile, List[FundingOpportunitySchema]]]:
+            scores = self._score_block([(c, w) for _, c, w in block])
+            if closed is not None:
+                scores[:, closed] = 0.0
+            top = min(k, scores.shape[1])
+            candidates = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+
+            for (profile, cols, weights), row_scores, row_candidates in zip(block, scores, candidates):
+                ranked = row_candidates[np.argsort(-row_scores[row_candidates], kind="stable")]
+                suggestions: List[FundingOpportunitySchema] = []
+                for row in ranked.tolist():
+                    score = float(row_scores[row])
+                    if score < min_score or score <= 0.0:
+                        break
+                    suggestions.append(self.opportunities[row].model_copy(update={
+                        "relevance_score": round(min(score, 1.0), 4),
+                        "relevance_explanation": self.explain(cols, weights, row),
+                    }))
+                yield profile, suggestions
+
+        for profile in profiles:
+            cols, weights = self.profile_vector(profile, max_terms)
+            block.append((profile, cols, weights))
+            block_size += int((self._posting_ptr[cols + 1] - self._posting_ptr[cols]).sum())
+            if block_size >= block_postings:
+                yield from flush()
+                block, block_size = [], 0
+        if block:
+            yield from flush()
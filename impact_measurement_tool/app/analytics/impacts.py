@@ -0,0 +1,298 @@
+# app/analytics/impacts.py
+"""
+Analityka korpusu impactów na DataFrame'ach pandas.
+
+Korpus jest ładowany partiami (z repozytorium – z projekcją – albo ze zrzutów)
+wprost do typowanej ramki: instytucja / dyscyplina / dziedzina / rodzaj jako
+`category`, rok jako `Int16`, interdyscyplinarność jako `boolean`. Długie teksty
+dwujęzyczne są domyślnie zastępowane flagami `has_<pole>`, więc cały korpus
+mieści się w pamięci z dużym zapasem.
+
+Agregacje operują na całych kolumnach (groupby / explode / unstack),
+bez pętli po wierszach.
+
+Użycie:
+    frame = await load_impacts_frame(get_impact_repository())
+    impacts_per_discipline_year(frame)
+    interdisciplinarity_rates(frame, by="domain_name")
+    impact_area_distribution(frame)
+    bilingual_completeness(frame, by="institution_name")
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from app.dumps.readers import iter_dump
+from app.models import ImpactCaseSchema
+from app.repositories.base import BaseImpactRepository
+
+# Liczba dokumentów zamienianych na jedną ramkę cząstkową
+DEFAULT_CHUNK_SIZE = 5000
+
+# Kolumny o małej liczbie unikalnych wartości – trzymane jako kody kategorii
+CATEGORICAL_COLUMNS: Tuple[str, ...] = (
+    "institution_uuid",
+    "institution_name",
+    "discipline_code",
+    "discipline_name",
+    "domain_code",
+    "domain_name",
+    "evaluation_period",
+    "evaluation_category",
+    "kind_code",
+    "kind_name",
+    "detailed_kind",
+    "data_source",
+)
+
+SCALAR_COLUMNS: Tuple[str, ...] = (
+    "impact_uuid",
+    "evaluation_year",
+    "is_interdisciplinary",
+    "other_impact_area",
+    "last_refresh",
+)
+
+# Pola występujące w parze _pl / _en
+BILINGUAL_FIELDS: Tuple[str, ...] = (
+    "title",
+    "summary",
+    "impact_description",
+    "main_conclusion",
+    "entity_name",
+    "entity_role",
+    "interdisciplinarity_characteristic",
+)
+
+TEXT_COLUMNS: Tuple[str, ...] = tuple(
+    f"{field}_{lang}" for field in BILINGUAL_FIELDS for lang in ("pl", "en")
+)
+
+
+def frame_fields() -> List[str]:
+    """Pola modelu potrzebne do zbudowania ramki (projekcja dla repozytorium)."""
+    return list(CATEGORICAL_COLUMNS + SCALAR_COLUMNS + ("impact_areas",) + TEXT_COLUMNS)
+
+
+def _has_text(values: List[Any]) -> pd.Series:
+    """Czy tekst jest niepusty (po obcięciu białych znaków) – wektorowo."""
+    s = pd.Series(values, dtype="string")
+    return s.str.strip().str.len().fillna(0).gt(0).astype(bool)
+
+
+def _chunk_frame(docs: List[Dict[str, Any]], include_text: bool) -> pd.DataFrame:
+    """Jedna partia dokumentów → ramka z docelowymi typami kolumn."""
+    columns: Dict[str, Any] = {}
+
+    for name in CATEGORICAL_COLUMNS:
+        columns[name] = pd.Categorical([d.get(name) for d in docs])
+
+    columns["impact_uuid"] = pd.array([d.get("impact_uuid") for d in docs], dtype="string")
+    columns["evaluation_year"] = pd.array([d.get("evaluation_year") for d in docs], dtype="Int16")
+    columns["is_interdisciplinary"] = pd.array([d.get("is_interdisciplinary") for d in docs], dtype="boolean")
+    columns["other_impact_area"] = pd.array([d.get("other_impact_area") for d in docs], dtype="string")
+    columns["last_refresh"] = pd.array([d.get("last_refresh") for d in docs], dtype="string")
+    columns["impact_areas"] = pd.Series([list(d.get("impact_areas") or ()) for d in docs], dtype=object)
+
+    for name in TEXT_COLUMNS:
+        values = [d.get(name) for d in docs]
+        columns[f"has_{name}"] = _has_text(values).to_numpy()
+        if include_text:
+            columns[name] = pd.array(values, dtype="string")
+
+    return pd.DataFrame(columns)
+
+
+def _concat_chunks(chunks: List[pd.DataFrame], include_text: bool) -> pd.DataFrame:
+    """
+    Skleja ramki cząstkowe. Kategorie są łączone przez `union_categoricals`,
+    bo zwykły `concat` kategorii o różnych słownikach cofa je do `object`.
+    """
+    if not chunks:
+        return _chunk_frame([], include_text)
+    if len(chunks) == 1:
+        return chunks[0]
+
+    order = list(chunks[0].columns)
+    categorical = {
+        name: union_categoricals([c[name] for c in chunks], ignore_order=True)
+        for name in CATEGORICAL_COLUMNS
+    }
+    frame = pd.concat(
+        [c.drop(columns=list(CATEGORICAL_COLUMNS)) for c in chunks],
+        ignore_index=True,
+    )
+    for name, values in categorical.items():
+        frame[name] = values
+    return frame[order]
+
+
+def frame_from_documents(
+    docs: Iterable[Dict[str, Any]],
+    include_text: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Buduje ramkę z dokumentów (słowników w układzie ImpactCaseSchema).
+
+    W pamięci jest naraz co najwyżej `chunk_size` dokumentów źródłowych.
+    """
+    chunks: List[pd.DataFrame] = []
+    buffer: List[Dict[str, Any]] = []
+
+    for doc in docs:
+        buffer.append(doc)
+        if len(buffer) >= chunk_size:
+            chunks.append(_chunk_frame(buffer, include_text))
+            buffer = []
+    if buffer:
+        chunks.append(_chunk_frame(buffer, include_text))
+
+    return _concat_chunks(chunks, include_text)
+
+
+def _impact_documents(impacts: Iterable[ImpactCaseSchema]) -> Iterator[Dict[str, Any]]:
+    fields = frame_fields()
+    for impact in impacts:
+        yield {name: getattr(impact, name) for name in fields}
+
+
+def frame_from_impacts(
+    impacts: Iterable[ImpactCaseSchema],
+    include_text: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Ramka z obiektów ImpactCaseSchema (np. prosto z connectora)."""
+    return frame_from_documents(_impact_documents(impacts), include_text, chunk_size)
+
+
+def load_dump_frame(
+    paths: Sequence[Path | str],
+    include_text: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """Ramka ze zrzutów (JSON / NDJSON / Parquet / Arrow), czytanych strumieniowo."""
+
+    def impacts() -> Iterator[ImpactCaseSchema]:
+        for path in paths:
+            yield from iter_dump(path)
+
+    return frame_from_impacts(impacts(), include_text, chunk_size)
+
+
+async def load_impacts_frame(
+    repo: BaseImpactRepository,
+    query: Optional[Dict[str, Any]] = None,
+    include_text: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> pd.DataFrame:
+    """
+    Ramka z repozytorium. Czytane są tylko potrzebne pola (bez `raw`,
+    dowodów i osiągnięć), partiami po `chunk_size`.
+    """
+    chunks: List[pd.DataFrame] = []
+    buffer: List[Dict[str, Any]] = []
+    docs: AsyncIterator[Dict[str, Any]] = repo.iter_documents(
+        query=query,
+        fields=frame_fields(),
+        batch_size=chunk_size,
+    )
+
+    async for doc in docs:
+        buffer.append(doc)
+        if len(buffer) >= chunk_size:
+            chunks.append(_chunk_frame(buffer, include_text))
+            buffer = []
+    if buffer:
+        chunks.append(_chunk_frame(buffer, include_text))
+
+    return _concat_chunks(chunks, include_text)
+
+
+# ================== AGREGACJE ==================
+
+
+def impacts_per_discipline_year(frame: pd.DataFrame, by: str = "discipline_name") -> pd.DataFrame:
+    """Liczba impactów: wiersze – dyscyplina (lub inna kolumna `by`), kolumny – rok ewaluacji."""
+    counts = frame.groupby([by, "evaluation_year"], observed=True).size()
+    return counts.unstack("evaluation_year", fill_value=0).sort_index()
+
+
+def interdisciplinarity_rates(frame: pd.DataFrame, by: str = "discipline_name") -> pd.DataFrame:
+    """
+    Odsetek impactów interdyscyplinarnych w grupach `by`.
+
+    `rate` liczony jest tylko z rekordów, w których pole jest wypełnione
+    (`known`); `impacts` to liczność całej grupy.
+    """
+    flag = frame["is_interdisciplinary"]
+    grouped = pd.DataFrame({
+        by: frame[by],
+        "known": flag.notna(),
+        "interdisciplinary": flag.fillna(False).astype(bool),
+    }).groupby(by, observed=True)
+
+    result = grouped.agg(
+        impacts=("known", "size"),
+        known=("known", "sum"),
+        interdisciplinary=("interdisciplinary", "sum"),
+    )
+    result["rate"] = result["interdisciplinary"] / result["known"].where(result["known"] > 0)
+    return result.sort_values("impacts", ascending=False)
+
+
+def impact_area_distribution(
+    frame: pd.DataFrame,
+    by: Optional[str] = None,
+    normalize: bool = False,
+) -> pd.DataFrame | pd.Series:
+    """
+    Rozkład obszarów impactu (jeden impact może mieć kilka obszarów).
+
+    Bez `by` zwraca Series obszar → liczba; z `by` – tabelę grupa × obszar.
+    `normalize=True` daje udział impactów danej grupy, które wskazały obszar.
+    """
+    columns = ["impact_areas"] + ([by] if by else [])
+    exploded = frame[columns].explode("impact_areas").dropna(subset=["impact_areas"])
+    exploded = exploded.rename(columns={"impact_areas": "impact_area"})
+
+    if by is None:
+        counts = exploded["impact_area"].value_counts()
+        return counts / len(frame) if normalize and len(frame) else counts
+
+    table = (
+        exploded.groupby([by, "impact_area"], observed=True)
+        .size()
+        .unstack("impact_area", fill_value=0)
+    )
+    if normalize:
+        sizes = frame.groupby(by, observed=True).size().reindex(table.index)
+        table = table.div(sizes, axis=0)
+    return table
+
+
+def bilingual_completeness(frame: pd.DataFrame, by: Optional[str] = None) -> pd.DataFrame:
+    """
+    Kompletność pól dwujęzycznych: udział rekordów z tekstem PL, EN i w obu językach.
+
+    Bez `by` – wiersz na pole; z `by` – wiersz na (grupa, pole).
+    """
+    parts: Dict[str, pd.DataFrame] = {}
+    for field in BILINGUAL_FIELDS:
+        pl = frame[f"has_{field}_pl"]
+        en = frame[f"has_{field}_en"]
+        parts[field] = pd.DataFrame({"pl": pl, "en": en, "both": pl & en})
+
+    if by is None:
+        return pd.DataFrame({field: part.mean() for field, part in parts.items()}).T.rename_axis("field")
+
+    tables = {
+        field: part.groupby(frame[by], observed=True).mean()
+        for field, part in parts.items()
+    }
+    return pd.concat(tables, names=["field"]).swaplevel(0, 1).sort_index()
@@ -0,0 +1,363 @@
+# app/analytics/institutions.py
+"""
+Indeks instytucji: UUID ↔ nazwa, z wyszukiwaniem po prefiksie i przybliżonym.
+
+Indeks jest uzupełniany przy ingeście impactów i ewaluacji (nazwy widziane
+w danych, liczby impactów i okresów ewaluacji) i zapisywany jako jeden plik
+JSON. W pamięci:
+- UUID → rekord oraz znormalizowana nazwa → UUID to zwykłe słowniki (O(1)),
+- autouzupełnianie to `bisect` na posortowanej liście kluczy: każdy wariant
+  nazwy od początku każdego słowa, więc „warsz” znajduje „Uniwersytet Warszawski”,
+- literówki obsługuje `difflib` na tych samych kluczach, gdy prefiks nie
+  daje dość wyników.
+
+Nazwy są porównywane po normalizacji: małe litery, bez znaków diakrytycznych
+i interpunkcji, pojedyncze spacje.
+
+Użycie:
+    index = InstitutionIndex.load("data/institutions.json")
+    index.resolve("Uniwersytet Warszawski")      # → UUID albo None
+    index.search("uniw warsz", limit=10)         # → List[InstitutionSchema]
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import difflib
+import json
+import logging
+import os
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import regex as re
+
+from app.db.settings import storage_settings
+from app.models import ImpactCaseSchema, InstitutionEvaluationSchema, InstitutionSchema
+from app.repositories.base import BaseImpactRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEARCH_LIMIT = 10
+# Minimalne podobieństwo (difflib) dla dopasowań przybliżonych
+FUZZY_CUTOFF = 0.75
+# Liczba instytucji (wg wspólnych trigramów) porównywanych dokładnie przez difflib
+FUZZY_CANDIDATES = 50
+
+_NON_ALNUM = re.compile(r"[^\p{L}\p{N}]+")
+# Litery bez rozkładu NFKD na literę bazową + znak diakrytyczny
+_EXTRA_FOLD = str.maketrans({"ł": "l", "ø": "o", "đ": "d", "ß": "ss"})
+
+
+def normalize_name(name: str) -> str:
+    """'Uniwersytet  Łódzki,' → 'uniwersytet lodzki'."""
+    folded = unicodedata.normalize("NFKD", name.casefold().translate(_EXTRA_FOLD))
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return " ".join(_NON_ALNUM.sub(" ", folded).split())
+
+
+def _word_suffixes(normalized: str) -> Iterable[Tuple[str, bool]]:
+    """Klucze autouzupełniania: nazwa od początku każdego słowa (True – od początku nazwy)."""
+    words = normalized.split()
+    for i in range(len(words)):
+        yield " ".join(words[i:]), i == 0
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _Entry:
+    __slots__ = ("uuid", "variants", "impact_count", "evaluation_count")
+
+    def __init__(self, uuid: str) -> None:
+        self.uuid = uuid
+        self.variants: Counter = Counter()
+        self.impact_count = 0
+        self.evaluation_count = 0
+
+    @property
+    def name(self) -> str:
+        return self.variants.most_common(1)[0][0] if self.variants else ""
+
+
+class InstitutionIndex:
+    """Indeks instytucji w pamięci, trwały jako plik JSON (`save` / `load`)."""
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, _Entry] = {}
+        self._by_name: Dict[str, str] = {}
+        # Posortowane klucze autouzupełniania, ich UUID-y i czy klucz to początek
+        # nazwy (listy równoległe), budowane leniwie po zmianach
+        self._keys: List[str] = []
+        self._key_uuids: List[str] = []
+        self._key_starts: List[bool] = []
+        # Dla wyszukiwania przybliżonego: trigram pełnej nazwy → UUID-y, UUID → klucze
+        self._trigram_uuids: Dict[str, Set[str]] = {}
+        self._uuid_keys: Dict[str, List[str]] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, institution_uuid: object) -> bool:
+        return institution_uuid in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    # ================== BUDOWA ==================
+
+    def observe(self, institution_uuid: Optional[str], name: Optional[str], times: int = 1) -> None:
+        """Rejestruje UUID i nazwę widzianą w danych (wariant nazwy zyskuje `times` wystąpień)."""
+        if not institution_uuid:
+            return
+        entry = self._entries.get(institution_uuid)
+        if entry is None:
+            entry = self._entries[institution_uuid] = _Entry(institution_uuid)
+            self._dirty = True
+        name = " ".join((name or "").split())
+        if not name:
+            return
+        if name not in entry.variants:
+            self._dirty = True
+            self._by_name.setdefault(normalize_name(name), institution_uuid)
+        entry.variants[name] += times
+
+    def observe_impacts(self, impacts: Iterable[ImpactCaseSchema]) -> None:
+        for impact in impacts:
+            self.observe(impact.institution_uuid, impact.institution_name)
+
+    def observe_evaluations(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> None:
+        for evaluation in evaluations:
+            self.observe(evaluation.institution_uuid, evaluation.institution_name)
+
+    def set_counts(
+        self,
+        institution_uuid: str,
+        impacts: Optional[int] = None,
+        evaluations: Optional[int] = None,
+    ) -> None:
+        """Ustawia liczby impactów / okresów ewaluacji (None – bez zmian)."""
+        entry = self._entries.get(institution_uuid)
+        if entry is None:
+            entry = self._entries[institution_uuid] = _Entry(institution_uuid)
+            self._dirty = True
+        if impacts is not None:
+            entry.impact_count = impacts
+        if evaluations is not None:
+            entry.evaluation_count = evaluations
+
+    def merge(self, other: "InstitutionIndex") -> None:
+        """Dokłada warianty nazw z `other`; liczby z `other` zastępują bieżące, jeśli są niezerowe."""
+        for uuid, entry in other._entries.items():
+            for name, times in entry.variants.items():
+                self.observe(uuid, name, times)
+            self.set_counts(
+                uuid,
+                impacts=entry.impact_count or None,
+                evaluations=entry.evaluation_count or None,
+            )
+
+    # ================== ODCZYT ==================
+
+    def _schema(self, entry: _Entry, score: Optional[float] = None) -> InstitutionSchema:
+        return InstitutionSchema(
+            institution_uuid=entry.uuid,
+            name=entry.name,
+            name_variants=[name for name, _ in entry.variants.most_common()],
+            impact_count=entry.impact_count,
+            evaluation_count=entry.evaluation_count,
+            score=score,
+        )
+
+    def get(self, institution_uuid: str) -> Optional[InstitutionSchema]:
+        entry = self._entries.get(institution_uuid)
+        return self._schema(entry) if entry is not None else None
+
+    def name_for(self, institution_uuid: str) -> Optional[str]:
+        """Kanoniczna nazwa instytucji (najczęstszy wariant) albo None."""
+        entry = self._entries.get(institution_uuid)
+        return (entry.name or None) if entry is not None else None
+
+    def resolve(self, name: str) -> Optional[str]:
+        """UUID instytucji o dokładnie tej nazwie (po normalizacji) albo None."""
+        return self._by_name.get(normalize_name(name))
+
+    def all(self, skip: int = 0, limit: Optional[int] = None) -> List[InstitutionSchema]:
+        """Instytucje alfabetycznie po nazwie kanonicznej (strona od `skip`)."""
+        entries = sorted(self._entries.values(), key=lambda e: normalize_name(e.name))
+        end = skip + limit if limit is not None else None
+        return [self._schema(e) for e in entries[skip:end]]
+
+    def _ensure_keys(self) -> None:
+        if not self._dirty:
+            return
+        keys = sorted(
+            {
+                (key, entry.uuid, is_start)
+                for entry in self._entries.values()
+                for name in entry.variants
+                for key, is_start in _word_suffixes(normalize_name(name))
+            }
+        )
+        self._keys = [key for key, _, _ in keys]
+        self._key_uuids = [uuid for _, uuid, _ in keys]
+        self._key_starts = [is_start for _, _, is_start in keys]
+
+        self._uuid_keys = {}
+        self._trigram_uuids = {}
+        for key, uuid, is_start in keys:
+            self._uuid_keys.setdefault(uuid, []).append(key)
+            if is_start:
+                for gram in _trigrams(key):
+                    self._trigram_uuids.setdefault(gram, set()).add(uuid)
+        self._dirty = False
+
+    def _prefix_matches(self, query: str) -> Dict[str, float]:
+        """UUID → wynik: 1.0 – nazwa zaczyna się od zapytania, 0.9 – któreś dalsze słowo."""
+        matches: Dict[str, float] = {}
+        position = bisect.bisect_left(self._keys, query)
+        while position < len(self._keys) and self._keys[position].startswith(query):
+            uuid = self._key_uuids[position]
+            score = 1.0 if self._key_starts[position] else 0.9
+            matches[uuid] = max(score, matches.get(uuid, 0.0))
+            position += 1
+        return matches
+
+    def _fuzzy_matches(self, query: str) -> Dict[str, float]:
+        """
+        UUID → wynik 0.8 × podobieństwo (difflib) zapytania do początku klucza
+        tej samej długości – literówki w pisanym prefiksie. Porównywane są tylko
+        klucze instytucji o największej liczbie wspólnych trigramów z zapytaniem.
+        """
+        shared: Counter = Counter()
+        for gram in _trigrams(query):
+            shared.update(self._trigram_uuids.get(gram, ()))
+
+        matches: Dict[str, float] = {}
+        matcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        for uuid, _ in shared.most_common(FUZZY_CANDIDATES):
+            best = 0.0
+            for key in self._uuid_keys[uuid]:
+                matcher.set_seq1(key[:len(query)])
+                if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+                    best = max(best, matcher.ratio())
+            if best >= FUZZY_CUTOFF:
+                matches[uuid] = 0.8 * best
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        fuzzy: bool = True,
+    ) -> List[InstitutionSchema]:
+        """
+        Autouzupełnianie nazw: najpierw dopasowania prefiksowe (od początku nazwy,
+        potem od początku dalszych słów), a gdy jest ich mniej niż `limit` –
+        przybliżone. W ramach wyniku – więcej impactów wyżej.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        self._ensure_keys()
+
+        matches = self._prefix_matches(normalized)
+        if fuzzy and len(matches) < limit:
+            for uuid, score in self._fuzzy_matches(normalized).items():
+                if uuid not in matches:
+                    matches[uuid] = score
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (-item[1], -self._entries[item[0]].impact_count, self._entries[item[0]].name),
+        )
+        return [self._schema(self._entries[uuid], round(score, 3)) for uuid, score in ranked[:limit]]
+
+    # ================== ZAPIS / ODCZYT PLIKU ==================
+
+    def to_records(self) -> List[Dict[str, object]]:
+        return [
+            {
+                "institution_uuid": entry.uuid,
+                "name_variants": dict(entry.variants.most_common()),
+                "impact_count": entry.impact_count,
+                "evaluation_count": entry.evaluation_count,
+            }
+            for entry in sorted(self._entries.values(), key=lambda e: e.uuid)
+        ]
+
+    def save(self, path: Path | str) -> None:
+        """Zapis atomowy (plik tymczasowy + `os.replace`) – API może czytać plik w trakcie."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_records(), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, object]]) -> "InstitutionIndex":
+        index = cls()
+        for record in records:
+            uuid = str(record["institution_uuid"])
+            for name, times in dict(record.get("name_variants") or {}).items():
+                index.observe(uuid, name, int(times))
+            index.set_counts(
+                uuid,
+                impacts=int(record.get("impact_count") or 0),
+                evaluations=int(record.get("evaluation_count") or 0),
+            )
+        return index
+
+    @classmethod
+    def load(cls, path: Path | str, missing_ok: bool = False) -> "InstitutionIndex":
+        """Wczytuje indeks z pliku; z `missing_ok` brak pliku daje pusty indeks."""
+        path = Path(path)
+        if missing_ok and not path.is_file():
+            return cls()
+        return cls.from_records(json.loads(path.read_text(encoding="utf-8")))
+
+
+def add_index_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólne opcje CLI skryptów ingestu: plik indeksu instytucji."""
+    parser.add_argument(
+        "--institution-index",
+        type=str,
+        default=storage_settings.institution_index_path,
+        help=f"Plik indeksu instytucji uzupełniany przy ingeście (domyślnie: {storage_settings.institution_index_path}).",
+    )
+    parser.add_argument(
+        "--no-institution-index",
+        action="store_true",
+        help="Nie aktualizuj indeksu instytucji.",
+    )
+
+
+async def refresh_impact_counts(index: InstitutionIndex, repo: BaseImpactRepository) -> None:
+    """Ustawia liczby impactów instytucji z indeksu na podstawie repozytorium (zliczanie po indeksie)."""
+    for uuid in index:
+        index.set_counts(uuid, impacts=await repo.count(institution_uuid=uuid))
+
+
+def update_index_file(path: Path | str, update: InstitutionIndex) -> InstitutionIndex:
+    """Wczytuje indeks z `path` (lub pusty), dokłada `update` i zapisuje z powrotem."""
+    index = InstitutionIndex.load(path, missing_ok=True)
+    index.merge(update)
+    index.save(path)
+    logger.info("Zaktualizowano indeks instytucji %s (%d instytucji)", path, len(index))
+    return index
+
+
+def evaluation_counts(evaluations: Iterable[InstitutionEvaluationSchema]) -> Dict[str, int]:
+    """Liczba różnych okresów ewaluacji na instytucję."""
+    periods: Dict[str, Set[str]] = {}
+    for evaluation in evaluations:
+        if evaluation.institution_uuid:
+            periods.setdefault(evaluation.institution_uuid, set()).add(evaluation.evaluation_period)
+    return {uuid: len(values) for uuid, values in periods.items()}
+
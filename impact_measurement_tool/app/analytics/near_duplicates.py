@@ -0,0 +1,423 @@
+# app/analytics/near_duplicates.py
+"""
+Wykrywanie prawie-duplikatów narracji impactów (MinHash + LSH).
+
+Ten sam opis wpływu bywa zgłaszany, z drobnymi zmianami, przez kilka
+instytucji lub w kilku dyscyplinach. Porównanie każdej pary jest kwadratowe,
+więc:
+
+1. tekst narracji (domyślnie impact_description_pl/en) jest dzielony na
+   shingle – k kolejnych słów, haszowane stabilnie między uruchomieniami (crc32),
+2. sygnatura MinHash (`num_perm` permutacji) liczona jest w NumPy,
+3. sygnatury są dzielone na `bands` pasm; rekordy z identycznym pasmem trafiają
+   do jednego kubełka i tylko one są kandydatami do porównania,
+4. podobieństwo kandydatów (estymata Jaccarda = odsetek zgodnych pozycji
+   sygnatury) jest filtrowane progiem, a pary łączone w klastry (union-find).
+
+Indeks sygnatur można zapisać (`.npz`) i dokładać do niego nowe rekordy –
+porównywane są wtedy tylko nowe / zmienione rekordy z całym indeksem.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import zlib
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import regex as re
+
+logger = logging.getLogger(__name__)
+
+NARRATIVE_FIELDS: Tuple[str, ...] = ("impact_description_pl", "impact_description_en")
+
+# Pola przechowywane w indeksie, żeby raport klastrów nie wymagał odczytu z bazy
+META_FIELDS: Tuple[str, ...] = ("institution_name", "discipline_name")
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 16          # 16 pasm × 8 wierszy → próg LSH ≈ (1/16)^(1/8) ≈ 0.71
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.7
+# Kubełki większe od limitu (np. wspólny szablon tekstu) są pomijane przy generowaniu par
+DEFAULT_MAX_BUCKET = 500
+
+_WORD = re.compile(r"\w+")
+_MAX_UINT32 = np.uint32(0xFFFFFFFF)
+_SHINGLE_PRIME = np.uint64(0x100000001B3)
+
+
+def narrative_text(doc: Dict[str, Any], fields: Sequence[str] = NARRATIVE_FIELDS) -> str:
+    """Skleja pola narracji dokumentu w jeden tekst."""
+    return "\n".join(str(doc.get(f) or "") for f in fields).strip()
+
+
+def shingle_hashes(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> np.ndarray:
+    """
+    Unikalne hasze shingli słownych (po `size` słów, małymi literami), uint32.
+
+    Słowa są haszowane crc32, a okna łączone haszem wielomianowym w NumPy –
+    bez sklejania napisów dla każdego shingla. Teksty krótsze niż `size`
+    słów dają pustą tablicę.
+    """
+    words = _WORD.findall(text.lower())
+    n = len(words) - size + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint32)
+
+    word_hashes = np.fromiter(
+        (zlib.crc32(w.encode("utf-8")) for w in words),
+        dtype=np.uint64,
+        count=len(words),
+    )
+    combined = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for j in range(size):
+            combined = combined * _SHINGLE_PRIME + word_hashes[j:j + n]
+    folded = (combined ^ (combined >> np.uint64(32))) & np.uint64(0xFFFFFFFF)
+    return np.unique(folded.astype(np.uint32))
+
+
+def text_fingerprint(text: str) -> int:
+    """Suma kontrolna tekstu – do wykrywania zmienionych rekordów przy aktualizacji indeksu."""
+    return zlib.crc32(text.encode("utf-8"))
+
+
+class MinHasher:
+    """
+    Rodzina `num_perm` funkcji haszujących typu multiply-shift:
+    h_i(x) = ((a_i * x + b_i) mod 2^64) >> 32, a_i nieparzyste.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1) -> None:
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.seed = seed
+        self._a = rng.integers(1, 2**63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes: np.ndarray) -> np.ndarray:
+        """Sygnatura MinHash (uint32, długość `num_perm`) dla zbioru haszy shingli."""
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_UINT32, dtype=np.uint32)
+        x = hashes.astype(np.uint64)[None, :]
+        with np.errstate(over="ignore"):
+            permuted = (self._a[:, None] * x + self._b[:, None]) >> np.uint64(32)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def signatures(self, texts: Iterable[str], shingle_size: int = DEFAULT_SHINGLE_SIZE) -> np.ndarray:
+        rows = [self.signature(shingle_hashes(t, shingle_size)) for t in texts]
+        if not rows:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.vstack(rows)
+
+
+def _band_keys(signatures: np.ndarray, bands: int) -> np.ndarray:
+    """Hasz każdego pasma sygnatury → macierz (n, bands) uint64."""
+    n, num_perm = signatures.shape
+    rows = num_perm // bands
+    banded = signatures[:, : bands * rows].reshape(n, bands, rows).astype(np.uint64)
+    # Hasz wielomianowy wierszy pasma (przepełnienie uint64 jest zamierzone)
+    keys = np.zeros((n, bands), dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for r in range(rows):
+            keys = keys * _SHINGLE_PRIME + banded[:, :, r]
+    return keys
+
+
+class _UnionFind:
+    def __init__(self) -> None:
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        parent = self.parent.setdefault(x, x)
+        if parent != x:
+            parent = self.parent[x] = self.find(parent)
+        return parent
+
+    def union(self, x: int, y: int) -> None:
+        rx, ry = self.find(x), self.find(y)
+        if rx != ry:
+            self.parent[max(rx, ry)] = min(rx, ry)
+
+
+class MinHashIndex:
+    """
+    Trwały indeks sygnatur MinHash z kubełkami LSH.
+
+    Wiersz indeksu = jeden impact (klucz: impact_uuid). Rekord dodany ponownie
+    z tym samym tekstem jest pomijany, ze zmienionym – podmieniany.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = 1,
+        fields: Sequence[str] = NARRATIVE_FIELDS,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) musi być wielokrotnością bands ({bands}).")
+
+        self.hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.fields = tuple(fields)
+
+        self.keys: List[str] = []
+        self.fingerprints = np.empty(0, dtype=np.uint32)
+        self.signatures = np.empty((0, num_perm), dtype=np.uint32)
+        self.band_keys = np.empty((0, bands), dtype=np.uint64)
+        self.meta: Dict[str, List[str]] = {f: [] for f in META_FIELDS}
+
+        self._rows: Dict[str, int] = {}
+        self._buckets: List[Dict[int, List[int]]] = [defaultdict(list) for _ in range(bands)]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def threshold_estimate(self) -> float:
+        """Przybliżone podobieństwo, od którego para ma ~50% szans zostać kandydatem."""
+        rows = self.hasher.num_perm // self.bands
+        return (1.0 / self.bands) ** (1.0 / rows)
+
+    # ================== BUDOWA ==================
+
+    def _bucket(self, row: int) -> None:
+        for band, key in enumerate(self.band_keys[row].tolist()):
+            self._buckets[band][key].append(row)
+
+    def _unbucket(self, row: int) -> None:
+        for band, key in enumerate(self.band_keys[row].tolist()):
+            members = self._buckets[band].get(key)
+            if members is not None and row in members:
+                members.remove(row)
+
+    def add(self, docs: Iterable[Dict[str, Any]]) -> List[int]:
+        """
+        Dodaje / aktualizuje dokumenty (słowniki z `impact_uuid` i polami narracji).
+
+        Zwraca numery wierszy nowych lub zmienionych rekordów. Dokumenty bez
+        klucza albo z narracją krótszą niż jeden shingle są pomijane.
+        """
+        pending: Dict[str, Tuple[Optional[int], str, int, Dict[str, Any]]] = {}
+        for doc in docs:
+            key = doc.get("impact_uuid")
+            text = narrative_text(doc, self.fields)
+            if not key or not text:
+                continue
+            fingerprint = text_fingerprint(text)
+            row = self._rows.get(key)
+            if row is not None and int(self.fingerprints[row]) == fingerprint:
+                continue
+            pending[key] = (row, text, fingerprint, doc)
+
+        if not pending:
+            return []
+
+        items = list(pending.items())
+        signatures = self.hasher.signatures((text for _, (_, text, _, _) in items), self.shingle_size)
+        valid = ~(signatures == _MAX_UINT32).all(axis=1)
+        band_keys = _band_keys(signatures, self.bands)
+
+        changed: List[int] = []
+        appended: List[int] = []
+        for i, (key, (row, _, fingerprint, doc)) in enumerate(items):
+            if not valid[i]:
+                continue
+            if row is not None:
+                # Zmieniony tekst – podmieniamy wiersz w miejscu
+                self._unbucket(row)
+                self.signatures[row] = signatures[i]
+                self.band_keys[row] = band_keys[i]
+                self.fingerprints[row] = fingerprint
+                for f in META_FIELDS:
+                    self.meta[f][row] = str(doc.get(f) or "")
+                self._bucket(row)
+                changed.append(row)
+            else:
+                appended.append(i)
+                self._rows[key] = len(self.keys)
+                self.keys.append(key)
+                for f in META_FIELDS:
+                    self.meta[f].append(str(doc.get(f) or ""))
+
+        if appended:
+            start = len(self.fingerprints)
+            self.signatures = np.vstack([self.signatures, signatures[appended]])
+            self.band_keys = np.vstack([self.band_keys, band_keys[appended]])
+            self.fingerprints = np.concatenate([
+                self.fingerprints,
+                np.array([items[i][1][2] for i in appended], dtype=np.uint32),
+            ])
+            for row in range(start, start + len(appended)):
+                self._bucket(row)
+                changed.append(row)
+
+        return changed
+
+    # ================== WYSZUKIWANIE ==================
+
+    def candidate_pairs(
+        self,
+        rows: Optional[Iterable[int]] = None,
+        max_bucket: int = DEFAULT_MAX_BUCKET,
+    ) -> np.ndarray:
+        """
+        Pary kandydatów (i < j) z kubełków LSH – wszystkie albo tylko z udziałem `rows`.
+
+        Zwraca tablicę (m, 2) int64 bez powtórzeń.
+        """
+        pairs: Set[Tuple[int, int]] = set()
+        oversized = 0
+
+        if rows is None:
+            for buckets in self._buckets:
+                for members in buckets.values():
+                    if len(members) < 2:
+                        continue
+                    if len(members) > max_bucket:
+                        oversized += 1
+                        continue
+                    ordered = sorted(members)
+                    pairs.update(
+                        (a, b) for i, a in enumerate(ordered) for b in ordered[i + 1:]
+                    )
+        else:
+            for row in rows:
+                for band, key in enumerate(self.band_keys[row].tolist()):
+                    members = self._buckets[band].get(key, ())
+                    if len(members) > max_bucket:
+                        oversized += 1
+                        continue
+                    pairs.update((min(row, m), max(row, m)) for m in members if m != row)
+
+        if oversized:
+            logger.warning("Pominięto %d kubełków LSH większych niż %d rekordów", oversized, max_bucket)
+        if not pairs:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.array(sorted(pairs), dtype=np.int64)
+
+    def similarities(self, pairs: np.ndarray) -> np.ndarray:
+        """Estymata Jaccarda dla par – odsetek zgodnych pozycji sygnatur (wektorowo)."""
+        if len(pairs) == 0:
+            return np.empty(0, dtype=np.float64)
+        return (self.signatures[pairs[:, 0]] == self.signatures[pairs[:, 1]]).mean(axis=1)
+
+    def similar_pairs(
+        self,
+        rows: Optional[Iterable[int]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_bucket: int = DEFAULT_MAX_BUCKET,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Pary kandydatów z podobieństwem >= `threshold` i ich podobieństwa."""
+        pairs = self.candidate_pairs(rows, max_bucket=max_bucket)
+        sims = self.similarities(pairs)
+        keep = sims >= threshold
+        return pairs[keep], sims[keep]
+
+    def clusters(
+        self,
+        rows: Optional[Iterable[int]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        max_bucket: int = DEFAULT_MAX_BUCKET,
+    ) -> List[Dict[str, Any]]:
+        """
+        Klastry prawie-duplikatów (spójne składowe grafu par powyżej progu).
+
+        Z `rows` – tylko klastry zawierające choć jeden z tych wierszy
+        (tryb przyrostowy). Klastry posortowane malejąco po rozmiarze.
+        """
+        pairs, sims = self.similar_pairs(rows, threshold=threshold, max_bucket=max_bucket)
+
+        uf = _UnionFind()
+        for a, b in pairs.tolist():
+            uf.union(a, b)
+
+        members: Dict[int, List[int]] = defaultdict(list)
+        for row in uf.parent:
+            members[uf.find(row)].append(row)
+        cluster_pairs: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for (a, b), sim in zip(pairs.tolist(), sims.tolist()):
+            cluster_pairs[uf.find(a)].append({
+                "a": self.keys[a],
+                "b": self.keys[b],
+                "similarity": round(sim, 4),
+            })
+
+        clusters: List[Dict[str, Any]] = []
+        for root, rows_in_cluster in members.items():
+            rows_in_cluster.sort()
+            scores = [p["similarity"] for p in cluster_pairs[root]]
+            clusters.append({
+                "size": len(rows_in_cluster),
+                "min_similarity": min(scores),
+                "max_similarity": max(scores),
+                "members": [
+                    {"impact_uuid": self.keys[r], **{f: self.meta[f][r] for f in META_FIELDS}}
+                    for r in rows_in_cluster
+                ],
+                "pairs": cluster_pairs[root],
+            })
+
+        clusters.sort(key=lambda c: (-c["size"], -c["max_similarity"]))
+        return [{"cluster_id": i, **cluster} for i, cluster in enumerate(clusters, start=1)]
+
+    # ================== ZAPIS / ODCZYT ==================
+
+    def save(self, path: Path | str) -> None:
+        """
+        Zapisuje indeks do pliku `.npz` (bez pickle) dokładnie pod `path` –
+        przez otwarty plik, bo np.savez ze ścieżką dokleja brakujące „.npz”.
+        Zapis jest atomowy (plik tymczasowy + os.replace).
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        params = {
+            "num_perm": self.hasher.num_perm,
+            "seed": self.hasher.seed,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "fields": list(self.fields),
+        }
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                params=np.array(json.dumps(params)),
+                keys=np.array(self.keys, dtype=np.str_),
+                fingerprints=self.fingerprints,
+                signatures=self.signatures,
+                band_keys=self.band_keys,
+                **{f"meta_{f}": np.array(self.meta[f], dtype=np.str_) for f in META_FIELDS},
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "MinHashIndex":
+        with np.load(path, allow_pickle=False) as data:
+            params = json.loads(str(data["params"]))
+            index = cls(
+                num_perm=params["num_perm"],
+                bands=params["bands"],
+                shingle_size=params["shingle_size"],
+                seed=params["seed"],
+                fields=params["fields"],
+            )
+            index.keys = data["keys"].tolist()
+            index.fingerprints = data["fingerprints"]
+            index.signatures = data["signatures"]
+            index.band_keys = data["band_keys"]
+            for f in META_FIELDS:
+                key = f"meta_{f}"
+                index.meta[f] = data[key].tolist() if key in data else [""] * len(index.keys)
+
+        index._rows = {key: row for row, key in enumerate(index.keys)}
+        for row in range(len(index.keys)):
+            index._bucket(row)
+        return index
@@ -0,0 +1,416 @@
+# app/analytics/similarity.py
+"""
+Lokalny indeks podobieństwa tekstów (impacty, fragmenty produktów naukowych).
+
+Domyślny wektoryzator to TF-IDF na haszowanych cechach (signed feature
+hashing): słowa i bigramy są rzutowane na `dim` wymiarów bez słownika,
+więc indeks działa w pełni offline i bez dodatkowych zależności. Zamiast
+niego można podpiąć dowolny model gęstych embeddingów (`Embedder`,
+ładowany z `modul:fabryka`).
+
+Wektory (znormalizowane L2, float32) są zapisywane jako `vectors.npy`
+i czytane przez `np.load(mmap_mode="r")` – macierz nie musi mieścić się
+w RAM, a zapytania top-k to mnożenie macierzy blokami wierszy.
+
+Układ katalogu indeksu:
+    vectors.npy   – macierz (n, dim) float32
+    items.json    – opis wierszy: key, kind, doc_id, label
+    meta.json     – parametry wektoryzatora
+    idf.npy       – wagi IDF (tylko wektoryzator haszujący)
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import logging
+import zlib
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+import numpy as np
+import regex as re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIM = 1024
+# Liczba wierszy macierzy mnożonych naraz przy zapytaniu
+DEFAULT_BLOCK_ROWS = 65536
+# Liczba tekstów wektoryzowanych naraz przy budowie indeksu
+BUILD_BATCH_SIZE = 1024
+
+ITEM_KINDS = ("impact", "product")
+
+_WORD = re.compile(r"\w+")
+
+
+@dataclass
+class IndexItem:
+    """Jeden wiersz indeksu: impact albo fragment (chunk) produktu."""
+
+    key: str                 # unikalny klucz wiersza, np. impact_uuid lub "<product_id>#<nr chunku>"
+    kind: str                # "impact" | "product"
+    doc_id: str              # impact_uuid / id produktu – do grupowania fragmentów
+    label: str = ""          # tytuł do wyświetlenia
+
+
+@runtime_checkable
+class Embedder(Protocol):
+    """
+    Wtyczka gęstych embeddingów. Implementacja musi zwracać macierz
+    (len(texts), dim) float32 – normalizacja L2 jest robiona przez indeks.
+    """
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        ...
+
+
+def load_embedder(spec: str) -> Embedder:
+    """Ładuje wtyczkę ze specyfikacji `pakiet.modul:fabryka` (fabryka bez argumentów)."""
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Oczekiwano specyfikacji 'modul:fabryka', otrzymano: {spec!r}")
+    factory = getattr(importlib.import_module(module_name), attr)
+    embedder = factory()
+    if not isinstance(embedder, Embedder):
+        raise TypeError(f"{spec} nie zwraca obiektu zgodnego z protokołem Embedder.")
+    return embedder
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class HashingTfidfVectorizer:
+    """
+    TF-IDF na haszowanych cechach ze znakiem (crc32 → indeks i znak).
+
+    Cechy: słowa (małe litery) i bigramy słów, waga TF = 1 + log(liczność).
+    IDF liczone jest po kubełkach haszujących, więc nie wymaga słownika.
+    """
+
+    name = "hashing-tfidf"
+
+    def __init__(self, dim: int = DEFAULT_DIM, bigrams: bool = True) -> None:
+        self.dim = dim
+        self.bigrams = bigrams
+        self.idf: Optional[np.ndarray] = None
+
+    def _features(self, text: str) -> Counter:
+        words = _WORD.findall(text.lower())
+        features = Counter(words)
+        if self.bigrams:
+            features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        return features
+
+    def term_frequencies(self, texts: Sequence[str]) -> np.ndarray:
+        """Macierz (len(texts), dim) haszowanych wag TF – bez IDF i normalizacji."""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            features = self._features(text)
+            if not features:
+                continue
+            hashes = np.fromiter(
+                (zlib.crc32(f.encode("utf-8")) for f in features),
+                dtype=np.uint32,
+                count=len(features),
+            )
+            weights = 1.0 + np.log(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+            # Najstarszy bit hasza wyznacza znak – kolizje częściowo się znoszą
+            signs = np.where(hashes >> np.uint32(31), -1.0, 1.0).astype(np.float32)
+            np.add.at(out[row], (hashes % np.uint32(self.dim)).astype(np.intp), signs * weights)
+        return out
+
+    def fit_idf(self, document_frequency: np.ndarray, n_docs: int) -> None:
+        """Wygładzone IDF: log((1 + n) / (1 + df)) + 1."""
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Wektory TF-IDF znormalizowane L2 (wymaga wcześniejszego `fit_idf`)."""
+        tf = self.term_frequencies(texts)
+        if self.idf is not None:
+            tf *= self.idf
+        return _normalize_rows(tf)
+
+
+class SimilarityIndex:
+    """
+    Indeks wektorów tylko do odczytu (macierz mapowana w pamięci).
+
+    Zapytania są wykonywane blokami po `block_rows` wierszy: wynik
+    bloku (q × block_rows) jest redukowany do top-k, więc zużycie pamięci
+    nie zależy od rozmiaru korpusu.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        items: List[IndexItem],
+        vectorizer: Optional[HashingTfidfVectorizer] = None,
+        embedder: Optional[Embedder] = None,
+        block_rows: int = DEFAULT_BLOCK_ROWS,
+    ) -> None:
+        if len(items) != len(vectors):
+            raise ValueError("Liczba opisów wierszy nie zgadza się z liczbą wektorów.")
+        self.vectors = vectors
+        self.items = items
+        self.vectorizer = vectorizer
+        self.embedder = embedder
+        self.block_rows = block_rows
+
+        self._rows_by_doc: Dict[str, List[int]] = {}
+        for row, item in enumerate(items):
+            self._rows_by_doc.setdefault(item.doc_id, []).append(row)
+        self._kinds = np.array([ITEM_KINDS.index(item.kind) for item in items], dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    # ================== ZAPYTANIA ==================
+
+    def embed_queries(self, texts: Sequence[str]) -> np.ndarray:
+        if self.embedder is not None:
+            return _normalize_rows(np.asarray(self.embedder.embed(texts), dtype=np.float32))
+        if self.vectorizer is None:
+            raise RuntimeError("Indeks nie ma wektoryzatora ani wtyczki embeddingów.")
+        return self.vectorizer.transform(texts)
+
+    def _top_k(
+        self,
+        queries: np.ndarray,
+        k: int,
+        kind: Optional[str],
+        exclude_rows: Optional[List[Sequence[int]]] = None,
+    ) -> List[List[Tuple[int, float]]]:
+        """Top-k (wiersz, podobieństwo kosinusowe) dla każdego zapytania."""
+        n_queries = len(queries)
+        best_scores = np.full((n_queries, 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((n_queries, 0), dtype=np.int64)
+        kind_code = ITEM_KINDS.index(kind) if kind else None
+
+        for start in range(0, len(self.vectors), self.block_rows):
+            block = np.asarray(self.vectors[start:start + self.block_rows])
+            scores = queries @ block.T
+
+            if kind_code is not None:
+                scores[:, self._kinds[start:start + len(block)] != kind_code] = -np.inf
+            if exclude_rows:
+                for q, rows in enumerate(exclude_rows):
+                    local = [r - start for r in rows if start <= r < start + len(block)]
+                    scores[q, local] = -np.inf
+
+            take = min(k, scores.shape[1])
+            part = np.argpartition(-scores, take - 1, axis=1)[:, :take]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, part, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, part + start], axis=1)
+
+            if best_scores.shape[1] > k:
+                keep = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_scores = np.take_along_axis(best_scores, keep, axis=1)
+                best_rows = np.take_along_axis(best_rows, keep, axis=1)
+
+        results: List[List[Tuple[int, float]]] = []
+        for q in range(n_queries):
+            order = np.argsort(-best_scores[q])
+            results.append([
+                (int(best_rows[q, i]), float(best_scores[q, i]))
+                for i in order
+                if np.isfinite(best_scores[q, i])
+            ])
+        return results
+
+    def _hits(self, ranked: List[Tuple[int, float]], k: int, group_by_doc: bool) -> List[Dict[str, Any]]:
+        hits: List[Dict[str, Any]] = []
+        seen: set = set()
+        for row, score in ranked:
+            item = self.items[row]
+            if group_by_doc:
+                # Dla produktów zwracamy tylko najlepszy fragment dokumentu
+                if item.doc_id in seen:
+                    continue
+                seen.add(item.doc_id)
+            hits.append({**asdict(item), "score": round(score, 4)})
+            if len(hits) >= k:
+                break
+        return hits
+
+    def search(
+        self,
+        texts: Sequence[str],
+        k: int = 10,
+        kind: Optional[str] = None,
+        group_by_doc: bool = True,
+    ) -> List[List[Dict[str, Any]]]:
+        """Top-k najbardziej podobnych wierszy dla każdego tekstu zapytania (wsadowo)."""
+        # Przy grupowaniu bierzemy zapas, bo kilka fragmentów może należeć do jednego dokumentu
+        fetch = k * 4 if group_by_doc else k
+        ranked = self._top_k(self.embed_queries(texts), fetch, kind)
+        return [self._hits(r, k, group_by_doc) for r in ranked]
+
+    def similar_to(
+        self,
+        doc_id: str,
+        k: int = 10,
+        kind: Optional[str] = None,
+        group_by_doc: bool = True,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Dokumenty podobne do zaindeksowanego dokumentu (impactu lub produktu).
+
+        Wektor zapytania to średnia wierszy dokumentu; sam dokument jest pomijany.
+        Zwraca None, jeśli dokumentu nie ma w indeksie.
+        """
+        rows = self._rows_by_doc.get(doc_id)
+        if rows is None:
+            return None
+        query = np.asarray(self.vectors[rows]).mean(axis=0, keepdims=True)
+        query = _normalize_rows(query.astype(np.float32))
+        fetch = k * 4 if group_by_doc else k
+        ranked = self._top_k(query, fetch, kind, exclude_rows=[rows])
+        return self._hits(ranked[0], k, group_by_doc)
+
+    # ================== ODCZYT ==================
+
+    @classmethod
+    def load(cls, directory: Path | str, block_rows: int = DEFAULT_BLOCK_ROWS) -> "SimilarityIndex":
+        directory = Path(directory)
+        meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+        items = [
+            IndexItem(**item)
+            for item in json.loads((directory / "items.json").read_text(encoding="utf-8"))
+        ]
+        vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+
+        vectorizer: Optional[HashingTfidfVectorizer] = None
+        embedder: Optional[Embedder] = None
+        if meta["vectorizer"] == HashingTfidfVectorizer.name:
+            vectorizer = HashingTfidfVectorizer(dim=meta["dim"], bigrams=meta.get("bigrams", True))
+            vectorizer.idf = np.load(directory / "idf.npy")
+        else:
+            embedder = load_embedder(meta["embedder"])
+
+        return cls(vectors, items, vectorizer=vectorizer, embedder=embedder, block_rows=block_rows)
+
+
+# ================== BUDOWA ==================
+
+
+def build_index(
+    entries: Iterable[Tuple[IndexItem, str]],
+    directory: Path | str,
+    dim: int = DEFAULT_DIM,
+    embedder_spec: Optional[str] = None,
+) -> int:
+    """
+    Buduje indeks w katalogu `directory` z par (opis wiersza, tekst).
+
+    Teksty są wektoryzowane partiami i zapisywane wprost do pliku `.npy`
+    otwartego jako memmap – w pamięci jest jedna partia wektorów. Dla
+    wektoryzatora haszującego IDF liczone jest w pierwszym przebiegu, a
+    skalowanie i normalizacja wykonywane blokami w drugim.
+
+    Zwraca liczbę zaindeksowanych wierszy.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    embedder = load_embedder(embedder_spec) if embedder_spec else None
+    vectorizer = None if embedder else HashingTfidfVectorizer(dim=dim)
+    width = embedder.dim if embedder else dim
+
+    # Liczba wierszy musi być znana przy tworzeniu memmapy, więc opisy i teksty
+    # trzymamy do czasu zapisu (same teksty, bez obiektów modeli).
+    items: List[IndexItem] = []
+    texts: List[str] = []
+    for item, text in entries:
+        if text and text.strip():
+            items.append(item)
+            texts.append(text)
+
+    vectors = np.lib.format.open_memmap(
+        directory / "vectors.npy", mode="w+", dtype=np.float32, shape=(len(items), width)
+    )
+    document_frequency = np.zeros(width, dtype=np.int64)
+
+    for start in range(0, len(texts), BUILD_BATCH_SIZE):
+        batch = texts[start:start + BUILD_BATCH_SIZE]
+        if embedder is not None:
+            block = _normalize_rows(np.asarray(embedder.embed(batch), dtype=np.float32))
+        else:
+            block = vectorizer.term_frequencies(batch)
+            document_frequency += np.count_nonzero(block, axis=0)
+        vectors[start:start + len(batch)] = block
+
+    meta: Dict[str, Any] = {"dim": width, "rows": len(items)}
+    if vectorizer is not None:
+        vectorizer.fit_idf(document_frequency, len(items))
+        for start in range(0, len(items), BUILD_BATCH_SIZE):
+            block = vectors[start:start + BUILD_BATCH_SIZE] * vectorizer.idf
+            vectors[start:start + len(block)] = _normalize_rows(block)
+        np.save(directory / "idf.npy", vectorizer.idf)
+        meta.update(vectorizer=vectorizer.name, bigrams=vectorizer.bigrams)
+    else:
+        meta.update(vectorizer="embedder", embedder=embedder_spec, embedder_name=embedder.name)
+
+    vectors.flush()
+    del vectors
+
+    (directory / "items.json").write_text(
+        json.dumps([asdict(item) for item in items], ensure_ascii=False),
+        encoding="utf-8",
+    )
+    (directory / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    logger.info(
+        "Zbudowano indeks podobieństwa: %d wierszy × %d wymiarów (%.1f MB) → %s",
+        len(items),
+        width,
+        len(items) * width * 4 / (1024 * 1024),
+        directory,
+    )
+    return len(items)
+
+
+# ================== ŹRÓDŁA TEKSTÓW ==================
+
+
+IMPACT_TEXT_FIELDS: Tuple[str, ...] = (
+    "impact_uuid",
+    "title_pl", "title_en",
+    "summary_pl", "summary_en",
+    "impact_description_pl", "impact_description_en",
+)
+
+
+def impact_entries(docs: Iterable[Dict[str, Any]]) -> Iterable[Tuple[IndexItem, str]]:
+    """Impacty: jeden wiersz na impact (tytuł, streszczenie i opis PL+EN)."""
+    for doc in docs:
+        uuid = doc.get("impact_uuid")
+        if not uuid:
+            continue
+        text = "\n".join(str(doc.get(f) or "") for f in IMPACT_TEXT_FIELDS[1:])
+        label = doc.get("title_pl") or doc.get("title_en") or ""
+        yield IndexItem(key=uuid, kind="impact", doc_id=uuid, label=label), text
+
+
+def product_entries(products: Iterable[Any]) -> Iterable[Tuple[IndexItem, str]]:
+    """
+    Produkty naukowe: wiersz na każdy fragment (`chunk_offsets` lub `chunks`,
+    zob. app/pipeline/chunking.py); produkt bez fragmentów jest indeksowany
+    jednym wierszem (tytuł + streszczenie + raw_content).
+    """
+    for product in products:
+        if product.chunk_offsets or product.chunks:
+            for i, chunk in enumerate(product.iter_chunks()):
+                yield IndexItem(key=f"{product.id}#{i}", kind="product", doc_id=product.id, label=product.title), chunk
+        else:
+            text = "\n".join(t for t in (product.title, product.summary, product.raw_content) if t)
+            yield IndexItem(key=product.id, kind="product", doc_id=product.id, label=product.title), text
+
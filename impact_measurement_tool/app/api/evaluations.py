@@ -0,0 +1,228 @@
+# app/api/evaluations.py
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, Hashable, List, Literal, Optional
+
+import pandas as pd
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.analytics import evaluations as stats
+from app.db.settings import storage_settings
+from app.models import InstitutionEvaluationSchema
+from app.repositories.base import BaseEvaluationRepository
+from app.repositories.factory import get_evaluation_repository
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+GroupColumn = Literal[
+    "domain_name",
+    "domain_code",
+    "discipline_name",
+    "discipline_code",
+    "evaluation_period",
+]
+
+# Jak GroupColumn, plus "all" – cały sektor bez podziału
+ChangeGroupColumn = Literal[
+    "domain_name",
+    "domain_code",
+    "discipline_name",
+    "discipline_code",
+    "all",
+]
+
+
+def get_evaluation_store() -> BaseEvaluationRepository:
+    """Magazyn ewaluacji na backendzie z IMETO_STORAGE_BACKEND (jak repozytorium impactów)."""
+    return get_evaluation_repository()
+
+
+def _records(table: pd.DataFrame | pd.Series) -> List[Dict[str, Any]]:
+    """Tabela wynikowa → lista słowników (indeks jako kolumny, NaN → null)."""
+    frame = table.reset_index() if isinstance(table, pd.DataFrame) else table.rename("value").reset_index()
+    frame.columns = [str(c) for c in frame.columns]
+    frame = frame.astype(object).where(frame.notna(), None)
+    return frame.to_dict(orient="records")
+
+
+class EvaluationStatsCache:
+    """
+    Ramka wszystkich ewaluacji (app/analytics/evaluations.py) i wyliczone z niej
+    tabele, trzymane w pamięci przez `ttl` sekund. Po wygaśnięciu ramka jest
+    wczytywana ponownie przy najbliższym żądaniu, a tabele liczone od nowa.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._frame: Optional[pd.DataFrame] = None
+        self._loaded_at = 0.0
+        self._results: Dict[Hashable, List[Dict[str, Any]]] = {}
+        self._lock = asyncio.Lock()
+
+    def clear(self) -> None:
+        self._frame = None
+        self._results = {}
+
+    async def frame(self, repo: BaseEvaluationRepository) -> pd.DataFrame:
+        async with self._lock:
+            if self._frame is None or time.monotonic() - self._loaded_at > self.ttl:
+                started = time.perf_counter()
+                self._frame = await stats.load_evaluations_frame(repo)
+                self._loaded_at = time.monotonic()
+                self._results = {}
+                logger.info(
+                    "Wczytano ramkę ewaluacji (%d wierszy) w %.2fs",
+                    len(self._frame),
+                    time.perf_counter() - started,
+                )
+            return self._frame
+
+    async def get(
+        self,
+        repo: BaseEvaluationRepository,
+        key: Hashable,
+        compute: Callable[[pd.DataFrame], pd.DataFrame | pd.Series],
+    ) -> List[Dict[str, Any]]:
+        frame = await self.frame(repo)
+        result = self._results.get(key)
+        if result is None:
+            result = _records(compute(frame))
+            self._results[key] = result
+        return result
+
+
+_CACHE = EvaluationStatsCache(ttl=storage_settings.evaluation_stats_ttl)
+
+
+def get_stats_cache() -> EvaluationStatsCache:
+    return _CACHE
+
+
+async def _require_periods(
+    cache: EvaluationStatsCache,
+    repo: BaseEvaluationRepository,
+    *periods: Optional[str],
+) -> None:
+    known = set((await cache.frame(repo))["evaluation_period"].cat.categories)
+    missing = [p for p in periods if p is not None and p not in known]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Unknown evaluation period: {', '.join(missing)}")
+
+
+@router.get(
+    "/stats/periods",
+    response_model=List[Dict[str, Any]],
+    summary="Okresy ewaluacji",
+    description="Okresy ewaluacji z liczbą instytucji i ocenionych dyscyplin.",
+)
+async def periods_endpoint(
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+    cache: EvaluationStatsCache = Depends(get_stats_cache),
+) -> List[Dict[str, Any]]:
+    return await cache.get(repo, ("periods",), stats.periods)
+
+
+@router.get(
+    "/stats/distribution",
+    response_model=List[Dict[str, Any]],
+    summary="Rozkład kategorii ewaluacyjnych",
+    description=(
+        "Liczba (lub udział) ocenionych dyscyplin w każdej kategorii, "
+        "w grupach `by`, we wszystkich instytucjach."
+    ),
+)
+async def distribution_endpoint(
+    by: GroupColumn = Query("domain_name", description="Kolumna grupująca."),
+    period: Optional[str] = Query(None, description="Okres ewaluacji, np. '2017-2021'."),
+    normalize: bool = Query(False, description="Udziały zamiast liczności."),
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+    cache: EvaluationStatsCache = Depends(get_stats_cache),
+) -> List[Dict[str, Any]]:
+    await _require_periods(cache, repo, period)
+    return await cache.get(
+        repo,
+        ("distribution", by, period, normalize),
+        lambda frame: stats.category_distribution(frame, by=by, period=period, normalize=normalize),
+    )
+
+
+@router.get(
+    "/stats/institutions",
+    response_model=List[Dict[str, Any]],
+    summary="Kategorie dyscyplin w instytucjach",
+    description="Liczba dyscyplin w każdej kategorii dla każdej instytucji.",
+)
+async def institutions_endpoint(
+    period: Optional[str] = Query(None, description="Okres ewaluacji, np. '2017-2021'."),
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+    cache: EvaluationStatsCache = Depends(get_stats_cache),
+) -> List[Dict[str, Any]]:
+    await _require_periods(cache, repo, period)
+    return await cache.get(
+        repo,
+        ("institutions", period),
+        lambda frame: stats.institution_categories(frame, period=period),
+    )
+
+
+@router.get(
+    "/stats/transitions",
+    response_model=List[Dict[str, Any]],
+    summary="Przejścia kategorii między okresami",
+    description="Macierz kategoria w okresie `before` × kategoria w okresie `after`.",
+)
+async def transitions_endpoint(
+    before: str = Query(..., description="Wcześniejszy okres, np. '2013-2016'."),
+    after: str = Query(..., description="Późniejszy okres, np. '2017-2021'."),
+    normalize: bool = Query(False, description="Udziały w wierszu zamiast liczności."),
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+    cache: EvaluationStatsCache = Depends(get_stats_cache),
+) -> List[Dict[str, Any]]:
+    await _require_periods(cache, repo, before, after)
+    return await cache.get(
+        repo,
+        ("transitions", before, after, normalize),
+        lambda frame: stats.period_transitions(frame, before, after, normalize=normalize),
+    )
+
+
+@router.get(
+    "/stats/changes",
+    response_model=List[Dict[str, Any]],
+    summary="Zmiany kategorii między okresami",
+    description="Awanse, spadki i średnia zmiana rangi kategorii w grupach `by`.",
+)
+async def changes_endpoint(
+    before: str = Query(..., description="Wcześniejszy okres, np. '2013-2016'."),
+    after: str = Query(..., description="Późniejszy okres, np. '2017-2021'."),
+    by: ChangeGroupColumn = Query("domain_name", description="Kolumna grupująca ('all' – cały sektor)."),
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+    cache: EvaluationStatsCache = Depends(get_stats_cache),
+) -> List[Dict[str, Any]]:
+    await _require_periods(cache, repo, before, after)
+    return await cache.get(
+        repo,
+        ("changes", before, after, by),
+        lambda frame: stats.period_changes(frame, before, after, by=None if by == "all" else by),
+    )
+
+
+@router.get(
+    "/{institution_uuid}",
+    response_model=List[InstitutionEvaluationSchema],
+    summary="Ewaluacje instytucji (od najnowszego okresu)",
+)
+async def institution_evaluations_endpoint(
+    institution_uuid: str,
+    repo: BaseEvaluationRepository = Depends(get_evaluation_store),
+) -> List[InstitutionEvaluationSchema]:
+    evaluations = await repo.get_for_institution(institution_uuid)
+    if not evaluations:
+        raise HTTPException(status_code=404, detail="No evaluations for institution")
+    return evaluations
@@ -6,18 +6,20 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.models import ImpactCaseSchema
-from app.repositories.impact_repository import ImpactRepository
+from app.models import BeneficiaryCategory, ImpactCaseSchema
+from app.pipeline.identifiers import identifier_key_for_query
+from app.repositories.base import BaseImpactRepository
+from app.repositories.factory import get_impact_repository
 
 router = APIRouter()
 
 
-def get_repository() -> ImpactRepository:
+def get_repository() -> BaseImpactRepository:
     """
     Prosta dependency injection dla repozytorium.
-    W przyszłości można tu dodać np. cache, konfigurację itd.
+    Backend (mongo / sqlite / memory) wybiera IMETO_STORAGE_BACKEND.
     """
-    return ImpactRepository()
+    return get_impact_repository()
 
 
 @router.get(
@@ -25,8 +27,10 @@ def get_repository() -> ImpactRepository:
     response_model=List[ImpactCaseSchema],
     summary="Lista impactów",
     description=(
-        "Zwraca listę opisów wpływu (impactów) z bazy MongoDB, "
-        "z opcjonalnym filtrowaniem po institution_uuid i discipline_code."
+        "Zwraca listę opisów wpływu (impactów) z repozytorium, "
+        "z opcjonalnym filtrowaniem po institution_uuid, discipline_code, "
+        "kategorii beneficjentów, kategorii ewaluacyjnej dyscypliny oraz "
+        "identyfikatorze cytowanym w osiągnięciach (DOI / ISBN / ISSN)."
     ),
 )
 async def list_impacts_endpoint(
@@ -40,13 +44,38 @@ async def list_impacts_endpoint(
         None,
         description="Filtr: kod dyscypliny (discipline_code).",
     ),
-    repo: ImpactRepository = Depends(get_repository),
+    beneficiary_category: Optional[BeneficiaryCategory] = Query(
+        None,
+        description="Filtr: kategoria beneficjentów (element beneficiary_categories).",
+    ),
+    evaluation_category: Optional[str] = Query(
+        None,
+        description="Filtr: kategoria ewaluacyjna dyscypliny w instytucji, np. 'A+' (evaluation_category).",
+    ),
+    evaluation_period: Optional[str] = Query(
+        None,
+        description="Filtr: okres ewaluacji kategorii, np. '2017-2021' (evaluation_period).",
+    ),
+    identifier: Optional[str] = Query(
+        None,
+        description="Filtr: cytowany DOI, ISBN lub ISSN, np. '10.1000/xyz', 'https://doi.org/10.1000/xyz', 'ISBN 83-...'.",
+    ),
+    repo: BaseImpactRepository = Depends(get_repository),
 ) -> List[ImpactCaseSchema]:
+    identifier_key = None
+    if identifier:
+        identifier_key = identifier_key_for_query(identifier)
+        if identifier_key is None:
+            raise HTTPException(status_code=422, detail="Unrecognized identifier (expected DOI, ISBN or ISSN)")
     return await repo.list_impacts(
         skip=skip,
         limit=limit,
         institution_uuid=institution_uuid,
         discipline_code=discipline_code,
+        beneficiary_category=beneficiary_category.value if beneficiary_category else None,
+        evaluation_category=evaluation_category,
+        evaluation_period=evaluation_period,
+        identifier_key=identifier_key,
     )
 
 
@@ -57,7 +86,7 @@ async def list_impacts_endpoint(
 )
 async def get_impact_endpoint(
     impact_uuid: str,
-    repo: ImpactRepository = Depends(get_repository),
+    repo: BaseImpactRepository = Depends(get_repository),
 ) -> ImpactCaseSchema:
     impact = await repo.get_by_impact_uuid(impact_uuid)
     if not impact:
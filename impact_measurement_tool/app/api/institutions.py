@@ -0,0 +1,140 @@
+# app/api/institutions.py
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.analytics.institutions import DEFAULT_SEARCH_LIMIT, InstitutionIndex
+from app.db.settings import storage_settings
+from app.models import InstitutionImpactSummarySchema, InstitutionSchema
+from app.repositories.base import BaseInstitutionSummaryRepository
+from app.repositories.factory import get_summary_repository
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_INDEX: Optional[InstitutionIndex] = None
+_INDEX_MTIME: float = 0.0
+
+
+def get_institution_index() -> InstitutionIndex:
+    """
+    Indeks jest trzymany w pamięci i wczytywany ponownie tylko wtedy, gdy
+    plik zmienił się od ostatniego odczytu (np. po ingeście).
+    """
+    global _INDEX, _INDEX_MTIME
+    path = Path(storage_settings.institution_index_path)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail="Institution index not built")
+
+    if _INDEX is None or mtime != _INDEX_MTIME:
+        _INDEX = InstitutionIndex.load(path)
+        _INDEX_MTIME = mtime
+        logger.info("Wczytano indeks instytucji %s (%d instytucji)", path, len(_INDEX))
+    return _INDEX
+
+
+def get_summary_store() -> BaseInstitutionSummaryRepository:
+    """Magazyn podsumowań na backendzie z IMETO_STORAGE_BACKEND (jak repozytorium impactów)."""
+    return get_summary_repository()
+
+
+@router.get(
+    "/",
+    response_model=List[InstitutionSchema],
+    summary="Lista instytucji",
+    description="Wszystkie instytucje z indeksu, alfabetycznie po nazwie.",
+)
+async def list_institutions_endpoint(
+    skip: int = Query(0, ge=0, description="Offset (liczba rekordów do pominięcia)"),
+    limit: int = Query(100, gt=0, le=1000, description="Liczba rekordów do zwrócenia"),
+    index: InstitutionIndex = Depends(get_institution_index),
+) -> List[InstitutionSchema]:
+    return index.all(skip=skip, limit=limit)
+
+
+@router.get(
+    "/search",
+    response_model=List[InstitutionSchema],
+    summary="Wyszukiwanie instytucji po nazwie (autouzupełnianie)",
+    description=(
+        "Dopasowania od początku nazwy lub dowolnego słowa nazwy (bez znaków "
+        "diakrytycznych i wielkości liter), a przy braku wyników – przybliżone."
+    ),
+)
+async def search_institutions_endpoint(
+    q: str = Query(..., min_length=1, description="Początek nazwy instytucji."),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, gt=0, le=100, description="Liczba wyników."),
+    fuzzy: bool = Query(True, description="Dopuszczaj dopasowania przybliżone (literówki)."),
+    index: InstitutionIndex = Depends(get_institution_index),
+) -> List[InstitutionSchema]:
+    return index.search(q, limit=limit, fuzzy=fuzzy)
+
+
+@router.get(
+    "/resolve",
+    response_model=InstitutionSchema,
+    summary="Instytucja o podanej nazwie (dokładne dopasowanie po normalizacji)",
+)
+async def resolve_institution_endpoint(
+    name: str = Query(..., min_length=1, description="Nazwa instytucji."),
+    index: InstitutionIndex = Depends(get_institution_index),
+) -> InstitutionSchema:
+    uuid = index.resolve(name)
+    institution = index.get(uuid) if uuid else None
+    if institution is None:
+        raise HTTPException(status_code=404, detail="Institution not found")
+    return institution
+
+
+@router.get(
+    "/summaries",
+    response_model=List[InstitutionImpactSummarySchema],
+    summary="Podsumowania impactów instytucji",
+    description="Zapisane podsumowania, od instytucji z największą liczbą impactów.",
+)
+async def list_summaries_endpoint(
+    skip: int = Query(0, ge=0, description="Offset (liczba rekordów do pominięcia)"),
+    limit: int = Query(100, gt=0, le=1000, description="Liczba rekordów do zwrócenia"),
+    include_titles: bool = Query(False, description="Dołącz listy tytułów impactów."),
+    store: BaseInstitutionSummaryRepository = Depends(get_summary_store),
+) -> List[InstitutionImpactSummarySchema]:
+    return await store.list_summaries(skip=skip, limit=limit, include_titles=include_titles)
+
+
+@router.get(
+    "/{institution_uuid}/summary",
+    response_model=InstitutionImpactSummarySchema,
+    summary="Podsumowanie impactów instytucji (profil)",
+    description="Liczba opisów, dyscypliny, obszary, lata i tytuły – przeliczane przy ingeście.",
+)
+async def get_summary_endpoint(
+    institution_uuid: str,
+    store: BaseInstitutionSummaryRepository = Depends(get_summary_store),
+) -> InstitutionImpactSummarySchema:
+    summary = await store.get(institution_uuid)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Institution summary not found")
+    return summary
+
+
+@router.get(
+    "/{institution_uuid}",
+    response_model=InstitutionSchema,
+    summary="Instytucja po UUID",
+)
+async def get_institution_endpoint(
+    institution_uuid: str,
+    index: InstitutionIndex = Depends(get_institution_index),
+) -> InstitutionSchema:
+    institution = index.get(institution_uuid)
+    if institution is None:
+        raise HTTPException(status_code=404, detail="Institution not found")
+    return institution
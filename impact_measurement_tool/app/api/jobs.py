@@ -0,0 +1,98 @@
+# app/api/jobs.py
+
+from __future__ import annotations
+
+import logging
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.models.ingest_job import FINISHED_JOB_STATUSES, IngestJobRequest, IngestJobSchema, IngestJobStatus
+from app.pipeline.ingest_jobs import IngestJobConflictError, IngestJobManager
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_MANAGER: Optional[IngestJobManager] = None
+
+
+def get_job_manager() -> IngestJobManager:
+    global _MANAGER
+    if _MANAGER is None:
+        _MANAGER = IngestJobManager()
+    return _MANAGER
+
+
+async def shutdown_jobs() -> None:
+    """Anuluje działające zadania ingestu (przy zamykaniu aplikacji)."""
+    if _MANAGER is not None:
+        await _MANAGER.shutdown()
+
+
+@router.post(
+    "/",
+    response_model=IngestJobSchema,
+    status_code=202,
+    summary="Uruchom zadanie ingestu",
+    description=(
+        "Ingest impactów z RAD-on w tle: cały kindCode, wskazane instytucje albo "
+        "synchronizacja przyrostowa (zapis tylko zmienionych rekordów). Zadania ponad "
+        "limit IMETO_INGEST_MAX_JOBS czekają w kolejce; drugie niezakończone zadanie "
+        "o tym samym celu zwraca 409."
+    ),
+)
+async def start_job_endpoint(
+    request: IngestJobRequest,
+    manager: IngestJobManager = Depends(get_job_manager),
+) -> IngestJobSchema:
+    try:
+        return manager.submit(request)
+    except IngestJobConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get(
+    "/",
+    response_model=List[IngestJobSchema],
+    summary="Lista zadań ingestu",
+    description="Zadania od najnowszego, z postępem; opcjonalnie tylko o danym statusie.",
+)
+async def list_jobs_endpoint(
+    status: Optional[IngestJobStatus] = Query(None, description="Filtr: status zadania."),
+    manager: IngestJobManager = Depends(get_job_manager),
+) -> List[IngestJobSchema]:
+    return manager.list_jobs(status=status)
+
+
+@router.get(
+    "/{job_id}",
+    response_model=IngestJobSchema,
+    summary="Status i postęp zadania ingestu",
+)
+async def get_job_endpoint(
+    job_id: str,
+    manager: IngestJobManager = Depends(get_job_manager),
+) -> IngestJobSchema:
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post(
+    "/{job_id}/cancel",
+    response_model=IngestJobSchema,
+    summary="Anuluj zadanie ingestu",
+    description="Zadanie jest przerywane od razu; impacty zapisane do tej pory zostają.",
+)
+async def cancel_job_endpoint(
+    job_id: str,
+    manager: IngestJobManager = Depends(get_job_manager),
+) -> IngestJobSchema:
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status in FINISHED_JOB_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Job already {job.status.value}")
+    return await manager.cancel(job_id)
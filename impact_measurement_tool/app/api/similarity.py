@@ -0,0 +1,74 @@
+# app/api/similarity.py
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+
+from app.analytics.similarity import SimilarityIndex
+from app.db.settings import storage_settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+_INDEX: Optional[SimilarityIndex] = None
+
+
+class SimilarityHit(BaseModel):
+    key: str
+    kind: str
+    doc_id: str
+    label: str
+    score: float
+
+
+def get_similarity_index() -> SimilarityIndex:
+    """
+    Indeks jest wczytywany raz (macierz przez memmap) i współdzielony
+    między żądaniami. Budowa: python -m app.scripts.build_similarity_index.
+    """
+    global _INDEX
+    if _INDEX is None:
+        path = Path(storage_settings.similarity_index_path)
+        if not (path / "meta.json").is_file():
+            raise HTTPException(status_code=503, detail="Similarity index not built")
+        _INDEX = SimilarityIndex.load(path)
+        logger.info("Wczytano indeks podobieństwa %s (%d wierszy)", path, len(_INDEX))
+    return _INDEX
+
+
+@router.get(
+    "/search",
+    response_model=List[SimilarityHit],
+    summary="Wyszukiwanie podobnych tekstów",
+    description="Zwraca top-k impactów / produktów najbardziej podobnych do tekstu zapytania.",
+)
+async def search_endpoint(
+    q: str = Query(..., min_length=1, description="Tekst zapytania."),
+    k: int = Query(10, gt=0, le=100, description="Liczba wyników."),
+    kind: Optional[Literal["impact", "product"]] = Query(None, description="Filtr: rodzaj dokumentu."),
+    index: SimilarityIndex = Depends(get_similarity_index),
+) -> List[SimilarityHit]:
+    return index.search([q], k=k, kind=kind)[0]
+
+
+@router.get(
+    "/{doc_id}",
+    response_model=List[SimilarityHit],
+    summary="Dokumenty podobne do zaindeksowanego impactu / produktu",
+)
+async def similar_endpoint(
+    doc_id: str,
+    k: int = Query(10, gt=0, le=100, description="Liczba wyników."),
+    kind: Optional[Literal["impact", "product"]] = Query(None, description="Filtr: rodzaj dokumentu."),
+    index: SimilarityIndex = Depends(get_similarity_index),
+) -> List[SimilarityHit]:
+    hits = index.similar_to(doc_id, k=k, kind=kind)
+    if hits is None:
+        raise HTTPException(status_code=404, detail="Document not in similarity index")
+    return hits
@@ -10,28 +10,182 @@ Dokumentacja przykładowa:
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Set, Union
 
 import requests
 
 from app.connectors.base import BaseConnector
-from app.models import ImpactCaseSchema, IdentifierSchema
+from app.models import ImpactCaseSchema, IdentifierSchema, IdentifierType, InstitutionEvaluationSchema
 
 logger = logging.getLogger(__name__)
 
+# Liczba surowych rekordów impactów pamiętanych przez connector (LRU po impactUuid)
+DEFAULT_CACHE_SIZE = 4096
+
+# Typy identyfikatorów traktowane jako impactUuid; pozostałe (DOI, ISBN, ...) RAD-on nie obsługuje
+IMPACT_ID_TYPES = (IdentifierType.INTERNAL, IdentifierType.OTHER)
+
+# Ponowienia zapytania po błędzie połączenia, 429/5xx albo odpowiedzi bez JSON;
+# opóźnienie rośnie wykładniczo: backoff, 2·backoff, 4·backoff, ...
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_RETRY_BACKOFF = 0.5
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+ImpactId = Union[IdentifierSchema, str]
+
+
+class RadonAPIError(RuntimeError):
+    """RAD-on nie zwrócił poprawnej odpowiedzi mimo ponowień."""
+
+
+class RadonRequestCancelled(RadonAPIError):
+    """Zapytanie przerwane przez `cancel` przed kolejną próbą."""
+
+
+def impact_uuid_of(identifier: ImpactId) -> str:
+    """impactUuid z identyfikatora (napis albo IdentifierSchema typu INTERNAL/OTHER)."""
+    if isinstance(identifier, IdentifierSchema):
+        if identifier.type not in IMPACT_ID_TYPES:
+            raise ValueError(
+                f"RAD-on nie wyszukuje impactów po identyfikatorze typu {identifier.type.value!r} "
+                "– użyj ImpactLookup (app/pipeline/impact_lookup.py) i indeksu identifier_keys."
+            )
+        return identifier.value.strip()
+    return identifier.strip()
+
+
+class _RecordCache:
+    """
+    Surowe rekordy impactów z odpowiedzi RAD-on (LRU po impactUuid).
+
+    Zasilany przez każdą pobraną stronę impactów, więc rekordy widziane
+    niedawno (np. przy ingeście) są rozwiązywane bez zapytania do API.
+    Chroniony blokadą – connector bywa używany z wątków (`asyncio.to_thread`).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, impact_uuid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._records.get(impact_uuid)
+            if record is not None:
+                self._records.move_to_end(impact_uuid)
+            return record
+
+    def put_many(self, records: Iterable[Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            for record in records:
+                impact_uuid = record.get("impactUuid") if isinstance(record, dict) else None
+                if not impact_uuid:
+                    continue
+                self._records[impact_uuid] = record
+                self._records.move_to_end(impact_uuid)
+            while len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
 
 class RadonConnector(BaseConnector):
     """
     Connector do RAD-on, z funkcjami:
-    - pobieranie ewaluacji instytucji,
+    - pobieranie ewaluacji instytucji (jedna strona albo wszystkie, z paginacją),
     - pobieranie opisów wpływu (impacts) po UUID instytucji,
-    - pobieranie wszystkich impactów po kindCode (np. kindCode=1).
+    - pobieranie wszystkich impactów po kindCode (np. kindCode=1),
+    - wyszukiwanie impactów po impactUuid (search_by_id) – najpierw w pamięci
+      podręcznej odpowiedzi, potem celowane zapytania do API.
+
+    Nieudane zapytania (błąd połączenia, 429/5xx, odpowiedź bez JSON) są
+    ponawiane do `max_retries` razy z rosnącym opóźnieniem; gdy i to nie
+    pomoże, metody rzucają RadonAPIError – paginacja nie kończy się po cichu
+    w połowie zbioru. `request_errors` zlicza wszystkie nieudane próby.
+    Metody stron przyjmują `cancel` (threading.Event) – ustawione przerywa
+    ponawianie (także czekanie między próbami), ale nie zapytanie HTTP w toku.
     """
 
-    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+    ) -> None:
         # base_url bez końcowego /polon – dokładamy w endpointach
         super().__init__(api_key=api_key, base_url=base_url)
         self.base_url = base_url or "https://radon.nauka.gov.pl/opendata"
+        self.impact_cache = _RecordCache(cache_size)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.request_errors = 0
+        self._errors_lock = threading.Lock()
+
+    def _get_json(
+        self,
+        path: str,
+        params: Dict[str, Any],
+        timeout: float,
+        what: str,
+        cancel: Optional[threading.Event] = None,
+    ) -> Dict[str, Any]:
+        """
+        GET `{base_url}/{path}` z ponowieniami; zwraca odpowiedź JSON.
+
+        Błędy 4xx (poza 429) nie są ponawiane. Rzuca RadonAPIError, gdy
+        żadna próba się nie powiodła, a RadonRequestCancelled, gdy przed
+        kolejną próbą ustawiono `cancel`.
+        """
+        url = f"{self.base_url.rstrip('/')}/{path}"
+        attempts = self.max_retries + 1
+        error = ""
+
+        for attempt in range(1, attempts + 1):
+            if cancel is not None and cancel.is_set():
+                raise RadonRequestCancelled(f"RAD-on {what}: przerwano przed próbą {attempt}")
+            retryable = True
+            try:
+                response = requests.get(url, params=params, timeout=timeout)
+                if response.status_code >= 400:
+                    retryable = response.status_code in _RETRY_STATUSES
+                    error = f"HTTP {response.status_code}"
+                else:
+                    data = response.json()
+                    if isinstance(data, dict):
+                        return data
+                    error = f"odpowiedź JSON typu {type(data).__name__}"
+            except requests.exceptions.RequestException as e:
+                error = f"{type(e).__name__}: {e}"
+            except ValueError:
+                error = "odpowiedź bez JSON"
+
+            with self._errors_lock:
+                self.request_errors += 1
+            if not retryable or attempt == attempts:
+                break
+            delay = self.retry_backoff * 2 ** (attempt - 1)
+            logger.warning(
+                "RAD-on %s – %s (próba %d/%d), ponawiam za %.1fs", what, error, attempt, attempts, delay
+            )
+            if cancel is not None:
+                cancel.wait(delay)
+            else:
+                time.sleep(delay)
+
+        logger.error("RAD-on %s – %s, rezygnuję po %d próbach", what, error, attempt)
+        raise RadonAPIError(f"RAD-on {what}: {error} (prób: {attempt})")
 
     # ========= Wymagane metody z BaseConnector =========
 
@@ -50,56 +204,199 @@ class RadonConnector(BaseConnector):
 
     def search_by_id(
         self,
-        identifier: IdentifierSchema | str,
+        identifier: Union[ImpactId, Sequence[ImpactId]],
+        institution_uuid: Optional[str] = None,
+        refresh: bool = False,
         **kwargs: Any,
     ) -> List[Dict[str, Any]]:
         """
-        Wyszukiwanie po identyfikatorze (wymagane przez BaseConnector).
+        Surowe rekordy impactów o podanym impactUuid (albo liście impactUuid –
+        wtedy pobierane razem, patrz `fetch_impact_records`), w kolejności
+        zapytania; nieznalezione są pomijane.
+
+        `institution_uuid` (o ile znany) zawęża zapytanie do jednej instytucji;
+        bez niego (i bez `allow_sweep=True`) impact spoza pamięci podręcznej
+        nie zostanie znaleziony. Z `refresh` pamięć podręczna
+        jest pomijana. Pozostałe argumenty (kind_code, page_size, allow_sweep,
+        timeout) trafiają do `fetch_impact_records`.
+        """
+        identifiers = [identifier] if isinstance(identifier, (str, IdentifierSchema)) else list(identifier)
+        uuids = list(dict.fromkeys(impact_uuid_of(i) for i in identifiers))
+        hints = {uuid: institution_uuid for uuid in uuids} if institution_uuid else None
+        records = self.fetch_impact_records(uuids, institution_uuids=hints, refresh=refresh, **kwargs)
+        return [records[uuid] for uuid in uuids if uuid in records]
 
-        Również stub – w razie potrzeby można dodać logikę wyszukiwania
-        np. po impactUuid.
+    def fetch_impact_records(
+        self,
+        impact_uuids: Iterable[str],
+        institution_uuids: Optional[Mapping[str, Optional[str]]] = None,
+        kind_code: str = "1",
+        page_size: int = 100,
+        allow_sweep: bool = False,
+        refresh: bool = False,
+        timeout: float = 10.0,
+    ) -> Dict[str, Dict[str, Any]]:
         """
-        raise NotImplementedError(
-            "RadonConnector.search_by_id() nie jest obecnie zaimplementowane. "
-            "Korzystaj z iter_impacts_for_institution() lub iter_all_impacts()."
-        )
+        Rekordy impactów po impactUuid: {impactUuid: surowy rekord}.
+
+        API RAD-on nie filtruje po impactUuid, więc:
+        1. rekordy z pamięci podręcznej odpowiedzi są zwracane od razu (bez `refresh`),
+        2. impacty o znanej instytucji (`institution_uuids`: impactUuid → institutionUuid)
+           są szukane w impactach tej instytucji – jedna paginowana seria zapytań
+           na instytucję dla wszystkich jej impactów, przerywana po znalezieniu
+           ostatniego,
+        3. reszta – tylko z `allow_sweep`: jednym przeglądem kindCode, także
+           przerywanym, gdy znajdą się wszystkie. Bez niego impacty o nieznanej
+           instytucji nie są szukane (brak w wyniku) – przegląd kindCode to pełny crawl.
+
+        Każda pobrana strona zasila pamięć podręczną.
+        """
+        pending: Set[str] = set(impact_uuids)
+        found: Dict[str, Dict[str, Any]] = {}
+
+        if not refresh:
+            for uuid in list(pending):
+                record = self.impact_cache.get(uuid)
+                if record is not None:
+                    found[uuid] = record
+                    pending.discard(uuid)
+
+        by_institution: Dict[str, Set[str]] = {}
+        for uuid in pending:
+            institution = (institution_uuids or {}).get(uuid)
+            if institution:
+                by_institution.setdefault(institution, set()).add(uuid)
+
+        for institution, wanted in by_institution.items():
+            self._scan_pages(
+                lambda token, inst=institution: self.get_impact_description(
+                    institution_uuid=inst, result_numbers=page_size, token=token, timeout=timeout
+                ),
+                wanted,
+                found,
+            )
+            pending -= set(found)
 
-    # ========= EWALUACJE (po nazwie instytucji) =========
+        if pending and allow_sweep:
+            logger.warning(
+                "%d impactów bez znanej instytucji – przegląd kindCode=%s do znalezienia wszystkich",
+                len(pending),
+                kind_code,
+            )
+            self._scan_pages(
+                lambda token: self.get_impacts_page(
+                    kind_code=kind_code, result_numbers=page_size, token=token, timeout=timeout
+                ),
+                pending,
+                found,
+            )
+        elif pending:
+            logger.warning(
+                "%d impactów bez znanej instytucji nie szukano (bez przeglądu kindCode): %s",
+                len(pending),
+                ", ".join(sorted(pending)),
+            )
+
+        return found
+
+    @staticmethod
+    def _iter_result_pages(fetch_page: Callable[[str], Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """Kolejne strony wyników (`results`) paginowanego endpointu RAD-on."""
+        token = ""
+        while True:
+            raw = fetch_page(token)
+            results = (raw.get("results") or []) if isinstance(raw, dict) else []
+            if not results:
+                return
+            yield results
+
+            next_token = (raw.get("pagination") or {}).get("token") or ""
+            if not next_token or next_token == token:
+                return
+            token = next_token
+
+    def _scan_pages(
+        self,
+        fetch_page: Callable[[str], Dict[str, Any]],
+        wanted: Set[str],
+        found: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Przegląda strony, aż w `found` znajdą się wszystkie `wanted`."""
+        remaining = set(wanted)
+        for results in self._iter_result_pages(fetch_page):
+            for record in results:
+                uuid = record.get("impactUuid") if isinstance(record, dict) else None
+                if uuid in remaining:
+                    found[uuid] = record
+                    remaining.discard(uuid)
+            if not remaining:
+                return
+
+    # ========= EWALUACJE (po nazwie instytucji albo wszystkie) =========
 
     def get_evaluations(
         self,
-        institution_name: str,
+        institution_name: Optional[str] = None,
         result_numbers: int = 10,
         token: str = "",
         timeout: float = 10.0,
     ) -> Dict[str, Any]:
         """
-        Pobiera dane ewaluacyjne dla instytucji po nazwie (institutionName).
+        Pobiera jedną stronę danych ewaluacyjnych – dla instytucji po nazwie
+        (institutionName) albo, bez nazwy, dla wszystkich instytucji.
         """
-        url = f"{self.base_url.rstrip('/')}/polon/evaluations"
-
         params: Dict[str, Any] = {
-            "institutionName": institution_name,
             "resultNumbers": result_numbers,
         }
 
+        if institution_name:
+            params["institutionName"] = institution_name
+
         if token:
             params["token"] = token
 
-        try:
-            response = requests.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            logger.exception(
-                "Error calling RAD-on evaluations for institution %s", institution_name
+        return self._get_json(
+            "polon/evaluations", params, timeout, f"evaluations (institution {institution_name or '<all>'})"
+        )
+
+    def iter_evaluations(
+        self,
+        institution_name: Optional[str] = None,
+        page_size: int = 50,
+        timeout: float = 10.0,
+    ) -> Iterable[InstitutionEvaluationSchema]:
+        """
+        Generator zwracający kolejne InstitutionEvaluationSchema – dla jednej
+        instytucji (filtr po institutionName) albo wszystkich, z obsługą
+        paginacji po tokenie.
+        """
+        token = ""
+
+        while True:
+            raw = self.get_evaluations(
+                institution_name=institution_name,
+                result_numbers=page_size,
+                token=token,
+                timeout=timeout,
             )
-            return {}
 
-        try:
-            return response.json()
-        except ValueError:
-            logger.error("RAD-on evaluations returned non-JSON response")
-            return {}
+            if not isinstance(raw, dict):
+                break
+
+            results = raw.get("results", []) or []
+            if not results:
+                break
+
+            for record in results:
+                if isinstance(record, dict):
+                    yield InstitutionEvaluationSchema.from_radon_record(record)
+
+            pagination = raw.get("pagination") or {}
+            next_token = pagination.get("token") or ""
+            if not next_token or next_token == token:
+                break
+
+            token = next_token
 
     # ========= IMPACTY (po UUID instytucji) =========
 
@@ -109,13 +406,12 @@ class RadonConnector(BaseConnector):
         result_numbers: int = 10,
         token: str = "",
         timeout: float = 10.0,
+        cancel: Optional[threading.Event] = None,
     ) -> Dict[str, Any]:
         """
         Pobiera opisy wpływu (impacts) wyszukując po UUID instytucji
         (parametr institutionUuid w RAD-on).
         """
-        url = f"{self.base_url.rstrip('/')}/polon/impacts"
-
         params: Dict[str, Any] = {
             "institutionUuid": institution_uuid,
             "resultNumbers": result_numbers,
@@ -124,21 +420,10 @@ class RadonConnector(BaseConnector):
         if token:
             params["token"] = token
 
-        try:
-            response = requests.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            logger.exception(
-                "Error calling RAD-on impacts for institutionUuid %s", institution_uuid
-            )
-            return {}
-
-        try:
-            data: Dict[str, Any] = response.json()
-        except ValueError:
-            logger.error("RAD-on impacts returned non-JSON response")
-            return {}
-
+        data = self._get_json(
+            "polon/impacts", params, timeout, f"impacts (institutionUuid {institution_uuid})", cancel=cancel
+        )
+        self.impact_cache.put_many(data.get("results") or [])
         return data
 
     def iter_impacts_for_institution(
@@ -168,10 +453,7 @@ class RadonConnector(BaseConnector):
             if not results:
                 break
 
-            for r in results:
-                if not isinstance(r, dict):
-                    continue
-                yield ImpactCaseSchema.from_radon_record(r)
+            yield from ImpactCaseSchema.from_radon_records(results)
 
             pagination = raw.get("pagination") or {}
             next_token = pagination.get("token") or ""
@@ -188,6 +470,7 @@ class RadonConnector(BaseConnector):
         result_numbers: int = 10,
         token: str = "",
         timeout: float = 10.0,
+        cancel: Optional[threading.Event] = None,
     ) -> Dict[str, Any]:
         """
         Pobiera jedną stronę impactów dla danego kindCode,
@@ -197,8 +480,6 @@ class RadonConnector(BaseConnector):
         https://radon.nauka.gov.pl/opendata/polon/impacts?resultNumbers=10&kindCode=1
         (+ opcjonalnie token do paginacji).
         """
-        url = f"{self.base_url.rstrip('/')}/polon/impacts"
-
         params: Dict[str, Any] = {
             "kindCode": kind_code,
             "resultNumbers": result_numbers,
@@ -207,21 +488,8 @@ class RadonConnector(BaseConnector):
         if token:
             params["token"] = token
 
-        try:
-            response = requests.get(url, params=params, timeout=timeout)
-            response.raise_for_status()
-        except requests.exceptions.RequestException:
-            logger.exception(
-                "Error calling RAD-on impacts for kindCode %s", kind_code
-            )
-            return {}
-
-        try:
-            data: Dict[str, Any] = response.json()
-        except ValueError:
-            logger.error("RAD-on impacts (kindCode=%s) returned non-JSON response", kind_code)
-            return {}
-
+        data = self._get_json("polon/impacts", params, timeout, f"impacts (kindCode {kind_code})", cancel=cancel)
+        self.impact_cache.put_many(data.get("results") or [])
         return data
 
     def iter_all_impacts(
@@ -263,10 +531,7 @@ class RadonConnector(BaseConnector):
                 logger.info("Brak dalszych wyników dla kindCode=%s – koniec.", kind_code)
                 break
 
-            for r in results:
-                if not isinstance(r, dict):
-                    continue
-                yield ImpactCaseSchema.from_radon_record(r)
+            yield from ImpactCaseSchema.from_radon_records(results)
 
             pagination = raw.get("pagination") or {}
             next_token = pagination.get("token") or ""
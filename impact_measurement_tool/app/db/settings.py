@@ -0,0 +1,39 @@
+# app/db/settings.py
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from pydantic import BaseModel
+
+# Dostępne backendy repozytorium impactów
+STORAGE_BACKENDS = ("mongo", "sqlite", "memory")
+
+
+class StorageSettings(BaseModel):
+    """
+    Wybór backendu przechowywania impactów.
+
+    Zmienne środowiskowe:
+    - IMETO_STORAGE_BACKEND – mongo (domyślnie) | sqlite | memory,
+    - IMETO_SQLITE_PATH – plik bazy dla backendu sqlite,
+    - IMETO_SIMILARITY_INDEX – katalog indeksu podobieństwa (build_similarity_index),
+    - IMETO_EVALUATION_STATS_TTL – czas życia (s) statystyk ewaluacji w pamięci API,
+    - IMETO_INSTITUTION_INDEX – plik indeksu instytucji (UUID ↔ nazwa),
+    - IMETO_RADON_BASE_URL – bazowy URL API RAD-on dla zadań ingestu uruchamianych przez API,
+    - IMETO_INGEST_MAX_JOBS – ile zadań ingestu może działać naraz (pozostałe czekają),
+    - IMETO_INGEST_STATE_DIR – katalog stanu synchronizacji przyrostowej (klucze rekordów po kindCode).
+    """
+
+    backend: str = os.getenv("IMETO_STORAGE_BACKEND", "mongo")
+    sqlite_path: str = os.getenv("IMETO_SQLITE_PATH", "data/imeto.sqlite3")
+    similarity_index_path: str = os.getenv("IMETO_SIMILARITY_INDEX", "data/similarity")
+    evaluation_stats_ttl: float = float(os.getenv("IMETO_EVALUATION_STATS_TTL", "600"))
+    institution_index_path: str = os.getenv("IMETO_INSTITUTION_INDEX", "data/institutions.json")
+    radon_base_url: Optional[str] = os.getenv("IMETO_RADON_BASE_URL")
+    ingest_max_jobs: int = int(os.getenv("IMETO_INGEST_MAX_JOBS", "1"))
+    ingest_state_dir: str = os.getenv("IMETO_INGEST_STATE_DIR", "data/ingest_state")
+
+
+storage_settings = StorageSettings()
@@ -0,0 +1,150 @@
+# app/dumps/arrow.py
+"""
+Mapowanie ImpactCaseSchema na typowany schemat Apache Arrow (Parquet / Arrow IPC).
+
+Schemat jest wyprowadzany z pól modelu pydantic:
+- Optional[int] / Optional[bool] / Optional[str] → int64 / bool / string,
+- List[str] → list<string>,
+- List[BaseModel] → list<struct<...>> (evidence, achievements),
+- Dict[str, Any] (np. 'raw') → string z JSON-em,
+- powtarzalne napisy (instytucja, dyscyplina, dziedzina, rodzaj) → dictionary<int32, string>.
+
+Wymaga opcjonalnej zależności `pyarrow` (`pip install imeto[parquet]`).
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Set, Union, get_args, get_origin
+
+from pydantic import BaseModel
+
+try:
+    import pyarrow as pa
+except ImportError as exc:  # pragma: no cover - zależy od środowiska
+    raise ImportError(
+        "Eksport do Parquet/Arrow wymaga pakietu 'pyarrow' "
+        "(pip install pyarrow lub pip install -e .[parquet])."
+    ) from exc
+
+from app.models import ImpactCaseSchema
+
+# Kolumny z dużą liczbą powtórzeń – kodowane słownikowo
+DICTIONARY_FIELDS: Set[str] = {
+    "institution_name",
+    "institution_uuid",
+    "discipline_name",
+    "discipline_code",
+    "domain_name",
+    "domain_code",
+    "evaluation_period",
+    "evaluation_category",
+    "kind_code",
+    "kind_name",
+    "detailed_kind",
+    "data_source",
+}
+
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+
+def _unwrap_optional(annotation: Any) -> Any:
+    """Optional[X] / Union[X, None] → X."""
+    if get_origin(annotation) is Union:
+        args = [a for a in get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+
+def arrow_type_for(annotation: Any, dictionary: bool = False) -> "pa.DataType":
+    """Zwraca typ Arrow dla adnotacji pola pydantic."""
+    annotation = _unwrap_optional(annotation)
+    origin = get_origin(annotation)
+
+    if origin in (list, List):
+        (item,) = get_args(annotation) or (str,)
+        return pa.list_(arrow_type_for(item, dictionary=dictionary))
+
+    if origin in (dict, Dict):
+        return pa.string()
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return model_struct_type(annotation)
+        if issubclass(annotation, Enum):
+            return _DICTIONARY_STRING
+        if issubclass(annotation, bool):
+            return pa.bool_()
+        if issubclass(annotation, int):
+            return pa.int64()
+        if issubclass(annotation, float):
+            return pa.float64()
+        if issubclass(annotation, datetime):
+            return pa.timestamp("ms")
+        if issubclass(annotation, date):
+            return pa.date32()
+
+    return _DICTIONARY_STRING if dictionary else pa.string()
+
+
+def model_struct_type(model: type[BaseModel]) -> "pa.StructType":
+    """Struktura Arrow odpowiadająca zagnieżdżonemu modelowi (np. EvidenceItem)."""
+    return pa.struct(
+        [pa.field(name, arrow_type_for(f.annotation)) for name, f in model.model_fields.items()]
+    )
+
+
+def impact_arrow_schema(include_raw: bool = False) -> "pa.Schema":
+    """Schemat Arrow dla ImpactCaseSchema (pole 'raw' jako JSON tylko na życzenie)."""
+    fields = []
+    for name, field in ImpactCaseSchema.model_fields.items():
+        if name == "raw" and not include_raw:
+            continue
+        fields.append(
+            pa.field(name, arrow_type_for(field.annotation, dictionary=name in DICTIONARY_FIELDS))
+        )
+    return pa.schema(fields)
+
+
+def _json_columns(schema: "pa.Schema") -> List[str]:
+    """Kolumny typu słownikowego w modelu (Dict) zapisywane jako JSON."""
+    return [
+        name
+        for name, field in ImpactCaseSchema.model_fields.items()
+        if name in schema.names and get_origin(_unwrap_optional(field.annotation)) in (dict, Dict)
+    ]
+
+
+def impacts_to_record_batch(
+    impacts: Iterable[ImpactCaseSchema],
+    schema: "pa.Schema",
+) -> "pa.RecordBatch":
+    """Konwertuje partię impactów na RecordBatch zgodny ze schematem."""
+    exclude: Optional[Set[str]] = None if "raw" in schema.names else {"raw"}
+    json_columns = _json_columns(schema)
+
+    rows: List[Dict[str, Any]] = []
+    for impact in impacts:
+        row = impact.model_dump(exclude=exclude)
+        for name in json_columns:
+            row[name] = json.dumps(row[name], ensure_ascii=False)
+        rows.append(row)
+
+    return pa.RecordBatch.from_pylist(rows, schema=schema)
+
+
+def record_batch_to_dicts(batch: "pa.RecordBatch") -> List[Dict[str, Any]]:
+    """
+    Odwrotność `impacts_to_record_batch`: wiersze jako słowniki gotowe
+    do `ImpactCaseSchema.model_validate` (kolumny JSON są dekodowane).
+    """
+    json_columns = _json_columns(batch.schema)
+    rows = batch.to_pylist()
+    for row in rows:
+        for name in json_columns:
+            if isinstance(row.get(name), str):
+                row[name] = json.loads(row[name])
+    return rows
@@ -0,0 +1,212 @@
+# app/dumps/diff.py
+"""
+Różnica między dwoma zrzutami impactów (np. datowanymi zrzutami z
+download_impacts): impacty dodane, usunięte i zmienione wraz z listą
+zmienionych pól.
+
+Zrzuty mogą być większe niż pamięć, więc porównanie jest dwuprzebiegowe:
+1. oba pliki są czytane strumieniowo (app/dumps/readers.py), a każdy rekord
+   – znormalizowany do ImpactCaseSchema i zserializowany kanonicznie – trafia
+   do jednej z `partitions` partycji na dysku według skrótu `impact_uuid`,
+   razem ze skrótem treści (blake2b),
+2. partycje są porównywane parami, każda jako słownik
+   {impact_uuid: (skrót, JSON)}. Rekordy o równych skrótach nie są nawet
+   parsowane.
+
+W pamięci jest naraz jedna para partycji; liczba partycji jest
+dobierana do rozmiaru plików (DEFAULT_PARTITION_BYTES), chyba że podano ją
+jawnie. Normalizacja sprawia, że można porównywać różne formaty (JSON,
+NDJSON, Parquet, surowe rekordy RAD-on).
+
+Zbiór zmian (NDJSON, jedna linia na impact):
+    {"op": "added",    "impact_uuid": "...", "record": {...}}
+    {"op": "removed",  "impact_uuid": "..."}
+    {"op": "modified", "impact_uuid": "...", "fields": ["title"], "new": {"title": "..."}}
+Z `with_old` zmienione rekordy mają też "old" (poprzednie wartości pól).
+
+Użycie:
+    with open("changes.ndjson", "w") as out:
+        summary = diff_dumps("impacts_2024-01.json", "impacts_2024-02.json", out)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import tempfile
+import zlib
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app.dumps.readers import impact_from_dump_record, iter_dump_records
+
+logger = logging.getLogger(__name__)
+
+# Docelowy rozmiar jednej partycji (w bajtach pliku wejściowego)
+DEFAULT_PARTITION_BYTES = 64 << 20
+
+# Pola pomijane w porównaniu: surowa odpowiedź API jest już rozłożona na pola modelu
+DEFAULT_IGNORED_FIELDS = ("raw",)
+
+DIFF_OPS = ("added", "removed", "modified")
+
+
+def canonical_record(record: Dict[str, Any], ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS) -> Tuple[str, str]:
+    """
+    (impact_uuid, kanoniczny JSON) rekordu zrzutu – po normalizacji do
+    ImpactCaseSchema, z posortowanymi kluczami i bez pól `ignored_fields`.
+    """
+    impact = impact_from_dump_record(record)
+    doc = impact.model_dump(mode="json", exclude=set(ignored_fields))
+    return impact.impact_uuid or "", json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def changed_fields(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Pola najwyższego poziomu o różnych wartościach (w kolejności nowego rekordu)."""
+    fields = [name for name in new if old.get(name) != new[name]]
+    fields.extend(name for name in old if name not in new)
+    return fields
+
+
+def partition_count(paths: Iterable[Union[Path, str]], partition_bytes: int = DEFAULT_PARTITION_BYTES) -> int:
+    """Liczba partycji tak, by partycja największego zrzutu miała ok. `partition_bytes`."""
+    largest = max((os.path.getsize(p) for p in paths), default=0)
+    return max(1, math.ceil(largest / partition_bytes))
+
+
+def _partition_dump(
+    path: Union[Path, str],
+    directory: Path,
+    partitions: int,
+    ignored_fields: Iterable[str],
+    stats: Counter,
+) -> List[Path]:
+    """Pierwszy przebieg: rozkłada zrzut na pliki partycji 'skrót\\tuuid\\tJSON'."""
+    files = [directory / f"part-{i:04d}.tsv" for i in range(partitions)]
+    with ExitStack() as stack:
+        outs = [stack.enter_context(open(f, "w", encoding="utf-8")) for f in files]
+        for i, record in enumerate(iter_dump_records(path), 1):
+            if not isinstance(record, dict):
+                continue
+            try:
+                uuid, doc = canonical_record(record, ignored_fields)
+            except Exception as e:
+                logger.warning("%s: rekord %d pominięty – błąd walidacji: %s", path, i, e)
+                stats["invalid"] += 1
+                continue
+            if not uuid:
+                stats["without_uuid"] += 1
+                continue
+            digest = hashlib.blake2b(doc.encode("utf-8"), digest_size=16).hexdigest()
+            part = zlib.crc32(uuid.encode("utf-8")) % partitions
+            outs[part].write(f"{digest}\t{uuid}\t{doc}\n")
+    return files
+
+
+def _iter_partition(path: Path) -> Iterator[Tuple[str, str, str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            digest, uuid, doc = line.rstrip("\n").split("\t", 2)
+            yield digest, uuid, doc
+
+
+def _diff_partition(
+    old_file: Path,
+    new_file: Path,
+    stats: Counter,
+    field_counts: Counter,
+    with_old: bool,
+) -> Iterator[Dict[str, Any]]:
+    """Zmiany w jednej parze partycji; powtórzony impact_uuid – wygrywa ostatni rekord."""
+    old: Dict[str, Tuple[str, str]] = {}
+    for digest, uuid, doc in _iter_partition(old_file):
+        if uuid in old:
+            stats["duplicates_old"] += 1
+        old[uuid] = (digest, doc)
+
+    new: Dict[str, Tuple[str, str]] = {}
+    for digest, uuid, doc in _iter_partition(new_file):
+        if uuid in new:
+            stats["duplicates_new"] += 1
+        new[uuid] = (digest, doc)
+
+    for uuid, (digest, doc) in new.items():
+        previous = old.pop(uuid, None)
+        if previous is None:
+            stats["added"] += 1
+            yield {"op": "added", "impact_uuid": uuid, "record": json.loads(doc)}
+        elif previous[0] == digest:
+            stats["unchanged"] += 1
+        else:
+            before, after = json.loads(previous[1]), json.loads(doc)
+            fields = changed_fields(before, after)
+            stats["modified"] += 1
+            field_counts.update(fields)
+            change: Dict[str, Any] = {
+                "op": "modified",
+                "impact_uuid": uuid,
+                "fields": fields,
+                "new": {name: after.get(name) for name in fields},
+            }
+            if with_old:
+                change["old"] = {name: before.get(name) for name in fields}
+            yield change
+
+    for uuid in old:
+        stats["removed"] += 1
+        yield {"op": "removed", "impact_uuid": uuid}
+
+
+def iter_dump_diff(
+    old_path: Union[Path, str],
+    new_path: Union[Path, str],
+    partitions: Optional[int] = None,
+    tmp_dir: Optional[Union[Path, str]] = None,
+    ignored_fields: Iterable[str] = DEFAULT_IGNORED_FIELDS,
+    with_old: bool = False,
+    stats: Optional[Counter] = None,
+    field_counts: Optional[Counter] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Generator zmian między zrzutami `old_path` i `new_path` (słowniki jak
+    linie NDJSON zbioru zmian). Liczniki operacji trafiają do `stats`,
+    a liczby zmian poszczególnych pól do `field_counts`.
+    """
+    stats = stats if stats is not None else Counter()
+    field_counts = field_counts if field_counts is not None else Counter()
+    ignored = tuple(ignored_fields)
+    partitions = partitions or partition_count([old_path, new_path])
+
+    with tempfile.TemporaryDirectory(prefix="imeto-diff-", dir=tmp_dir) as tmp:
+        old_dir, new_dir = Path(tmp, "old"), Path(tmp, "new")
+        old_dir.mkdir()
+        new_dir.mkdir()
+        old_files = _partition_dump(old_path, old_dir, partitions, ignored, stats)
+        new_files = _partition_dump(new_path, new_dir, partitions, ignored, stats)
+        logger.debug("Zrzuty rozłożone na %d partycji w %s", partitions, tmp)
+
+        for old_file, new_file in zip(old_files, new_files):
+            yield from _diff_partition(old_file, new_file, stats, field_counts, with_old)
+
+
+def diff_dumps(
+    old_path: Union[Path, str],
+    new_path: Union[Path, str],
+    out: IO[str],
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """
+    Zapisuje zbiór zmian jako NDJSON do `out` (argumenty jak w iter_dump_diff).
+
+    Zwraca podsumowanie: liczniki operacji i liczby zmian poszczególnych pól.
+    """
+    stats: Counter = Counter({op: 0 for op in DIFF_OPS})
+    field_counts: Counter = Counter()
+    for change in iter_dump_diff(old_path, new_path, stats=stats, field_counts=field_counts, **kwargs):
+        out.write(json.dumps(change, ensure_ascii=False, separators=(",", ":")) + "\n")
+    return {**stats, "fields": dict(field_counts.most_common())}
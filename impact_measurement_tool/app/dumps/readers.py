@@ -0,0 +1,174 @@
+# app/dumps/readers.py
+"""
+Strumieniowe czytanie zrzutów impactów (JSON / NDJSON / Parquet / Arrow IPC).
+
+Odpowiednik `app/dumps/writers.py`: rekordy są odczytywane pojedynczo
+(lub batchami Arrow), bez wczytywania całego pliku do pamięci.
+Obsługiwane są zarówno zrzuty z `download_impacts` (pola snake_case),
+jak i surowe rekordy RAD-on (pola camelCase).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Type, TypeVar
+
+import regex as re
+from pydantic import BaseModel
+
+from app.models import ImpactCaseSchema, ScientificProductSchema
+
+logger = logging.getLogger(__name__)
+
+_M = TypeVar("_M", bound=BaseModel)
+
+# Rozmiar porcji czytanej z pliku JSON przy parsowaniu strumieniowym
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_JSON_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def iter_json_array(path: Path | str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    Iteruje po obiektach tablicy JSON najwyższego poziomu bez wczytywania całego pliku.
+
+    Plik jest czytany porcjami po `chunk_size` znaków; w buforze jest naraz
+    co najwyżej jedna porcja i bieżący (niedokończony) obiekt.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = f.read(chunk_size).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{path}: oczekiwano tablicy JSON na początku pliku.")
+
+        pos = 1
+        eof = False
+
+        while True:
+            # Pomijamy białe znaki i przecinki między obiektami, w razie potrzeby doczytując
+            pos = _JSON_SEPARATORS.match(buffer, pos).end()
+            if pos >= len(buffer):
+                if eof:
+                    raise ValueError(f"{path}: niedomknięta tablica JSON.")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            if buffer[pos] == "]":
+                return
+
+            try:
+                obj, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Obiekt przecięty granicą porcji – doczytujemy i próbujemy ponownie
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+
+            yield obj
+            pos = end
+
+
+def iter_ndjson(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """Iteruje po rekordach NDJSON (jeden obiekt JSON na linię, puste linie pomijane)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning("%s:%d – pominięto niepoprawną linię JSON: %s", path, line_no, e)
+
+
+def iter_parquet(path: Path | str, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+    """Iteruje po wierszach pliku Parquet, czytając go batchami."""
+    import pyarrow.parquet as pq
+
+    from app.dumps.arrow import record_batch_to_dicts
+
+    parquet_file = pq.ParquetFile(path)
+    for batch in parquet_file.iter_batches(batch_size=batch_size):
+        yield from record_batch_to_dicts(batch)
+
+
+def iter_arrow_stream(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """Iteruje po wierszach strumienia Arrow IPC (`.arrows`), batch po batchu."""
+    import pyarrow as pa
+
+    from app.dumps.arrow import record_batch_to_dicts
+
+    with open(path, "rb") as f:
+        reader = pa.ipc.open_stream(f)
+        for batch in reader:
+            yield from record_batch_to_dicts(batch)
+
+
+READERS_BY_SUFFIX: Dict[str, Callable[[Path], Iterator[Dict[str, Any]]]] = {
+    ".json": iter_json_array,
+    ".ndjson": iter_ndjson,
+    ".jsonl": iter_ndjson,
+    ".parquet": iter_parquet,
+    ".arrows": iter_arrow_stream,
+}
+
+
+def iter_dump_records(path: Path | str) -> Iterator[Dict[str, Any]]:
+    """Zwraca generator surowych słowników z pliku zrzutu (format po rozszerzeniu)."""
+    path = Path(path)
+    reader = READERS_BY_SUFFIX.get(path.suffix.lower())
+    if reader is None:
+        supported = ", ".join(sorted(READERS_BY_SUFFIX))
+        raise ValueError(f"Nieobsługiwany format: {path.suffix}. Obsługiwane: {supported}.")
+    return reader(path)
+
+
+def impact_from_dump_record(record: Dict[str, Any]) -> ImpactCaseSchema:
+    """
+    Odtwarza ImpactCaseSchema z rekordu zrzutu.
+
+    Rekordy z `download_impacts` mają pola snake_case (model_dump),
+    a surowe rekordy RAD-on – camelCase; te drugie przechodzą przez from_radon_record.
+    """
+    if "impact_uuid" not in record and "impactUuid" in record:
+        return ImpactCaseSchema.from_radon_record(record)
+    return ImpactCaseSchema.model_validate(record)
+
+
+def iter_dump(path: Path | str) -> Iterator[ImpactCaseSchema]:
+    """
+    Strumieniowo odtwarza ImpactCaseSchema z pliku zrzutu.
+
+    Rekordy, których nie da się zwalidować, są pomijane z ostrzeżeniem.
+    """
+    for i, record in enumerate(iter_dump_records(path), 1):
+        if not isinstance(record, dict):
+            continue
+        try:
+            yield impact_from_dump_record(record)
+        except Exception as e:
+            logger.warning("%s: rekord %d pominięty – błąd walidacji: %s", path, i, e)
+
+
+def iter_model_dump(path: Path | str, model: Type[_M]) -> Iterator[_M]:
+    """Strumieniowo odtwarza obiekty dowolnego modelu (np. produkty, nabory) z pliku zrzutu."""
+    for i, record in enumerate(iter_dump_records(path), 1):
+        if not isinstance(record, dict):
+            continue
+        try:
+            yield model.model_validate(record)
+        except Exception as e:
+            logger.warning("%s: rekord %d pominięty – błąd walidacji %s: %s", path, i, model.__name__, e)
+
+
+def iter_product_dump(path: Path | str) -> Iterator[ScientificProductSchema]:
+    """Strumieniowo odtwarza ScientificProductSchema z pliku (JSON / NDJSON / Parquet / Arrow)."""
+    return iter_model_dump(path, ScientificProductSchema)
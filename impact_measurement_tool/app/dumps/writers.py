@@ -0,0 +1,573 @@
+# app/dumps/writers.py
+"""
+Strumieniowe writery zrzutów impactów (JSON / NDJSON / CSV / Parquet / Arrow IPC).
+
+Każdy rekord jest serializowany i zapisywany na dysk od razu po otrzymaniu,
+więc zużycie pamięci nie zależy od liczby impactów zwróconych przez RAD-on.
+Zapis idzie do pliku `<nazwa>.tmp`, przenoszonego na docelową ścieżkę
+(os.replace) dopiero po poprawnym domknięciu – przerwany eksport nie
+zostawia niekompletnego pliku, który wygląda na poprawny.
+
+Użycie:
+    with open_writer(Path("impacts.ndjson")) as writer:
+        for impact in connector.iter_all_impacts():
+            writer.write(impact)
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Optional, Set, Type
+
+from pydantic import BaseModel
+
+from app.models import AchievementItem, EvidenceItem, ImpactCaseSchema
+
+logger = logging.getLogger(__name__)
+
+# Co ile rekordów wymuszamy flush bufora pliku na dysk
+DEFAULT_FLUSH_EVERY = 500
+
+# Liczba rekordów w jednej grupie wierszy (row group) Parquet / batchu Arrow
+DEFAULT_ROW_GROUP_SIZE = 5000
+DEFAULT_COMPRESSION = "zstd"
+
+# Domyślna liczba slotów evidence_N_* / achievement_N_* w układzie "wide" CSV
+DEFAULT_MAX_EVIDENCE = 5
+DEFAULT_MAX_ACHIEVEMENTS = 5
+
+CSV_LAYOUTS = ("wide", "long")
+
+# Pola zagnieżdżone, które w CSV są rozkładane na osobne kolumny
+_NESTED_FIELDS = {"raw", "impact_evidence", "achievements"}
+
+# Pole modelu -> sufiks kolumny CSV (np. evidence_1_pl, achievement_1_summary_en)
+EVIDENCE_COLUMNS: Dict[str, str] = {
+    "description_pl": "pl",
+    "description_en": "en",
+}
+ACHIEVEMENT_COLUMNS: Dict[str, str] = {
+    "bibliographic_description_pl": "bibliographic_pl",
+    "bibliographic_description_en": "bibliographic_en",
+    "summary_pl": "summary_pl",
+    "summary_en": "summary_en",
+}
+
+
+def _check_columns(columns: Dict[str, str], model: Type[BaseModel]) -> None:
+    """
+    Mapowanie pól na kolumny CSV musi pokrywać wszystkie pola modelu – nowe
+    pole bez kolumny zniknęłoby z eksportu. Jawny wyjątek zamiast assert,
+    żeby sprawdzenie działało także pod `python -O`.
+    """
+    if set(columns) != set(model.model_fields):
+        raise RuntimeError(
+            f"Kolumny CSV dla {model.__name__} nie odpowiadają polom modelu: "
+            f"{sorted(set(columns) ^ set(model.model_fields))}"
+        )
+
+
+_check_columns(EVIDENCE_COLUMNS, EvidenceItem)
+_check_columns(ACHIEVEMENT_COLUMNS, AchievementItem)
+
+
+def base_columns() -> List[str]:
+    """Kolumny skalarne CSV – wszystkie pola ImpactCaseSchema poza zagnieżdżonymi."""
+    return [name for name in ImpactCaseSchema.model_fields if name not in _NESTED_FIELDS]
+
+
+def csv_columns(
+    layout: str = "wide",
+    max_evidence: int = DEFAULT_MAX_EVIDENCE,
+    max_achievements: int = DEFAULT_MAX_ACHIEVEMENTS,
+) -> List[str]:
+    """
+    Pełna lista kolumn CSV wyznaczona ze schematu (bez oglądania danych).
+
+    - "wide": jeden wiersz na impact, stała liczba slotów evidence_N_* / achievement_N_*,
+    - "long": jeden wiersz na dowód / osiągnięcie (item_type, item_index + pola elementu).
+    """
+    columns = base_columns()
+
+    if layout == "wide":
+        for i in range(1, max_evidence + 1):
+            columns.extend(f"evidence_{i}_{suffix}" for suffix in EVIDENCE_COLUMNS.values())
+        for i in range(1, max_achievements + 1):
+            columns.extend(f"achievement_{i}_{suffix}" for suffix in ACHIEVEMENT_COLUMNS.values())
+    elif layout == "long":
+        columns.extend(["item_type", "item_index"])
+        columns.extend(f"evidence_{suffix}" for suffix in EVIDENCE_COLUMNS.values())
+        columns.extend(f"achievement_{suffix}" for suffix in ACHIEVEMENT_COLUMNS.values())
+    else:
+        raise ValueError(f"Nieznany układ CSV: {layout}. Dostępne: {', '.join(CSV_LAYOUTS)}.")
+
+    return columns
+
+
+def _csv_value(value: Any) -> Any:
+    """Listy → string rozdzielany '; ' (obiekty jako JSON), pozostałe wartości bez zmian."""
+    if isinstance(value, list):
+        return "; ".join(
+            json.dumps(v, ensure_ascii=False) if isinstance(v, dict) else str(v)
+            for v in value
+        )
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _base_row(impact: ImpactCaseSchema) -> Dict[str, Any]:
+    row = impact.model_dump(mode="json", exclude=_NESTED_FIELDS)
+    return {key: _csv_value(value) for key, value in row.items()}
+
+
+def flatten_impact(
+    impact: ImpactCaseSchema,
+    max_evidence: Optional[int] = None,
+    max_achievements: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Spłaszcza zagnieżdżone pola (evidence, achievements) do osobnych kolumn.
+    Np. evidence_1_pl, evidence_1_en, ..., achievement_1_bibliographic_pl, ...
+
+    Bez limitów (`None`) tworzy tyle kolumn, ile elementów ma rekord;
+    z limitem nadmiarowe elementy są pomijane.
+    """
+    row = _base_row(impact)
+
+    for i, ev in enumerate(impact.impact_evidence[:max_evidence], 1):
+        for field, suffix in EVIDENCE_COLUMNS.items():
+            row[f"evidence_{i}_{suffix}"] = getattr(ev, field)
+
+    for i, ach in enumerate(impact.achievements[:max_achievements], 1):
+        for field, suffix in ACHIEVEMENT_COLUMNS.items():
+            row[f"achievement_{i}_{suffix}"] = getattr(ach, field)
+
+    return row
+
+
+def explode_impact(impact: ImpactCaseSchema) -> List[Dict[str, Any]]:
+    """
+    Układ "long": jeden wiersz na każdy dowód wpływu i osiągnięcie
+    (kolumny bazowe powtarzane). Impact bez elementów daje jeden wiersz.
+    """
+    base = _base_row(impact)
+    rows: List[Dict[str, Any]] = []
+
+    for i, ev in enumerate(impact.impact_evidence, 1):
+        row = dict(base, item_type="evidence", item_index=i)
+        for field, suffix in EVIDENCE_COLUMNS.items():
+            row[f"evidence_{suffix}"] = getattr(ev, field)
+        rows.append(row)
+
+    for i, ach in enumerate(impact.achievements, 1):
+        row = dict(base, item_type="achievement", item_index=i)
+        for field, suffix in ACHIEVEMENT_COLUMNS.items():
+            row[f"achievement_{suffix}"] = getattr(ach, field)
+        rows.append(row)
+
+    return rows or [base]
+
+
+class ImpactWriter(ABC):
+    """
+    Bazowa klasa dla strumieniowych writerów impactów.
+
+    Writer jest context managerem: otwiera plik w `__enter__`,
+    zapisuje rekordy pojedynczo przez `write()` i domyka plik w `__exit__`.
+    Wyjątek wewnątrz bloku `with` porzuca plik (`abort()`) bez stopki.
+    """
+
+    # Czy plik jest otwierany w trybie binarnym (Parquet / Arrow)
+    binary = False
+
+    def __init__(
+        self,
+        path: Path | str,
+        include_raw: bool = False,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+    ) -> None:
+        self.path = Path(path)
+        self.include_raw = include_raw
+        self.flush_every = max(1, flush_every)
+        self.count = 0
+        self._file: Optional[IO[Any]] = None
+
+    def __enter__(self) -> "ImpactWriter":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    # ========= Cykl życia pliku =========
+
+    @property
+    def tmp_path(self) -> Path:
+        """Plik roboczy – na `path` trafia dopiero w `close()`."""
+        return self.path.with_name(self.path.name + ".tmp")
+
+    def open(self) -> None:
+        if self.binary:
+            self._file = open(self.tmp_path, "wb")
+        else:
+            self._file = open(self.tmp_path, "w", encoding="utf-8", newline="")
+        self._write_header()
+
+    def close(self) -> None:
+        """Dopisuje stopkę i przenosi kompletny plik na docelową ścieżkę."""
+        if self._file is None:
+            return
+        try:
+            self._write_footer()
+        except BaseException:
+            self.abort()
+            raise
+        self._file.close()
+        self._file = None
+        os.replace(self.tmp_path, self.path)
+        logger.info("Zapisano %d rekordów do %s", self.count, self.path)
+
+    def abort(self) -> None:
+        """Zamyka plik bez stopki i usuwa go – docelowa ścieżka pozostaje bez zmian."""
+        if self._file is None:
+            return
+        try:
+            self._discard()
+        finally:
+            self._file.close()
+            self._file = None
+            self.tmp_path.unlink(missing_ok=True)
+        logger.warning("Przerwano zapis %s po %d rekordach – plik nie został utworzony", self.path, self.count)
+
+    # ========= Zapis =========
+
+    def write(self, impact: ImpactCaseSchema) -> None:
+        """Zapisuje jeden impact i co `flush_every` rekordów opróżnia bufor."""
+        if self._file is None:
+            raise RuntimeError(f"Writer dla {self.path} nie jest otwarty.")
+
+        self._write_record(impact)
+        self.count += 1
+
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+            logger.debug("Flush %s po %d rekordach", self.path, self.count)
+
+    def write_all(self, impacts: Iterable[ImpactCaseSchema]) -> int:
+        """Zapisuje wszystkie impacty z iterowalnego źródła; zwraca łączną liczbę rekordów."""
+        for impact in impacts:
+            self.write(impact)
+        return self.count
+
+    # ========= Haki dla podklas =========
+
+    @property
+    def exclude(self) -> Optional[Set[str]]:
+        """Pola pomijane przy serializacji (domyślnie bez 'raw')."""
+        return None if self.include_raw else {"raw"}
+
+    def _write_header(self) -> None:
+        pass
+
+    def _write_footer(self) -> None:
+        pass
+
+    def _discard(self) -> None:
+        """Zwalnia zasoby podklasy przy `abort()` (bez zapisu stopki)."""
+        pass
+
+    @abstractmethod
+    def _write_record(self, impact: ImpactCaseSchema) -> None:
+        ...
+
+
+class JsonArrayImpactWriter(ImpactWriter):
+    """
+    Zapis do pojedynczej tablicy JSON, budowanej przyrostowo.
+
+    Każdy rekord trafia do osobnej linii, więc plik pozostaje czytelny
+    i można go później czytać strumieniowo.
+    """
+
+    def _write_header(self) -> None:
+        assert self._file is not None
+        self._file.write("[\n")
+
+    def _write_footer(self) -> None:
+        assert self._file is not None
+        self._file.write("\n]\n" if self.count else "]\n")
+
+    def _write_record(self, impact: ImpactCaseSchema) -> None:
+        assert self._file is not None
+        if self.count:
+            self._file.write(",\n")
+        self._file.write(impact.model_dump_json(exclude=self.exclude))
+
+
+class NdjsonImpactWriter(ImpactWriter):
+    """Zapis w formacie NDJSON – jeden obiekt JSON na linię."""
+
+    def _write_record(self, impact: ImpactCaseSchema) -> None:
+        assert self._file is not None
+        self._file.write(impact.model_dump_json(exclude=self.exclude))
+        self._file.write("\n")
+
+
+class CsvImpactWriter(ImpactWriter):
+    """
+    Jednoprzebiegowy zapis CSV ze stałym zestawem kolumn.
+
+    Kolumny są wyznaczane ze schematu (`csv_columns`), więc nagłówek
+    powstaje od razu, a każdy wiersz jest zapisywany w chwili otrzymania rekordu.
+    W układzie "wide" elementy ponad `max_evidence` / `max_achievements`
+    są pomijane (z ostrzeżeniem w logu); układ "long" nie ma limitów.
+    Pole 'raw' nigdy nie trafia do CSV.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        layout: str = "wide",
+        max_evidence: int = DEFAULT_MAX_EVIDENCE,
+        max_achievements: int = DEFAULT_MAX_ACHIEVEMENTS,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, **kwargs)
+        self.layout = layout
+        self.max_evidence = max_evidence
+        self.max_achievements = max_achievements
+        self.columns = csv_columns(layout, max_evidence, max_achievements)
+        self.truncated = 0
+        self._writer: Optional[csv.DictWriter] = None
+
+    def _write_header(self) -> None:
+        assert self._file is not None
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns, restval="")
+        self._writer.writeheader()
+
+    def _write_footer(self) -> None:
+        if self.truncated:
+            logger.warning(
+                "%d impactów miało więcej elementów niż slotów CSV "
+                "(max_evidence=%d, max_achievements=%d) – nadmiar pominięto. "
+                "Użyj układu 'long' albo zwiększ limity.",
+                self.truncated,
+                self.max_evidence,
+                self.max_achievements,
+            )
+        self._writer = None
+
+    def _write_record(self, impact: ImpactCaseSchema) -> None:
+        assert self._writer is not None
+        if self.layout == "long":
+            self._writer.writerows(explode_impact(impact))
+            return
+
+        if (
+            len(impact.impact_evidence) > self.max_evidence
+            or len(impact.achievements) > self.max_achievements
+        ):
+            self.truncated += 1
+        self._writer.writerow(
+            flatten_impact(impact, self.max_evidence, self.max_achievements)
+        )
+
+
+class _ArrowBatchImpactWriter(ImpactWriter):
+    """
+    Wspólna logika writerów kolumnowych: rekordy są buforowane
+    do `row_group_size` i zapisywane jako jeden RecordBatch.
+    Pamięć jest ograniczona rozmiarem jednej grupy wierszy.
+    """
+
+    binary = True
+
+    def __init__(
+        self,
+        path: Path | str,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: Optional[str] = DEFAULT_COMPRESSION,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(path, **kwargs)
+        self.row_group_size = max(1, row_group_size)
+        self.compression = compression
+        self._buffer: List[ImpactCaseSchema] = []
+        self._schema: Any = None
+        self._sink: Any = None
+
+    def _write_header(self) -> None:
+        # Import leniwy – pyarrow jest zależnością opcjonalną
+        from app.dumps.arrow import impact_arrow_schema
+
+        self._schema = impact_arrow_schema(include_raw=self.include_raw)
+        self._sink = self._open_sink()
+
+    def _write_footer(self) -> None:
+        self._write_buffer()
+        self._sink.close()
+        self._sink = None
+
+    def _discard(self) -> None:
+        self._buffer = []
+        sink, self._sink = self._sink, None
+        if sink is not None:
+            # Writer pyarrow trzeba zamknąć przed plikiem; jego stopka trafia do usuwanego pliku
+            try:
+                sink.close()
+            except Exception as e:
+                logger.debug("Błąd zamykania porzuconego writera %s: %s", self.path, e)
+
+    def _write_record(self, impact: ImpactCaseSchema) -> None:
+        self._buffer.append(impact)
+        if len(self._buffer) >= self.row_group_size:
+            self._write_buffer()
+
+    def _write_buffer(self) -> None:
+        if not self._buffer:
+            return
+        from app.dumps.arrow import impacts_to_record_batch
+
+        self._sink.write_batch(impacts_to_record_batch(self._buffer, self._schema))
+        self._buffer = []
+
+    @abstractmethod
+    def _open_sink(self) -> Any:
+        ...
+
+
+class ParquetImpactWriter(_ArrowBatchImpactWriter):
+    """
+    Zapis do Parquet z typowanymi kolumnami, listami struktur dla
+    evidence/achievements, kodowaniem słownikowym i kompresją (domyślnie zstd).
+    Każdy bufor `row_group_size` rekordów to osobna grupa wierszy.
+    """
+
+    def _open_sink(self) -> Any:
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(
+            self._file,
+            self._schema,
+            compression=self.compression or "none",
+            use_dictionary=True,
+        )
+
+
+class ArrowIpcImpactWriter(_ArrowBatchImpactWriter):
+    """
+    Zapis do strumienia Arrow IPC (`.arrows`), czytanego przez
+    `pyarrow.ipc.open_stream`. Format strumieniowy pozwala na osobne
+    słowniki w każdym batchu, więc nie trzeba trzymać całego korpusu.
+    """
+
+    def _open_sink(self) -> Any:
+        import pyarrow as pa
+
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        return pa.ipc.new_stream(self._file, self._schema, options=options)
+
+
+WRITERS_BY_SUFFIX: Dict[str, Type[ImpactWriter]] = {
+    ".json": JsonArrayImpactWriter,
+    ".ndjson": NdjsonImpactWriter,
+    ".jsonl": NdjsonImpactWriter,
+    ".csv": CsvImpactWriter,
+    ".parquet": ParquetImpactWriter,
+    ".arrows": ArrowIpcImpactWriter,
+}
+
+
+def open_writer(path: Path | str, **kwargs: Any) -> ImpactWriter:
+    """
+    Zwraca writer odpowiedni dla rozszerzenia pliku.
+
+    Dodatkowe argumenty (np. `include_raw`, `flush_every`) są przekazywane
+    do konstruktora writera.
+    """
+    path = Path(path)
+    writer_cls = WRITERS_BY_SUFFIX.get(path.suffix.lower())
+    if writer_cls is None:
+        supported = ", ".join(sorted(WRITERS_BY_SUFFIX))
+        raise ValueError(f"Nieobsługiwany format: {path.suffix}. Obsługiwane: {supported}.")
+    return writer_cls(path, **kwargs)
+
+
+def add_writer_arguments(parser: argparse.ArgumentParser) -> None:
+    """Dodaje do parsera CLI wspólne opcje formatu wyjściowego writerów."""
+    parser.add_argument(
+        "--include-raw",
+        action="store_true",
+        help="Dołącz pełne surowe rekordy z API (JSON/NDJSON; w Parquet/Arrow jako kolumna JSON).",
+    )
+    parser.add_argument(
+        "--flush-every",
+        type=int,
+        default=DEFAULT_FLUSH_EVERY,
+        help=f"Co ile rekordów opróżniać bufor pliku (domyślnie: {DEFAULT_FLUSH_EVERY}).",
+    )
+    parser.add_argument(
+        "--csv-layout",
+        choices=CSV_LAYOUTS,
+        default="wide",
+        help=(
+            "Układ CSV: 'wide' – jeden wiersz na impact ze stałą liczbą slotów "
+            "evidence/achievement, 'long' – jeden wiersz na element (domyślnie: wide)."
+        ),
+    )
+    parser.add_argument(
+        "--max-evidence",
+        type=int,
+        default=DEFAULT_MAX_EVIDENCE,
+        help=f"Liczba slotów evidence_N_* w CSV 'wide' (domyślnie: {DEFAULT_MAX_EVIDENCE}).",
+    )
+    parser.add_argument(
+        "--max-achievements",
+        type=int,
+        default=DEFAULT_MAX_ACHIEVEMENTS,
+        help=f"Liczba slotów achievement_N_* w CSV 'wide' (domyślnie: {DEFAULT_MAX_ACHIEVEMENTS}).",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=DEFAULT_ROW_GROUP_SIZE,
+        help=f"Rekordów na grupę wierszy Parquet / batch Arrow (domyślnie: {DEFAULT_ROW_GROUP_SIZE}).",
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default=DEFAULT_COMPRESSION,
+        help=f"Kompresja Parquet/Arrow, np. zstd, snappy, lz4 (domyślnie: {DEFAULT_COMPRESSION}).",
+    )
+
+
+def writer_kwargs_from_args(path: Path | str, args: argparse.Namespace) -> Dict[str, Any]:
+    """Wybiera z argumentów CLI opcje właściwe dla writera danego formatu."""
+    suffix = Path(path).suffix.lower()
+    kwargs: Dict[str, Any] = {"flush_every": args.flush_every}
+
+    if suffix == ".csv":
+        kwargs.update(
+            layout=args.csv_layout,
+            max_evidence=args.max_evidence,
+            max_achievements=args.max_achievements,
+        )
+        return kwargs
+
+    kwargs["include_raw"] = args.include_raw
+    if suffix in (".parquet", ".arrows"):
+        kwargs.update(
+            row_group_size=args.row_group_size,
+            compression=args.compression,
+        )
+    return kwargs
@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from fastapi import FastAPI
 
+from app.api.evaluations import router as evaluations_router
 from app.api.impacts import router as impacts_router
+from app.api.institutions import router as institutions_router
+from app.api.jobs import router as jobs_router
+from app.api.jobs import shutdown_jobs
+from app.api.similarity import router as similarity_router
 
 logging.basicConfig(level=logging.INFO)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    yield
+    # Przy zamykaniu aplikacji anulujemy działające zadania ingestu
+    await shutdown_jobs()
+
+
 app = FastAPI(
     title="imeto API",
     version="0.1.0",
     description=(
         "Read impacts retrieved from radon api"
     ),
+    lifespan=lifespan,
 )
 
 
@@ -26,3 +42,7 @@ async def health() -> dict:
 
 # Rejestrujemy router z endpointami dla impactów
 app.include_router(impacts_router, prefix="/impacts", tags=["impacts"])
+app.include_router(similarity_router, prefix="/similarity", tags=["similarity"])
+app.include_router(evaluations_router, prefix="/evaluations", tags=["evaluations"])
+app.include_router(institutions_router, prefix="/institutions", tags=["institutions"])
+app.include_router(jobs_router, prefix="/jobs", tags=["jobs"])
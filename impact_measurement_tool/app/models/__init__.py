@@ -5,7 +5,23 @@ from .beneficiaries import BeneficiaryCategory, BeneficiarySchema
 from .impact import ImpactDimension, ImpactSectionSchema, ImpactReportSchema
 from .funding import FundingType, FundingOpportunitySchema
 from .evaluation import DisciplineEvaluationSchema, InstitutionEvaluationSchema
-from .impact_case import EvidenceItem, AchievementItem, ImpactCaseSchema, InstitutionImpactSetSchema
+from .institution import InstitutionSchema
+from .ingest_job import (
+    IngestJobKind,
+    IngestJobStatus,
+    IngestJobRequest,
+    IngestJobProgress,
+    IngestJobSchema,
+)
+from .impact_case import (
+    EvidenceItem,
+    AchievementItem,
+    ImpactCaseSchema,
+    InstitutionImpactSetSchema,
+    SummaryCount,
+    CaseTitle,
+    InstitutionImpactSummarySchema,
+)
 
 __all__ = [
     "IdentifierType",
@@ -23,8 +39,17 @@ __all__ = [
     "FundingOpportunitySchema",
     "DisciplineEvaluationSchema",
     "InstitutionEvaluationSchema",
+    "InstitutionSchema",
+    "IngestJobKind",
+    "IngestJobStatus",
+    "IngestJobRequest",
+    "IngestJobProgress",
+    "IngestJobSchema",
     "EvidenceItem",
     "AchievementItem",
     "ImpactCaseSchema",
     "InstitutionImpactSetSchema",
+    "SummaryCount",
+    "CaseTitle",
+    "InstitutionImpactSummarySchema",
 ]
@@ -9,6 +9,8 @@ class IdentifierType(str, Enum):
     """Type of identifier used in the system."""
 
     DOI = "doi"
+    ISBN = "isbn"
+    ISSN = "issn"
     ORCID = "orcid"
     GRANT_ID = "grant_id"
     INTERNAL = "internal"
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+import hashlib
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
+
+from .beneficiaries import BeneficiarySchema
+from .identifiers import IdentifierSchema
 
 
 class EvidenceItem(BaseModel):
@@ -72,6 +78,17 @@ class ImpactCaseSchema(BaseModel):
     domain_name: Optional[str] = None
     domain_code: Optional[str] = None
 
+    # Kategoria ewaluacyjna dyscypliny impactu w instytucji – zdenormalizowana
+    # z kolekcji ewaluacji (app/pipeline/evaluation_join.py), nie pochodzi z /polon/impacts
+    evaluation_period: Optional[str] = Field(
+        default=None,
+        description="Okres ewaluacji, z którego pochodzi evaluation_category, np. '2017-2021'.",
+    )
+    evaluation_category: Optional[str] = Field(
+        default=None,
+        description="Kategoria naukowa dyscypliny w instytucji w tym okresie, np. 'A+'.",
+    )
+
     # Rodzaj
     kind_code: Optional[str] = None
     kind_name: Optional[str] = None
@@ -116,6 +133,26 @@ class ImpactCaseSchema(BaseModel):
     interdisciplinarity_characteristic_pl: Optional[str] = None
     interdisciplinarity_characteristic_en: Optional[str] = None
 
+    # Beneficjenci – wyliczani z narracji (app/pipeline/beneficiaries.py), nie pochodzą z RAD-on
+    beneficiaries: List[BeneficiarySchema] = Field(
+        default_factory=list,
+        description="Grupy beneficjentów rozpoznane w opisie wpływu.",
+    )
+    beneficiary_categories: List[str] = Field(
+        default_factory=list,
+        description="Kategorie beneficjentów (BeneficiaryCategory) – indeksowane do filtrowania.",
+    )
+
+    # Identyfikatory z opisów bibliograficznych osiągnięć (app/pipeline/identifiers.py)
+    identifiers: List[IdentifierSchema] = Field(
+        default_factory=list,
+        description="Znormalizowane DOI / ISBN / ISSN cytowane w osiągnięciach.",
+    )
+    identifier_keys: List[str] = Field(
+        default_factory=list,
+        description="Klucze identyfikatorów 'typ:wartość' (np. 'doi:10.1000/xyz') – indeksowane do wyszukiwania.",
+    )
+
     # Metadane
     data_source: Optional[str] = None
     last_refresh: Optional[str] = None
@@ -126,74 +163,140 @@ class ImpactCaseSchema(BaseModel):
     @classmethod
     def from_radon_record(cls, record: Dict[str, Any]) -> "ImpactCaseSchema":
         """Tworzy ImpactCaseSchema z pojedynczego rekordu RAD-on."""
-        evaluation_year: Optional[int] = None
-        evaluation_year_raw = record.get("evaluationYear")
-        if evaluation_year_raw is not None:
-            try:
-                evaluation_year = int(str(evaluation_year_raw))
-            except ValueError:
-                pass
-
-        impact_areas_raw = record.get("impactArea") or []
-        if isinstance(impact_areas_raw, list):
-            impact_areas = [str(a) for a in impact_areas_raw]
-        else:
-            impact_areas = [str(impact_areas_raw)]
-
-        evidence_items: List[EvidenceItem] = []
-        for ev in (record.get("impactEvidence") or []):
-            if isinstance(ev, dict):
-                evidence_items.append(EvidenceItem(
-                    description_pl=ev.get("descriptionPl"),
-                    description_en=ev.get("descriptionEn"),
-                ))
-
-        achievement_items: List[AchievementItem] = []
-        for ach in (record.get("achievements") or []):
-            if isinstance(ach, dict):
-                achievement_items.append(AchievementItem(
-                    bibliographic_description_pl=ach.get("bibliographicDescriptionPl"),
-                    bibliographic_description_en=ach.get("bibliographicDescriptionEn"),
-                    summary_pl=ach.get("summaryPl"),
-                    summary_en=ach.get("summaryEn"),
-                ))
-
-        return cls(
-            impact_uuid=record.get("impactUuid"),
-            institution_name=record.get("institutionName"),
-            institution_uuid=record.get("institutionUuid"),
-            evaluation_year=evaluation_year,
-            discipline_name=record.get("disciplineName"),
-            discipline_code=record.get("disciplineCode"),
-            domain_name=record.get("domainName"),
-            domain_code=record.get("domainCode"),
-            kind_code=record.get("kindCode"),
-            kind_name=record.get("kindName"),
-            detailed_kind=record.get("detailedKind"),
-            title_pl=record.get("titlePl"),
-            title_en=record.get("titleEn"),
-            summary_pl=record.get("summaryPl"),
-            summary_en=record.get("summaryEn"),
-            impact_description_pl=record.get("impactDescriptionPl"),
-            impact_description_en=record.get("impactDescriptionEn"),
-            main_conclusion_pl=record.get("mainConclusionPl"),
-            main_conclusion_en=record.get("mainConclusionEn"),
-            impact_evidence=evidence_items,
-            achievements=achievement_items,
-            entity_name_pl=record.get("entityNamePl"),
-            entity_name_en=record.get("entityNameEn"),
-            entity_role_pl=record.get("entityRolePl"),
-            entity_role_en=record.get("entityRoleEn"),
-            impact_areas=impact_areas,
-            other_impact_area=record.get("otherImpactArea"),
-            is_interdisciplinary=record.get("isInterdisciplinary"),
-            interdisciplinarity_characteristic_pl=record.get("interdisciplinarityCharacteristicPl"),
-            interdisciplinarity_characteristic_en=record.get("interdisciplinarityCharacteristicEn"),
-            data_source=record.get("dataSource"),
-            last_refresh=record.get("lastRefresh"),
-            raw=record,
+        return cls.model_validate(radon_record_to_dict(record))
+
+    @classmethod
+    def from_radon_records(cls, records: Iterable[Any]) -> List["ImpactCaseSchema"]:
+        """
+        Konwertuje całą stronę rekordów RAD-on jednym przebiegiem walidacji
+        (`TypeAdapter` dla listy), zamiast budować modele pojedynczo.
+
+        Elementy niebędące słownikami są pomijane.
+        """
+        return _IMPACT_LIST_ADAPTER.validate_python(
+            [radon_record_to_dict(r) for r in records if isinstance(r, dict)]
         )
 
+    @classmethod
+    def construct_from_radon_record(cls, record: Dict[str, Any]) -> "ImpactCaseSchema":
+        """
+        Buduje ImpactCaseSchema BEZ walidacji.
+
+        Tylko dla zaufanego wejścia (np. własnych zrzutów lub danych już
+        zwalidowanych) – typy pól nie są sprawdzane ani konwertowane.
+        """
+        data = radon_record_to_dict(record)
+        # Pola-listy spoza rekordu RAD-on dostają puste listy od razu: model_construct
+        # sprawdza sygnaturę default_factory przy każdym wywołaniu, co kosztuje więcej niż walidacja
+        for name in _LIST_DEFAULT_FIELDS:
+            data.setdefault(name, [])
+        data["impact_evidence"] = [EvidenceItem.model_construct(**ev) for ev in data["impact_evidence"]]
+        data["achievements"] = [AchievementItem.model_construct(**ach) for ach in data["achievements"]]
+        return cls.model_construct(**data)
+
+
+# Pola ImpactCaseSchema z domyślną pustą listą (construct_from_radon_record)
+_LIST_DEFAULT_FIELDS: Tuple[str, ...] = tuple(
+    name for name, field in ImpactCaseSchema.model_fields.items() if field.default_factory is list
+)
+
+
+# Mapowanie pól RAD-on (camelCase) -> ImpactCaseSchema (snake_case), kompilowane raz.
+# Pola wymagające konwersji (evaluationYear, impactArea, impactEvidence, achievements)
+# są obsługiwane osobno w `radon_record_to_dict`.
+RADON_IMPACT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("impactUuid", "impact_uuid"),
+    ("institutionName", "institution_name"),
+    ("institutionUuid", "institution_uuid"),
+    ("disciplineName", "discipline_name"),
+    ("disciplineCode", "discipline_code"),
+    ("domainName", "domain_name"),
+    ("domainCode", "domain_code"),
+    ("kindCode", "kind_code"),
+    ("kindName", "kind_name"),
+    ("detailedKind", "detailed_kind"),
+    ("titlePl", "title_pl"),
+    ("titleEn", "title_en"),
+    ("summaryPl", "summary_pl"),
+    ("summaryEn", "summary_en"),
+    ("impactDescriptionPl", "impact_description_pl"),
+    ("impactDescriptionEn", "impact_description_en"),
+    ("mainConclusionPl", "main_conclusion_pl"),
+    ("mainConclusionEn", "main_conclusion_en"),
+    ("entityNamePl", "entity_name_pl"),
+    ("entityNameEn", "entity_name_en"),
+    ("entityRolePl", "entity_role_pl"),
+    ("entityRoleEn", "entity_role_en"),
+    ("otherImpactArea", "other_impact_area"),
+    ("isInterdisciplinary", "is_interdisciplinary"),
+    ("interdisciplinarityCharacteristicPl", "interdisciplinarity_characteristic_pl"),
+    ("interdisciplinarityCharacteristicEn", "interdisciplinarity_characteristic_en"),
+    ("dataSource", "data_source"),
+    ("lastRefresh", "last_refresh"),
+)
+
+RADON_EVIDENCE_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("descriptionPl", "description_pl"),
+    ("descriptionEn", "description_en"),
+)
+
+RADON_ACHIEVEMENT_FIELDS: Tuple[Tuple[str, str], ...] = (
+    ("bibliographicDescriptionPl", "bibliographic_description_pl"),
+    ("bibliographicDescriptionEn", "bibliographic_description_en"),
+    ("summaryPl", "summary_pl"),
+    ("summaryEn", "summary_en"),
+)
+
+
+def radon_record_to_dict(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Mapuje surowy rekord RAD-on na słownik z polami ImpactCaseSchema
+    (snake_case), jeszcze bez walidacji pydantic.
+    """
+    get = record.get
+    data: Dict[str, Any] = {field: get(key) for key, field in RADON_IMPACT_FIELDS}
+
+    evaluation_year: Optional[int] = None
+    evaluation_year_raw = get("evaluationYear")
+    if evaluation_year_raw is not None:
+        try:
+            evaluation_year = int(str(evaluation_year_raw))
+        except ValueError:
+            pass
+    data["evaluation_year"] = evaluation_year
+
+    impact_areas_raw = get("impactArea") or []
+    if isinstance(impact_areas_raw, list):
+        data["impact_areas"] = [str(a) for a in impact_areas_raw]
+    else:
+        data["impact_areas"] = [str(impact_areas_raw)]
+
+    data["impact_evidence"] = [
+        {field: ev.get(key) for key, field in RADON_EVIDENCE_FIELDS}
+        for ev in (get("impactEvidence") or [])
+        if isinstance(ev, dict)
+    ]
+    data["achievements"] = [
+        {field: ach.get(key) for key, field in RADON_ACHIEVEMENT_FIELDS}
+        for ach in (get("achievements") or [])
+        if isinstance(ach, dict)
+    ]
+
+    data["raw"] = record
+    return data
+
+
+# Walidator całej strony rekordów naraz
+_IMPACT_LIST_ADAPTER: TypeAdapter[List[ImpactCaseSchema]] = TypeAdapter(List[ImpactCaseSchema])
+
+
+def radon_records_to_documents(records: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Konwertuje stronę rekordów RAD-on na zwalidowane słowniki gotowe do zapisu
+    w MongoDB (odpowiednik `model_dump()` dla każdego rekordu).
+    """
+    return _IMPACT_LIST_ADAPTER.dump_python(ImpactCaseSchema.from_radon_records(records))
+
 
 class InstitutionImpactSetSchema(BaseModel):
     """Zestaw impactów powiązanych z jedną instytucją."""
@@ -204,15 +307,145 @@ class InstitutionImpactSetSchema(BaseModel):
     @classmethod
     def from_radon_response(cls, response: Dict[str, Any]) -> "InstitutionImpactSetSchema":
         results = response.get("results", []) or []
-        cases: List[ImpactCaseSchema] = []
-        institution_name: Optional[str] = None
-
-        for r in results:
-            if not isinstance(r, dict):
-                continue
-            case = ImpactCaseSchema.from_radon_record(r)
-            cases.append(case)
-            if case.institution_name and institution_name is None:
-                institution_name = case.institution_name
+        cases = ImpactCaseSchema.from_radon_records(results)
+        institution_name: Optional[str] = next(
+            (case.institution_name for case in cases if case.institution_name),
+            None,
+        )
 
         return cls(institution_name=institution_name, cases=cases)
+
+    def summary(self, institution_uuid: Optional[str] = None) -> "InstitutionImpactSummarySchema":
+        """Podsumowanie zestawu (InstitutionImpactSummarySchema)."""
+        uuid = institution_uuid or next((c.institution_uuid for c in self.cases if c.institution_uuid), None)
+        if not uuid:
+            raise ValueError("Brak institution_uuid dla podsumowania zestawu impactów.")
+        fields = set(SUMMARY_FIELDS)
+        return InstitutionImpactSummarySchema.from_documents(
+            uuid, (case.model_dump(include=fields) for case in self.cases)
+        )
+
+
+# Pola impactu potrzebne do podsumowania instytucji (projekcja dla repozytorium)
+SUMMARY_FIELDS: Tuple[str, ...] = (
+    "impact_uuid",
+    "institution_uuid",
+    "institution_name",
+    "evaluation_year",
+    "discipline_name",
+    "discipline_code",
+    "title_pl",
+    "title_en",
+    "impact_areas",
+    "other_impact_area",
+    "is_interdisciplinary",
+)
+
+
+class SummaryCount(BaseModel):
+    """Wartość (dyscyplina, obszar, rok) z liczbą impactów."""
+
+    name: str
+    code: Optional[str] = None
+    count: int
+
+
+class CaseTitle(BaseModel):
+    """Tytuł impactu w podsumowaniu instytucji."""
+
+    impact_uuid: Optional[str] = None
+    title_pl: Optional[str] = None
+    title_en: Optional[str] = None
+    evaluation_year: Optional[int] = None
+    discipline_name: Optional[str] = None
+
+
+class InstitutionImpactSummarySchema(BaseModel):
+    """
+    Zapisywane podsumowanie impactów jednej instytucji (profil instytucji):
+    liczba opisów, dyscypliny, obszary, lata i tytuły, bez pełnych opisów.
+
+    `fingerprint` to skrót treści podsumowania – pozwala pominąć zapis, gdy
+    po ingeście nic się nie zmieniło.
+    """
+
+    institution_uuid: str
+    institution_name: Optional[str] = None
+    case_count: int = 0
+    interdisciplinary_count: int = 0
+    disciplines: List[SummaryCount] = Field(default_factory=list)
+    impact_areas: List[SummaryCount] = Field(default_factory=list)
+    evaluation_years: List[SummaryCount] = Field(default_factory=list)
+    titles: List[CaseTitle] = Field(default_factory=list)
+    fingerprint: Optional[str] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def from_documents(
+        cls,
+        institution_uuid: str,
+        docs: Iterable[Dict[str, Any]],
+    ) -> "InstitutionImpactSummarySchema":
+        """
+        Podsumowanie z dokumentów impactów instytucji (słowniki z polami
+        SUMMARY_FIELDS, np. z `iter_documents`). Listy są uporządkowane
+        deterministycznie, więc ten sam zbiór impactów daje ten sam `fingerprint`.
+        """
+        names: Counter = Counter()
+        disciplines: Counter = Counter()
+        discipline_codes: Dict[str, str] = {}
+        areas: Counter = Counter()
+        years: Counter = Counter()
+        titles: List[CaseTitle] = []
+        interdisciplinary = 0
+
+        for doc in docs:
+            if doc.get("institution_name"):
+                names[doc["institution_name"]] += 1
+            discipline = doc.get("discipline_name")
+            if discipline:
+                disciplines[discipline] += 1
+                if doc.get("discipline_code"):
+                    discipline_codes.setdefault(discipline, doc["discipline_code"])
+            case_areas = list(doc.get("impact_areas") or ())
+            if doc.get("other_impact_area"):
+                case_areas.append(doc["other_impact_area"])
+            areas.update(set(case_areas))
+            if doc.get("evaluation_year"):
+                years[doc["evaluation_year"]] += 1
+            interdisciplinary += bool(doc.get("is_interdisciplinary"))
+            titles.append(CaseTitle(
+                impact_uuid=doc.get("impact_uuid"),
+                title_pl=doc.get("title_pl"),
+                title_en=doc.get("title_en"),
+                evaluation_year=doc.get("evaluation_year"),
+                discipline_name=discipline,
+            ))
+
+        def counted(counter: Counter, codes: Optional[Dict[str, str]] = None) -> List[SummaryCount]:
+            # Od najczęstszych, przy remisie alfabetycznie
+            return [
+                SummaryCount(name=name, code=(codes or {}).get(name), count=n)
+                for name, n in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+            ]
+
+        titles.sort(key=lambda t: (-(t.evaluation_year or 0), t.title_pl or t.title_en or "", t.impact_uuid or ""))
+        summary = cls(
+            institution_uuid=institution_uuid,
+            institution_name=names.most_common(1)[0][0] if names else None,
+            case_count=len(titles),
+            interdisciplinary_count=interdisciplinary,
+            disciplines=counted(disciplines, discipline_codes),
+            impact_areas=counted(areas),
+            evaluation_years=[
+                SummaryCount(name=str(year), count=n) for year, n in sorted(years.items(), reverse=True)
+            ],
+            titles=titles,
+        )
+        summary.fingerprint = summary.content_fingerprint()
+        return summary
+
+    def content_fingerprint(self) -> str:
+        """Skrót SHA-1 treści podsumowania (bez `fingerprint` i `updated_at`)."""
+        payload = self.model_dump_json(exclude={"fingerprint", "updated_at"})
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class IngestJobKind(str, Enum):
+    """What an ingest job fetches from RAD-on."""
+
+    KIND_CODE = "kind_code"          # all impacts of one kindCode
+    INSTITUTIONS = "institutions"    # impacts of the listed institutions
+    INCREMENTAL = "incremental"      # kindCode sweep, only records changed since the last sync are written
+
+
+class IngestJobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_JOB_STATUSES = (IngestJobStatus.SUCCEEDED, IngestJobStatus.FAILED, IngestJobStatus.CANCELLED)
+
+
+class IngestJobRequest(BaseModel):
+    """Parameters of an ingest job started through the API."""
+
+    kind: IngestJobKind = IngestJobKind.KIND_CODE
+    kind_code: str = Field(default="1", description="RAD-on kindCode (kind_code and incremental jobs).")
+    institution_uuids: List[str] = Field(
+        default_factory=list,
+        description="Institutions to ingest (institutions jobs).",
+    )
+    page_size: int = Field(default=50, gt=0, le=1000, description="Records per RAD-on request.")
+    classify_beneficiaries: bool = True
+    extract_identifiers: bool = True
+    refresh_summaries: bool = Field(
+        default=True,
+        description=(
+            "Recompute institution summaries and the institution index afterwards "
+            "(stored on the same backend as the impacts)."
+        ),
+    )
+    refresh_categories: bool = Field(
+        default=True,
+        description="Fill evaluation categories of the ingested impacts from the stored institution evaluations.",
+    )
+
+    @model_validator(mode="after")
+    def _check_target(self) -> "IngestJobRequest":
+        self.institution_uuids = list(dict.fromkeys(u.strip() for u in self.institution_uuids if u.strip()))
+        if self.kind == IngestJobKind.INSTITUTIONS and not self.institution_uuids:
+            raise ValueError("institutions jobs need at least one institution UUID")
+        return self
+
+    def target(self) -> str:
+        """What the job touches; two unfinished jobs never share a target."""
+        if self.kind == IngestJobKind.INSTITUTIONS:
+            return "institutions:" + ",".join(sorted(self.institution_uuids))
+        return f"kind_code:{self.kind_code}"
+
+
+class IngestJobProgress(BaseModel):
+    """Live counters of a job."""
+
+    pages_fetched: int = 0
+    records_fetched: int = 0
+    records_saved: int = 0
+    records_skipped: int = Field(default=0, description="Duplicates and records unchanged since the last sync.")
+    errors: int = Field(default=0, description="Failed RAD-on requests and rejected records.")
+    records_per_second: float = 0.0
+    current: Optional[str] = Field(default=None, description="Institution UUID or kindCode being fetched.")
+
+
+class IngestJobSchema(BaseModel):
+    """An ingest job with its status and progress."""
+
+    job_id: str
+    request: IngestJobRequest
+    status: IngestJobStatus = IngestJobStatus.PENDING
+    progress: IngestJobProgress = Field(default_factory=IngestJobProgress)
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = Field(default=None, description="Why the job failed.")
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class InstitutionSchema(BaseModel):
+    """
+    An institution known to IMeTo: POL-on / RAD-on UUID, canonical name,
+    name variants seen in the data, and how many impacts / evaluations it has.
+    """
+
+    institution_uuid: str = Field(description="Institution UUID from POL-on / RAD-on.")
+    name: str = Field(description="Canonical name (the most frequent variant).")
+    name_variants: List[str] = Field(
+        default_factory=list,
+        description="All names seen for this UUID, most frequent first.",
+    )
+    impact_count: int = Field(default=0, description="Number of stored impacts.")
+    evaluation_count: int = Field(default=0, description="Number of stored evaluation periods.")
+    score: Optional[float] = Field(
+        default=None,
+        description="Match score of a name search (1.0 = prefix match), empty otherwise.",
+    )
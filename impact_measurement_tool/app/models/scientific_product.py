@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -86,9 +86,27 @@ class ScientificProductSchema(BaseModel):
         default_factory=list,
         description="Text chunks prepared for vector search / LLM.",
     )
+    chunk_offsets: List[Tuple[int, int]] = Field(
+        default_factory=list,
+        description=(
+            "Chunk boundaries as (start, end) character offsets into raw_content, "
+            "filled by app.pipeline.chunking instead of copying the text into chunks."
+        ),
+    )
 
     # Who benefits from this product
     beneficiaries: List[BeneficiarySchema] = Field(
         default_factory=list,
         description="Beneficiaries related to this specific product or activity.",
     )
+
+    def iter_chunks(self) -> Iterator[str]:
+        """
+        Yields chunk texts: slices of raw_content by chunk_offsets when present,
+        otherwise the stored chunks.
+        """
+        if self.chunk_offsets and self.raw_content is not None:
+            for start, end in self.chunk_offsets:
+                yield self.raw_content[start:end]
+        else:
+            yield from self.chunks
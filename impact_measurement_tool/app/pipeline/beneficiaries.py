@@ -0,0 +1,228 @@
+# app/pipeline/beneficiaries.py
+"""
+Klasyfikacja beneficjentów impactów (BeneficiaryCategory) na podstawie słów
+kluczowych w narracjach, dowodach wpływu i opisie podmiotu.
+
+Słowniki PL/EN to rdzenie słów (dopasowywane od początku słowa, z dowolną
+końcówką – odmiana), także wielowyrazowe, np. "organizacj pozarząd". Wszystkie
+kategorie są kompilowane do JEDNEGO wyrażenia regularnego w postaci drzewa
+prefiksów (wspólne początki słów sprawdzane raz), więc każde pole tekstowe
+jest skanowane raz, niezależnie od liczby słów kluczowych.
+
+Użycie:
+    classifier = BeneficiaryClassifier()
+    impact = classifier.tag(impact)          # uzupełnia beneficiaries i beneficiary_categories
+    tagged = tag_beneficiaries(impacts)      # generator, domyślny klasyfikator
+"""
+
+from __future__ import annotations
+
+import logging
+# Biblioteka standardowa zamiast `regex`: dla tego wzorca (bez cech specyficznych
+# dla `regex`) jej silnik jest kilkukrotnie szybszy, a to gorąca ścieżka ingestu
+import re
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.models import BeneficiaryCategory, BeneficiarySchema, ImpactCaseSchema
+
+logger = logging.getLogger(__name__)
+
+# Rdzenie słów kluczowych (małe litery). Każde słowo rdzenia może mieć dowolną końcówkę.
+BENEFICIARY_KEYWORDS: Dict[BeneficiaryCategory, Tuple[str, ...]] = {
+    BeneficiaryCategory.GENERAL_PUBLIC: (
+        "społeczeństw", "mieszkańc", "obywatel", "opini publiczn", "szerok publiczn", "ogół społeczeństw",
+        "general public", "wider public", "citizen", "residents", "society", "wide audience",
+    ),
+    BeneficiaryCategory.STUDENTS: (
+        "uczni", "uczeń", "student", "doktorant", "słuchacz", "absolwent",
+        "pupil", "learner", "phd candidate", "doctoral candidate", "graduate",
+    ),
+    BeneficiaryCategory.EDUCATORS: (
+        "nauczyciel", "pedagog", "wykładowc", "dydaktyk", "edukator",
+        "teacher", "educator", "lecturer", "instructor",
+    ),
+    BeneficiaryCategory.POLICY_MAKERS: (
+        "decydent", "ustawodaw", "parlament", "sejm", "senat", "ministerstw", "minister", "rząd", "legislac",
+        "policy maker", "policymaker", "policy-maker", "legislat", "parliament", "government", "ministry",
+    ),
+    BeneficiaryCategory.PUBLIC_ADMINISTRATION: (
+        "administracj publiczn", "administracj samorząd", "samorząd", "urząd", "urzęd", "gmin", "powiat",
+        "województw", "jednost samorząd",
+        "public administration", "local government", "local authorit", "municipal", "public sector",
+    ),
+    BeneficiaryCategory.CULTURAL_INSTITUTIONS: (
+        "muze", "bibliotek", "archiw", "teatr", "galeri", "instytucj kultur", "dom kultur", "filharmoni",
+        "museum", "librar", "archive", "theatre", "theater", "gallery", "cultural institution",
+    ),
+    BeneficiaryCategory.BUSINESS: (
+        "przedsiębior", "firm", "spółk", "przemysł", "sektor prywatn", "sektor gospodarcz",
+        "business", "compan", "enterprise", "industr", "private sector", "startup", "start-up",
+    ),
+    BeneficiaryCategory.NGOS: (
+        "organizacj pozarząd", "fundacj", "stowarzysz", "trzeci sektor", "organizacj społeczn",
+        "ngo", "non-governmental", "nongovernmental", "foundation", "association", "charit",
+    ),
+    BeneficiaryCategory.HEALTHCARE_SECTOR: (
+        "szpital", "pacjent", "lekarz", "lekarsk", "klinik", "ochron zdrow", "służb zdrow", "pielęgniar",
+        "hospital", "patient", "clinic", "physician", "nurse", "healthcare", "health care", "health service",
+    ),
+    BeneficiaryCategory.INTERNAL_INSTITUTION: (
+        "pracownic uczeln", "pracowników uczeln", "społecznoś akademick", "własn uczeln",
+        "academic community", "university staff", "faculty members",
+    ),
+}
+
+# Pola tekstowe impactu i ich wagi (opis podmiotu wprost wskazuje beneficjenta)
+TEXT_FIELD_WEIGHTS: Tuple[Tuple[str, float], ...] = (
+    ("title_pl", 1.0),
+    ("title_en", 1.0),
+    ("summary_pl", 1.0),
+    ("summary_en", 1.0),
+    ("impact_description_pl", 1.0),
+    ("impact_description_en", 1.0),
+    ("main_conclusion_pl", 1.0),
+    ("main_conclusion_en", 1.0),
+    ("entity_name_pl", 2.0),
+    ("entity_name_en", 2.0),
+    ("entity_role_pl", 2.0),
+    ("entity_role_en", 2.0),
+)
+EVIDENCE_WEIGHT = 1.0
+
+# Minimalna ważona liczba trafień, od której kategoria jest przypisywana
+DEFAULT_MIN_SCORE = 2.0
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """'organizacj pozarząd' → 'organizacj\\w*[\\s-]+pozarząd\\w*' (każde słowo z końcówką)."""
+    return r"[\s\-]+".join(re.escape(word) + r"\w*" for word in keyword.split())
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    Alternatywa wszystkich słów kluczowych zapisana jako drzewo prefiksów:
+    wspólne początki są sprawdzane raz, więc w każdej pozycji tekstu silnik
+    odrzuca nietrafione gałęzie po pierwszym znaku.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in " ".join(keyword.lower().split()):
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict[str, dict]) -> str:
+        alternatives = [
+            (r"\w*[\s\-]+" if char == " " else re.escape(char)) + emit(child)
+            for char, child in node.items()
+            if char
+        ]
+        if "" in node:
+            alternatives.append(r"\w*")
+        return alternatives[0] if len(alternatives) == 1 else f"(?:{'|'.join(alternatives)})"
+
+    return emit(trie)
+
+
+class BeneficiaryClassifier:
+    """
+    Przypisuje impactom kategorie beneficjentów jednym skanem każdego pola.
+
+    Wszystkie słowa kluczowe tworzą jedno wyrażenie (`pattern`); kategoria
+    dopasowanego fragmentu jest ustalana na krótkim tekście trafienia
+    i zapamiętywana, bo te same formy słów powtarzają się w korpusie.
+    """
+
+    def __init__(
+        self,
+        keywords: Optional[Dict[BeneficiaryCategory, Sequence[str]]] = None,
+        min_score: float = DEFAULT_MIN_SCORE,
+    ) -> None:
+        keywords = keywords or BENEFICIARY_KEYWORDS
+        self.min_score = min_score
+        self.pattern = re.compile(
+            r"(?<!\w)" + _trie_pattern(w for words in keywords.values() for w in words),
+            re.IGNORECASE,
+        )
+        self._category_patterns = [
+            (category, re.compile("|".join(_keyword_pattern(w) for w in words), re.IGNORECASE))
+            for category, words in keywords.items()
+        ]
+        self._categories: Dict[str, BeneficiaryCategory] = {}
+
+    def _category(self, matched: str) -> BeneficiaryCategory:
+        category = self._categories.get(matched)
+        if category is None:
+            category = next(
+                (c for c, pattern in self._category_patterns if pattern.fullmatch(matched)),
+                BeneficiaryCategory.OTHER,
+            )
+            self._categories[matched] = category
+        return category
+
+    def _texts(self, impact: ImpactCaseSchema) -> Iterator[Tuple[str, float]]:
+        for name, weight in TEXT_FIELD_WEIGHTS:
+            text = getattr(impact, name)
+            if text:
+                yield text, weight
+        for evidence in impact.impact_evidence:
+            for text in (evidence.description_pl, evidence.description_en):
+                if text:
+                    yield text, EVIDENCE_WEIGHT
+
+    def scores(self, impact: ImpactCaseSchema) -> Dict[BeneficiaryCategory, Tuple[float, Counter]]:
+        """Kategoria → (ważona liczba trafień, liczności dopasowanych słów)."""
+        result: Dict[BeneficiaryCategory, Tuple[float, Counter]] = {}
+        for text, weight in self._texts(impact):
+            for match in self.pattern.finditer(text):
+                matched = match.group().lower()
+                category = self._category(matched)
+                score, terms = result.get(category, (0.0, Counter()))
+                terms[matched] += 1
+                result[category] = (score + weight, terms)
+        return result
+
+    def classify(self, impact: ImpactCaseSchema) -> List[BeneficiarySchema]:
+        """Beneficjenci impactu, od najsilniej wskazanej kategorii."""
+        ranked = sorted(
+            ((score, category, terms) for category, (score, terms) in self.scores(impact).items()
+             if score >= self.min_score),
+            key=lambda item: (-item[0], item[1].value),
+        )
+        # Stabilne id (impact + kategoria): ponowna klasyfikacja nie zmienia dokumentu
+        prefix = impact.impact_uuid or ""
+        return [
+            BeneficiarySchema(
+                id=f"{prefix}:{category.value}",
+                category=category,
+                label=terms.most_common(1)[0][0],
+                description=f"Trafienia słów kluczowych: {', '.join(t for t, _ in terms.most_common(5))}",
+                is_intended=False,
+            )
+            for score, category, terms in ranked
+        ]
+
+    def tag(self, impact: ImpactCaseSchema) -> ImpactCaseSchema:
+        """Uzupełnia `beneficiaries` i `beneficiary_categories` (w miejscu) i zwraca impact."""
+        beneficiaries = self.classify(impact)
+        impact.beneficiaries = beneficiaries
+        impact.beneficiary_categories = [b.category.value for b in beneficiaries]
+        return impact
+
+
+_default_classifier: Optional[BeneficiaryClassifier] = None
+
+
+def default_classifier() -> BeneficiaryClassifier:
+    global _default_classifier
+    if _default_classifier is None:
+        _default_classifier = BeneficiaryClassifier()
+    return _default_classifier
+
+
+def tag_beneficiaries(impacts: Iterable[ImpactCaseSchema]) -> Iterator[ImpactCaseSchema]:
+    """Generator: impacty z uzupełnionymi beneficjentami (domyślny klasyfikator)."""
+    classifier = default_classifier()
+    for impact in impacts:
+        yield classifier.tag(impact)
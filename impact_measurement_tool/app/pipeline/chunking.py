@@ -0,0 +1,218 @@
+# app/pipeline/chunking.py
+"""
+Dzielenie pełnych tekstów produktów naukowych (`raw_content`) na fragmenty.
+
+Fragmenty są reprezentowane jako przesunięcia (start, end) w oryginalnym
+tekście – nic nie jest kopiowane ani cięte podczas wyznaczania granic,
+a produkt przechowuje tylko `chunk_offsets`. Tekst fragmentu to zwykły
+wycinek `raw_content[start:end]` (`ScientificProductSchema.iter_chunks`).
+
+Granice:
+- "paragraph" – koniec akapitu (pusta linia), w razie braku – koniec zdania,
+- "sentence"  – koniec zdania lub akapitu,
+- "none"      – dowolna spacja (bez cięcia słów).
+
+Kandydaci na granice są wyznaczani raz dla całego tekstu (jeden przebieg
+wyrażenia regularnego), a wybór granicy każdego fragmentu to wyszukiwanie
+binarne. Partie produktów mogą być przetwarzane w puli procesów – do procesów
+trafiają teksty, a wracają wyłącznie listy przesunięć.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import regex as re
+
+from app.models import ScientificProductSchema
+
+logger = logging.getLogger(__name__)
+
+BOUNDARIES = ("paragraph", "sentence", "none")
+
+DEFAULT_CHUNK_SIZE = 1200
+DEFAULT_OVERLAP = 150
+DEFAULT_BATCH_SIZE = 32
+
+# Koniec akapitu: pusta linia (pozycja za białymi znakami)
+_PARAGRAPH_END = re.compile(r"\n[^\S\n]*\n\s*")
+# Koniec zdania: . ! ? … (ew. z cudzysłowem / nawiasem) i białe znaki
+_SENTENCE_END = re.compile(r"(?<=[.!?…][\"'”»)\]]?)\s+")
+_WHITESPACE = re.compile(r"\s+")
+
+Offsets = List[Tuple[int, int]]
+
+
+@dataclass(frozen=True)
+class ChunkingConfig:
+    """Parametry dzielenia: rozmiar i zakładka w znakach, rodzaj granic."""
+
+    size: int = DEFAULT_CHUNK_SIZE
+    overlap: int = DEFAULT_OVERLAP
+    boundary: str = "sentence"
+
+    def __post_init__(self) -> None:
+        if self.size <= 0:
+            raise ValueError("Rozmiar fragmentu musi być dodatni.")
+        if not 0 <= self.overlap < self.size:
+            raise ValueError("Zakładka musi być nieujemna i mniejsza niż rozmiar fragmentu.")
+        if self.boundary not in BOUNDARIES:
+            raise ValueError(f"Nieznany rodzaj granic: {self.boundary!r}. Dostępne: {', '.join(BOUNDARIES)}.")
+
+
+def _boundary_positions(text: str, pattern: re.Pattern) -> List[int]:
+    """Pozycje (posortowane), od których może zaczynać się nowy fragment."""
+    return [m.end() for m in pattern.finditer(text)]
+
+
+def _pick(positions: Sequence[int], low: int, high: int, last: bool) -> Optional[int]:
+    """Ostatnia (`last`) lub pierwsza pozycja z przedziału (low, high] albo None."""
+    if last:
+        i = bisect_right(positions, high) - 1
+        return positions[i] if i >= 0 and positions[i] > low else None
+    i = bisect_left(positions, low + 1)
+    return positions[i] if i < len(positions) and positions[i] <= high else None
+
+
+def iter_chunk_offsets(text: str, config: ChunkingConfig = ChunkingConfig()) -> Iterator[Tuple[int, int]]:
+    """
+    Generator przesunięć (start, end) kolejnych fragmentów tekstu.
+
+    Fragment kończy się na najpóźniejszej granicy preferowanego rodzaju,
+    która mieści się w `size` i daje fragment dłuższy niż połowa `size`;
+    w przeciwnym razie na granicy słabszej (zdanie → spacja), a w ostateczności
+    twardo po `size` znakach. Kolejny fragment zaczyna się na najwcześniejszej
+    granicy w obrębie ostatnich `overlap` znaków poprzedniego.
+    """
+    n = len(text)
+    if n == 0:
+        return
+
+    # Od najsilniejszej do najsłabszej granicy
+    tiers: List[List[int]] = []
+    if config.boundary == "paragraph":
+        tiers.append(_boundary_positions(text, _PARAGRAPH_END))
+    if config.boundary in ("paragraph", "sentence"):
+        sentences = _boundary_positions(text, _SENTENCE_END)
+        if config.boundary == "sentence":
+            # Koniec akapitu też kończy zdanie
+            sentences = sorted(set(sentences).union(_boundary_positions(text, _PARAGRAPH_END)))
+        tiers.append(sentences)
+    tiers.append(_boundary_positions(text, _WHITESPACE))
+
+    start = _WHITESPACE.match(text).end() if text[0].isspace() else 0
+    min_length = config.size // 2
+
+    while start < n:
+        limit = start + config.size
+        if limit >= n:
+            end = n
+        else:
+            end = limit
+            for positions in tiers:
+                found = _pick(positions, start + min_length, limit, last=True)
+                if found is not None:
+                    end = found
+                    break
+
+        # Końcowe białe znaki nie należą do fragmentu
+        stop = end
+        while stop > start and text[stop - 1].isspace():
+            stop -= 1
+        if stop > start:
+            yield start, stop
+
+        if end >= n:
+            return
+
+        next_start = end
+        if config.overlap:
+            for positions in tiers:
+                found = _pick(positions, end - config.overlap - 1, end - 1, last=False)
+                if found is not None:
+                    next_start = found
+                    break
+        start = max(next_start, start + 1)
+
+
+def chunk_offsets(text: str, config: ChunkingConfig = ChunkingConfig()) -> Offsets:
+    return list(iter_chunk_offsets(text, config))
+
+
+def _offsets_batch(texts: List[str], config: ChunkingConfig) -> List[Offsets]:
+    """Funkcja wykonywana w procesie roboczym: partia tekstów → listy przesunięć."""
+    return [chunk_offsets(t, config) for t in texts]
+
+
+def _apply(product: ScientificProductSchema, offsets: Offsets, materialize: bool) -> ScientificProductSchema:
+    product.chunk_offsets = offsets
+    if materialize:
+        product.chunks = list(product.iter_chunks())
+    return product
+
+
+def chunk_products(
+    products: Iterable[ScientificProductSchema],
+    config: ChunkingConfig = ChunkingConfig(),
+    materialize: bool = False,
+) -> Iterator[ScientificProductSchema]:
+    """
+    Generator: uzupełnia `chunk_offsets` kolejnych produktów (w bieżącym procesie).
+
+    Produkty bez `raw_content` przechodzą bez zmian. `materialize=True` dodatkowo
+    wypełnia `chunks` tekstami fragmentów (kopie – tylko gdy odbiorca ich wymaga).
+    """
+    for product in products:
+        if product.raw_content:
+            _apply(product, chunk_offsets(product.raw_content, config), materialize)
+        yield product
+
+
+def chunk_products_parallel(
+    products: Iterable[ScientificProductSchema],
+    config: ChunkingConfig = ChunkingConfig(),
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    materialize: bool = False,
+) -> Iterator[ScientificProductSchema]:
+    """
+    Jak `chunk_products`, ale partie po `batch_size` produktów trafiają do puli
+    procesów. Kolejność wyjścia odpowiada wejściu, a w locie jest co najwyżej
+    2 × liczba procesów partii, więc wejście może być dowolnie długim strumieniem.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Tuple[List[ScientificProductSchema], Future]] = deque()
+
+        def submit(batch: List[ScientificProductSchema]) -> None:
+            texts = [p.raw_content or "" for p in batch]
+            pending.append((batch, pool.submit(_offsets_batch, texts, config)))
+
+        def drain_one() -> Iterator[ScientificProductSchema]:
+            batch, future = pending.popleft()
+            for product, offsets in zip(batch, future.result()):
+                if product.raw_content:
+                    _apply(product, offsets, materialize)
+                yield product
+
+        batch: List[ScientificProductSchema] = []
+        for product in products:
+            batch.append(product)
+            if len(batch) >= batch_size:
+                submit(batch)
+                batch = []
+                if len(pending) >= max_in_flight:
+                    yield from drain_one()
+        if batch:
+            submit(batch)
+
+        while pending:
+            yield from drain_one()
@@ -0,0 +1,267 @@
+# app/pipeline/dedup.py
+"""
+Deduplikacja impactów w ramach ingestu.
+
+Ingest po instytucjach (ingest_radon_impacts) i po kindCode
+(ingest_radon_impacts_all) zwracają w dużej części te same impacty. Każdy
+rekord dostaje klucz: 64-bitowy skrót (blake2b) z `impact_uuid` i treści
+surowego rekordu RAD-on. Rekord o kluczu już widzianym w bieżącym przebiegu
+jest odrzucany przed klasyfikacją i zapisem. Ten sam impact ze zmienioną
+treścią ma inny klucz, więc jest przetwarzany ponownie.
+
+Zbiór widzianych kluczy:
+- `SeenSet` – dokładny zbiór (domyślnie),
+- `BloomFilter` – dla bardzo dużych przebiegów: stała pamięć, ale z
+  prawdopodobieństwem `error_rate` unikalny rekord zostanie uznany za
+  duplikat i pominięty.
+
+Klucz trafia do stanu dopiero po udanym zapisie rekordu: `candidate` tylko
+sprawdza rekord i odkłada klucz do zbioru oczekujących, a `commit` utrwala
+oczekujące klucze po save_one / save_many. Rekord odrzucony przy zapisie
+nie jest więc traktowany jako przetworzony w kolejnych przebiegach.
+
+Stan można zapisać (`.npz`) i wczytać w kolejnym skrypcie, np. ingest po
+instytucjach, a potem po kindCode z tym samym --dedup-state – wtedy wspólne
+impacty są przetwarzane tylko raz w całej serii.
+
+Użycie:
+    dedup = IngestDeduplicator()
+    pending: Set[int] = set()
+    page = [impact for impact in impacts if dedup.candidate(impact, pending)]
+    await repo.save_many(page)
+    dedup.commit(pending)
+    logger.info("duplikaty: %d", dedup.duplicates)
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set, Union
+
+import numpy as np
+
+from app.models import ImpactCaseSchema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOOM_ERROR_RATE = 1e-6
+
+
+def content_key(impact: ImpactCaseSchema) -> int:
+    """
+    Klucz rekordu: skrót `impact_uuid` i treści surowego rekordu (albo modelu,
+    gdy `raw` jest pusty) jako liczba 64-bitowa bez znaku. Rekord bez
+    `impact_uuid` jest kluczowany samą treścią – zapis i tak go pominie.
+    """
+    if impact.raw:
+        content = json.dumps(impact.raw, sort_keys=True, ensure_ascii=False, default=str)
+    else:
+        content = impact.model_dump_json(exclude={"raw"})
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update((impact.impact_uuid or "").encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(content.encode("utf-8"))
+    return int.from_bytes(digest.digest(), "little")
+
+
+class SeenSet:
+    """Dokładny zbiór kluczy."""
+
+    kind = "set"
+
+    def __init__(self) -> None:
+        self._keys: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: int) -> bool:
+        return key in self._keys
+
+    def add(self, key: int) -> bool:
+        """Dodaje klucz; False – jeśli już był."""
+        if key in self._keys:
+            return False
+        self._keys.add(key)
+        return True
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"keys": np.fromiter(self._keys, dtype=np.uint64, count=len(self._keys))}
+
+    @classmethod
+    def from_arrays(cls, data: Dict[str, np.ndarray]) -> "SeenSet":
+        seen = cls()
+        seen._keys = set(int(k) for k in data["keys"])
+        return seen
+
+
+class BloomFilter:
+    """
+    Filtr Blooma nad 64-bitowymi kluczami. Rozmiar z `capacity` i `error_rate`;
+    pozycje bitów metodą podwójnego haszowania (h1 + i·h2) z dwóch połówek
+    ponownie wymieszanego klucza.
+    """
+
+    kind = "bloom"
+
+    def __init__(self, capacity: int, error_rate: float = DEFAULT_BLOOM_ERROR_RATE) -> None:
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("BloomFilter: capacity > 0 i 0 < error_rate < 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _positions(self, key: int) -> Iterator[int]:
+        digest = hashlib.blake2b(key.to_bytes(8, "little"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return ((h1 + i * h2) % m for i in range(self.num_hashes))
+
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def add(self, key: int) -> bool:
+        """Dodaje klucz; False – jeśli (prawdopodobnie) już był."""
+        new = False
+        bits = self.bits
+        for position in self._positions(key):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self.count += 1
+            if self.count == self.capacity + 1:
+                logger.warning(
+                    "Filtr Blooma przekroczył pojemność %d – rośnie odsetek fałszywych duplikatów",
+                    self.capacity,
+                )
+        return new
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "bits": np.frombuffer(bytes(self.bits), dtype=np.uint8),
+            "params": np.array([self.capacity, self.count], dtype=np.int64),
+            "error_rate": np.array(self.error_rate),
+        }
+
+    @classmethod
+    def from_arrays(cls, data: Dict[str, np.ndarray]) -> "BloomFilter":
+        capacity, count = (int(v) for v in data["params"])
+        bloom = cls(capacity, float(data["error_rate"]))
+        bloom.bits = bytearray(data["bits"].tobytes())
+        bloom.count = count
+        return bloom
+
+
+Seen = Union[SeenSet, BloomFilter]
+
+
+class IngestDeduplicator:
+    """Odrzuca impacty już przetworzone w bieżącym przebiegu (lub serii z tym samym stanem)."""
+
+    def __init__(self, seen: Optional[Seen] = None) -> None:
+        self.seen: Seen = seen if seen is not None else SeenSet()
+        self.unique = 0
+        self.duplicates = 0
+
+    def add(self, impact: ImpactCaseSchema) -> bool:
+        """True – rekord nowy (do przetworzenia); False – duplikat. Klucz trafia do stanu od razu."""
+        if self.seen.add(content_key(impact)):
+            self.unique += 1
+            return True
+        self.duplicates += 1
+        return False
+
+    def candidate(self, impact: ImpactCaseSchema, pending: Set[int]) -> bool:
+        """
+        Jak `add`, ale bez zmiany stanu: klucz nowego rekordu trafia do `pending`
+        (duplikaty wewnątrz `pending` też są odrzucane), a do stanu – przez
+        `commit(pending)` po udanym zapisie.
+        """
+        key = content_key(impact)
+        if key in pending or key in self.seen:
+            self.duplicates += 1
+            return False
+        pending.add(key)
+        return True
+
+    def commit(self, keys: Iterable[int]) -> None:
+        """Utrwala klucze rekordów zapisanych w repozytorium."""
+        for key in keys:
+            if self.seen.add(key):
+                self.unique += 1
+
+    def save(self, path: Union[Path, str]) -> None:
+        """Zapis atomowy stanu do `.npz` (bez pickle)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, kind=np.array(self.seen.kind), **self.seen.to_arrays())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[Path, str]) -> "IngestDeduplicator":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        kind = str(arrays.pop("kind"))
+        seen: Seen = BloomFilter.from_arrays(arrays) if kind == BloomFilter.kind else SeenSet.from_arrays(arrays)
+        return cls(seen)
+
+
+def add_dedup_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólne opcje CLI skryptów ingestu impactów."""
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Nie pomijaj impactów już przetworzonych w tym przebiegu.",
+    )
+    parser.add_argument(
+        "--dedup-state",
+        type=str,
+        default=None,
+        help="Plik .npz ze stanem deduplikacji – wczytywany (o ile istnieje) i zapisywany po ingeście; "
+             "wspólny dla serii skryptów ingestu.",
+    )
+    parser.add_argument(
+        "--bloom-capacity",
+        type=int,
+        default=None,
+        help="Filtr Blooma na tyle rekordów zamiast dokładnego zbioru (bardzo duże przebiegi).",
+    )
+
+
+def deduplicator_from_args(args: argparse.Namespace) -> Optional[IngestDeduplicator]:
+    if args.no_dedup:
+        return None
+    if args.dedup_state and Path(args.dedup_state).is_file():
+        dedup = IngestDeduplicator.load(args.dedup_state)
+        logger.info("Wczytano stan deduplikacji %s (%d kluczy)", args.dedup_state, len(dedup.seen))
+        return dedup
+    if args.bloom_capacity:
+        return IngestDeduplicator(BloomFilter(args.bloom_capacity))
+    return IngestDeduplicator()
+
+
+def finish_dedup(dedup: Optional[IngestDeduplicator], args: argparse.Namespace) -> None:
+    """Raportuje liczby unikalnych rekordów i duplikatów, zapisuje stan (--dedup-state)."""
+    if dedup is None:
+        return
+    logger.info("Deduplikacja: unikalne %d, pominięte duplikaty %d", dedup.unique, dedup.duplicates)
+    if args.dedup_state:
+        dedup.save(args.dedup_state)
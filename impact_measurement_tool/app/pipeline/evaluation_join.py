@@ -0,0 +1,211 @@
+# app/pipeline/evaluation_join.py
+"""
+Denormalizacja kategorii ewaluacyjnych na impacty.
+
+Kategoria dyscypliny (DisciplineEvaluationSchema.category) jest kopiowana do
+pól `evaluation_period` / `evaluation_category` każdego impactu o tej samej
+instytucji i dyscyplinie, więc pytanie „impacty z dyscyplin A+ w 2017-2021”
+jest zwykłym filtrem po indeksowanych polach repozytorium – bez `$lookup`
+ani łączenia w Pythonie przy każdym zapytaniu.
+
+Okres ewaluacji dla impactu: ten, który obejmuje `evaluation_year`, a gdy
+takiego nie ma – ostatni zakończony przed tym rokiem (impacty są zgłaszane
+po zakończeniu okresu). Bez roku – najnowszy okres.
+
+Odświeżanie jest przyrostowe: można je zawęzić do instytucji, których
+ewaluacje się zmieniły, a zapisywane są tylko impacty ze zmienionymi polami.
+Po ingeście impactów `refresh_categories_after_ingest` uzupełnia kategorie
+zapisanych instytucji z magazynu ewaluacji, więc nowe impacty nie czekają na
+kolejne uruchomienie join_evaluations.
+
+Użycie:
+    index = EvaluationCategoryIndex(evaluations)
+    counts = await refresh_evaluation_categories(repo, index, institution_uuids=["..."])
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import logging
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pymongo.errors import PyMongoError
+
+from app.models import ImpactCaseSchema, InstitutionEvaluationSchema
+from app.repositories.base import BaseEvaluationRepository, BaseImpactRepository
+from app.repositories.factory import get_evaluation_repository
+
+logger = logging.getLogger(__name__)
+
+# (okres, kategoria) – wartości pól evaluation_period / evaluation_category
+EvaluationLabel = Tuple[Optional[str], Optional[str]]
+
+_NO_LABEL: EvaluationLabel = (None, None)
+
+# Liczba instytucji w jednym zapytaniu `$in` o ich ewaluacje
+EVALUATION_QUERY_CHUNK = 500
+
+
+class EvaluationCategoryIndex:
+    """
+    Słownik (institution_uuid, discipline_code) → okresy ewaluacji z kategorią,
+    posortowane po końcu okresu (wyszukiwanie okresu przez `bisect`).
+    """
+
+    def __init__(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> None:
+        periods: Dict[Tuple[str, str], Dict[str, Tuple[int, int, str]]] = defaultdict(dict)
+        self.institutions: Set[str] = set()
+
+        for evaluation in evaluations:
+            if evaluation.period_start is None or evaluation.period_end is None:
+                logger.debug(
+                    "Pominięto ewaluację z nieczytelnym okresem %r (%s)",
+                    evaluation.evaluation_period,
+                    evaluation.institution_uuid,
+                )
+                continue
+            self.institutions.add(evaluation.institution_uuid)
+            for discipline in evaluation.disciplines:
+                if discipline.discipline_code and discipline.category:
+                    # Ten sam okres w kilku rekordach – wygrywa ostatni
+                    periods[(evaluation.institution_uuid, discipline.discipline_code)][evaluation.evaluation_period] = (
+                        evaluation.period_start,
+                        evaluation.period_end,
+                        discipline.category,
+                    )
+
+        self._ends: Dict[Tuple[str, str], List[int]] = {}
+        self._entries: Dict[Tuple[str, str], List[Tuple[int, int, str, str]]] = {}
+        for key, by_period in periods.items():
+            entries = sorted((end, start, period, category) for period, (start, end, category) in by_period.items())
+            self._entries[key] = entries
+            self._ends[key] = [entry[0] for entry in entries]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self,
+        institution_uuid: Optional[str],
+        discipline_code: Optional[str],
+        evaluation_year: Optional[int] = None,
+    ) -> EvaluationLabel:
+        """(okres, kategoria) dla dyscypliny w instytucji albo (None, None)."""
+        key = (institution_uuid or "", discipline_code or "")
+        entries = self._entries.get(key)
+        if not entries:
+            return _NO_LABEL
+
+        if evaluation_year is None:
+            _, _, period, category = entries[-1]
+            return period, category
+
+        # Pierwszy okres kończący się w roku impactu lub później – jeśli go obejmuje
+        position = bisect.bisect_left(self._ends[key], evaluation_year)
+        if position < len(entries) and entries[position][1] <= evaluation_year:
+            _, _, period, category = entries[position]
+            return period, category
+        # W przeciwnym razie ostatni okres zakończony przed rokiem impactu
+        if position > 0:
+            _, _, period, category = entries[position - 1]
+            return period, category
+        return _NO_LABEL
+
+    def annotate(self, impact: ImpactCaseSchema) -> bool:
+        """Ustawia evaluation_period / evaluation_category (w miejscu); True, jeśli się zmieniły."""
+        period, category = self.lookup(impact.institution_uuid, impact.discipline_code, impact.evaluation_year)
+        if impact.evaluation_period == period and impact.evaluation_category == category:
+            return False
+        impact.evaluation_period = period
+        impact.evaluation_category = category
+        return True
+
+
+async def refresh_evaluation_categories(
+    repo: BaseImpactRepository,
+    index: EvaluationCategoryIndex,
+    institution_uuids: Optional[Sequence[str]] = None,
+    batch_size: int = 500,
+) -> Dict[str, int]:
+    """
+    Przelicza zdenormalizowane kategorie impactów (wszystkich albo wskazanych
+    instytucji) i zapisuje partiami tylko te impacty, których pola się zmieniły.
+
+    Zwraca liczniki: read, changed.
+    """
+    counts = {"read": 0, "changed": 0}
+    batch: List[ImpactCaseSchema] = []
+
+    queries = [{"institution_uuid": uuid} for uuid in institution_uuids] if institution_uuids is not None else [{}]
+    for query in queries:
+        async for impact in repo.iter_impacts(query=query, batch_size=batch_size):
+            counts["read"] += 1
+            if index.annotate(impact):
+                batch.append(impact)
+                if len(batch) >= batch_size:
+                    await repo.save_many(batch)
+                    counts["changed"] += len(batch)
+                    batch = []
+
+    if batch:
+        await repo.save_many(batch)
+        counts["changed"] += len(batch)
+
+    return counts
+
+
+async def load_category_index(
+    store: BaseEvaluationRepository,
+    institution_uuids: Sequence[str],
+    chunk_size: int = EVALUATION_QUERY_CHUNK,
+) -> EvaluationCategoryIndex:
+    """Indeks kategorii z ewaluacji wskazanych instytucji (zapytania `$in` porcjami)."""
+    uuids = list(dict.fromkeys(institution_uuids))
+    evaluations: List[InstitutionEvaluationSchema] = []
+    for start in range(0, len(uuids), chunk_size):
+        query = {"institution_uuid": {"$in": uuids[start : start + chunk_size]}}
+        evaluations.extend([evaluation async for evaluation in store.iter_evaluations(query)])
+    return EvaluationCategoryIndex(evaluations)
+
+
+def add_category_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólna opcja CLI skryptów zapisujących impacty."""
+    parser.add_argument(
+        "--no-categories",
+        action="store_true",
+        help="Nie uzupełniaj kategorii ewaluacyjnych zapisanych impactów z magazynu ewaluacji.",
+    )
+
+
+async def refresh_categories_after_ingest(
+    repo: BaseImpactRepository,
+    institution_uuids: Sequence[str],
+    store: Optional[BaseEvaluationRepository] = None,
+) -> None:
+    """
+    Uzupełnia evaluation_period / evaluation_category impactów instytucji
+    zapisanych przez ingest z ewaluacji w `store` (domyślnie magazyn backendu
+    z ustawień). Instytucje bez zapisanych ewaluacji są pomijane – ich impacty
+    zachowują dotychczasowe kategorie (np. z importowanego zrzutu). Błąd bazy
+    nie przerywa skryptu – kategorie można przeliczyć skryptem join_evaluations.
+    """
+    store = store if store is not None else get_evaluation_repository()
+    try:
+        index = await load_category_index(store, institution_uuids)
+        institutions = [uuid for uuid in dict.fromkeys(institution_uuids) if uuid in index.institutions]
+        if not institutions:
+            logger.info("Brak zapisanych ewaluacji instytucji z ingestu – kategorie impactów bez zmian")
+            return
+        counts = await refresh_evaluation_categories(repo, index, institution_uuids=institutions)
+    except (PyMongoError, sqlite3.Error) as e:
+        logger.error("Nie udało się uzupełnić kategorii ewaluacyjnych impactów: %s", e)
+        return
+    logger.info(
+        "Kategorie ewaluacyjne impactów %d instytucji: przeliczone %d, zmienione %d",
+        len(institutions),
+        counts["read"],
+        counts["changed"],
+    )
@@ -0,0 +1,174 @@
+# app/pipeline/identifiers.py
+"""
+Ekstrakcja identyfikatorów (DOI, ISBN, ISSN) z opisów bibliograficznych
+osiągnięć impactu (AchievementItem.bibliographic_description_pl/en).
+
+Wszystkie rodzaje identyfikatorów są w JEDNYM skompilowanym wyrażeniu
+regularnym z grupami nazwanymi, więc każdy opis jest skanowany raz.
+Wartości są normalizowane – DOI małymi literami, bez prefiksu resolvera
+i końcowej interpunkcji; ISBN jako ISBN-13 bez myślników (ISBN-10 jest
+przeliczany); ISSN jako NNNN-NNNC – a ISBN/ISSN z błędną cyfrą kontrolną
+są odrzucane.
+
+Wynik trafia do `identifiers` (IdentifierSchema) i `identifier_keys`
+('doi:10.1000/xyz') – to drugie pole jest indeksowane w każdym backendzie
+(MULTI_VALUE_FIELDS), więc „które impacty cytują DOI X” to wyszukiwanie
+w indeksie: `GET /impacts?identifier=10.1000/xyz`.
+
+Użycie:
+    changed = tag_identifiers(impact)        # uzupełnia identifiers i identifier_keys
+    key = identifier_key_for_query("https://doi.org/10.1000/XYZ")   # 'doi:10.1000/xyz'
+"""
+
+from __future__ import annotations
+
+# Biblioteka standardowa zamiast `regex` – jak w app/pipeline/beneficiaries.py:
+# wzorzec nie korzysta z cech `regex`, a `re` jest na tej ścieżce ingestu szybszy
+import re
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+from app.models import IdentifierSchema, IdentifierType, ImpactCaseSchema
+
+# Znaki DOI wg wzorca zalecanego przez Crossref (obejmuje zdecydowaną większość DOI)
+_IDENTIFIER_PATTERN = re.compile(
+    r"""
+    (?P<doi>\b10\.\d{4,9}/[-._;()/:A-Z0-9]+)
+    | \bISBN(?:-1[03])?:?\s*(?P<isbn>(?:97[89][\s-]?)?\d{1,5}[\s-]?\d{1,7}[\s-]?\d{1,7}[\s-]?[\dX])\b
+    | \bISSN:?\s*(?P<issn>\d{4}-?\d{3}[\dX])\b
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_DOI_PATTERN = re.compile(r"10\.\d{4,9}/[-._;()/:A-Z0-9]+", re.IGNORECASE)
+
+# Prefiks rodzaju w identyfikatorze podanym przez użytkownika ('ISBN-10: ...', 'doi:...')
+_QUERY_PREFIX = re.compile(r"^(?P<kind>doi|isbn|issn)(?:-1[03])?\s*:?\s*", re.IGNORECASE)
+
+# Znaki zamykające zdanie/cytowanie, które wzorzec DOI łapie na końcu
+_DOI_TRAILING = ".,;:"
+
+
+def normalize_doi(value: str) -> Optional[str]:
+    """
+    DOI w postaci kanonicznej: małe litery, bez 'https://doi.org/' / 'doi:',
+    bez końcowej interpunkcji i niesparowanego nawiasu. None – gdy to nie DOI.
+    """
+    doi = unquote(value.strip())
+    match = _DOI_PATTERN.search(doi)
+    if not match:
+        return None
+    doi = match.group(0)
+    while doi and doi[-1] in _DOI_TRAILING + ")":
+        if doi[-1] == ")" and doi.count("(") >= doi.count(")"):
+            break
+        doi = doi[:-1]
+    return doi.lower() if "/" in doi and not doi.endswith("/") else None
+
+
+def _isbn13_check(digits: str) -> str:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits[:12]))
+    return str((10 - total % 10) % 10)
+
+
+def normalize_isbn(value: str) -> Optional[str]:
+    """ISBN-13 bez myślników (ISBN-10 przeliczony); None – przy błędnej cyfrze kontrolnej."""
+    chars = re.sub(r"[\s-]", "", value).upper()
+    if len(chars) == 10 and chars[:9].isdigit():
+        total = sum(int(d) * (10 - i) for i, d in enumerate(chars[:9]))
+        check = (11 - total % 11) % 11
+        if chars[9] != ("X" if check == 10 else str(check)):
+            return None
+        digits = "978" + chars[:9]
+        return digits + _isbn13_check(digits)
+    if len(chars) == 13 and chars.isdigit() and chars[:3] in ("978", "979"):
+        return chars if chars[12] == _isbn13_check(chars) else None
+    return None
+
+
+def normalize_issn(value: str) -> Optional[str]:
+    """ISSN w postaci NNNN-NNNC; None – przy błędnej cyfrze kontrolnej."""
+    chars = value.replace("-", "").upper()
+    if len(chars) != 8 or not chars[:7].isdigit():
+        return None
+    check = (11 - sum(int(d) * (8 - i) for i, d in enumerate(chars[:7])) % 11) % 11
+    if chars[7] != ("X" if check == 10 else str(check)):
+        return None
+    return f"{chars[:4]}-{chars[4:]}"
+
+
+def identifier_key(identifier: IdentifierSchema) -> str:
+    """Klucz do indeksu `identifier_keys`: 'typ:wartość'."""
+    return f"{identifier.type.value}:{identifier.value}"
+
+
+def extract_identifiers(text: Optional[str]) -> List[IdentifierSchema]:
+    """Znormalizowane identyfikatory z tekstu, bez powtórzeń, w kolejności wystąpienia."""
+    if not text:
+        return []
+
+    found: Dict[Tuple[IdentifierType, str], IdentifierSchema] = {}
+    for match in _IDENTIFIER_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "doi":
+            value, identifier_type = normalize_doi(match.group("doi")), IdentifierType.DOI
+        elif kind == "isbn":
+            value, identifier_type = normalize_isbn(match.group("isbn")), IdentifierType.ISBN
+        else:
+            value, identifier_type = normalize_issn(match.group("issn")), IdentifierType.ISSN
+        if value:
+            found.setdefault((identifier_type, value), IdentifierSchema(type=identifier_type, value=value))
+    return list(found.values())
+
+
+def impact_identifiers(impact: ImpactCaseSchema) -> List[IdentifierSchema]:
+    """Identyfikatory ze wszystkich opisów bibliograficznych osiągnięć impactu."""
+    found: Dict[str, IdentifierSchema] = {}
+    for achievement in impact.achievements:
+        for text in (achievement.bibliographic_description_pl, achievement.bibliographic_description_en):
+            for identifier in extract_identifiers(text):
+                found.setdefault(identifier_key(identifier), identifier)
+    return list(found.values())
+
+
+def tag_identifiers(impact: ImpactCaseSchema) -> bool:
+    """
+    Uzupełnia `identifiers` i `identifier_keys` (w miejscu).
+
+    Zwraca True, jeśli wartości się zmieniły (backfill zapisuje tylko takie impacty).
+    """
+    identifiers = impact_identifiers(impact)
+    keys = [identifier_key(i) for i in identifiers]
+    if keys == impact.identifier_keys and impact.identifiers == identifiers:
+        return False
+    impact.identifiers = identifiers
+    impact.identifier_keys = keys
+    return True
+
+
+def identifier_key_for_query(text: str) -> Optional[str]:
+    """
+    Klucz `identifier_keys` dla identyfikatora podanego przez użytkownika:
+    DOI (także jako URL doi.org albo 'doi:...'), 'ISBN ...', 'ISSN ...' albo
+    gołe ISBN/ISSN. None – gdy tekstu nie da się rozpoznać.
+    """
+    text = text.strip()
+    kind = None
+    prefix = _QUERY_PREFIX.match(text)
+    if prefix and not text.lower().startswith("doi.org"):
+        kind = prefix.group("kind").lower()
+        text = text[prefix.end():]
+
+    if kind in (None, "doi"):
+        doi = normalize_doi(text)
+        if doi:
+            return f"{IdentifierType.DOI.value}:{doi}"
+    if kind in (None, "isbn"):
+        isbn = normalize_isbn(text)
+        if isbn:
+            return f"{IdentifierType.ISBN.value}:{isbn}"
+    if kind in (None, "issn"):
+        issn = normalize_issn(text)
+        if issn:
+            return f"{IdentifierType.ISSN.value}:{issn}"
+    return None
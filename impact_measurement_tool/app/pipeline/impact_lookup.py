@@ -0,0 +1,151 @@
+# app/pipeline/impact_lookup.py
+"""
+Rozwiązywanie impactów po identyfikatorze – najpierw lokalnie, potem w RAD-on.
+
+Kolejność dla impactUuid:
+1. pamięć wyników (LRU) – impacty rozwiązane wcześniej przez ten obiekt,
+2. repozytorium impactów (`get_by_impact_uuid`, indeks po impact_uuid),
+3. RadonConnector.fetch_impact_records – pamięć podręczna odpowiedzi,
+   a dopiero potem celowane zapytania po instytucji; wszystkie brakujące
+   identyfikatory z jednego wywołania są pobierane razem. Impacty bez
+   znanej instytucji (brak lokalnego rekordu) są szukane przeglądem całego
+   kindCode tylko z `allow_sweep=True` – domyślnie zwracane jako brakujące.
+
+Z `refresh` kroki 1–2 są pomijane jako źródło wyniku, ale lokalny rekord
+podpowiada instytucję, więc odświeżenie pojedynczego impactu to kilka
+zapytań o impacty jednej instytucji, a nie przegląd całego kindCode.
+
+DOI / ISBN / ISSN są rozwiązywane wyłącznie lokalnie – przez indeks
+`identifier_keys` (app/pipeline/identifiers.py); RAD-on po nich nie szuka.
+
+Użycie:
+    lookup = ImpactLookup(repo, RadonConnector())
+    impacts = await lookup.get_many(["uuid1", "uuid2"])
+    fresh = await lookup.get("uuid1", refresh=True)
+    citing = await lookup.search_by_id(IdentifierSchema(type=IdentifierType.DOI, value="10.1000/xyz"))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from app.connectors.radon import DEFAULT_CACHE_SIZE, IMPACT_ID_TYPES, ImpactId, RadonConnector, impact_uuid_of
+from app.models import IdentifierSchema, IdentifierType, ImpactCaseSchema
+from app.pipeline.identifiers import identifier_key_for_query
+from app.repositories.base import BaseImpactRepository
+
+logger = logging.getLogger(__name__)
+
+# Identyfikatory rozwiązywane przez indeks identifier_keys
+INDEXED_ID_TYPES = (IdentifierType.DOI, IdentifierType.ISBN, IdentifierType.ISSN)
+
+
+class ImpactLookup:
+    """
+    Impacty po impactUuid (lokalnie, potem RAD-on) i po DOI/ISBN/ISSN (lokalnie).
+
+    `stats` zlicza, skąd pochodziły wyniki: memo, local, remote, missing.
+    Bez `connector` brakujące lokalnie impacty nie są szukane w RAD-on.
+    """
+
+    def __init__(
+        self,
+        repo: BaseImpactRepository,
+        connector: Optional[RadonConnector] = None,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        allow_sweep: bool = False,
+    ) -> None:
+        self.repo = repo
+        self.connector = connector
+        self.cache_size = cache_size
+        self.allow_sweep = allow_sweep
+        self.stats: Counter = Counter()
+        self._memo: "OrderedDict[str, ImpactCaseSchema]" = OrderedDict()
+
+    def _remember(self, impact: ImpactCaseSchema) -> None:
+        if not impact.impact_uuid or self.cache_size <= 0:
+            return
+        self._memo[impact.impact_uuid] = impact
+        self._memo.move_to_end(impact.impact_uuid)
+        while len(self._memo) > self.cache_size:
+            self._memo.popitem(last=False)
+
+    def forget(self, impact_uuid: str) -> None:
+        self._memo.pop(impact_uuid, None)
+
+    async def get_many(
+        self,
+        impact_uuids: Iterable[str],
+        refresh: bool = False,
+        sources: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, ImpactCaseSchema]:
+        """
+        {impactUuid: impact} dla znalezionych identyfikatorów. W `sources`
+        trafia źródło każdego wyniku (memo, local, remote) – np. żeby zapisać
+        w repozytorium tylko impacty pobrane z RAD-on.
+        """
+        sources = sources if sources is not None else {}
+        wanted = list(dict.fromkeys(u.strip() for u in impact_uuids if u and u.strip()))
+        found: Dict[str, ImpactCaseSchema] = {}
+        hints: Dict[str, Optional[str]] = {}
+
+        for uuid in wanted:
+            if not refresh and uuid in self._memo:
+                self._memo.move_to_end(uuid)
+                found[uuid] = self._memo[uuid]
+                sources[uuid] = "memo"
+                self.stats["memo"] += 1
+                continue
+
+            impact = await self.repo.get_by_impact_uuid(uuid)
+            if impact is None:
+                continue
+            if refresh:
+                hints[uuid] = impact.institution_uuid
+            else:
+                found[uuid] = impact
+                sources[uuid] = "local"
+                self._remember(impact)
+                self.stats["local"] += 1
+
+        remaining = [uuid for uuid in wanted if uuid not in found]
+        if remaining and self.connector is not None:
+            records = await asyncio.to_thread(
+                self.connector.fetch_impact_records,
+                remaining,
+                institution_uuids=hints,
+                allow_sweep=self.allow_sweep,
+                refresh=refresh,
+            )
+            for impact in ImpactCaseSchema.from_radon_records(records.values()):
+                if impact.impact_uuid in records:
+                    found[impact.impact_uuid] = impact
+                    sources[impact.impact_uuid] = "remote"
+                    self._remember(impact)
+                    self.stats["remote"] += 1
+
+        self.stats["missing"] += sum(1 for uuid in wanted if uuid not in found)
+        return {uuid: found[uuid] for uuid in wanted if uuid in found}
+
+    async def get(self, impact_uuid: str, refresh: bool = False) -> Optional[ImpactCaseSchema]:
+        return (await self.get_many([impact_uuid], refresh=refresh)).get(impact_uuid)
+
+    async def search_by_id(self, identifier: ImpactId, refresh: bool = False) -> List[ImpactCaseSchema]:
+        """
+        Impacty o identyfikatorze: impactUuid (napis albo IdentifierSchema typu
+        INTERNAL/OTHER) – jeden impact; DOI/ISBN/ISSN – wszystkie impacty, które
+        go cytują (z repozytorium).
+        """
+        if isinstance(identifier, IdentifierSchema) and identifier.type not in IMPACT_ID_TYPES:
+            if identifier.type not in INDEXED_ID_TYPES:
+                raise ValueError(f"Wyszukiwanie impactów po identyfikatorze typu {identifier.type.value!r} nie jest obsługiwane.")
+            key = identifier_key_for_query(f"{identifier.type.value}:{identifier.value}")
+            if key is None:
+                return []
+            return [impact async for impact in self.repo.iter_impacts(query={"identifier_keys": key})]
+
+        impact = await self.get(impact_uuid_of(identifier), refresh=refresh)
+        return [impact] if impact is not None else []
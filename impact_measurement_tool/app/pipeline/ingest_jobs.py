@@ -0,0 +1,343 @@
+# app/pipeline/ingest_jobs.py
+"""
+Zadania ingestu impactów uruchamiane w tle (przez API – app/api/jobs.py)
+zamiast skryptów z app/scripts uruchamianych z crona.
+
+Rodzaje zadań (IngestJobRequest.kind):
+- kind_code – wszystkie impacty jednego kindCode,
+- institutions – impacty wskazanych instytucji (odświeżenie celowane),
+- incremental – przegląd kindCode, ale zapisywane są tylko rekordy, których
+  treść zmieniła się od poprzedniej synchronizacji. RAD-on nie filtruje po
+  dacie zmiany, więc strony i tak są pobierane; oszczędzane są klasyfikacja
+  i zapisy. Stan (klucze rekordów, app/pipeline/dedup.py) jest w
+  IMETO_INGEST_STATE_DIR i zapisuje go też pełne zadanie kind_code.
+
+Zadania działają jako asyncio.Task w pętli zdarzeń aplikacji. Strony RAD-on
+są pobierane w wątku (asyncio.to_thread), więc API odpowiada w trakcie
+ingestu, a impacty z każdej strony są zapisywane jednym save_many.
+Semafor (IMETO_INGEST_MAX_JOBS, domyślnie 1) ogranicza liczbę zadań
+działających naraz – pozostałe czekają jako `pending` – a dwa niezakończone
+zadania o tym samym celu (kindCode / zbiór instytucji) są odrzucane.
+
+Po ingeście (refresh_categories) impacty zapisanych instytucji dostają
+kategorie ewaluacyjne z magazynu z `evaluation_store_factory`, a potem
+(refresh_summaries) przeliczane są liczniki indeksu instytucji i podsumowania
+instytucji – w magazynie z `summary_store_factory`. Oba magazyny są domyślnie
+na tym samym backendzie co impacty (factory.get_*_repository).
+
+Postęp (strony, rekordy, rekordy/s, błędy) jest aktualizowany po każdej
+stronie. Anulowanie przerywa zadanie od razu (w trakcie pobierania albo
+zapisu strony); zapisane już impacty zostają. Wątek pobierający stronę
+dostaje sygnał `cancel` i nie ponawia już zapytań – kończy się najpóźniej
+po zapytaniu HTTP w toku (timeout connectora). Zadania i ich historia są
+w pamięci procesu – API powinno działać w jednym procesie (jeden worker
+uvicorn).
+
+Użycie:
+    manager = IngestJobManager()
+    job = manager.submit(IngestJobRequest(kind=IngestJobKind.INSTITUTIONS, institution_uuids=["..."]))
+    manager.get(job.job_id).progress
+    await manager.cancel(job.job_id)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from pydantic import ValidationError
+
+from app.analytics.institutions import InstitutionIndex, refresh_impact_counts, update_index_file
+from app.connectors.radon import RadonConnector
+from app.db.settings import storage_settings
+from app.models import ImpactCaseSchema
+from app.models.ingest_job import (
+    FINISHED_JOB_STATUSES,
+    IngestJobKind,
+    IngestJobRequest,
+    IngestJobSchema,
+    IngestJobStatus,
+)
+from app.pipeline.beneficiaries import default_classifier
+from app.pipeline.dedup import IngestDeduplicator
+from app.pipeline.evaluation_join import refresh_categories_after_ingest
+from app.pipeline.identifiers import tag_identifiers
+from app.pipeline.institution_summaries import refresh_after_ingest
+from app.repositories.base import (
+    DERIVED_FIELDS,
+    BaseEvaluationRepository,
+    BaseImpactRepository,
+    BaseInstitutionSummaryRepository,
+)
+from app.repositories.factory import get_evaluation_repository, get_impact_repository, get_summary_repository
+
+logger = logging.getLogger(__name__)
+
+# Ile zakończonych zadań trzymamy w historii
+DEFAULT_JOB_HISTORY = 100
+
+# Jak długo cancel() czeka, aż zadanie przejdzie w stan cancelled
+CANCEL_WAIT = 5.0
+
+PageFetcher = Callable[..., Dict[str, Any]]
+
+
+class IngestJobConflictError(ValueError):
+    """Niezakończone zadanie o tym samym celu już istnieje."""
+
+
+class IngestJobManager:
+    """Kolejka i wykonanie zadań ingestu w pętli zdarzeń aplikacji."""
+
+    def __init__(
+        self,
+        repo_factory: Callable[[], BaseImpactRepository] = get_impact_repository,
+        connector_factory: Optional[Callable[[], RadonConnector]] = None,
+        summary_store_factory: Callable[[], BaseInstitutionSummaryRepository] = get_summary_repository,
+        evaluation_store_factory: Callable[[], BaseEvaluationRepository] = get_evaluation_repository,
+        max_concurrent: Optional[int] = None,
+        state_dir: Optional[str] = None,
+        history: int = DEFAULT_JOB_HISTORY,
+    ) -> None:
+        self.repo_factory = repo_factory
+        self.summary_store_factory = summary_store_factory
+        self.evaluation_store_factory = evaluation_store_factory
+        self.connector_factory = connector_factory or (lambda: RadonConnector(base_url=storage_settings.radon_base_url))
+        self.max_concurrent = max(1, max_concurrent or storage_settings.ingest_max_jobs)
+        self.state_dir = Path(state_dir or storage_settings.ingest_state_dir)
+        self.history = history
+        self.jobs: "OrderedDict[str, IngestJobSchema]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # ========= API menedżera =========
+
+    def submit(self, request: IngestJobRequest) -> IngestJobSchema:
+        """Tworzy zadanie i uruchamia je w tle (wymaga działającej pętli zdarzeń)."""
+        target = request.target()
+        for job in self.jobs.values():
+            if job.status not in FINISHED_JOB_STATUSES and job.request.target() == target:
+                raise IngestJobConflictError(f"Zadanie {job.job_id} dla {target} jeszcze działa.")
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        job = IngestJobSchema(job_id=uuid.uuid4().hex, request=request, created_at=datetime.now())
+        self.jobs[job.job_id] = job
+        self._tasks[job.job_id] = asyncio.create_task(self._run(job), name=f"ingest-{job.job_id}")
+        logger.info("Zadanie ingestu %s (%s) w kolejce", job.job_id, target)
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJobSchema]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self, status: Optional[IngestJobStatus] = None) -> List[IngestJobSchema]:
+        """Zadania od najnowszego."""
+        return [job for job in reversed(self.jobs.values()) if status is None or job.status == status]
+
+    async def cancel(self, job_id: str) -> Optional[IngestJobSchema]:
+        """Anuluje zadanie oczekujące lub działające; zakończone zwraca bez zmian."""
+        job = self.jobs.get(job_id)
+        task = self._tasks.get(job_id)
+        if job is not None and task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait([task], timeout=CANCEL_WAIT)
+        return job
+
+    async def shutdown(self) -> None:
+        """Anuluje wszystkie niezakończone zadania i czeka na ich zakończenie."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ========= Wykonanie =========
+
+    async def _run(self, job: IngestJobSchema) -> None:
+        assert self._semaphore is not None
+        try:
+            async with self._semaphore:
+                job.status = IngestJobStatus.RUNNING
+                job.started_at = datetime.now()
+                logger.info("Start zadania ingestu %s (%s)", job.job_id, job.request.target())
+                await self._ingest(job)
+            job.status = IngestJobStatus.SUCCEEDED
+        except asyncio.CancelledError:
+            job.status = IngestJobStatus.CANCELLED
+        except Exception as e:
+            logger.exception("Zadanie ingestu %s zakończone błędem", job.job_id)
+            job.status = IngestJobStatus.FAILED
+            job.error = str(e) or type(e).__name__
+        finally:
+            job.finished_at = datetime.now()
+            self._tasks.pop(job.job_id, None)
+            self._prune()
+
+        progress = job.progress
+        logger.info(
+            "Zadanie ingestu %s: %s – stron %d, rekordów %d, zapisanych %d, pominiętych %d, błędów %d",
+            job.job_id,
+            job.status.value,
+            progress.pages_fetched,
+            progress.records_fetched,
+            progress.records_saved,
+            progress.records_skipped,
+            progress.errors,
+        )
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINISHED_JOB_STATUSES]
+        for job_id in finished[: max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    def _state_path(self, kind_code: str) -> Path:
+        return self.state_dir / f"kind_code_{kind_code}.npz"
+
+    async def _ingest(self, job: IngestJobSchema) -> None:
+        request = job.request
+        connector = self.connector_factory()
+        repo = self.repo_factory()
+        await repo.ensure_indexes()
+
+        state_path = self._state_path(request.kind_code)
+        if request.kind == IngestJobKind.INCREMENTAL and state_path.is_file():
+            dedup = await asyncio.to_thread(IngestDeduplicator.load, state_path)
+        else:
+            dedup = IngestDeduplicator()
+
+        index = InstitutionIndex()
+        institution_uuids: Set[str] = set()
+        started = time.perf_counter()
+
+        if request.kind == IngestJobKind.INSTITUTIONS:
+            for institution_uuid in request.institution_uuids:
+                job.progress.current = institution_uuid
+                fetch = partial(
+                    connector.get_impact_description,
+                    institution_uuid=institution_uuid,
+                    result_numbers=request.page_size,
+                )
+                await self._ingest_pages(
+                    job, connector, fetch, repo, dedup, index, institution_uuids, started, institution_uuid
+                )
+        else:
+            job.progress.current = request.kind_code
+            fetch = partial(connector.get_impacts_page, kind_code=request.kind_code, result_numbers=request.page_size)
+            await self._ingest_pages(job, connector, fetch, repo, dedup, index, institution_uuids, started)
+            # Pełny przegląd kindCode to aktualny stan do kolejnych synchronizacji przyrostowych
+            await asyncio.to_thread(dedup.save, state_path)
+        job.progress.current = None
+
+        if request.refresh_categories and institution_uuids:
+            await refresh_categories_after_ingest(
+                repo, sorted(institution_uuids), store=self.evaluation_store_factory()
+            )
+        if request.refresh_summaries and institution_uuids:
+            await refresh_impact_counts(index, repo)
+            await asyncio.to_thread(update_index_file, storage_settings.institution_index_path, index)
+            await refresh_after_ingest(repo, sorted(institution_uuids), store=self.summary_store_factory())
+
+    @staticmethod
+    async def _fetch_page(
+        job: IngestJobSchema,
+        connector: RadonConnector,
+        fetch: PageFetcher,
+        token: str,
+    ) -> Dict[str, Any]:
+        """
+        Strona z RAD-on w wątku. Ponowienia robi connector; jego nieudane próby
+        trafiają do `errors`, a RadonAPIError po ostatniej kończy zadanie błędem.
+        Anulowanie zadania ustawia `cancel`, więc wątek nie ponawia już zapytań.
+        """
+        errors_before = connector.request_errors
+        cancel = threading.Event()
+        try:
+            return await asyncio.to_thread(fetch, token=token, cancel=cancel)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
+        finally:
+            job.progress.errors += connector.request_errors - errors_before
+
+    async def _ingest_pages(
+        self,
+        job: IngestJobSchema,
+        connector: RadonConnector,
+        fetch: PageFetcher,
+        repo: BaseImpactRepository,
+        dedup: IngestDeduplicator,
+        index: InstitutionIndex,
+        institution_uuids: Set[str],
+        started: float,
+        institution_uuid: Optional[str] = None,
+    ) -> None:
+        request = job.request
+        progress = job.progress
+        token = ""
+
+        while True:
+            raw = await self._fetch_page(job, connector, fetch, token)
+            results = raw.get("results") or []
+            if not results:
+                return
+            progress.pages_fetched += 1
+            progress.records_fetched += len(results)
+
+            impacts: List[ImpactCaseSchema] = []
+            pending: Set[int] = set()
+            for impact in self._parse_page(job, results):
+                if not dedup.candidate(impact, pending):
+                    progress.records_skipped += 1
+                    continue
+                if not impact.institution_uuid and institution_uuid:
+                    impact.institution_uuid = institution_uuid
+                if request.classify_beneficiaries:
+                    default_classifier().tag(impact)
+                if request.extract_identifiers:
+                    tag_identifiers(impact)
+                index.observe(impact.institution_uuid, impact.institution_name)
+                impacts.append(impact)
+
+            if impacts:
+                try:
+                    await repo.save_many(impacts, preserve_fields=DERIVED_FIELDS)
+                except ValueError as e:
+                    logger.warning("Zadanie %s: strona pominięta – błąd zapisu: %s", job.job_id, e)
+                    progress.errors += 1
+                else:
+                    # Klucze dopiero po zapisie – odrzucona strona wróci w kolejnej synchronizacji
+                    dedup.commit(pending)
+                    progress.records_saved += len(impacts)
+                    institution_uuids.update(i.institution_uuid for i in impacts if i.institution_uuid)
+            progress.records_per_second = round(progress.records_fetched / max(time.perf_counter() - started, 1e-9), 1)
+
+            next_token = (raw.get("pagination") or {}).get("token") or ""
+            if not next_token or next_token == token:
+                return
+            token = next_token
+
+    @staticmethod
+    def _parse_page(job: IngestJobSchema, results: List[Any]) -> List[ImpactCaseSchema]:
+        """Cała strona jednym przebiegiem walidacji; przy błędzie – rekord po rekordzie."""
+        try:
+            return ImpactCaseSchema.from_radon_records(results)
+        except ValidationError:
+            pass
+        impacts: List[ImpactCaseSchema] = []
+        for record in results:
+            if not isinstance(record, dict):
+                continue
+            try:
+                impacts.append(ImpactCaseSchema.from_radon_record(record))
+            except ValidationError as e:
+                logger.warning("Zadanie %s: rekord %s pominięty – %s", job.job_id, record.get("impactUuid"), e)
+                job.progress.errors += 1
+        return impacts
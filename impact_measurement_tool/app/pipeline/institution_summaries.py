@@ -0,0 +1,136 @@
+# app/pipeline/institution_summaries.py
+"""
+Przeliczanie podsumowań impactów instytucji (InstitutionImpactSummarySchema).
+
+Podsumowanie – liczba opisów, dyscypliny, obszary, lata i tytuły – jest
+liczone z projekcji SUMMARY_FIELDS impactów instytucji i zapisywane w
+magazynie podsumowań (`institution_summaries` – kolekcja MongoDB albo tabela
+SQLite, zależnie od backendu), więc profil instytucji w API nie wymaga
+pobierania i grupowania wszystkich jej impactów przy każdym wyświetleniu.
+
+Odświeżanie jest przyrostowe: po ingeście przeliczane są tylko instytucje,
+których impacty zostały zapisane, a zapisywane – tylko podsumowania ze
+zmienionym skrótem treści (`fingerprint`). Instytucje bez impactów tracą
+podsumowanie.
+
+Użycie:
+    counts = await refresh_institution_summaries(repo, get_summary_repository(), ["uuid1", "uuid2"])
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sqlite3
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from pymongo.errors import PyMongoError
+
+from app.models import InstitutionImpactSummarySchema
+from app.models.impact_case import SUMMARY_FIELDS
+from app.repositories.base import BaseImpactRepository, BaseInstitutionSummaryRepository
+from app.repositories.factory import get_summary_repository
+
+logger = logging.getLogger(__name__)
+
+# Liczba instytucji, których skróty są porównywane i zapisywane jedną partią
+SUMMARY_BATCH_SIZE = 100
+
+
+async def _institution_documents(
+    repo: BaseImpactRepository,
+    institution_uuids: Optional[Sequence[str]],
+) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Pary (uuid instytucji, dokumenty jej impactów). Wskazane instytucje są
+    czytane osobnymi zapytaniami po indeksowanym `institution_uuid`; bez listy –
+    jeden przebieg po całym repozytorium z grupowaniem w pamięci (tylko projekcja).
+    """
+    if institution_uuids is not None:
+        for uuid in dict.fromkeys(institution_uuids):
+            docs = [
+                doc async for doc in repo.iter_documents(query={"institution_uuid": uuid}, fields=SUMMARY_FIELDS)
+            ]
+            yield uuid, docs
+        return
+
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    async for doc in repo.iter_documents(fields=SUMMARY_FIELDS):
+        uuid = doc.get("institution_uuid")
+        if uuid:
+            groups.setdefault(uuid, []).append(doc)
+    for uuid, docs in groups.items():
+        yield uuid, docs
+
+
+async def refresh_institution_summaries(
+    repo: BaseImpactRepository,
+    store: BaseInstitutionSummaryRepository,
+    institution_uuids: Optional[Sequence[str]] = None,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+) -> Dict[str, int]:
+    """
+    Przelicza podsumowania wszystkich albo wskazanych instytucji i zapisuje
+    tylko te, których treść się zmieniła.
+
+    Zwraca liczniki: institutions, changed, removed.
+    """
+    counts = {"institutions": 0, "changed": 0, "removed": 0}
+    summaries: List[InstitutionImpactSummarySchema] = []
+    empty: List[str] = []
+
+    async def flush() -> None:
+        stored = await store.fingerprints(s.institution_uuid for s in summaries) if summaries else {}
+        changed = [s for s in summaries if stored.get(s.institution_uuid) != s.fingerprint]
+        await store.save_many(changed)
+        counts["changed"] += len(changed)
+        counts["removed"] += await store.delete_many(empty)
+        summaries.clear()
+        empty.clear()
+
+    async for uuid, docs in _institution_documents(repo, institution_uuids):
+        counts["institutions"] += 1
+        if docs:
+            summaries.append(InstitutionImpactSummarySchema.from_documents(uuid, docs))
+        else:
+            empty.append(uuid)
+        if len(summaries) + len(empty) >= batch_size:
+            await flush()
+
+    await flush()
+    return counts
+
+
+def add_summary_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólna opcja CLI skryptów ingestu impactów."""
+    parser.add_argument(
+        "--no-summaries",
+        action="store_true",
+        help="Nie przeliczaj podsumowań instytucji (institution_summaries) po ingeście.",
+    )
+
+
+async def refresh_after_ingest(
+    repo: BaseImpactRepository,
+    institution_uuids: Sequence[str],
+    store: Optional[BaseInstitutionSummaryRepository] = None,
+) -> None:
+    """
+    Przelicza podsumowania instytucji, których impacty zapisał ingest, w
+    `store` (domyślnie magazyn backendu z ustawień – ten sam co repozytorium
+    impactów). Błąd bazy nie przerywa skryptu – impacty są już zapisane,
+    a podsumowania można odbudować skryptem build_institution_summaries.
+    """
+    store = store if store is not None else get_summary_repository()
+    try:
+        await store.ensure_indexes()
+        counts = await refresh_institution_summaries(repo, store, institution_uuids=list(institution_uuids))
+    except (PyMongoError, sqlite3.Error) as e:
+        logger.error("Nie udało się odświeżyć podsumowań instytucji: %s", e)
+        return
+    logger.info(
+        "Podsumowania instytucji: przeliczone %d, zmienione %d, usunięte %d",
+        counts["institutions"],
+        counts["changed"],
+        counts["removed"],
+    )
@@ -0,0 +1,266 @@
+# app/pipeline/reports.py
+"""
+Wsadowe generowanie raportów wpływu (ImpactReportSchema) dla instytucji.
+
+Impacty instytucji (jak w InstitutionImpactSetSchema) są przypisywane do
+wymiarów wpływu (ImpactDimension) na podstawie obszarów impactu, a każdy
+niepusty wymiar daje jedną sekcję raportu (ImpactSectionSchema). Opcjonalnie
+raport dostaje propozycje finansowania z FundingMatcher.
+
+Praca dla każdej instytucji jest niezależna i obciąża CPU, więc raporty
+powstają w puli procesów: matcher jest przekazywany do procesu raz (przy
+starcie), a do zadań trafiają tylko dokumenty danej instytucji (projekcja
+REPORT_FIELDS). Gotowe raporty są zwracane w kolejności ukończenia,
+a w locie jest co najwyżej 2 × liczba procesów instytucji.
+
+Użycie:
+    async for report in iter_reports(groups, matcher=matcher, workers=8):
+        ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from app.analytics.funding_matching import (
+    DEFAULT_MIN_SCORE,
+    DEFAULT_TOP_K,
+    IMPACT_PROFILE_FIELDS,
+    FundingMatcher,
+    profiles_from_impacts,
+)
+from app.models import EntityType, ImpactDimension, ImpactReportSchema, ImpactSectionSchema
+from app.repositories.base import BaseImpactRepository
+
+logger = logging.getLogger(__name__)
+
+# Pola impactu potrzebne do raportu (projekcja dla repozytorium)
+REPORT_FIELDS: Tuple[str, ...] = tuple(dict.fromkeys(IMPACT_PROFILE_FIELDS + (
+    "impact_uuid",
+    "evaluation_year",
+    "is_interdisciplinary",
+)))
+
+# Liczba przykładowych impactów wymienianych w sekcji
+EXAMPLES_PER_SECTION = 5
+
+# Fragmenty nazw obszarów impactu → wymiar (pierwsze dopasowanie wygrywa)
+AREA_DIMENSIONS: Tuple[Tuple[str, ImpactDimension], ...] = (
+    ("gospodar", ImpactDimension.ECONOMIC),
+    ("ekonom", ImpactDimension.ECONOMIC),
+    ("przedsiębior", ImpactDimension.ECONOMIC),
+    ("innowac", ImpactDimension.ECONOMIC),
+    ("administrac", ImpactDimension.POLICY),
+    ("polityk", ImpactDimension.POLICY),
+    ("prawo", ImpactDimension.POLICY),
+    ("bezpieczeństw", ImpactDimension.POLICY),
+    ("obronn", ImpactDimension.POLICY),
+    ("eduka", ImpactDimension.EDUCATIONAL),
+    ("kształc", ImpactDimension.EDUCATIONAL),
+    ("szkol", ImpactDimension.EDUCATIONAL),
+    ("nauk", ImpactDimension.SCIENTIFIC),
+    ("badań", ImpactDimension.SCIENTIFIC),
+    ("zdrow", ImpactDimension.SOCIETAL),
+    ("kultur", ImpactDimension.SOCIETAL),
+    ("sztuk", ImpactDimension.SOCIETAL),
+    ("środowisk", ImpactDimension.SOCIETAL),
+    ("społ", ImpactDimension.SOCIETAL),
+)
+
+DIMENSION_TITLES: Dict[ImpactDimension, str] = {
+    ImpactDimension.SCIENTIFIC: "Wpływ naukowy",
+    ImpactDimension.SOCIETAL: "Wpływ społeczny",
+    ImpactDimension.POLICY: "Wpływ na politykę publiczną",
+    ImpactDimension.EDUCATIONAL: "Wpływ edukacyjny",
+    ImpactDimension.ECONOMIC: "Wpływ gospodarczy",
+    ImpactDimension.OTHER: "Inne obszary wpływu",
+}
+
+# (uuid instytucji, nazwa, dokumenty impactów)
+InstitutionGroup = Tuple[str, Optional[str], List[Dict[str, Any]]]
+
+
+@lru_cache(maxsize=1024)
+def area_dimension(area: str) -> ImpactDimension:
+    """Wymiar wpływu dla nazwy obszaru impactu (np. 'ochrona zdrowia' → SOCIETAL)."""
+    name = area.lower()
+    for fragment, dimension in AREA_DIMENSIONS:
+        if fragment in name:
+            return dimension
+    return ImpactDimension.OTHER
+
+
+def case_dimensions(doc: Dict[str, Any]) -> Set[ImpactDimension]:
+    """Wymiary jednego impactu; bez obszarów – OTHER."""
+    areas = list(doc.get("impact_areas") or ())
+    if doc.get("other_impact_area"):
+        areas.append(doc["other_impact_area"])
+    return {area_dimension(a) for a in areas} or {ImpactDimension.OTHER}
+
+
+def _counted(counter: Counter, limit: int = 8) -> str:
+    return ", ".join(f"{name} ({count})" for name, count in counter.most_common(limit))
+
+
+def _section(dimension: ImpactDimension, docs: List[Dict[str, Any]]) -> ImpactSectionSchema:
+    years = [d["evaluation_year"] for d in docs if d.get("evaluation_year")]
+    areas = Counter(
+        a for d in docs for a in (d.get("impact_areas") or ()) if area_dimension(a) == dimension
+    )
+    disciplines = Counter(d["discipline_name"] for d in docs if d.get("discipline_name"))
+    interdisciplinary = sum(1 for d in docs if d.get("is_interdisciplinary"))
+
+    lines = [f"Liczba opisów wpływu: {len(docs)}"
+             + (f" (lata {min(years)}–{max(years)})." if years else ".")]
+    if areas:
+        lines.append(f"Obszary: {_counted(areas)}.")
+    if disciplines:
+        lines.append(f"Dyscypliny: {_counted(disciplines)}.")
+    lines.append(f"Interdyscyplinarne: {interdisciplinary} z {len(docs)}.")
+
+    examples = [d for d in docs if d.get("title_pl") or d.get("title_en")][:EXAMPLES_PER_SECTION]
+    if examples:
+        lines.append("Przykłady:")
+        for d in examples:
+            year = f" ({d['evaluation_year']})" if d.get("evaluation_year") else ""
+            lines.append(f"- {(d.get('title_pl') or d.get('title_en')).strip()}{year}")
+
+    return ImpactSectionSchema(title=DIMENSION_TITLES[dimension], content="\n".join(lines), dimension=dimension)
+
+
+def build_report(
+    institution_uuid: str,
+    institution_name: Optional[str],
+    docs: List[Dict[str, Any]],
+    matcher: Optional[FundingMatcher] = None,
+    k: int = DEFAULT_TOP_K,
+    min_score: float = DEFAULT_MIN_SCORE,
+) -> ImpactReportSchema:
+    """Raport jednej instytucji: sekcja na każdy niepusty wymiar + propozycje finansowania."""
+    by_dimension: Dict[ImpactDimension, List[Dict[str, Any]]] = {}
+    for doc in docs:
+        for dimension in case_dimensions(doc):
+            by_dimension.setdefault(dimension, []).append(doc)
+
+    years = [d["evaluation_year"] for d in docs if d.get("evaluation_year")]
+    report = ImpactReportSchema(
+        entity_id=institution_uuid,
+        entity_type=EntityType.INSTITUTION,
+        period_start=min(years) if years else None,
+        period_end=max(years) if years else None,
+        # Kolejność sekcji jak w ImpactDimension
+        sections=[_section(d, by_dimension[d]) for d in ImpactDimension if d in by_dimension],
+    )
+
+    if matcher is not None and docs:
+        profiles = profiles_from_impacts(docs)
+        for _, funding in matcher.recommend(profiles.values(), k=k, min_score=min_score):
+            report.recommended_funding = funding
+    logger.debug("Raport dla %s: %d sekcji", institution_name or institution_uuid, len(report.sections))
+    return report
+
+
+# ================== PULA PROCESÓW ==================
+
+_WORKER_MATCHER: Optional[FundingMatcher] = None
+_WORKER_OPTIONS: Dict[str, Any] = {}
+
+
+def _init_worker(matcher: Optional[FundingMatcher], k: int, min_score: float) -> None:
+    """Inicjalizacja procesu: matcher jest przekazywany raz, a nie z każdym zadaniem."""
+    global _WORKER_MATCHER, _WORKER_OPTIONS
+    _WORKER_MATCHER = matcher
+    _WORKER_OPTIONS = {"k": k, "min_score": min_score}
+
+
+def _build_in_worker(group: InstitutionGroup) -> ImpactReportSchema:
+    institution_uuid, institution_name, docs = group
+    return build_report(institution_uuid, institution_name, docs, _WORKER_MATCHER, **_WORKER_OPTIONS)
+
+
+async def iter_reports(
+    groups: AsyncIterable[InstitutionGroup],
+    matcher: Optional[FundingMatcher] = None,
+    workers: Optional[int] = None,
+    k: int = DEFAULT_TOP_K,
+    min_score: float = DEFAULT_MIN_SCORE,
+) -> AsyncIterator[ImpactReportSchema]:
+    """
+    Asynchroniczny generator raportów budowanych w puli `workers` procesów.
+
+    Kolejne grupy są pobierane dopiero, gdy zwolni się miejsce w puli, więc
+    odczyt z repozytorium i budowa raportów przeplatają się, a pamięć zależy
+    od liczby procesów, nie od liczby instytucji.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(matcher, k, min_score),
+    ) as pool:
+        pending: Set[asyncio.Future] = set()
+
+        async for group in groups:
+            pending.add(loop.run_in_executor(pool, _build_in_worker, group))
+            if len(pending) >= max_in_flight:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+async def groups_from_documents(docs: Iterable[Dict[str, Any]]) -> AsyncIterator[InstitutionGroup]:
+    """Grupy instytucji z dokumentów w dowolnej kolejności (grupowanie w pamięci)."""
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    names: Dict[str, Optional[str]] = {}
+    for doc in docs:
+        uuid = doc.get("institution_uuid")
+        if uuid:
+            groups.setdefault(uuid, []).append(doc)
+            names[uuid] = names.get(uuid) or doc.get("institution_name")
+    for uuid, group in groups.items():
+        yield uuid, names[uuid], group
+
+
+async def groups_from_repository(
+    repo: BaseImpactRepository,
+    institution_uuids: Optional[Sequence[str]] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[InstitutionGroup]:
+    """
+    Grupy instytucji z repozytorium. Z listą UUID – jedno zapytanie (po indeksie)
+    na instytucję, pobierane dopiero na żądanie; bez listy – cały korpus
+    (projekcja REPORT_FIELDS) grupowany w pamięci.
+    """
+    if institution_uuids is None:
+        docs = [doc async for doc in repo.iter_documents(fields=REPORT_FIELDS, batch_size=batch_size)]
+        async for group in groups_from_documents(docs):
+            yield group
+        return
+
+    for uuid in institution_uuids:
+        docs = [
+            doc async for doc in repo.iter_documents(
+                query={"institution_uuid": uuid},
+                fields=REPORT_FIELDS,
+                batch_size=batch_size,
+            )
+        ]
+        if not docs:
+            logger.info("Brak impactów dla instytucji %s – pomijam raport", uuid)
+            continue
+        name = next((d["institution_name"] for d in docs if d.get("institution_name")), None)
+        yield uuid, name, docs
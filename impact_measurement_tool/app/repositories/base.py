@@ -0,0 +1,344 @@
+# app/repositories/base.py
+
+from __future__ import annotations
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.dumps.writers import ImpactWriter
+from app.models import ImpactCaseSchema, ImpactReportSchema, InstitutionEvaluationSchema, InstitutionImpactSummarySchema
+
+logger = logging.getLogger(__name__)
+
+# Pola, po których filtruje endpoint GET /impacts – każdy backend je indeksuje
+INDEXED_FIELDS: Tuple[str, ...] = (
+    "impact_uuid",
+    "institution_uuid",
+    "discipline_code",
+    "evaluation_category",
+    "evaluation_period",
+)
+
+# Pola wyliczane z innych kolekcji (kategorie ewaluacyjne, app/pipeline/evaluation_join.py).
+# Ingest z RAD-on zapisuje z preserve_fields=DERIVED_FIELDS, żeby ich nie zerować –
+# ustawia je tylko refresh_evaluation_categories (także zaraz po ingeście).
+DERIVED_FIELDS: Tuple[str, ...] = ("evaluation_period", "evaluation_category")
+
+# Pola-listy indeksowane po elementach: filtr {pole: wartość} oznacza „lista zawiera wartość”
+MULTI_VALUE_FIELDS: Tuple[str, ...] = ("beneficiary_categories", "identifier_keys")
+
+# Klucz logiczny ewaluacji: jeden rekord na instytucję i okres ewaluacji
+EVALUATION_KEY_FIELDS: Tuple[str, ...] = ("institution_uuid", "evaluation_period")
+
+# Pola, po których można filtrować ewaluacje na każdym backendzie
+EVALUATION_FILTER_FIELDS: Tuple[str, ...] = ("institution_uuid", "evaluation_period", "disciplines.category")
+
+# Klucz logiczny raportu: jeden raport na podmiot i okres
+REPORT_KEY_FIELDS: Tuple[str, ...] = ("entity_type", "entity_id", "period_start", "period_end")
+
+
+class BaseImpactRepository(ABC):
+    """
+    Wspólny interfejs repozytoriów impactów (MongoDB, SQLite, pamięć).
+
+    Filtry przekazywane w `query` to proste warunki równościowe
+    {nazwa_pola: wartość} (dla MULTI_VALUE_FIELDS – przynależność wartości
+    do listy); tylko MongoDB akceptuje pełną składnię zapytań.
+    """
+
+    # ================== ZAPIS ==================
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        """Tworzy indeksy używane przez upserty i filtry listy."""
+
+    @abstractmethod
+    async def save_one(self, impact: ImpactCaseSchema, preserve_fields: Sequence[str] = ()) -> None:
+        """
+        Zapisuje jeden opis wpływu w trybie upsert.
+
+        Pola z `preserve_fields` są ustawiane tylko przy wstawieniu nowego
+        dokumentu – istniejący zachowuje swoje wartości (np. DERIVED_FIELDS).
+        """
+
+    @abstractmethod
+    async def save_many(
+        self,
+        impacts: Iterable[ImpactCaseSchema],
+        preserve_fields: Sequence[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Zapisuje partię impactów (upsert); `preserve_fields` jak w save_one.
+
+        Zwraca liczniki: matched, modified, upserted, skipped.
+        """
+
+    @staticmethod
+    def upsert_key(doc: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Zwraca parę (pole, wartość) będącą kluczem logicznym dokumentu.
+
+        Kluczem jest `impact_uuid` (jeśli istnieje w modelu),
+        a jeśli go nie ma – `source_record_id`.
+        """
+        # Preferujemy impact_uuid jako klucz, jeśli jest w modelu
+        impact_uuid: Optional[str] = doc.get("impact_uuid") or doc.get("impactUuid")
+        source_record_id: Optional[str] = doc.get("source_record_id")
+
+        if not impact_uuid and not source_record_id:
+            # Ostateczna próba – wyciągnąć z raw, jeśli jest
+            raw = doc.get("raw") or {}
+            impact_uuid = raw.get("impactUuid") or raw.get("impact_uuid")
+
+        if not impact_uuid and not source_record_id:
+            raise ValueError(
+                "Nie można zapisać impactu: brak zarówno impact_uuid, jak i source_record_id."
+            )
+
+        if impact_uuid:
+            return "impact_uuid", impact_uuid
+        return "source_record_id", source_record_id  # type: ignore[return-value]
+
+    # ================== ODCZYT ==================
+
+    @abstractmethod
+    async def list_impacts(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        institution_uuid: Optional[str] = None,
+        discipline_code: Optional[str] = None,
+        beneficiary_category: Optional[str] = None,
+        evaluation_category: Optional[str] = None,
+        evaluation_period: Optional[str] = None,
+        identifier_key: Optional[str] = None,
+    ) -> List[ImpactCaseSchema]:
+        """Zwraca stronę impactów z opcjonalnym filtrowaniem (endpoint GET /impacts)."""
+
+    @abstractmethod
+    async def get_by_impact_uuid(self, impact_uuid: str) -> Optional[ImpactCaseSchema]:
+        """Zwraca pojedynczy impact po `impact_uuid` albo None."""
+
+    @abstractmethod
+    async def count(self, institution_uuid: Optional[str] = None) -> int:
+        """Zlicza impacty (opcjonalnie tylko dla danej instytucji)."""
+
+    @abstractmethod
+    def iter_impacts(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ImpactCaseSchema]:
+        """Asynchroniczny generator po impactach pasujących do `query`, czytanych partiami."""
+
+    @abstractmethod
+    def iter_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Jak `iter_impacts`, ale zwraca surowe słowniki bez walidacji modelu,
+        ograniczone do `fields` (projekcja) – dla analityki i masowych odczytów.
+        """
+
+    # ================== EKSPORT ==================
+
+    async def export(
+        self,
+        writer: ImpactWriter,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Eksportuje impacty do otwartego writera (JSON/NDJSON/CSV/Parquet/Arrow).
+
+        Zwraca liczbę zapisanych rekordów.
+        """
+        async for impact in self.iter_impacts(query=query, batch_size=batch_size):
+            writer.write(impact)
+        return writer.count
+
+    @staticmethod
+    def _list_filters(
+        institution_uuid: Optional[str] = None,
+        discipline_code: Optional[str] = None,
+        beneficiary_category: Optional[str] = None,
+        evaluation_category: Optional[str] = None,
+        evaluation_period: Optional[str] = None,
+        identifier_key: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Filtry równościowe dla list_impacts / count."""
+        query: Dict[str, Any] = {}
+        if institution_uuid:
+            query["institution_uuid"] = institution_uuid
+        if discipline_code:
+            query["discipline_code"] = discipline_code
+        if beneficiary_category:
+            query["beneficiary_categories"] = beneficiary_category
+        if evaluation_category:
+            query["evaluation_category"] = evaluation_category
+        if evaluation_period:
+            query["evaluation_period"] = evaluation_period
+        if identifier_key:
+            query["identifier_keys"] = identifier_key
+        return query
+
+
+class BaseInstitutionSummaryRepository(ABC):
+    """
+    Wspólny interfejs magazynów podsumowań instytucji (InstitutionImpactSummarySchema)
+    – MongoDB, SQLite i pamięć, wybierane przez factory.get_summary_repository
+    razem z backendem impactów.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        """Tworzy indeksy po institution_uuid i kolejności listy."""
+
+    @abstractmethod
+    async def fingerprints(self, institution_uuids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Zapisane skróty treści podsumowań wskazanych instytucji (brak dokumentu – brak klucza)."""
+
+    @abstractmethod
+    async def save_many(self, summaries: Iterable[InstitutionImpactSummarySchema]) -> Dict[str, int]:
+        """Zapisuje (zastępuje) partię podsumowań; zwraca liczniki matched, modified, upserted."""
+
+    @abstractmethod
+    async def delete_many(self, institution_uuids: Iterable[str]) -> int:
+        """Usuwa podsumowania instytucji, które nie mają już impactów."""
+
+    @abstractmethod
+    async def get(self, institution_uuid: str) -> Optional[InstitutionImpactSummarySchema]:
+        """Podsumowanie instytucji albo None."""
+
+    @abstractmethod
+    async def list_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_titles: bool = False,
+    ) -> List[InstitutionImpactSummarySchema]:
+        """Podsumowania od instytucji z największą liczbą impactów; bez tytułów, o ile nie wskazano inaczej."""
+
+    @abstractmethod
+    async def count(self) -> int:
+        """Liczba zapisanych podsumowań."""
+
+
+class BaseEvaluationRepository(ABC):
+    """
+    Wspólny interfejs magazynów ewaluacji instytucji (InstitutionEvaluationSchema)
+    – MongoDB, SQLite i pamięć (factory.get_evaluation_repository).
+
+    Filtry `query` to warunki {pole: wartość} albo {pole: {"$in": [...]}} po
+    polach EVALUATION_FILTER_FIELDS („disciplines.category” – którakolwiek
+    dyscyplina); tylko MongoDB akceptuje pełną składnię zapytań.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        """Tworzy indeks unikalny klucza i indeksy filtrów."""
+
+    @abstractmethod
+    async def save_many(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> Dict[str, int]:
+        """
+        Zapisuje partię ewaluacji (upsert po EVALUATION_KEY_FIELDS).
+
+        Rekordy bez institution_uuid lub evaluation_period są pomijane z ostrzeżeniem.
+        Zwraca liczniki: matched, modified, upserted, skipped.
+        """
+
+    @abstractmethod
+    async def get_for_institution(self, institution_uuid: str) -> List[InstitutionEvaluationSchema]:
+        """Ewaluacje instytucji, od najnowszego okresu."""
+
+    @abstractmethod
+    async def count(self, evaluation_period: Optional[str] = None, category: Optional[str] = None) -> int:
+        """Liczba ewaluacji z filtrem jak w list_evaluations."""
+
+    @abstractmethod
+    def iter_evaluations(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 500,
+    ) -> AsyncIterator[InstitutionEvaluationSchema]:
+        """Strumieniowy odczyt ewaluacji w kolejności klucza (`limit` 0 – bez limitu)."""
+
+    async def list_evaluations(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        evaluation_period: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> List[InstitutionEvaluationSchema]:
+        """Lista ewaluacji z filtrem po okresie i kategorii którejkolwiek dyscypliny."""
+        evaluations: List[InstitutionEvaluationSchema] = []
+        async for evaluation in self.iter_evaluations(
+            self._filters(evaluation_period, category), skip=skip, limit=limit
+        ):
+            evaluations.append(evaluation)
+        return evaluations
+
+    @staticmethod
+    def _filters(evaluation_period: Optional[str], category: Optional[str]) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if evaluation_period:
+            query["evaluation_period"] = evaluation_period
+        if category:
+            query["disciplines.category"] = category
+        return query
+
+    @staticmethod
+    def _key(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: doc.get(field) for field in EVALUATION_KEY_FIELDS}
+
+    @classmethod
+    def _keyed_documents(
+        cls,
+        evaluations: Iterable[InstitutionEvaluationSchema],
+        mode: str = "python",
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Dokumenty ewaluacji z kompletnym kluczem i liczba pominiętych."""
+        docs: List[Dict[str, Any]] = []
+        skipped = 0
+        for evaluation in evaluations:
+            doc = evaluation.model_dump(mode=mode)
+            if not all(cls._key(doc).values()):
+                logger.warning(
+                    "Pominięto ewaluację bez klucza (id=%s, instytucja=%s)",
+                    evaluation.evaluation_record_id,
+                    evaluation.institution_name,
+                )
+                skipped += 1
+                continue
+            docs.append(doc)
+        return docs, skipped
+
+
+class BaseReportRepository(ABC):
+    """
+    Wspólny interfejs magazynów raportów wpływu (ImpactReportSchema) – MongoDB,
+    SQLite i pamięć (factory.get_report_repository). Raport dla tego samego
+    podmiotu i okresu (REPORT_KEY_FIELDS) zastępuje poprzedni.
+    """
+
+    @abstractmethod
+    async def ensure_indexes(self) -> None:
+        """Tworzy indeks unikalny klucza raportu."""
+
+    @abstractmethod
+    async def save_many(self, reports: Iterable[ImpactReportSchema]) -> Dict[str, int]:
+        """Zapisuje (zastępuje) partię raportów; zwraca liczniki matched, modified, upserted."""
+
+    @abstractmethod
+    async def get_latest(self, entity_id: str) -> Optional[ImpactReportSchema]:
+        """Najnowszy raport podmiotu (po końcu okresu, potem dacie utworzenia)."""
+
+    @staticmethod
+    def _key(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: doc.get(field) for field in REPORT_KEY_FIELDS}
@@ -0,0 +1,113 @@
+# app/repositories/evaluation_repository.py
+
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+
+from app.db.mongo import db
+from app.models import InstitutionEvaluationSchema
+from app.repositories.base import EVALUATION_KEY_FIELDS, BaseEvaluationRepository
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationRepository(BaseEvaluationRepository):
+    """
+    Repozytorium ewaluacji instytucji (InstitutionEvaluationSchema) w MongoDB.
+
+    Domyślna kolekcja: `radon_evaluations`. Ponowny ingest tej samej
+    instytucji i okresu aktualizuje istniejący dokument.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "radon_evaluations",
+        collection: Optional[AsyncIOMotorCollection] = None,
+    ) -> None:
+        self.collection: AsyncIOMotorCollection = (
+            collection if collection is not None else db[collection_name]
+        )
+
+    async def ensure_indexes(self) -> None:
+        """
+        Indeks unikalny (institution_uuid, evaluation_period) obsługuje upserty
+        i odczyt po instytucji; osobne indeksy – filtry po okresie i kategorii.
+        """
+        await self.collection.create_index(
+            [(field, ASCENDING) for field in EVALUATION_KEY_FIELDS],
+            unique=True,
+        )
+        await self.collection.create_index("evaluation_period")
+        await self.collection.create_index("disciplines.category")
+
+    async def save_many(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> Dict[str, int]:
+        """
+        Zapisuje partię ewaluacji jednym `bulk_write` (UpdateOne z upsert, unordered).
+
+        Rekordy bez institution_uuid lub evaluation_period są pomijane z ostrzeżeniem.
+        """
+        docs, skipped = self._keyed_documents(evaluations)
+        operations = [UpdateOne(self._key(doc), {"$set": doc}, upsert=True) for doc in docs]
+
+        if not operations:
+            return {"matched": 0, "modified": 0, "upserted": 0, "skipped": skipped}
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return {
+            "matched": result.matched_count,
+            "modified": result.modified_count,
+            "upserted": result.upserted_count,
+            "skipped": skipped,
+        }
+
+    @staticmethod
+    def _to_model(doc: Dict[str, Any]) -> Optional[InstitutionEvaluationSchema]:
+        doc.pop("_id", None)
+        try:
+            return InstitutionEvaluationSchema.model_validate(doc)
+        except Exception as e:
+            logger.error(
+                "Błąd walidacji InstitutionEvaluationSchema dla institution_uuid=%s: %s",
+                doc.get("institution_uuid"),
+                e,
+            )
+            return None
+
+    async def get_for_institution(self, institution_uuid: str) -> List[InstitutionEvaluationSchema]:
+        """Ewaluacje instytucji, od najnowszego okresu."""
+        cursor = self.collection.find({"institution_uuid": institution_uuid}).sort(
+            "evaluation_period", DESCENDING
+        )
+        evaluations: List[InstitutionEvaluationSchema] = []
+        async for doc in cursor:
+            evaluation = self._to_model(doc)
+            if evaluation is not None:
+                evaluations.append(evaluation)
+        return evaluations
+
+    async def count(self, evaluation_period: Optional[str] = None, category: Optional[str] = None) -> int:
+        return await self.collection.count_documents(self._filters(evaluation_period, category))
+
+    async def iter_evaluations(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 500,
+    ) -> AsyncIterator[InstitutionEvaluationSchema]:
+        """Strumieniowy odczyt ewaluacji (kursor z `batch_size`), w kolejności klucza."""
+        cursor = (
+            self.collection.find(query or {})
+            .sort([(field, ASCENDING) for field in EVALUATION_KEY_FIELDS])
+            .skip(skip)
+            .limit(limit)
+            .batch_size(batch_size)
+        )
+        async for doc in cursor:
+            evaluation = self._to_model(doc)
+            if evaluation is not None:
+                yield evaluation
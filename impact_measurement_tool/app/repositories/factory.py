@@ -0,0 +1,167 @@
+# app/repositories/factory.py
+
+from __future__ import annotations
+
+import argparse
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from app.db.settings import STORAGE_BACKENDS, storage_settings
+from app.repositories.base import (
+    BaseEvaluationRepository,
+    BaseImpactRepository,
+    BaseInstitutionSummaryRepository,
+    BaseReportRepository,
+)
+
+_T = TypeVar("_T")
+
+# Jedna instancja na (rodzaj, backend, ścieżka): backend pamięciowy musi być
+# współdzielony między żądaniami, a SQLite trzyma jedno połączenie na plik i tabelę.
+_REPOSITORIES: Dict[Tuple[str, str, Optional[str]], Any] = {}
+
+
+def _get_or_build(
+    kind: str,
+    backend: Optional[str],
+    sqlite_path: Optional[str],
+    build: Callable[[str, Optional[str]], _T],
+) -> _T:
+    backend = backend or storage_settings.backend
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Nieznany backend: {backend!r}. Dostępne: {', '.join(STORAGE_BACKENDS)}.")
+
+    path = (sqlite_path or storage_settings.sqlite_path) if backend == "sqlite" else None
+    key = (kind, backend, path)
+    repo = _REPOSITORIES.get(key)
+    if repo is None:
+        repo = _REPOSITORIES[key] = build(backend, path)
+    return repo
+
+
+def get_impact_repository(
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None,
+) -> BaseImpactRepository:
+    """
+    Zwraca repozytorium impactów dla wybranego backendu (domyślnie z `storage_settings`).
+
+    Moduły backendów są importowane leniwie – backend SQLite / pamięciowy
+    nie wymaga zainstalowanego Motor ani działającego MongoDB.
+    """
+
+    def build(backend: str, path: Optional[str]) -> BaseImpactRepository:
+        if backend == "mongo":
+            from app.repositories.impact_repository import ImpactRepository
+
+            return ImpactRepository()
+        if backend == "sqlite":
+            from app.repositories.sqlite_impact_repository import SqliteImpactRepository
+
+            return SqliteImpactRepository(path)
+
+        from app.repositories.memory_impact_repository import InMemoryImpactRepository
+
+        return InMemoryImpactRepository()
+
+    return _get_or_build("impacts", backend, sqlite_path, build)
+
+
+def get_summary_repository(
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None,
+) -> BaseInstitutionSummaryRepository:
+    """Magazyn podsumowań instytucji na tym samym backendzie (i pliku SQLite) co impacty."""
+
+    def build(backend: str, path: Optional[str]) -> BaseInstitutionSummaryRepository:
+        if backend == "mongo":
+            from app.repositories.institution_summary_repository import InstitutionSummaryRepository
+
+            return InstitutionSummaryRepository()
+        if backend == "sqlite":
+            from app.repositories.sqlite_stores import SqliteInstitutionSummaryRepository
+
+            return SqliteInstitutionSummaryRepository(path)
+
+        from app.repositories.memory_stores import InMemoryInstitutionSummaryRepository
+
+        return InMemoryInstitutionSummaryRepository()
+
+    return _get_or_build("summaries", backend, sqlite_path, build)
+
+
+def get_evaluation_repository(
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None,
+) -> BaseEvaluationRepository:
+    """Magazyn ewaluacji instytucji na tym samym backendzie (i pliku SQLite) co impacty."""
+
+    def build(backend: str, path: Optional[str]) -> BaseEvaluationRepository:
+        if backend == "mongo":
+            from app.repositories.evaluation_repository import EvaluationRepository
+
+            return EvaluationRepository()
+        if backend == "sqlite":
+            from app.repositories.sqlite_stores import SqliteEvaluationRepository
+
+            return SqliteEvaluationRepository(path)
+
+        from app.repositories.memory_stores import InMemoryEvaluationRepository
+
+        return InMemoryEvaluationRepository()
+
+    return _get_or_build("evaluations", backend, sqlite_path, build)
+
+
+def get_report_repository(
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None,
+) -> BaseReportRepository:
+    """Magazyn raportów wpływu na tym samym backendzie (i pliku SQLite) co impacty."""
+
+    def build(backend: str, path: Optional[str]) -> BaseReportRepository:
+        if backend == "mongo":
+            from app.repositories.report_repository import ReportRepository
+
+            return ReportRepository()
+        if backend == "sqlite":
+            from app.repositories.sqlite_stores import SqliteReportRepository
+
+            return SqliteReportRepository(path)
+
+        from app.repositories.memory_stores import InMemoryReportRepository
+
+        return InMemoryReportRepository()
+
+    return _get_or_build("reports", backend, sqlite_path, build)
+
+
+def add_storage_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólne opcje CLI wyboru backendu (skrypty ingestu, importu i eksportu)."""
+    parser.add_argument(
+        "--backend",
+        choices=STORAGE_BACKENDS,
+        default=None,
+        help="Backend przechowywania (domyślnie IMETO_STORAGE_BACKEND albo mongo).",
+    )
+    parser.add_argument(
+        "--sqlite-path",
+        type=str,
+        default=None,
+        help="Plik bazy SQLite dla --backend sqlite (domyślnie IMETO_SQLITE_PATH).",
+    )
+
+
+def repository_from_args(args: argparse.Namespace) -> BaseImpactRepository:
+    return get_impact_repository(backend=args.backend, sqlite_path=args.sqlite_path)
+
+
+def summary_repository_from_args(args: argparse.Namespace) -> BaseInstitutionSummaryRepository:
+    return get_summary_repository(backend=args.backend, sqlite_path=args.sqlite_path)
+
+
+def evaluation_repository_from_args(args: argparse.Namespace) -> BaseEvaluationRepository:
+    return get_evaluation_repository(backend=args.backend, sqlite_path=args.sqlite_path)
+
+
+def report_repository_from_args(args: argparse.Namespace) -> BaseReportRepository:
+    return get_report_repository(backend=args.backend, sqlite_path=args.sqlite_path)
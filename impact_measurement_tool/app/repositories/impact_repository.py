@@ -3,65 +3,75 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence
 
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import UpdateOne
 
 from app.db.mongo import db
 from app.models import ImpactCaseSchema
+from app.repositories.base import INDEXED_FIELDS, MULTI_VALUE_FIELDS, BaseImpactRepository
 
 logger = logging.getLogger(__name__)
 
 
-class ImpactRepository:
+class ImpactRepository(BaseImpactRepository):
     """
     Repozytorium do pracy z kolekcją impactów z RAD-on w MongoDB.
 
-    Domyślna kolekcja: `radon_impacts`.
+    Domyślna kolekcja: `radon_impacts`. Można też przekazać gotową
+    kolekcję Motor (np. z innej bazy – benchmarki, testy).
     """
 
-    def __init__(self, collection_name: str = "radon_impacts") -> None:
-        self.collection: AsyncIOMotorCollection = db[collection_name]
+    def __init__(
+        self,
+        collection_name: str = "radon_impacts",
+        collection: Optional[AsyncIOMotorCollection] = None,
+    ) -> None:
+        self.collection: AsyncIOMotorCollection = (
+            collection if collection is not None else db[collection_name]
+        )
 
     # ================== ZAPIS ==================
 
-    async def save_one(self, impact: ImpactCaseSchema) -> None:
+    async def ensure_indexes(self) -> None:
         """
-        Zapisuje jeden opis wpływu w trybie upsert.
+        Tworzy indeksy używane przez upserty i filtry listy.
 
-        Kluczem logicznym jest `impact_uuid` (jeśli istnieje w modelu),
-        a jeśli go nie ma – `source_record_id`.
+        Bez indeksu na `impact_uuid` każdy upsert skanuje całą kolekcję.
+        Pola-listy (MULTI_VALUE_FIELDS) dostają indeksy wielokluczowe.
+        """
+        for field in INDEXED_FIELDS + MULTI_VALUE_FIELDS:
+            await self.collection.create_index(field)
+
+    def _upsert_filter(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        """Buduje filtr upsert dla dokumentu na podstawie klucza logicznego."""
+        field, value = self.upsert_key(doc)
+        return {field: value}
+
+    @staticmethod
+    def _upsert_update(doc: Dict[str, Any], preserve_fields: Sequence[str]) -> Dict[str, Any]:
+        """$set dokumentu; pola z `preserve_fields` – tylko przy wstawieniu ($setOnInsert)."""
+        if not preserve_fields:
+            return {"$set": doc}
+        on_insert = {name: doc.pop(name) for name in preserve_fields if name in doc}
+        return {"$set": doc, "$setOnInsert": on_insert} if on_insert else {"$set": doc}
+
+    async def save_one(self, impact: ImpactCaseSchema, preserve_fields: Sequence[str] = ()) -> None:
+        """
+        Zapisuje jeden opis wpływu w trybie upsert.
 
         Dzięki temu ponowny ingest nie duplikuje dokumentów.
         """
         doc: Dict[str, Any] = impact.model_dump()
-
-        # Preferujemy impact_uuid jako klucz, jeśli jest w modelu
-        impact_uuid: Optional[str] = doc.get("impact_uuid") or doc.get("impactUuid")
-        source_record_id: Optional[str] = doc.get("source_record_id")
-
-        if not impact_uuid and not source_record_id:
-            # Ostateczna próba – wyciągnąć z raw, jeśli jest
-            raw = doc.get("raw") or {}
-            impact_uuid = raw.get("impactUuid") or raw.get("impact_uuid")
-
-        if not impact_uuid and not source_record_id:
-            raise ValueError(
-                "Nie można zapisać impactu: brak zarówno impact_uuid, jak i source_record_id."
-            )
-
-        # Budujemy filtr upsert
-        if impact_uuid:
-            filter_doc = {"impact_uuid": impact_uuid}
-        else:
-            filter_doc = {"source_record_id": source_record_id}
+        filter_doc = self._upsert_filter(doc)
 
         # Usuwamy ewentualne _id z poprzedniego odczytu, żeby MongoDB się nie buntowało
         doc.pop("_id", None)
 
         result = await self.collection.update_one(
             filter_doc,
-            {"$set": doc},
+            self._upsert_update(doc, preserve_fields),
             upsert=True,
         )
         logger.debug(
@@ -71,6 +81,49 @@ class ImpactRepository:
             result.upserted_id,
         )
 
+    async def save_many(
+        self,
+        impacts: Iterable[ImpactCaseSchema],
+        preserve_fields: Sequence[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Zapisuje partię impactów jednym wywołaniem `bulk_write` (upserty, unordered).
+
+        Rekordy bez klucza są pomijane z ostrzeżeniem.
+        Zwraca liczniki: matched, modified, upserted, skipped.
+        """
+        operations: List[UpdateOne] = []
+        skipped = 0
+
+        for impact in impacts:
+            doc: Dict[str, Any] = impact.model_dump()
+            try:
+                filter_doc = self._upsert_filter(doc)
+            except ValueError as e:
+                logger.warning("Pominięto impact w zapisie partii: %s", e)
+                skipped += 1
+                continue
+            doc.pop("_id", None)
+            operations.append(UpdateOne(filter_doc, self._upsert_update(doc, preserve_fields), upsert=True))
+
+        if not operations:
+            return {"matched": 0, "modified": 0, "upserted": 0, "skipped": skipped}
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        logger.debug(
+            "Zapisano partię %d impactów – matched: %s, modified: %s, upserted: %s",
+            len(operations),
+            result.matched_count,
+            result.modified_count,
+            result.upserted_count,
+        )
+        return {
+            "matched": result.matched_count,
+            "modified": result.modified_count,
+            "upserted": result.upserted_count,
+            "skipped": skipped,
+        }
+
     # ================== ODCZYT – LISTA ==================
 
     async def list_impacts(
@@ -79,21 +132,29 @@ class ImpactRepository:
         limit: int = 50,
         institution_uuid: Optional[str] = None,
         discipline_code: Optional[str] = None,
+        beneficiary_category: Optional[str] = None,
+        evaluation_category: Optional[str] = None,
+        evaluation_period: Optional[str] = None,
+        identifier_key: Optional[str] = None,
     ) -> List[ImpactCaseSchema]:
         """
         Zwraca listę impactów z opcjonalnym filtrowaniem po:
         - institution_uuid
         - discipline_code
+        - beneficiary_category (element beneficiary_categories)
+        - evaluation_category / evaluation_period (zdenormalizowana kategoria ewaluacyjna)
+        - identifier_key (element identifier_keys, np. 'doi:10.1000/xyz')
 
         Używane przez endpoint GET /impacts.
         """
-        query: Dict[str, Any] = {}
-
-        if institution_uuid:
-            query["institution_uuid"] = institution_uuid
-
-        if discipline_code:
-            query["discipline_code"] = discipline_code
+        query = self._list_filters(
+            institution_uuid,
+            discipline_code,
+            beneficiary_category,
+            evaluation_category,
+            evaluation_period,
+            identifier_key,
+        )
 
         cursor = (
             self.collection.find(query)
@@ -141,8 +202,47 @@ class ImpactRepository:
         """
         Zlicza impacty (opcjonalnie tylko dla danej instytucji).
         """
-        query: Dict[str, Any] = {}
-        if institution_uuid:
-            query["institution_uuid"] = institution_uuid
+        query = self._list_filters(institution_uuid)
 
         return await self.collection.count_documents(query)
+
+    # ================== ODCZYT – STRUMIENIOWO / EKSPORT ==================
+
+    async def iter_impacts(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ImpactCaseSchema]:
+        """
+        Asynchroniczny generator po wszystkich impactach pasujących do `query`.
+
+        Kursor pobiera dokumenty partiami po `batch_size`, więc w pamięci
+        jest naraz co najwyżej jedna partia.
+        """
+        cursor = self.collection.find(query or {}).batch_size(batch_size)
+
+        async for doc in cursor:
+            doc.pop("_id", None)
+            try:
+                yield ImpactCaseSchema.model_validate(doc)
+            except Exception as e:
+                logger.warning("Nie udało się zmapować dokumentu na ImpactCaseSchema: %s", e)
+
+    async def iter_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Surowe dokumenty z projekcją po stronie serwera – pola spoza `fields`
+        (np. `raw`, pełne opisy) w ogóle nie są przesyłane z MongoDB.
+        """
+        projection: Optional[Dict[str, int]] = None
+        if fields is not None:
+            projection = {"_id": 0, **{f: 1 for f in fields}}
+
+        cursor = self.collection.find(query or {}, projection).batch_size(batch_size)
+        async for doc in cursor:
+            doc.pop("_id", None)
+            yield doc
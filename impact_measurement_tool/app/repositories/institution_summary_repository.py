@@ -0,0 +1,112 @@
+# app/repositories/institution_summary_repository.py
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+
+from app.db.mongo import db
+from app.models import InstitutionImpactSummarySchema
+from app.repositories.base import BaseInstitutionSummaryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class InstitutionSummaryRepository(BaseInstitutionSummaryRepository):
+    """
+    Repozytorium podsumowań impactów instytucji (InstitutionImpactSummarySchema)
+    w MongoDB.
+
+    Domyślna kolekcja: `institution_summaries`, jeden dokument na instytucję.
+    Podsumowania są przeliczane po ingeście (app/pipeline/institution_summaries.py),
+    a API czyta je bez sięgania do impactów.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "institution_summaries",
+        collection: Optional[AsyncIOMotorCollection] = None,
+    ) -> None:
+        self.collection: AsyncIOMotorCollection = (
+            collection if collection is not None else db[collection_name]
+        )
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index("institution_uuid", unique=True)
+        await self.collection.create_index([("case_count", DESCENDING), ("institution_uuid", ASCENDING)])
+
+    async def fingerprints(self, institution_uuids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Zapisane skróty treści podsumowań wskazanych instytucji (brak dokumentu – brak klucza)."""
+        cursor = self.collection.find(
+            {"institution_uuid": {"$in": list(institution_uuids)}},
+            {"_id": 0, "institution_uuid": 1, "fingerprint": 1},
+        )
+        return {doc["institution_uuid"]: doc.get("fingerprint") async for doc in cursor}
+
+    async def save_many(self, summaries: Iterable[InstitutionImpactSummarySchema]) -> Dict[str, int]:
+        """Zapisuje partię podsumowań jednym `bulk_write` (ReplaceOne z upsert)."""
+        operations: List[ReplaceOne] = []
+        for summary in summaries:
+            doc = summary.model_dump()
+            operations.append(ReplaceOne({"institution_uuid": summary.institution_uuid}, doc, upsert=True))
+
+        if not operations:
+            return {"matched": 0, "modified": 0, "upserted": 0}
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return {
+            "matched": result.matched_count,
+            "modified": result.modified_count,
+            "upserted": result.upserted_count,
+        }
+
+    async def delete_many(self, institution_uuids: Iterable[str]) -> int:
+        """Usuwa podsumowania instytucji, które nie mają już impactów."""
+        uuids = list(institution_uuids)
+        if not uuids:
+            return 0
+        result = await self.collection.delete_many({"institution_uuid": {"$in": uuids}})
+        return result.deleted_count
+
+    def _validate(self, doc: Dict[str, Any]) -> Optional[InstitutionImpactSummarySchema]:
+        doc.pop("_id", None)
+        try:
+            return InstitutionImpactSummarySchema.model_validate(doc)
+        except Exception as e:
+            logger.error(
+                "Błąd walidacji InstitutionImpactSummarySchema dla institution_uuid=%s: %s",
+                doc.get("institution_uuid"),
+                e,
+            )
+            return None
+
+    async def get(self, institution_uuid: str) -> Optional[InstitutionImpactSummarySchema]:
+        doc = await self.collection.find_one({"institution_uuid": institution_uuid})
+        return self._validate(doc) if doc else None
+
+    async def list_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_titles: bool = False,
+    ) -> List[InstitutionImpactSummarySchema]:
+        """Podsumowania od instytucji z największą liczbą impactów; bez tytułów, o ile nie wskazano inaczej."""
+        projection = None if include_titles else {"titles": 0}
+        cursor = (
+            self.collection.find({}, projection)
+            .sort([("case_count", DESCENDING), ("institution_uuid", ASCENDING)])
+            .skip(skip)
+            .limit(limit)
+        )
+        summaries: List[InstitutionImpactSummarySchema] = []
+        async for doc in cursor:
+            summary = self._validate(doc)
+            if summary is not None:
+                summaries.append(summary)
+        return summaries
+
+    async def count(self) -> int:
+        return await self.collection.count_documents({})
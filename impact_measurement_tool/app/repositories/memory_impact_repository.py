@@ -0,0 +1,188 @@
+# app/repositories/memory_impact_repository.py
+
+from __future__ import annotations
+
+import itertools
+import logging
+from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Set
+
+from app.models import ImpactCaseSchema
+from app.repositories.base import INDEXED_FIELDS, MULTI_VALUE_FIELDS, BaseImpactRepository
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryImpactRepository(BaseImpactRepository):
+    """
+    Repozytorium impactów trzymane w pamięci procesu – do testów, benchmarków
+    i szybkich eksperymentów. Dane znikają po zakończeniu procesu.
+
+    Dokumenty są przechowywane jako słowniki (`model_dump`) w kolejności
+    wstawienia; pola z INDEXED_FIELDS mają indeksy wartość → klucze,
+    a pola-listy z MULTI_VALUE_FIELDS – element listy → klucze.
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._order: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self._indexes: Dict[str, Dict[Any, Set[str]]] = {
+            field: defaultdict(set) for field in INDEXED_FIELDS + MULTI_VALUE_FIELDS
+        }
+
+    # ================== ZAPIS ==================
+
+    async def ensure_indexes(self) -> None:
+        # Indeksy są utrzymywane na bieżąco przy każdym zapisie
+        return None
+
+    def _put(self, impact: ImpactCaseSchema, preserve_fields: Sequence[str] = ()) -> Optional[bool]:
+        """
+        Upsert jednego dokumentu; istniejący zachowuje wartości `preserve_fields`.
+
+        Zwraca: None – nowy dokument, True – zmieniony, False – bez zmian.
+        """
+        doc: Dict[str, Any] = impact.model_dump()
+        field, key = self.upsert_key(doc)
+        # Jak w MongoDB: pole klucza z filtra upsert trafia do dokumentu
+        doc[field] = key
+
+        existing = self._docs.get(key)
+        if existing is not None:
+            for name in preserve_fields:
+                if name in existing:
+                    doc[name] = existing[name]
+            if existing == doc:
+                return False
+            self._unindex(key, existing)
+        else:
+            self._order[key] = next(self._seq)
+
+        self._docs[key] = doc
+        for name, index in self._indexes.items():
+            for value in self._index_values(name, doc):
+                index[value].add(key)
+
+        return None if existing is None else True
+
+    @staticmethod
+    def _index_values(name: str, doc: Dict[str, Any]) -> Iterable[Any]:
+        if name in MULTI_VALUE_FIELDS:
+            return set(doc.get(name) or ())
+        return (doc.get(name),)
+
+    def _unindex(self, key: str, doc: Dict[str, Any]) -> None:
+        for name, index in self._indexes.items():
+            for value in self._index_values(name, doc):
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+
+    async def save_one(self, impact: ImpactCaseSchema, preserve_fields: Sequence[str] = ()) -> None:
+        self._put(impact, preserve_fields)
+
+    async def save_many(
+        self,
+        impacts: Iterable[ImpactCaseSchema],
+        preserve_fields: Sequence[str] = (),
+    ) -> Dict[str, int]:
+        counts = {"matched": 0, "modified": 0, "upserted": 0, "skipped": 0}
+
+        for impact in impacts:
+            try:
+                changed = self._put(impact, preserve_fields)
+            except ValueError as e:
+                logger.warning("Pominięto impact w zapisie partii: %s", e)
+                counts["skipped"] += 1
+                continue
+
+            if changed is None:
+                counts["upserted"] += 1
+            else:
+                counts["matched"] += 1
+                counts["modified"] += int(changed)
+
+        return counts
+
+    # ================== ODCZYT ==================
+
+    def _select(self, query: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Klucze dokumentów spełniających filtr równościowy, w kolejności wstawienia."""
+        query = query or {}
+
+        indexed = [(f, v) for f, v in query.items() if f in self._indexes]
+        if indexed:
+            candidates = set.intersection(
+                *(self._indexes[f].get(v, set()) for f, v in indexed)
+            )
+        else:
+            candidates = set(self._docs)
+
+        rest = [(f, v) for f, v in query.items() if f not in self._indexes]
+        keys = [
+            k for k in candidates
+            if all(self._docs[k].get(f) == v for f, v in rest)
+        ]
+        keys.sort(key=self._order.__getitem__)
+        return keys
+
+    async def list_impacts(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        institution_uuid: Optional[str] = None,
+        discipline_code: Optional[str] = None,
+        beneficiary_category: Optional[str] = None,
+        evaluation_category: Optional[str] = None,
+        evaluation_period: Optional[str] = None,
+        identifier_key: Optional[str] = None,
+    ) -> List[ImpactCaseSchema]:
+        query = self._list_filters(
+            institution_uuid,
+            discipline_code,
+            beneficiary_category,
+            evaluation_category,
+            evaluation_period,
+            identifier_key,
+        )
+        keys = self._select(query)
+        return [
+            ImpactCaseSchema.model_validate(self._docs[k])
+            for k in keys[skip:skip + limit]
+        ]
+
+    async def get_by_impact_uuid(self, impact_uuid: str) -> Optional[ImpactCaseSchema]:
+        doc = self._docs.get(impact_uuid)
+        return ImpactCaseSchema.model_validate(doc) if doc is not None else None
+
+    async def count(self, institution_uuid: Optional[str] = None) -> int:
+        if not institution_uuid:
+            return len(self._docs)
+        return len(self._indexes["institution_uuid"].get(institution_uuid, ()))
+
+    async def iter_impacts(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ImpactCaseSchema]:
+        for key in self._select(query):
+            doc = self._docs.get(key)
+            if doc is not None:
+                yield ImpactCaseSchema.model_validate(doc)
+
+    async def iter_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        # Kopia płytka: zagnieżdżone listy / słowniki są współdzielone z magazynem
+        for key in self._select(query):
+            doc = self._docs.get(key)
+            if doc is None:
+                continue
+            if fields is None:
+                yield dict(doc)
+            else:
+                yield {f: doc[f] for f in fields if f in doc}
@@ -0,0 +1,175 @@
+# app/repositories/memory_stores.py
+
+from __future__ import annotations
+
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.models import ImpactReportSchema, InstitutionEvaluationSchema, InstitutionImpactSummarySchema
+from app.repositories.base import (
+    EVALUATION_FILTER_FIELDS,
+    BaseEvaluationRepository,
+    BaseInstitutionSummaryRepository,
+    BaseReportRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class InMemoryInstitutionSummaryRepository(BaseInstitutionSummaryRepository):
+    """
+    Podsumowania instytucji w pamięci procesu (para dla InMemoryImpactRepository)
+    – słownik institution_uuid → dokument (`model_dump`).
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[str, Dict[str, Any]] = {}
+
+    async def ensure_indexes(self) -> None:
+        return None
+
+    async def fingerprints(self, institution_uuids: Iterable[str]) -> Dict[str, Optional[str]]:
+        return {
+            uuid: self._docs[uuid].get("fingerprint")
+            for uuid in institution_uuids
+            if uuid in self._docs
+        }
+
+    async def save_many(self, summaries: Iterable[InstitutionImpactSummarySchema]) -> Dict[str, int]:
+        counts = {"matched": 0, "modified": 0, "upserted": 0}
+        for summary in summaries:
+            doc = summary.model_dump()
+            existing = self._docs.get(summary.institution_uuid)
+            if existing is None:
+                counts["upserted"] += 1
+            else:
+                counts["matched"] += 1
+                counts["modified"] += existing != doc
+            self._docs[summary.institution_uuid] = doc
+        return counts
+
+    async def delete_many(self, institution_uuids: Iterable[str]) -> int:
+        return sum(self._docs.pop(uuid, None) is not None for uuid in set(institution_uuids))
+
+    async def get(self, institution_uuid: str) -> Optional[InstitutionImpactSummarySchema]:
+        doc = self._docs.get(institution_uuid)
+        return InstitutionImpactSummarySchema.model_validate(doc) if doc is not None else None
+
+    async def list_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_titles: bool = False,
+    ) -> List[InstitutionImpactSummarySchema]:
+        docs = sorted(self._docs.values(), key=lambda d: (-d["case_count"], d["institution_uuid"]))
+        summaries: List[InstitutionImpactSummarySchema] = []
+        for doc in docs[skip:skip + limit]:
+            summary = InstitutionImpactSummarySchema.model_validate(doc)
+            if not include_titles:
+                summary.titles = []
+            summaries.append(summary)
+        return summaries
+
+    async def count(self) -> int:
+        return len(self._docs)
+
+
+class InMemoryEvaluationRepository(BaseEvaluationRepository):
+    """
+    Ewaluacje instytucji w pamięci procesu – słownik
+    (institution_uuid, evaluation_period) → dokument (`model_dump`).
+    """
+
+    def __init__(self) -> None:
+        self._docs: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    async def ensure_indexes(self) -> None:
+        return None
+
+    async def save_many(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> Dict[str, int]:
+        docs, skipped = self._keyed_documents(evaluations)
+        counts = {"matched": 0, "modified": 0, "upserted": 0, "skipped": skipped}
+        for doc in docs:
+            key = tuple(self._key(doc).values())
+            existing = self._docs.get(key)
+            if existing is None:
+                counts["upserted"] += 1
+            else:
+                counts["matched"] += 1
+                counts["modified"] += existing != doc
+            self._docs[key] = doc
+        return counts
+
+    @staticmethod
+    def _values(doc: Dict[str, Any], name: str) -> List[Any]:
+        if name == "disciplines.category":
+            return [d.get("category") for d in doc.get("disciplines") or ()]
+        return [doc.get(name)]
+
+    @classmethod
+    def _matches(cls, doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+        """Filtr {pole: wartość | {"$in": [...]}} po EVALUATION_FILTER_FIELDS."""
+        for name, condition in query.items():
+            if name not in EVALUATION_FILTER_FIELDS:
+                raise ValueError(f"Backend pamięciowy nie obsługuje filtra ewaluacji po polu {name!r}")
+            if isinstance(condition, dict):
+                if set(condition) != {"$in"}:
+                    raise ValueError(f"Backend pamięciowy obsługuje tylko warunki równościowe i $in, nie: {condition!r}")
+                allowed = set(condition["$in"])
+            else:
+                allowed = {condition}
+            if not any(value in allowed for value in cls._values(doc, name)):
+                return False
+        return True
+
+    async def get_for_institution(self, institution_uuid: str) -> List[InstitutionEvaluationSchema]:
+        docs = [doc for doc in self._docs.values() if doc.get("institution_uuid") == institution_uuid]
+        docs.sort(key=lambda d: d["evaluation_period"], reverse=True)
+        return [InstitutionEvaluationSchema.model_validate(doc) for doc in docs]
+
+    async def count(self, evaluation_period: Optional[str] = None, category: Optional[str] = None) -> int:
+        query = self._filters(evaluation_period, category)
+        return sum(self._matches(doc, query) for doc in self._docs.values())
+
+    async def iter_evaluations(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 500,
+    ) -> AsyncIterator[InstitutionEvaluationSchema]:
+        docs = [self._docs[key] for key in sorted(self._docs) if self._matches(self._docs[key], query or {})]
+        for doc in docs[skip:skip + limit if limit else None]:
+            yield InstitutionEvaluationSchema.model_validate(doc)
+
+
+class InMemoryReportRepository(BaseReportRepository):
+    """Raporty wpływu w pamięci procesu – słownik klucz raportu (REPORT_KEY_FIELDS) → dokument."""
+
+    def __init__(self) -> None:
+        self._docs: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+
+    async def ensure_indexes(self) -> None:
+        return None
+
+    async def save_many(self, reports: Iterable[ImpactReportSchema]) -> Dict[str, int]:
+        counts = {"matched": 0, "modified": 0, "upserted": 0}
+        for report in reports:
+            doc = report.model_dump()
+            key = tuple(self._key(doc).values())
+            existing = self._docs.get(key)
+            if existing is None:
+                counts["upserted"] += 1
+            else:
+                counts["matched"] += 1
+                counts["modified"] += existing != doc
+            self._docs[key] = doc
+        return counts
+
+    async def get_latest(self, entity_id: str) -> Optional[ImpactReportSchema]:
+        docs = [doc for doc in self._docs.values() if doc["entity_id"] == entity_id]
+        if not docs:
+            return None
+        # Jak sortowanie malejące w MongoDB: brak końca okresu na końcu
+        latest = max(docs, key=lambda d: (d["period_end"] is not None, d["period_end"] or 0, d["created_at"]))
+        return ImpactReportSchema.model_validate(latest)
@@ -0,0 +1,71 @@
+# app/repositories/report_repository.py
+
+from __future__ import annotations
+
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, ReplaceOne
+
+from app.db.mongo import db
+from app.models import ImpactReportSchema
+from app.repositories.base import REPORT_KEY_FIELDS, BaseReportRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ReportRepository(BaseReportRepository):
+    """
+    Repozytorium raportów wpływu (ImpactReportSchema) w MongoDB.
+
+    Domyślna kolekcja: `impact_reports`. Ponowne wygenerowanie raportu
+    dla tego samego podmiotu i okresu zastępuje poprzedni dokument.
+    """
+
+    def __init__(
+        self,
+        collection_name: str = "impact_reports",
+        collection: Optional[AsyncIOMotorCollection] = None,
+    ) -> None:
+        self.collection: AsyncIOMotorCollection = (
+            collection if collection is not None else db[collection_name]
+        )
+
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index(
+            [(field, ASCENDING) for field in REPORT_KEY_FIELDS],
+            unique=True,
+        )
+
+    async def save_many(self, reports: Iterable[ImpactReportSchema]) -> Dict[str, int]:
+        """Zapisuje partię raportów jednym `bulk_write` (ReplaceOne z upsert)."""
+        operations: List[ReplaceOne] = []
+        for report in reports:
+            doc = report.model_dump(mode="json")
+            operations.append(ReplaceOne(self._key(doc), doc, upsert=True))
+
+        if not operations:
+            return {"matched": 0, "modified": 0, "upserted": 0}
+
+        result = await self.collection.bulk_write(operations, ordered=False)
+        return {
+            "matched": result.matched_count,
+            "modified": result.modified_count,
+            "upserted": result.upserted_count,
+        }
+
+    async def get_latest(self, entity_id: str) -> Optional[ImpactReportSchema]:
+        """Najnowszy raport podmiotu (po końcu okresu, potem dacie utworzenia)."""
+        doc = await self.collection.find_one(
+            {"entity_id": entity_id},
+            sort=[("period_end", DESCENDING), ("created_at", DESCENDING)],
+        )
+        if not doc:
+            return None
+        doc.pop("_id", None)
+        try:
+            return ImpactReportSchema.model_validate(doc)
+        except Exception as e:
+            logger.error("Błąd walidacji ImpactReportSchema dla entity_id=%s: %s", entity_id, e)
+            return None
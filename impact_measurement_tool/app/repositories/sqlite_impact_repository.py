@@ -0,0 +1,396 @@
+# app/repositories/sqlite_impact_repository.py
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import typing
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from app.models import ImpactCaseSchema
+from app.repositories.base import INDEXED_FIELDS, MULTI_VALUE_FIELDS, BaseImpactRepository
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Liczba kluczy w jednym zapytaniu IN (...) – poniżej limitu zmiennych SQLite
+_KEY_CHUNK = 500
+
+_SQL_TYPES: Dict[type, str] = {str: "TEXT", int: "INTEGER", float: "REAL", bool: "INTEGER"}
+
+
+def _column_type(annotation: Any) -> Optional[str]:
+    """Typ kolumny SQLite dla pola skalarnego albo None dla pól zagnieżdżonych (JSON)."""
+    if typing.get_origin(annotation) is Union:
+        args = [a for a in typing.get_args(annotation) if a is not type(None)]
+        if len(args) == 1:
+            annotation = args[0]
+    return _SQL_TYPES.get(annotation)
+
+
+# Kolumny tabeli wyprowadzone z modelu: skalary jako kolumny typowane,
+# listy / słowniki / modele zagnieżdżone jako JSON w kolumnie TEXT.
+COLUMN_TYPES: Dict[str, Optional[str]] = {
+    name: _column_type(field.annotation)
+    for name, field in ImpactCaseSchema.model_fields.items()
+}
+JSON_COLUMNS: Tuple[str, ...] = tuple(name for name, t in COLUMN_TYPES.items() if t is None)
+COLUMNS: Tuple[str, ...] = tuple(COLUMN_TYPES)
+# Pozycja kolumny w wierszu z _to_row (pierwszy element to upsert_key)
+_ROW_POSITION: Dict[str, int] = {name: i for i, name in enumerate(COLUMNS, 1)}
+
+
+class SqliteImpactRepository(BaseImpactRepository):
+    """
+    Repozytorium impactów w lokalnym pliku SQLite (moduł `sqlite3` z biblioteki standardowej).
+
+    Przeznaczone dla laptopów, CI i wdrożeń jednowęzłowych – nie wymaga serwera.
+    Jedno połączenie (tryb WAL) jest chronione blokadą, a zapytania wykonywane
+    w wątku roboczym (`asyncio.to_thread`), żeby nie blokować pętli zdarzeń.
+
+    Pola-listy z MULTI_VALUE_FIELDS mają tabele pomocnicze `<tabela>__<pole>`
+    (wartość, upsert_key) z kluczem głównym po wartości – filtr po elemencie
+    listy to wyszukiwanie w indeksie, a nie skan kolumny JSON.
+    """
+
+    def __init__(self, path: Union[str, Path] = "imeto.sqlite3", table: str = "radon_impacts") -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Nieprawidłowa nazwa tabeli: {table!r}")
+
+        self.path = str(path)
+        self.table = table
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+        # Zapytania upsert według zbioru pól zachowywanych (preserve_fields)
+        self._upsert_sql: Dict[Tuple[str, ...], str] = {}
+
+    # ================== SCHEMAT ==================
+
+    def _create_schema(self) -> None:
+        columns = ", ".join(f"{name} {COLUMN_TYPES[name] or 'TEXT'}" for name in COLUMNS)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} (upsert_key TEXT PRIMARY KEY, {columns})"
+        )
+
+        # Model mógł dostać nowe pola od czasu utworzenia pliku – dokładamy brakujące kolumny
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({self.table})")}
+        for name in COLUMNS:
+            if name not in existing:
+                logger.info("Dodaję kolumnę %s do tabeli %s", name, self.table)
+                self._conn.execute(
+                    f"ALTER TABLE {self.table} ADD COLUMN {name} {COLUMN_TYPES[name] or 'TEXT'}"
+                )
+
+        for field in MULTI_VALUE_FIELDS:
+            self._create_value_table(field)
+
+        self._create_indexes()
+
+    def _value_table(self, field: str) -> str:
+        return f"{self.table}__{field}"
+
+    def _create_value_table(self, field: str) -> None:
+        name = self._value_table(field)
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        ).fetchone()
+        if exists:
+            return
+
+        self._conn.execute(
+            f"CREATE TABLE {name} (value TEXT NOT NULL, upsert_key TEXT NOT NULL, "
+            f"PRIMARY KEY (value, upsert_key)) WITHOUT ROWID"
+        )
+        self._conn.execute(f"CREATE INDEX ix_{name}_upsert_key ON {name} (upsert_key)")
+        # Plik sprzed dodania tabeli – uzupełniamy ją z kolumny JSON
+        self._conn.execute(
+            f"INSERT OR IGNORE INTO {name} (value, upsert_key) "
+            f"SELECT j.value, t.upsert_key FROM {self.table} AS t, json_each(t.{field}) AS j "
+            f"WHERE t.{field} IS NOT NULL AND json_valid(t.{field})"
+        )
+
+    def _write_values(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Odświeża tabele pomocnicze pól-list dla zapisanych wierszy (w bieżącej transakcji)."""
+        # Ten sam klucz może wystąpić w partii kilka razy – liczy się ostatnia wersja
+        latest = list({row[0]: row for row in rows}.values())
+        keys = [(row[0],) for row in latest]
+        for field in MULTI_VALUE_FIELDS:
+            name = self._value_table(field)
+            position = _ROW_POSITION[field]
+            self._conn.executemany(f"DELETE FROM {name} WHERE upsert_key = ?", keys)
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO {name} (value, upsert_key) VALUES (?, ?)",
+                [
+                    (value, row[0])
+                    for row in latest
+                    for value in json.loads(row[position]) or ()
+                ],
+            )
+
+    def _create_indexes(self) -> None:
+        for field in INDEXED_FIELDS:
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_{field} ON {self.table} ({field})"
+            )
+
+    def _build_upsert_sql(self, preserve_fields: Tuple[str, ...] = ()) -> str:
+        names = ("upsert_key",) + COLUMNS
+        placeholders = ", ".join("?" for _ in names)
+        # Kolumny zachowywane są ustawiane tylko przy INSERT
+        updated = [c for c in COLUMNS if c not in preserve_fields]
+        updates = ", ".join(f"{c} = excluded.{c}" for c in updated)
+        # WHERE: wiersz bez zmian nie jest nadpisywany, więc total_changes liczy tylko realne modyfikacje
+        changed = " OR ".join(f"{c} IS NOT excluded.{c}" for c in updated)
+        return (
+            f"INSERT INTO {self.table} ({', '.join(names)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(upsert_key) DO UPDATE SET {updates} WHERE {changed}"
+        )
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        def locked() -> _T:
+            with self._lock:
+                return fn(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ================== KONWERSJE ==================
+
+    def _to_row(self, impact: ImpactCaseSchema) -> Tuple[Any, ...]:
+        doc: Dict[str, Any] = impact.model_dump()
+        field, key = self.upsert_key(doc)
+        if field in COLUMN_TYPES:
+            doc[field] = key
+
+        values: List[Any] = [key]
+        for name in COLUMNS:
+            value = doc.get(name)
+            if COLUMN_TYPES[name] is None:
+                value = json.dumps(value, ensure_ascii=False)
+            values.append(value)
+        return tuple(values)
+
+    @staticmethod
+    def _from_row(row: Sequence[Any]) -> ImpactCaseSchema:
+        doc = dict(zip(COLUMNS, row))
+        for name in JSON_COLUMNS:
+            if doc[name] is not None:
+                doc[name] = json.loads(doc[name])
+            else:
+                del doc[name]
+        return ImpactCaseSchema.model_validate(doc)
+
+    def _where(self, query: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """
+        Filtr równościowy {kolumna: wartość} → klauzula WHERE z parametrami.
+        Dla pól-list (MULTI_VALUE_FIELDS) – przynależność przez tabelę pomocniczą.
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        for name, value in (query or {}).items():
+            if name in MULTI_VALUE_FIELDS:
+                clauses.append(f"upsert_key IN (SELECT upsert_key FROM {self._value_table(name)} WHERE value = ?)")
+                params.append(value)
+                continue
+            if name not in COLUMN_TYPES or COLUMN_TYPES[name] is None:
+                raise ValueError(f"SQLite obsługuje tylko filtry równościowe po polach skalarnych, nie: {name!r}")
+            clauses.append(f"{name} IS ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    # ================== ZAPIS ==================
+
+    async def ensure_indexes(self) -> None:
+        await self._run(self._create_indexes)
+
+    def _upsert_statement(self, preserve_fields: Sequence[str]) -> str:
+        key = tuple(sorted(f for f in preserve_fields if f in COLUMN_TYPES))
+        sql = self._upsert_sql.get(key)
+        if sql is None:
+            sql = self._upsert_sql[key] = self._build_upsert_sql(key)
+        return sql
+
+    async def save_one(self, impact: ImpactCaseSchema, preserve_fields: Sequence[str] = ()) -> None:
+        await self._run(self._save_rows, [self._to_row(impact)], self._upsert_statement(preserve_fields))
+
+    def _save_rows(self, rows: List[Tuple[Any, ...]], upsert_sql: str) -> Tuple[int, int]:
+        """Zapisuje wiersze w jednej transakcji; zwraca (nowe, zmienione)."""
+        keys = list({row[0] for row in rows})
+        existing = set()
+        for i in range(0, len(keys), _KEY_CHUNK):
+            chunk = keys[i:i + _KEY_CHUNK]
+            cur = self._conn.execute(
+                f"SELECT upsert_key FROM {self.table} WHERE upsert_key IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            )
+            existing.update(k for (k,) in cur)
+
+        before = self._conn.total_changes
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(upsert_sql, rows)
+            # Liczone przed zapisem tabel pomocniczych, które też zwiększają total_changes
+            changes = self._conn.total_changes - before
+            self._write_values(rows)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+        inserted = len(keys) - len(existing)
+        return inserted, changes - inserted
+
+    async def save_many(
+        self,
+        impacts: Iterable[ImpactCaseSchema],
+        preserve_fields: Sequence[str] = (),
+    ) -> Dict[str, int]:
+        """
+        Zapisuje partię impactów w jednej transakcji (INSERT ... ON CONFLICT DO UPDATE;
+        kolumny z `preserve_fields` tylko przy INSERT).
+
+        Zwraca liczniki: matched, modified, upserted, skipped – jak wersja MongoDB.
+        """
+        rows: List[Tuple[Any, ...]] = []
+        skipped = 0
+        for impact in impacts:
+            try:
+                rows.append(self._to_row(impact))
+            except ValueError as e:
+                logger.warning("Pominięto impact w zapisie partii: %s", e)
+                skipped += 1
+
+        if not rows:
+            return {"matched": 0, "modified": 0, "upserted": 0, "skipped": skipped}
+
+        inserted, modified = await self._run(self._save_rows, rows, self._upsert_statement(preserve_fields))
+        return {
+            "matched": len(rows) - inserted,
+            "modified": modified,
+            "upserted": inserted,
+            "skipped": skipped,
+        }
+
+    # ================== ODCZYT ==================
+
+    def _fetch(self, sql: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        return self._conn.execute(sql, params).fetchall()
+
+    async def list_impacts(
+        self,
+        skip: int = 0,
+        limit: int = 50,
+        institution_uuid: Optional[str] = None,
+        discipline_code: Optional[str] = None,
+        beneficiary_category: Optional[str] = None,
+        evaluation_category: Optional[str] = None,
+        evaluation_period: Optional[str] = None,
+        identifier_key: Optional[str] = None,
+    ) -> List[ImpactCaseSchema]:
+        query = self._list_filters(
+            institution_uuid,
+            discipline_code,
+            beneficiary_category,
+            evaluation_category,
+            evaluation_period,
+            identifier_key,
+        )
+        where, params = self._where(query)
+        rows = await self._run(
+            self._fetch,
+            f"SELECT {', '.join(COLUMNS)} FROM {self.table}{where} ORDER BY rowid LIMIT ? OFFSET ?",
+            params + [limit, skip],
+        )
+
+        impacts: List[ImpactCaseSchema] = []
+        for row in rows:
+            try:
+                impacts.append(self._from_row(row))
+            except Exception as e:
+                logger.warning("Nie udało się zmapować wiersza na ImpactCaseSchema: %s", e)
+        return impacts
+
+    async def get_by_impact_uuid(self, impact_uuid: str) -> Optional[ImpactCaseSchema]:
+        rows = await self._run(
+            self._fetch,
+            f"SELECT {', '.join(COLUMNS)} FROM {self.table} WHERE impact_uuid = ? LIMIT 1",
+            [impact_uuid],
+        )
+        if not rows:
+            return None
+        try:
+            return self._from_row(rows[0])
+        except Exception as e:
+            logger.error("Błąd walidacji ImpactCaseSchema dla impact_uuid=%s: %s", impact_uuid, e)
+            return None
+
+    async def count(self, institution_uuid: Optional[str] = None) -> int:
+        where, params = self._where(self._list_filters(institution_uuid))
+        rows = await self._run(self._fetch, f"SELECT COUNT(*) FROM {self.table}{where}", params)
+        return rows[0][0]
+
+    async def _iter_rows(
+        self,
+        query: Optional[Dict[str, Any]],
+        columns: Sequence[str],
+        batch_size: int,
+    ) -> AsyncIterator[Tuple[Any, ...]]:
+        """
+        Wiersze (bez rowid) pasujące do `query`, stronicowane po `rowid` (keyset),
+        więc każda partia to szybki skan indeksu niezależnie od pozycji w tabeli.
+        """
+        where, params = self._where(query)
+        where = f"{where} AND rowid > ?" if where else " WHERE rowid > ?"
+        sql = f"SELECT rowid, {', '.join(columns)} FROM {self.table}{where} ORDER BY rowid LIMIT ?"
+
+        last_rowid = 0
+        while True:
+            rows = await self._run(self._fetch, sql, params + [last_rowid, batch_size])
+            for row in rows:
+                yield row[1:]
+            if len(rows) < batch_size:
+                return
+            last_rowid = rows[-1][0]
+
+    async def iter_impacts(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[ImpactCaseSchema]:
+        async for row in self._iter_rows(query, COLUMNS, batch_size):
+            try:
+                yield self._from_row(row)
+            except Exception as e:
+                logger.warning("Nie udało się zmapować wiersza na ImpactCaseSchema: %s", e)
+
+    async def iter_documents(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        fields: Optional[Sequence[str]] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Surowe dokumenty; czytane są tylko kolumny z `fields`."""
+        columns = COLUMNS if fields is None else tuple(f for f in fields if f in COLUMN_TYPES)
+        json_columns = [c for c in columns if c in JSON_COLUMNS]
+
+        async for row in self._iter_rows(query, columns, batch_size):
+            doc = dict(zip(columns, row))
+            for name in json_columns:
+                if doc[name] is not None:
+                    doc[name] = json.loads(doc[name])
+            yield doc
@@ -0,0 +1,360 @@
+# app/repositories/sqlite_stores.py
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from app.models import ImpactReportSchema, InstitutionEvaluationSchema, InstitutionImpactSummarySchema
+from app.repositories.base import (
+    EVALUATION_FILTER_FIELDS,
+    EVALUATION_KEY_FIELDS,
+    BaseEvaluationRepository,
+    BaseInstitutionSummaryRepository,
+    BaseReportRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Liczba kluczy w jednym zapytaniu IN (...) – poniżej limitu zmiennych SQLite
+_KEY_CHUNK = 500
+
+
+class SqliteDocumentStore:
+    """
+    Wspólna część magazynów pomocniczych w SQLite (podsumowania, ewaluacje,
+    raporty): tabela z kolumnami klucza i sortowania oraz pełnym dokumentem
+    (`model_dump(mode="json")`) w kolumnie `doc`.
+
+    Jak SqliteImpactRepository: jedno połączenie (tryb WAL) chronione blokadą,
+    zapytania w wątku roboczym. Zwykle ten sam plik co impacty – każdy
+    magazyn ma własną tabelę i połączenie.
+    """
+
+    # Kolumny tabeli poza `doc` (nazwa → typ SQL), klucz główny i indeksy
+    COLUMNS: Dict[str, str] = {}
+    KEY_COLUMNS: Tuple[str, ...] = ()
+    INDEXES: Tuple[Tuple[str, ...], ...] = ()
+
+    def __init__(self, path: Union[str, Path], table: str) -> None:
+        if not table.isidentifier():
+            raise ValueError(f"Nieprawidłowa nazwa tabeli: {table!r}")
+
+        self.path = str(path)
+        self.table = table
+        self._lock = threading.Lock()
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type in self.COLUMNS.items())
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ({columns}, doc TEXT NOT NULL, "
+            f"PRIMARY KEY ({', '.join(self.KEY_COLUMNS)}))"
+        )
+        self._create_indexes()
+
+        names = tuple(self.COLUMNS) + ("doc",)
+        self._upsert_sql = (
+            f"INSERT INTO {self.table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)}) "
+            f"ON CONFLICT({', '.join(self.KEY_COLUMNS)}) DO UPDATE SET "
+            + ", ".join(f"{name} = excluded.{name}" for name in names if name not in self.KEY_COLUMNS)
+            # Dokument bez zmian nie jest nadpisywany – total_changes liczy tylko realne modyfikacje
+            + " WHERE doc IS NOT excluded.doc"
+        )
+
+    def _create_indexes(self) -> None:
+        for columns in self.INDEXES:
+            name = "_".join(c.split()[0] for c in columns)
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{self.table}_{name} ON {self.table} ({', '.join(columns)})"
+            )
+
+    async def _run(self, fn: Callable[..., _T], *args: Any) -> _T:
+        def locked() -> _T:
+            with self._lock:
+                return fn(*args)
+
+        return await asyncio.to_thread(locked)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    async def ensure_indexes(self) -> None:
+        await self._run(self._create_indexes)
+
+    def _to_row(self, doc: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(doc.get(name) for name in self.COLUMNS) + (json.dumps(doc, ensure_ascii=False),)
+
+    def _upsert_rows(self, rows: List[Tuple[Any, ...]]) -> Dict[str, int]:
+        """Upsert wierszy w jednej transakcji; liczniki jak bulk_write w MongoDB."""
+        before_rows = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        before = self._conn.total_changes
+        self._conn.execute("BEGIN")
+        try:
+            self._conn.executemany(self._upsert_sql, rows)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+        upserted = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0] - before_rows
+        return {
+            "matched": len(rows) - upserted,
+            "modified": self._conn.total_changes - before - upserted,
+            "upserted": upserted,
+        }
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> List[Tuple[Any, ...]]:
+        return self._conn.execute(sql, params).fetchall()
+
+    def _fetch_in(self, sql: str, column: str, values: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        """`sql` z warunkiem `column IN (...)` dla kolejnych porcji `values`."""
+        rows: List[Tuple[Any, ...]] = []
+        for i in range(0, len(values), _KEY_CHUNK):
+            chunk = list(values[i:i + _KEY_CHUNK])
+            rows.extend(self._conn.execute(f"{sql} WHERE {column} IN ({', '.join('?' for _ in chunk)})", chunk))
+        return rows
+
+    def _delete_in(self, column: str, values: Sequence[Any]) -> int:
+        before = self._conn.total_changes
+        for i in range(0, len(values), _KEY_CHUNK):
+            chunk = list(values[i:i + _KEY_CHUNK])
+            self._conn.execute(f"DELETE FROM {self.table} WHERE {column} IN ({', '.join('?' for _ in chunk)})", chunk)
+        return self._conn.total_changes - before
+
+
+class SqliteInstitutionSummaryRepository(SqliteDocumentStore, BaseInstitutionSummaryRepository):
+    """Podsumowania instytucji w SQLite – tabela `institution_summaries`, wiersz na instytucję."""
+
+    COLUMNS = {"institution_uuid": "TEXT NOT NULL", "case_count": "INTEGER NOT NULL", "fingerprint": "TEXT"}
+    KEY_COLUMNS = ("institution_uuid",)
+    INDEXES = (("case_count DESC", "institution_uuid"),)
+
+    def __init__(self, path: Union[str, Path] = "imeto.sqlite3", table: str = "institution_summaries") -> None:
+        super().__init__(path, table)
+
+    async def fingerprints(self, institution_uuids: Iterable[str]) -> Dict[str, Optional[str]]:
+        rows = await self._run(
+            self._fetch_in,
+            f"SELECT institution_uuid, fingerprint FROM {self.table}",
+            "institution_uuid",
+            list(dict.fromkeys(institution_uuids)),
+        )
+        return dict(rows)
+
+    async def save_many(self, summaries: Iterable[InstitutionImpactSummarySchema]) -> Dict[str, int]:
+        rows = [self._to_row(summary.model_dump(mode="json")) for summary in summaries]
+        if not rows:
+            return {"matched": 0, "modified": 0, "upserted": 0}
+        return await self._run(self._upsert_rows, rows)
+
+    async def delete_many(self, institution_uuids: Iterable[str]) -> int:
+        uuids = list(institution_uuids)
+        if not uuids:
+            return 0
+        return await self._run(self._delete_in, "institution_uuid", uuids)
+
+    @staticmethod
+    def _validate(doc_json: str, include_titles: bool = True) -> Optional[InstitutionImpactSummarySchema]:
+        doc = json.loads(doc_json)
+        if not include_titles:
+            doc.pop("titles", None)
+        try:
+            return InstitutionImpactSummarySchema.model_validate(doc)
+        except Exception as e:
+            logger.error(
+                "Błąd walidacji InstitutionImpactSummarySchema dla institution_uuid=%s: %s",
+                doc.get("institution_uuid"),
+                e,
+            )
+            return None
+
+    async def get(self, institution_uuid: str) -> Optional[InstitutionImpactSummarySchema]:
+        rows = await self._run(
+            self._fetch, f"SELECT doc FROM {self.table} WHERE institution_uuid = ?", [institution_uuid]
+        )
+        return self._validate(rows[0][0]) if rows else None
+
+    async def list_summaries(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        include_titles: bool = False,
+    ) -> List[InstitutionImpactSummarySchema]:
+        rows = await self._run(
+            self._fetch,
+            f"SELECT doc FROM {self.table} ORDER BY case_count DESC, institution_uuid LIMIT ? OFFSET ?",
+            [limit, skip],
+        )
+        summaries = (self._validate(doc, include_titles) for (doc,) in rows)
+        return [summary for summary in summaries if summary is not None]
+
+    async def count(self) -> int:
+        rows = await self._run(self._fetch, f"SELECT COUNT(*) FROM {self.table}")
+        return rows[0][0]
+
+
+class SqliteEvaluationRepository(SqliteDocumentStore, BaseEvaluationRepository):
+    """
+    Ewaluacje instytucji w SQLite – tabela `radon_evaluations`, wiersz na
+    (institution_uuid, evaluation_period). Filtr po kategorii dyscypliny
+    przegląda listę `disciplines` dokumentu (json_each).
+    """
+
+    COLUMNS = {"institution_uuid": "TEXT NOT NULL", "evaluation_period": "TEXT NOT NULL"}
+    KEY_COLUMNS = EVALUATION_KEY_FIELDS
+    INDEXES = (("evaluation_period",),)
+
+    def __init__(self, path: Union[str, Path] = "imeto.sqlite3", table: str = "radon_evaluations") -> None:
+        super().__init__(path, table)
+
+    async def save_many(self, evaluations: Iterable[InstitutionEvaluationSchema]) -> Dict[str, int]:
+        docs, skipped = self._keyed_documents(evaluations, mode="json")
+        if not docs:
+            return {"matched": 0, "modified": 0, "upserted": 0, "skipped": skipped}
+        counts = await self._run(self._upsert_rows, [self._to_row(doc) for doc in docs])
+        return {**counts, "skipped": skipped}
+
+    def _where(self, query: Optional[Dict[str, Any]]) -> Tuple[str, List[Any]]:
+        """Filtr {pole: wartość | {"$in": [...]}} po EVALUATION_FILTER_FIELDS → klauzula WHERE."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        for name, condition in (query or {}).items():
+            if isinstance(condition, dict):
+                if set(condition) != {"$in"}:
+                    raise ValueError(f"SQLite obsługuje tylko warunki równościowe i $in, nie: {condition!r}")
+                values = list(condition["$in"])
+            else:
+                values = [condition]
+            placeholders = ", ".join("?" for _ in values)
+
+            if name == "disciplines.category":
+                clauses.append(
+                    f"EXISTS (SELECT 1 FROM json_each({self.table}.doc, '$.disciplines') AS d "
+                    f"WHERE json_extract(d.value, '$.category') IN ({placeholders}))"
+                )
+            elif name in EVALUATION_FILTER_FIELDS:
+                clauses.append(f"{name} IN ({placeholders})")
+            else:
+                raise ValueError(f"SQLite nie obsługuje filtra ewaluacji po polu {name!r}")
+            params.extend(values)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    @staticmethod
+    def _to_model(doc_json: str) -> Optional[InstitutionEvaluationSchema]:
+        doc = json.loads(doc_json)
+        try:
+            return InstitutionEvaluationSchema.model_validate(doc)
+        except Exception as e:
+            logger.error(
+                "Błąd walidacji InstitutionEvaluationSchema dla institution_uuid=%s: %s",
+                doc.get("institution_uuid"),
+                e,
+            )
+            return None
+
+    async def get_for_institution(self, institution_uuid: str) -> List[InstitutionEvaluationSchema]:
+        rows = await self._run(
+            self._fetch,
+            f"SELECT doc FROM {self.table} WHERE institution_uuid = ? ORDER BY evaluation_period DESC",
+            [institution_uuid],
+        )
+        evaluations = (self._to_model(doc) for (doc,) in rows)
+        return [evaluation for evaluation in evaluations if evaluation is not None]
+
+    async def count(self, evaluation_period: Optional[str] = None, category: Optional[str] = None) -> int:
+        where, params = self._where(self._filters(evaluation_period, category))
+        rows = await self._run(self._fetch, f"SELECT COUNT(*) FROM {self.table}{where}", params)
+        return rows[0][0]
+
+    async def iter_evaluations(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        batch_size: int = 500,
+    ) -> AsyncIterator[InstitutionEvaluationSchema]:
+        """Odczyt partiami po `batch_size` wierszy (stronicowanie po kluczu, bez OFFSET w kolejnych partiach)."""
+        where, params = self._where(query)
+        order = ", ".join(EVALUATION_KEY_FIELDS)
+        remaining = limit or None
+        last: Optional[Tuple[Any, ...]] = None
+        offset = skip
+
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            after = ""
+            after_params: List[Any] = []
+            if last is not None:
+                after = (" AND " if where else " WHERE ") + f"({order}) > ({', '.join('?' for _ in last)})"
+                after_params = list(last)
+            rows = await self._run(
+                self._fetch,
+                f"SELECT {order}, doc FROM {self.table}{where}{after} ORDER BY {order} LIMIT ? OFFSET ?",
+                params + after_params + [size, offset],
+            )
+            if not rows:
+                return
+            offset = 0
+            last = tuple(rows[-1][:-1])
+            if remaining is not None:
+                remaining -= len(rows)
+
+            for row in rows:
+                evaluation = self._to_model(row[-1])
+                if evaluation is not None:
+                    yield evaluation
+            if len(rows) < size:
+                return
+
+
+class SqliteReportRepository(SqliteDocumentStore, BaseReportRepository):
+    """
+    Raporty wpływu w SQLite – tabela `impact_reports`. Okres raportu bywa
+    pusty (NULL), a NULL w kluczu głównym nie koliduje z innym NULL, więc
+    kluczem jest `report_key` – JSON z wartości REPORT_KEY_FIELDS.
+    """
+
+    COLUMNS = {"report_key": "TEXT NOT NULL", "entity_id": "TEXT NOT NULL", "period_end": "INTEGER", "created_at": "TEXT"}
+    KEY_COLUMNS = ("report_key",)
+    INDEXES = (("entity_id", "period_end DESC", "created_at DESC"),)
+
+    def __init__(self, path: Union[str, Path] = "imeto.sqlite3", table: str = "impact_reports") -> None:
+        super().__init__(path, table)
+
+    def _to_row(self, doc: Dict[str, Any]) -> Tuple[Any, ...]:
+        # report_key jest pierwszą kolumną tabeli, ale nie polem dokumentu
+        return (json.dumps(list(self._key(doc).values())),) + super()._to_row(doc)[1:]
+
+    async def save_many(self, reports: Iterable[ImpactReportSchema]) -> Dict[str, int]:
+        rows = [self._to_row(report.model_dump(mode="json")) for report in reports]
+        if not rows:
+            return {"matched": 0, "modified": 0, "upserted": 0}
+        return await self._run(self._upsert_rows, rows)
+
+    async def get_latest(self, entity_id: str) -> Optional[ImpactReportSchema]:
+        rows = await self._run(
+            self._fetch,
+            f"SELECT doc FROM {self.table} WHERE entity_id = ? "
+            f"ORDER BY period_end DESC, created_at DESC LIMIT 1",
+            [entity_id],
+        )
+        if not rows:
+            return None
+        try:
+            return ImpactReportSchema.model_validate_json(rows[0][0])
+        except Exception as e:
+            logger.error("Błąd walidacji ImpactReportSchema dla entity_id=%s: %s", entity_id, e)
+            return None
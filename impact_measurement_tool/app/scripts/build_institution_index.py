@@ -0,0 +1,95 @@
+# app/scripts/build_institution_index.py
+"""
+Buduje od zera indeks instytucji UUID ↔ nazwa (app/analytics/institutions.py)
+z impactów w repozytorium i – opcjonalnie – z ewaluacji. Na co dzień indeks
+jest uzupełniany przez skrypty ingestu; ten skrypt służy do pierwszego
+wypełnienia albo odbudowy pliku. Plik wskazuje IMETO_INSTITUTION_INDEX.
+
+Użycie:
+    # Impacty z repozytorium (domyślny backend):
+    python -m app.scripts.build_institution_index
+
+    # Impacty z SQLite + ewaluacje z kolekcji radon_evaluations:
+    python -m app.scripts.build_institution_index --backend sqlite --with-evaluations
+
+    # Ewaluacje ze zrzutów zamiast MongoDB, własny plik indeksu:
+    python -m app.scripts.build_institution_index --evaluations evaluations.ndjson -o data/institutions.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import List
+
+from app.analytics.institutions import InstitutionIndex, evaluation_counts, refresh_impact_counts
+from app.db.settings import storage_settings
+from app.dumps.readers import iter_model_dump
+from app.models import InstitutionEvaluationSchema
+from app.repositories.factory import add_storage_arguments, evaluation_repository_from_args, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Budowa indeksu instytucji (UUID ↔ nazwa) z impactów i ewaluacji.")
+    evaluations_source = parser.add_mutually_exclusive_group()
+    evaluations_source.add_argument(
+        "--evaluations",
+        nargs="+",
+        default=None,
+        help="Zrzuty ewaluacji (JSON/NDJSON) – nazwy wariantowe i liczba okresów ewaluacji.",
+    )
+    evaluations_source.add_argument(
+        "--with-evaluations",
+        action="store_true",
+        help="Ewaluacje z kolekcji MongoDB radon_evaluations.",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default=storage_settings.institution_index_path,
+        help="Plik indeksu (domyślnie IMETO_INSTITUTION_INDEX).",
+    )
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    index = InstitutionIndex()
+    repo = repository_from_args(args)
+    async for doc in repo.iter_documents(fields=["institution_uuid", "institution_name"]):
+        index.observe(doc.get("institution_uuid"), doc.get("institution_name"))
+    await refresh_impact_counts(index, repo)
+
+    evaluations: List[InstitutionEvaluationSchema] = []
+    if args.evaluations:
+        for path in args.evaluations:
+            evaluations.extend(iter_model_dump(path, InstitutionEvaluationSchema))
+    elif args.with_evaluations:
+        async for evaluation in evaluation_repository_from_args(args).iter_evaluations():
+            evaluations.append(evaluation)
+
+    index.observe_evaluations(evaluations)
+    for uuid, periods in evaluation_counts(evaluations).items():
+        index.set_counts(uuid, evaluations=periods)
+
+    index.save(args.output)
+    logger.info(
+        "Indeks instytucji gotowy: %d instytucji (%d ewaluacji) w %.1fs → %s",
+        len(index),
+        len(evaluations),
+        time.perf_counter() - started,
+        args.output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+# app/scripts/build_institution_summaries.py
+"""
+Przelicza podsumowania impactów instytucji (`institution_summaries` na
+wybranym backendzie, app/pipeline/institution_summaries.py) z impactów
+w repozytorium. Ingest impactów robi to sam dla pobranych instytucji; ten
+skrypt służy do pierwszego wypełnienia kolekcji i po imporcie zrzutów.
+
+Zapisywane są tylko podsumowania, których treść się zmieniła.
+
+Użycie:
+    python -m app.scripts.build_institution_summaries
+    python -m app.scripts.build_institution_summaries --backend sqlite
+    python -m app.scripts.build_institution_summaries --institution-uuid <uuid1> <uuid2>
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+
+from app.pipeline.institution_summaries import SUMMARY_BATCH_SIZE, refresh_institution_summaries
+from app.repositories.factory import add_storage_arguments, repository_from_args, summary_repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Przeliczenie podsumowań impactów instytucji.")
+    parser.add_argument(
+        "--institution-uuid",
+        nargs="+",
+        default=None,
+        help="Przelicz tylko te instytucje (bez tej opcji – wszystkie z repozytorium).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=SUMMARY_BATCH_SIZE,
+        help=f"Liczba instytucji w partii zapisu (domyślnie: {SUMMARY_BATCH_SIZE}).",
+    )
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    store = summary_repository_from_args(args)
+    await store.ensure_indexes()
+    counts = await refresh_institution_summaries(
+        repository_from_args(args),
+        store,
+        institution_uuids=args.institution_uuid,
+        batch_size=args.batch_size,
+    )
+
+    logger.info(
+        "Przeliczono podsumowania %d instytucji w %.1fs – zmienione: %d, usunięte: %d",
+        counts["institutions"],
+        time.perf_counter() - started,
+        counts["changed"],
+        counts["removed"],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
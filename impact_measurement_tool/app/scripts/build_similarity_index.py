@@ -0,0 +1,99 @@
+# app/scripts/build_similarity_index.py
+"""
+Buduje lokalny indeks podobieństwa (app/analytics/similarity.py) nad narracjami
+impactów i fragmentami produktów naukowych. Indeks jest używany przez API
+(/similarity) – katalog wskazuje IMETO_SIMILARITY_INDEX.
+
+Użycie:
+    # Impacty z repozytorium:
+    python -m app.scripts.build_similarity_index
+
+    # Impacty ze zrzutu + produkty (ScientificProductSchema, JSON/NDJSON):
+    python -m app.scripts.build_similarity_index -i impacts.parquet --products products.ndjson -o data/similarity
+
+    # Gęste embeddingi z własnej wtyczki zamiast TF-IDF:
+    python -m app.scripts.build_similarity_index --embedder my_pkg.embeddings:create
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import List, Tuple
+
+from app.analytics.similarity import (
+    DEFAULT_DIM,
+    IMPACT_TEXT_FIELDS,
+    IndexItem,
+    build_index,
+    impact_entries,
+    product_entries,
+)
+from app.db.settings import storage_settings
+from app.dumps.readers import iter_dump, iter_product_dump
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Budowa lokalnego indeksu podobieństwa impactów i produktów.")
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        default=None,
+        help="Zrzuty impactów (JSON/NDJSON/Parquet/Arrow). Bez tej opcji impacty są czytane z repozytorium.",
+    )
+    parser.add_argument("--skip-impacts", action="store_true", help="Nie indeksuj impactów (tylko produkty).")
+    parser.add_argument(
+        "--products",
+        nargs="+",
+        default=[],
+        help="Pliki z produktami naukowymi (ScientificProductSchema, JSON/NDJSON).",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default=storage_settings.similarity_index_path,
+        help="Katalog indeksu (domyślnie IMETO_SIMILARITY_INDEX).",
+    )
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help=f"Wymiar wektorów TF-IDF (domyślnie: {DEFAULT_DIM}).")
+    parser.add_argument(
+        "--embedder",
+        type=str,
+        default=None,
+        help="Wtyczka gęstych embeddingów 'modul:fabryka' zamiast haszowanego TF-IDF.",
+    )
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    entries: List[Tuple[IndexItem, str]] = []
+
+    if not args.skip_impacts:
+        if args.input:
+            fields = set(IMPACT_TEXT_FIELDS)
+            for path in args.input:
+                entries.extend(impact_entries(i.model_dump(include=fields) for i in iter_dump(path)))
+        else:
+            repo = repository_from_args(args)
+            docs = [doc async for doc in repo.iter_documents(fields=IMPACT_TEXT_FIELDS)]
+            entries.extend(impact_entries(docs))
+
+    for path in args.products:
+        entries.extend(product_entries(iter_product_dump(path)))
+
+    rows = build_index(entries, args.output, dim=args.dim, embedder_spec=args.embedder)
+    logger.info("Indeks gotowy: %d wierszy w %.1fs", rows, time.perf_counter() - started)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+# app/scripts/chunk_products.py
+"""
+Dzieli pełne teksty produktów naukowych (`raw_content`) na fragmenty
+(app/pipeline/chunking.py) i zapisuje produkty z `chunk_offsets` do NDJSON.
+
+Wejście i wyjście są przetwarzane strumieniowo – w pamięci są tylko partie
+w locie, więc plik może być dowolnie duży.
+
+Użycie:
+    python -m app.scripts.chunk_products -i products.ndjson -o products.chunked.ndjson
+
+    # Granice akapitów, 4 procesy, teksty fragmentów w polu `chunks`:
+    python -m app.scripts.chunk_products -i products.ndjson -o out.ndjson \\
+        --boundary paragraph --workers 4 --materialize
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Iterator
+
+from app.dumps.readers import iter_product_dump
+from app.models import ScientificProductSchema
+from app.pipeline.chunking import (
+    BOUNDARIES,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_OVERLAP,
+    ChunkingConfig,
+    chunk_products,
+    chunk_products_parallel,
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Dzielenie tekstów produktów naukowych na fragmenty.")
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        required=True,
+        help="Pliki z produktami naukowymi (ScientificProductSchema, JSON/NDJSON/Parquet/Arrow).",
+    )
+    parser.add_argument("--output", "-o", type=str, required=True, help="Plik wynikowy NDJSON.")
+    parser.add_argument("--size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Maks. długość fragmentu w znakach (domyślnie: {DEFAULT_CHUNK_SIZE}).")
+    parser.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help=f"Zakładka między fragmentami w znakach (domyślnie: {DEFAULT_OVERLAP}).")
+    parser.add_argument("--boundary", choices=BOUNDARIES, default="sentence", help="Preferowane granice fragmentów (domyślnie: sentence).")
+    parser.add_argument("--workers", type=int, default=1, help="Liczba procesów (1 = w bieżącym procesie, 0 = liczba rdzeni).")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help=f"Produktów na partię dla procesu (domyślnie: {DEFAULT_BATCH_SIZE}).")
+    parser.add_argument("--materialize", action="store_true", help="Zapisz też teksty fragmentów w polu `chunks`.")
+
+    args = parser.parse_args()
+    config = ChunkingConfig(size=args.size, overlap=args.overlap, boundary=args.boundary)
+
+    def products() -> Iterator[ScientificProductSchema]:
+        for path in args.input:
+            yield from iter_product_dump(path)
+
+    if args.workers == 1:
+        chunked = chunk_products(products(), config, materialize=args.materialize)
+    else:
+        chunked = chunk_products_parallel(
+            products(),
+            config,
+            workers=args.workers or None,
+            batch_size=args.batch_size,
+            materialize=args.materialize,
+        )
+
+    started = time.perf_counter()
+    count = chunks = 0
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as f:
+        for product in chunked:
+            f.write(product.model_dump_json())
+            f.write("\n")
+            count += 1
+            chunks += len(product.chunk_offsets)
+
+    logger.info(
+        "Podzielono %d produktów na %d fragmentów w %.1fs → %s",
+        count, chunks, time.perf_counter() - started, output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+# app/scripts/diff_dumps.py
+"""
+Porównuje dwa zrzuty impactów (np. datowane zrzuty z download_impacts)
+i zapisuje zbiór zmian jako NDJSON: impacty dodane, usunięte i zmienione
+z listą zmienionych pól (app/dumps/diff.py).
+
+Zrzuty są czytane strumieniowo i rozkładane na partycje na dysku, więc
+mogą być większe niż pamięć; pliki tymczasowe trafiają do --tmp-dir.
+
+Użycie:
+    python -m app.scripts.diff_dumps impacts_2024-01.json impacts_2024-02.json -o changes.ndjson
+    python -m app.scripts.diff_dumps old.parquet new.ndjson --with-old --partitions 64 --tmp-dir /data/tmp
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+
+from app.dumps.diff import DEFAULT_IGNORED_FIELDS, DIFF_OPS, diff_dumps
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+        stream=sys.stderr,
+    )
+
+    parser = argparse.ArgumentParser(description="Zbiór zmian (NDJSON) między dwoma zrzutami impactów.")
+    parser.add_argument("old", help="Starszy zrzut (.json, .ndjson/.jsonl, .parquet lub .arrows).")
+    parser.add_argument("new", help="Nowszy zrzut.")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Plik NDJSON (domyślnie: stdout).")
+    parser.add_argument(
+        "--with-old",
+        action="store_true",
+        help="Dla zmienionych impactów zapisz też poprzednie wartości pól.",
+    )
+    parser.add_argument(
+        "--ignore-field",
+        nargs="+",
+        default=list(DEFAULT_IGNORED_FIELDS),
+        help=f"Pola pomijane w porównaniu (domyślnie: {' '.join(DEFAULT_IGNORED_FIELDS)}).",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=None,
+        help="Liczba partycji na dysku (domyślnie: z rozmiaru plików, ok. 64 MB na partycję).",
+    )
+    parser.add_argument("--tmp-dir", type=str, default=None, help="Katalog na partycje tymczasowe.")
+
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        summary = diff_dumps(
+            args.old,
+            args.new,
+            out,
+            partitions=args.partitions,
+            tmp_dir=args.tmp_dir,
+            ignored_fields=args.ignore_field,
+            with_old=args.with_old,
+        )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info(
+        "Porównano zrzuty w %.1fs – %s, bez zmian: %d",
+        time.perf_counter() - started,
+        ", ".join(f"{op}: {summary[op]}" for op in DIFF_OPS),
+        summary.get("unchanged", 0),
+    )
+    for name in ("duplicates_old", "duplicates_new", "invalid", "without_uuid"):
+        if summary.get(name):
+            logger.warning("  %s: %d", name, summary[name])
+    for field, count in summary["fields"].items():
+        logger.info("  %-32s %d", field, count)
+
+
+if __name__ == "__main__":
+    main()
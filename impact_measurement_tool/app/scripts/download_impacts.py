@@ -7,6 +7,12 @@ Użycie:
     # Wszystkie impacty (kindCode=1), zapis do JSON:
     python -m app.scripts.download_impacts --output impacts.json
 
+    # Wszystkie impacty, zapis strumieniowy do NDJSON (jeden rekord na linię):
+    python -m app.scripts.download_impacts --output impacts.ndjson
+
+    # Wszystkie impacty, zapis do Parquet (typowane kolumny, kompresja zstd):
+    python -m app.scripts.download_impacts --output impacts.parquet
+
     # Wszystkie impacty, zapis do CSV:
     python -m app.scripts.download_impacts --output impacts.csv
 
@@ -23,14 +29,23 @@ Użycie:
 from __future__ import annotations
 
 import argparse
-import json
-import csv
 import logging
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 from app.connectors.radon import RadonConnector
+from app.dumps.writers import (  # noqa: F401 – flatten_impact re-eksportowane dla zgodności
+    DEFAULT_MAX_ACHIEVEMENTS,
+    DEFAULT_MAX_EVIDENCE,
+    WRITERS_BY_SUFFIX,
+    CsvImpactWriter,
+    JsonArrayImpactWriter,
+    add_writer_arguments,
+    flatten_impact,
+    open_writer,
+    writer_kwargs_from_args,
+)
 from app.models import ImpactCaseSchema
 
 logger = logging.getLogger(__name__)
@@ -50,24 +65,27 @@ def download_all_impacts(
     kind_code: str = "1",
     page_size: int = 50,
     max_records: Optional[int] = None,
-) -> List[ImpactCaseSchema]:
-    """Pobiera wszystkie impacty po kindCode."""
-    impacts: List[ImpactCaseSchema] = []
+) -> Iterator[ImpactCaseSchema]:
+    """
+    Pobiera wszystkie impacty po kindCode.
+
+    Generator – rekordy są oddawane na bieżąco, bez gromadzenia w pamięci.
+    """
+    count = 0
 
     for impact in connector.iter_all_impacts(
         kind_code=kind_code,
         page_size=page_size,
     ):
-        impacts.append(impact)
+        yield impact
+        count += 1
 
-        if len(impacts) % page_size == 0:
-            logger.info("Pobrano %d rekordów...", len(impacts))
+        if count % page_size == 0:
+            logger.info("Pobrano %d rekordów...", count)
 
-        if max_records and len(impacts) >= max_records:
+        if max_records and count >= max_records:
             logger.info("Osiągnięto limit %d rekordów.", max_records)
-            break
-
-    return impacts
+            return
 
 
 def download_impacts_for_institutions(
@@ -75,9 +93,13 @@ def download_impacts_for_institutions(
     institution_uuids: List[str],
     page_size: int = 50,
     max_records: Optional[int] = None,
-) -> List[ImpactCaseSchema]:
-    """Pobiera impacty dla listy instytucji (po UUID)."""
-    impacts: List[ImpactCaseSchema] = []
+) -> Iterator[ImpactCaseSchema]:
+    """
+    Pobiera impacty dla listy instytucji (po UUID).
+
+    Generator – rekordy są oddawane na bieżąco, bez gromadzenia w pamięci.
+    """
+    count = 0
 
     for i, uuid in enumerate(institution_uuids, 1):
         logger.info(
@@ -88,81 +110,50 @@ def download_impacts_for_institutions(
             institution_uuid=uuid,
             page_size=page_size,
         ):
-            impacts.append(impact)
+            yield impact
+            count += 1
 
-            if max_records and len(impacts) >= max_records:
+            if max_records and count >= max_records:
                 logger.info("Osiągnięto limit %d rekordów.", max_records)
-                return impacts
+                return
 
         logger.info(
             "Instytucja %s — łącznie pobrano dotychczas %d rekordów.",
-            uuid, len(impacts),
+            uuid, count,
         )
 
-    return impacts
-
-
-def flatten_impact(impact: ImpactCaseSchema) -> Dict[str, Any]:
-    """
-    Spłaszcza zagnieżdżone pola (evidence, achievements) do osobnych kolumn.
-    Np. evidence_1_pl, evidence_1_en, ..., achievement_1_bibliographic_pl, ...
-    """
-    row = impact.model_dump(exclude={"raw", "impact_evidence", "achievements"})
-
-    # impact_areas: lista → string
-    row["impact_areas"] = "; ".join(row.get("impact_areas") or [])
-
-    # Evidence (max 5)
-    for i, ev in enumerate(impact.impact_evidence, 1):
-        row[f"evidence_{i}_pl"] = ev.description_pl
-        row[f"evidence_{i}_en"] = ev.description_en
-
-    # Achievements (max 5)
-    for i, ach in enumerate(impact.achievements, 1):
-        row[f"achievement_{i}_bibliographic_pl"] = ach.bibliographic_description_pl
-        row[f"achievement_{i}_bibliographic_en"] = ach.bibliographic_description_en
-        row[f"achievement_{i}_summary_pl"] = ach.summary_pl
-        row[f"achievement_{i}_summary_en"] = ach.summary_en
-
-    return row
-
-
-def save_json(impacts: List[ImpactCaseSchema], path: Path) -> None:
-    """Zapisuje impacty do JSON (bez pola 'raw')."""
-    data = [impact.model_dump(exclude={"raw"}) for impact in impacts]
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    logger.info("Zapisano %d rekordów do %s", len(data), path)
-
 
-def save_json_full(impacts: List[ImpactCaseSchema], path: Path) -> None:
-    """Zapisuje impacty do JSON z pełnym polem 'raw'."""
-    data = [impact.model_dump() for impact in impacts]
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    logger.info("Zapisano %d rekordów (z raw) do %s", len(data), path)
+def save_json(impacts: Iterable[ImpactCaseSchema], path: Path) -> int:
+    """Zapisuje impacty strumieniowo do JSON (bez pola 'raw')."""
+    with JsonArrayImpactWriter(path) as writer:
+        return writer.write_all(impacts)
 
 
-def save_csv(impacts: List[ImpactCaseSchema], path: Path) -> None:
-    """Zapisuje impacty do CSV ze spłaszczonymi evidence i achievements."""
-    if not impacts:
-        logger.warning("Brak danych do zapisania.")
-        return
+def save_json_full(impacts: Iterable[ImpactCaseSchema], path: Path) -> int:
+    """Zapisuje impacty strumieniowo do JSON z pełnym polem 'raw'."""
+    with JsonArrayImpactWriter(path, include_raw=True) as writer:
+        return writer.write_all(impacts)
 
-    # Budujemy wiersze i zbieramy wszystkie unikalne kolumny
-    rows = [flatten_impact(imp) for imp in impacts]
-    all_keys: List[str] = []
-    seen: set = set()
-    for row in rows:
-        for k in row:
-            if k not in seen:
-                all_keys.append(k)
-                seen.add(k)
 
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=all_keys)
-        writer.writeheader()
-        writer.writerows(rows)
+def save_csv(
+    impacts: Iterable[ImpactCaseSchema],
+    path: Path,
+    layout: str = "wide",
+    max_evidence: int = DEFAULT_MAX_EVIDENCE,
+    max_achievements: int = DEFAULT_MAX_ACHIEVEMENTS,
+) -> int:
+    """
+    Zapisuje impacty strumieniowo do CSV ze spłaszczonymi evidence i achievements.
 
-    logger.info("Zapisano %d rekordów do %s", len(impacts), path)
+    Kolumny wynikają ze schematu, więc wiersze są zapisywane w miarę pobierania.
+    """
+    with CsvImpactWriter(
+        path,
+        layout=layout,
+        max_evidence=max_evidence,
+        max_achievements=max_achievements,
+    ) as writer:
+        return writer.write_all(impacts)
 
 
 def main() -> None:
@@ -172,13 +163,13 @@ def main() -> None:
     )
 
     parser = argparse.ArgumentParser(
-        description="Pobierz impacty z RAD-on i zapisz lokalnie (JSON/CSV)."
+        description="Pobierz impacty z RAD-on i zapisz lokalnie (JSON/NDJSON/CSV/Parquet)."
     )
     parser.add_argument(
         "--output", "-o",
         type=str,
         required=True,
-        help="Ścieżka pliku wyjściowego (.json lub .csv).",
+        help="Ścieżka pliku wyjściowego (.json, .ndjson/.jsonl, .csv, .parquet lub .arrows).",
     )
     parser.add_argument(
         "--institutions-file",
@@ -205,23 +196,26 @@ def main() -> None:
         help="Maksymalna liczba rekordów do pobrania (do testów).",
     )
     parser.add_argument(
-        "--include-raw",
-        action="store_true",
-        help="Dołącz pełne surowe rekordy z API (tylko JSON).",
+        "--base-url",
+        type=str,
+        default=None,
+        help="Bazowy URL API RAD-on (domyślnie https://radon.nauka.gov.pl/opendata).",
     )
+    add_writer_arguments(parser)
 
     args = parser.parse_args()
 
     output_path = Path(args.output)
     suffix = output_path.suffix.lower()
 
-    if suffix not in (".json", ".csv"):
-        print(f"Nieobsługiwany format: {suffix}. Użyj .json lub .csv.")
+    supported = sorted(WRITERS_BY_SUFFIX)
+    if suffix not in supported:
+        print(f"Nieobsługiwany format: {suffix}. Użyj jednego z: {', '.join(supported)}.")
         sys.exit(1)
 
-    connector = RadonConnector()
+    connector = RadonConnector(base_url=args.base_url)
 
-    # Pobieranie danych
+    # Pobieranie danych – generator, rekordy są zapisywane w miarę pobierania
     if args.institutions_file:
         uuids = load_institutions_from_file(args.institutions_file)
         logger.info("Wczytano %d UUID-ów instytucji.", len(uuids))
@@ -240,18 +234,12 @@ def main() -> None:
             max_records=args.max_records,
         )
 
-    logger.info("Pobrano łącznie %d impactów.", len(impacts))
-
     # Zapis
-    if suffix == ".json":
-        if args.include_raw:
-            save_json_full(impacts, output_path)
-        else:
-            save_json(impacts, output_path)
-    elif suffix == ".csv":
-        save_csv(impacts, output_path)
-
-    print(f"\nGotowe! Zapisano {len(impacts)} rekordów → {output_path}")
+    with open_writer(output_path, **writer_kwargs_from_args(output_path, args)) as writer:
+        count = writer.write_all(impacts)
+
+    logger.info("Pobrano łącznie %d impactów.", count)
+    print(f"\nGotowe! Zapisano {count} rekordów → {output_path}")
 
 
 if __name__ == "__main__":
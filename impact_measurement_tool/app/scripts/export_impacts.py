@@ -0,0 +1,91 @@
+# app/scripts/export_impacts.py
+"""
+Eksportuje impacty zapisane w repozytorium (MongoDB / SQLite) do pliku (JSON/NDJSON/CSV/Parquet/Arrow IPC).
+
+Użycie:
+    # Cała kolekcja do Parquet:
+    python -m app.scripts.export_impacts --output impacts.parquet
+
+    # Tylko jedna instytucja, NDJSON:
+    python -m app.scripts.export_impacts --institution-uuid <uuid> --output inst.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Any, Dict
+
+from app.dumps.writers import (
+    WRITERS_BY_SUFFIX,
+    add_writer_arguments,
+    open_writer,
+    writer_kwargs_from_args,
+)
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Eksport impactów z repozytorium do pliku (JSON/NDJSON/CSV/Parquet/Arrow)."
+    )
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        required=True,
+        help="Ścieżka pliku wyjściowego (.json, .ndjson/.jsonl, .csv, .parquet lub .arrows).",
+    )
+    parser.add_argument(
+        "--institution-uuid",
+        type=str,
+        default=None,
+        help="Filtr: UUID instytucji.",
+    )
+    parser.add_argument(
+        "--discipline-code",
+        type=str,
+        default=None,
+        help="Filtr: kod dyscypliny.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Liczba dokumentów pobieranych z bazy w jednej partii (domyślnie: 500).",
+    )
+    add_writer_arguments(parser)
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    output_path = Path(args.output)
+    if output_path.suffix.lower() not in WRITERS_BY_SUFFIX:
+        print(f"Nieobsługiwany format: {output_path.suffix}. Użyj jednego z: {', '.join(sorted(WRITERS_BY_SUFFIX))}.")
+        sys.exit(1)
+
+    query: Dict[str, Any] = {}
+    if args.institution_uuid:
+        query["institution_uuid"] = args.institution_uuid
+    if args.discipline_code:
+        query["discipline_code"] = args.discipline_code
+
+    repo = repository_from_args(args)
+
+    with open_writer(output_path, **writer_kwargs_from_args(output_path, args)) as writer:
+        count = await repo.export(writer, query=query, batch_size=args.batch_size)
+
+    print(f"\nGotowe! Wyeksportowano {count} rekordów → {output_path}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
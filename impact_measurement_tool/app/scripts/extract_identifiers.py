@@ -0,0 +1,80 @@
+# app/scripts/extract_identifiers.py
+"""
+Backfill identyfikatorów (DOI, ISBN, ISSN) z opisów bibliograficznych
+osiągnięć (app/pipeline/identifiers.py) dla impactów już zapisanych
+w repozytorium – np. zapisanych przed dodaniem ekstrakcji do ingestu.
+
+Impacty są czytane strumieniowo, a zapisywane partiami (bulk upsert) tylko
+te, których identyfikatory się zmieniły.
+
+Użycie:
+    python -m app.scripts.extract_identifiers
+    python -m app.scripts.extract_identifiers --institution-uuid <uuid>
+    python -m app.scripts.extract_identifiers --backend sqlite --sqlite-path data/imeto.sqlite3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from app.models import ImpactCaseSchema
+from app.pipeline.identifiers import tag_identifiers
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Backfill identyfikatorów DOI/ISBN/ISSN impactów w repozytorium.")
+    parser.add_argument("--institution-uuid", type=str, default=None, help="Tylko impacty tej instytucji.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rozmiar partii zapisu (domyślnie: 500).")
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    repo = repository_from_args(args)
+    await repo.ensure_indexes()
+
+    query: Dict[str, Any] = {"institution_uuid": args.institution_uuid} if args.institution_uuid else {}
+    totals = Counter()
+    types = Counter()
+    batch: List[ImpactCaseSchema] = []
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        await repo.save_many(batch)
+        totals["changed"] += len(batch)
+        batch.clear()
+
+    async for impact in repo.iter_impacts(query=query, batch_size=args.batch_size):
+        totals["read"] += 1
+        if tag_identifiers(impact):
+            batch.append(impact)
+            if len(batch) >= args.batch_size:
+                await flush()
+        types.update(identifier.type.value for identifier in impact.identifiers)
+    if batch:
+        await flush()
+
+    logger.info(
+        "Przetworzono %d impactów w %.1fs – zmienione: %d",
+        totals["read"],
+        time.perf_counter() - started,
+        totals["changed"],
+    )
+    for identifier_type, count in types.most_common():
+        logger.info("  %-6s %d", identifier_type, count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+# app/scripts/fetch_impacts.py
+"""
+Pobiera pojedyncze impacty po impactUuid (albo DOI/ISBN/ISSN) – najpierw
+z repozytorium, a brakujące z RAD-on (app/pipeline/impact_lookup.py) –
+i wypisuje je jako NDJSON. Do sprawdzania i odświeżania pojedynczych
+rekordów bez przeglądania całego kindCode.
+
+Z --refresh rekordy są pobierane z RAD-on także wtedy, gdy są w repozytorium
+(instytucja z lokalnego rekordu zawęża zapytanie); z --save zapisywane są
+z powrotem do repozytorium (z kategoriami beneficjentów i identyfikatorami,
+a kategorie ewaluacyjne uzupełniane są z magazynu ewaluacji).
+Impacty nieobecne w repozytorium (bez znanej instytucji) są szukane w RAD-on
+tylko z --sweep – przeglądem całego kindCode.
+
+Użycie:
+    python -m app.scripts.fetch_impacts <uuid1> <uuid2>
+    python -m app.scripts.fetch_impacts <uuid> --refresh --save --backend sqlite
+    python -m app.scripts.fetch_impacts --doi 10.1000/xyz -o cited.ndjson
+    python -m app.scripts.fetch_impacts <nowy-uuid> --sweep
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from typing import Dict, List
+
+from app.connectors.radon import RadonConnector
+from app.models import IdentifierSchema, IdentifierType, ImpactCaseSchema
+from app.pipeline.beneficiaries import default_classifier
+from app.pipeline.evaluation_join import add_category_arguments, refresh_categories_after_ingest
+from app.pipeline.identifiers import tag_identifiers
+from app.pipeline.impact_lookup import ImpactLookup
+from app.repositories.base import DERIVED_FIELDS
+from app.repositories.factory import add_storage_arguments, evaluation_repository_from_args, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+        stream=sys.stderr,
+    )
+
+    parser = argparse.ArgumentParser(description="Impacty po impactUuid / DOI – lokalnie, a brakujące z RAD-on.")
+    parser.add_argument("impact_uuids", nargs="*", help="impactUuid impactów do pobrania.")
+    parser.add_argument("--doi", nargs="+", default=[], help="Impacty cytujące te DOI (tylko repozytorium).")
+    parser.add_argument("--refresh", action="store_true", help="Pobierz z RAD-on także impacty obecne w repozytorium.")
+    parser.add_argument("--save", action="store_true", help="Zapisz pobrane z RAD-on impacty w repozytorium.")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Szukaj impactów o nieznanej instytucji przeglądem całego kindCode (pełny crawl).",
+    )
+    parser.add_argument("--output", "-o", type=str, default=None, help="Plik NDJSON (domyślnie: stdout).")
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="Bazowy URL API RAD-on (domyślnie https://radon.nauka.gov.pl/opendata).",
+    )
+    add_storage_arguments(parser)
+    add_category_arguments(parser)
+
+    args = parser.parse_args()
+    if not args.impact_uuids and not args.doi:
+        parser.error("Podaj impactUuid albo --doi.")
+
+    started = time.perf_counter()
+    repo = repository_from_args(args)
+    lookup = ImpactLookup(repo, RadonConnector(base_url=args.base_url), allow_sweep=args.sweep)
+
+    sources: Dict[str, str] = {}
+    impacts: Dict[str, ImpactCaseSchema] = await lookup.get_many(args.impact_uuids, refresh=args.refresh, sources=sources)
+    missing = [uuid for uuid in args.impact_uuids if uuid not in impacts]
+    for doi in args.doi:
+        for impact in await lookup.search_by_id(IdentifierSchema(type=IdentifierType.DOI, value=doi)):
+            impacts.setdefault(impact.impact_uuid or "", impact)
+
+    # Zapisujemy tylko impacty pobrane z RAD-on – te z repozytorium już tam są
+    fetched: List[ImpactCaseSchema] = [impacts[uuid] for uuid, source in sources.items() if source == "remote"]
+    if args.save and fetched:
+        for impact in fetched:
+            default_classifier().tag(impact)
+            tag_identifiers(impact)
+        result = await repo.save_many(fetched, preserve_fields=DERIVED_FIELDS)
+        logger.info("Zapisano %d impactów (zmienione: %d, nowe: %d)", len(fetched), result["modified"], result["upserted"])
+        if not args.no_categories:
+            institutions = sorted({impact.institution_uuid for impact in fetched if impact.institution_uuid})
+            await refresh_categories_after_ingest(repo, institutions, store=evaluation_repository_from_args(args))
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for impact in impacts.values():
+            out.write(impact.model_dump_json(exclude={"raw"}) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    logger.info(
+        "Znaleziono %d impactów w %.2fs (lokalnie: %d, RAD-on: %d)%s",
+        len(impacts),
+        time.perf_counter() - started,
+        lookup.stats["local"],
+        lookup.stats["remote"],
+        f" – nie znaleziono: {', '.join(missing)}" if missing else "",
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+# app/scripts/find_near_duplicates.py
+"""
+Wyszukuje klastry prawie-duplikatów narracji impactów (MinHash + LSH).
+
+Indeks sygnatur (--index, plik .npz) jest trwały: przy kolejnym uruchomieniu
+dokładane są tylko nowe / zmienione rekordy i raportowane tylko klastry,
+które ich dotyczą (chyba że podano --all).
+
+Użycie:
+    # Pierwsze uruchomienie – cały korpus z repozytorium:
+    python -m app.scripts.find_near_duplicates --index dup_index.npz -o clusters.json
+
+    # Po kolejnym ingeście – tylko nowe rekordy względem indeksu:
+    python -m app.scripts.find_near_duplicates --index dup_index.npz -o new_clusters.ndjson
+
+    # Ze zrzutów, z niższym progiem:
+    python -m app.scripts.find_near_duplicates -i impacts.parquet --index dup_index.npz --threshold 0.5 -o clusters.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
+
+from app.analytics.near_duplicates import (
+    DEFAULT_BANDS,
+    DEFAULT_NUM_PERM,
+    DEFAULT_SHINGLE_SIZE,
+    DEFAULT_THRESHOLD,
+    META_FIELDS,
+    NARRATIVE_FIELDS,
+    MinHashIndex,
+)
+from app.dumps.readers import iter_dump
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+# Liczba dokumentów dokładanych do indeksu naraz
+ADD_BATCH_SIZE = 1000
+
+
+async def _iter_source(args: argparse.Namespace, fields: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    if args.input:
+        include = set(fields)
+        for path in args.input:
+            for impact in iter_dump(path):
+                yield impact.model_dump(include=include)
+    else:
+        repo = repository_from_args(args)
+        async for doc in repo.iter_documents(fields=fields, batch_size=ADD_BATCH_SIZE):
+            yield doc
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Klastry prawie-duplikatów narracji impactów (MinHash/LSH).")
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        default=None,
+        help="Pliki zrzutów (JSON/NDJSON/Parquet/Arrow). Bez tej opcji dane są czytane z repozytorium.",
+    )
+    parser.add_argument("--index", type=str, required=True, help="Plik indeksu sygnatur (.npz), tworzony lub aktualizowany.")
+    parser.add_argument("--rebuild", action="store_true", help="Zbuduj indeks od zera, ignorując istniejący plik.")
+    parser.add_argument("--all", action="store_true", help="Raportuj wszystkie klastry, nie tylko dotyczące nowych rekordów.")
+    parser.add_argument("--output", "-o", type=str, required=True, help="Plik z klastrami (.json lub .ndjson).")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Minimalne podobieństwo (estymata Jaccarda) pary (domyślnie: {DEFAULT_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--fields",
+        nargs="+",
+        default=list(NARRATIVE_FIELDS),
+        help="Pola narracji (tylko dla nowego indeksu; domyślnie: impact_description_pl/en).",
+    )
+    parser.add_argument("--num-perm", type=int, default=DEFAULT_NUM_PERM, help="Liczba permutacji MinHash (nowy indeks).")
+    parser.add_argument("--bands", type=int, default=DEFAULT_BANDS, help="Liczba pasm LSH (nowy indeks).")
+    parser.add_argument("--shingle-size", type=int, default=DEFAULT_SHINGLE_SIZE, help="Liczba słów w shinglu (nowy indeks).")
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    index_path = Path(args.index)
+    if index_path.is_file() and not args.rebuild:
+        index = MinHashIndex.load(index_path)
+        logger.info("Wczytano indeks %s (%d rekordów)", index_path, len(index))
+        report_all = args.all
+    else:
+        index = MinHashIndex(
+            num_perm=args.num_perm,
+            bands=args.bands,
+            shingle_size=args.shingle_size,
+            fields=args.fields,
+        )
+        report_all = True
+
+    logger.info("Próg LSH ≈ %.2f, próg raportu = %.2f", index.threshold_estimate, args.threshold)
+
+    fields = ["impact_uuid", *index.fields, *META_FIELDS]
+    started = time.perf_counter()
+    changed: List[int] = []
+    batch: List[Dict[str, Any]] = []
+
+    async for doc in _iter_source(args, fields):
+        batch.append(doc)
+        if len(batch) >= ADD_BATCH_SIZE:
+            changed.extend(index.add(batch))
+            batch = []
+    if batch:
+        changed.extend(index.add(batch))
+
+    logger.info(
+        "Dodano / zaktualizowano %d rekordów w %.1fs (indeks: %d)",
+        len(changed),
+        time.perf_counter() - started,
+        len(index),
+    )
+
+    clusters = index.clusters(rows=None if report_all else changed, threshold=args.threshold)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    index.save(index_path)
+
+    output_path = Path(args.output)
+    with output_path.open("w", encoding="utf-8") as f:
+        if output_path.suffix.lower() in (".ndjson", ".jsonl"):
+            for cluster in clusters:
+                f.write(json.dumps(cluster, ensure_ascii=False) + "\n")
+        else:
+            json.dump(clusters, f, ensure_ascii=False, indent=2)
+
+    logger.info(
+        "Zapisano %d klastrów (%d rekordów) → %s",
+        len(clusters),
+        sum(c["size"] for c in clusters),
+        output_path,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
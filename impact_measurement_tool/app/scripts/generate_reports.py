@@ -0,0 +1,143 @@
+# app/scripts/generate_reports.py
+"""
+Generuje raporty wpływu (ImpactReportSchema) dla instytucji w puli procesów
+(app/pipeline/reports.py) i zapisuje je strumieniowo – do magazynu
+`impact_reports` na wybranym backendzie (MongoDB, SQLite) albo do pliku NDJSON.
+
+Użycie:
+    # Instytucje z app/data/institutions.txt, impacty z repozytorium, raporty do tego samego backendu:
+    python -m app.scripts.generate_reports
+
+    # Wszystkie instytucje ze zrzutu, z propozycjami finansowania, do NDJSON:
+    python -m app.scripts.generate_reports --all -i impacts.parquet \\
+        --opportunities calls.ndjson --workers 8 -o reports.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from app.analytics.funding_matching import DEFAULT_MIN_SCORE, DEFAULT_TOP_K, FundingMatcher
+from app.dumps.readers import iter_dump, iter_model_dump
+from app.models import FundingOpportunitySchema, ImpactReportSchema
+from app.pipeline.reports import (
+    REPORT_FIELDS,
+    InstitutionGroup,
+    groups_from_documents,
+    groups_from_repository,
+    iter_reports,
+)
+from app.repositories.factory import add_storage_arguments, report_repository_from_args, repository_from_args
+from app.scripts.ingest_radon_impacts import load_institutions_from_file
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INSTITUTIONS_FILE = "app/data/institutions.txt"
+
+# Liczba raportów zapisywanych jedną partią
+SAVE_BATCH_SIZE = 50
+
+
+def _dump_groups(paths: List[str], institutions: Optional[List[str]]) -> AsyncIterator[InstitutionGroup]:
+    fields = set(REPORT_FIELDS)
+    wanted = set(institutions) if institutions is not None else None
+
+    def docs() -> Iterator[Dict[str, Any]]:
+        for path in paths:
+            for impact in iter_dump(path):
+                if wanted is None or impact.institution_uuid in wanted:
+                    yield impact.model_dump(include=fields)
+
+    return groups_from_documents(docs())
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Wsadowe generowanie raportów wpływu dla instytucji.")
+    parser.add_argument(
+        "--institutions-file",
+        type=str,
+        default=DEFAULT_INSTITUTIONS_FILE,
+        help=f"Plik z listą institutionUuid oddzielonych przecinkami (domyślnie: {DEFAULT_INSTITUTIONS_FILE}).",
+    )
+    parser.add_argument("--all", action="store_true", help="Raporty dla wszystkich instytucji w danych (ignoruje --institutions-file).")
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        default=None,
+        help="Zrzuty impactów (JSON/NDJSON/Parquet/Arrow). Bez tej opcji impacty są czytane z repozytorium.",
+    )
+    parser.add_argument(
+        "--opportunities",
+        nargs="+",
+        default=[],
+        help="Pliki z naborami (FundingOpportunitySchema) – raporty dostaną recommended_funding.",
+    )
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K, help=f"Liczba propozycji finansowania (domyślnie: {DEFAULT_TOP_K}).")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help="Minimalny wynik dopasowania naboru 0–1.")
+    parser.add_argument("--workers", type=int, default=None, help="Liczba procesów (domyślnie: liczba rdzeni).")
+    parser.add_argument(
+        "--output", "-o",
+        type=str,
+        default=None,
+        help="Plik NDJSON z raportami. Bez tej opcji raporty trafiają do kolekcji MongoDB impact_reports.",
+    )
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    institutions = None if args.all else load_institutions_from_file(args.institutions_file)
+
+    matcher: Optional[FundingMatcher] = None
+    if args.opportunities:
+        opportunities: List[FundingOpportunitySchema] = []
+        for path in args.opportunities:
+            opportunities.extend(iter_model_dump(path, FundingOpportunitySchema))
+        matcher = FundingMatcher(opportunities)
+
+    if args.input:
+        groups = _dump_groups(args.input, institutions)
+    else:
+        groups = groups_from_repository(repository_from_args(args), institutions)
+
+    reports = iter_reports(groups, matcher=matcher, workers=args.workers, k=args.k, min_score=args.min_score)
+    count = 0
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("w", encoding="utf-8") as f:
+            async for report in reports:
+                f.write(report.model_dump_json())
+                f.write("\n")
+                count += 1
+        destination = str(output)
+    else:
+        store = report_repository_from_args(args)
+        await store.ensure_indexes()
+        batch: List[ImpactReportSchema] = []
+        async for report in reports:
+            batch.append(report)
+            count += 1
+            if len(batch) >= SAVE_BATCH_SIZE:
+                await store.save_many(batch)
+                batch = []
+        if batch:
+            await store.save_many(batch)
+        destination = "impact_reports"
+
+    logger.info("Wygenerowano %d raportów w %.1fs → %s", count, time.perf_counter() - started, destination)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+# app/scripts/impact_stats.py
+"""
+Zestawienia statystyczne korpusu impactów (app/analytics/impacts.py) zapisywane jako CSV.
+
+Źródło: repozytorium (--backend) albo pliki zrzutów (--input).
+
+Użycie:
+    python -m app.scripts.impact_stats --output-dir stats/
+    python -m app.scripts.impact_stats --input impacts.parquet --by domain_name --output-dir stats/
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from app.analytics.impacts import (
+    CATEGORICAL_COLUMNS,
+    DEFAULT_CHUNK_SIZE,
+    bilingual_completeness,
+    impact_area_distribution,
+    impacts_per_discipline_year,
+    interdisciplinarity_rates,
+    load_dump_frame,
+    load_impacts_frame,
+)
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Statystyki korpusu impactów → pliki CSV.")
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        default=None,
+        help="Pliki zrzutów (JSON/NDJSON/Parquet/Arrow). Bez tej opcji dane są czytane z repozytorium.",
+    )
+    parser.add_argument(
+        "--by",
+        choices=CATEGORICAL_COLUMNS,
+        default="discipline_name",
+        help="Kolumna grupująca zestawienia (domyślnie: discipline_name).",
+    )
+    parser.add_argument("--output-dir", "-o", type=str, required=True, help="Katalog na pliki CSV.")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Liczba rekordów w jednej partii ładowania (domyślnie: {DEFAULT_CHUNK_SIZE}).",
+    )
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    if args.input:
+        frame = load_dump_frame(args.input, chunk_size=args.chunk_size)
+    else:
+        frame = await load_impacts_frame(repository_from_args(args), chunk_size=args.chunk_size)
+
+    logger.info(
+        "Załadowano %d impactów (%.1f MB w pamięci)",
+        len(frame),
+        frame.memory_usage(deep=True).sum() / (1024 * 1024),
+    )
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tables = {
+        "impacts_per_year.csv": impacts_per_discipline_year(frame, by=args.by),
+        "interdisciplinarity.csv": interdisciplinarity_rates(frame, by=args.by),
+        "impact_areas.csv": impact_area_distribution(frame, by=args.by),
+        "bilingual_completeness.csv": bilingual_completeness(frame, by=args.by),
+    }
+    for name, table in tables.items():
+        table.to_csv(output_dir / name)
+        logger.info("Zapisano %s", output_dir / name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,151 @@
+# app/scripts/import_impacts.py
+"""
+Importuje zrzuty impactów (z download_impacts / export_impacts) do repozytorium
+(MongoDB, SQLite albo pamięć – patrz --backend).
+
+Pliki są czytane strumieniowo, rekordy odtwarzane jako ImpactCaseSchema
+i zapisywane partiami (bulk upsert) – bez dostępu do sieci i API RAD-on.
+
+Użycie:
+    python -m app.scripts.import_impacts --input impacts.ndjson
+    python -m app.scripts.import_impacts --input impacts.json impacts_kind2.parquet --batch-size 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from app.dumps.readers import READERS_BY_SUFFIX, iter_dump
+from app.models import ImpactCaseSchema
+from app.pipeline.evaluation_join import add_category_arguments, refresh_categories_after_ingest
+from app.repositories.base import DERIVED_FIELDS, BaseImpactRepository
+from app.repositories.factory import add_storage_arguments, evaluation_repository_from_args, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def import_dump(
+    path: Path,
+    repo: BaseImpactRepository,
+    batch_size: int = 1000,
+    institution_uuids: Optional[Set[str]] = None,
+) -> Dict[str, int]:
+    """
+    Wczytuje jeden plik zrzutu i zapisuje go do repozytorium partiami po `batch_size`.
+    Kategorie ewaluacyjne (DERIVED_FIELDS) ze zrzutu trafiają tylko do nowych
+    impactów – istniejące zachowują swoje. Jeśli podano `institution_uuids`,
+    dopisywane są do niego instytucje wczytanych impactów.
+
+    Zwraca zsumowane liczniki zapisów (read, matched, modified, upserted, skipped).
+    """
+    totals = {"read": 0, "matched": 0, "modified": 0, "upserted": 0, "skipped": 0}
+    batch: List[ImpactCaseSchema] = []
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        result = await repo.save_many(batch, preserve_fields=DERIVED_FIELDS)
+        for key, value in result.items():
+            totals[key] += value
+        batch.clear()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "%s: wczytano %d rekordów (%.0f rek/s) – nowe: %d, zaktualizowane: %d",
+            path.name,
+            totals["read"],
+            totals["read"] / elapsed if elapsed else 0.0,
+            totals["upserted"],
+            totals["modified"],
+        )
+
+    for impact in iter_dump(path):
+        batch.append(impact)
+        totals["read"] += 1
+        if institution_uuids is not None and impact.institution_uuid:
+            institution_uuids.add(impact.institution_uuid)
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+
+    return totals
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Import zrzutów impactów (JSON/NDJSON/Parquet/Arrow) do repozytorium."
+    )
+    parser.add_argument(
+        "--input", "-i",
+        type=str,
+        nargs="+",
+        required=True,
+        help="Plik(i) zrzutu: .json, .ndjson/.jsonl, .parquet lub .arrows.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="Liczba rekordów w jednej operacji bulk upsert (domyślnie: 1000).",
+    )
+
+    add_storage_arguments(parser)
+    add_category_arguments(parser)
+
+    args = parser.parse_args()
+
+    paths = [Path(p) for p in args.input]
+    for path in paths:
+        if not path.is_file():
+            raise FileNotFoundError(f"Nie znaleziono pliku: {path}")
+        if path.suffix.lower() not in READERS_BY_SUFFIX:
+            raise ValueError(
+                f"Nieobsługiwany format: {path.suffix}. "
+                f"Obsługiwane: {', '.join(sorted(READERS_BY_SUFFIX))}."
+            )
+
+    repo = repository_from_args(args)
+    await repo.ensure_indexes()
+
+    started = time.perf_counter()
+    total_read = 0
+    institution_uuids: Set[str] = set()
+
+    for path in paths:
+        logger.info("Import pliku %s...", path)
+        totals = await import_dump(path, repo, batch_size=args.batch_size, institution_uuids=institution_uuids)
+        total_read += totals["read"]
+        logger.info(
+            "Zakończono %s: wczytano %d, nowe %d, zaktualizowane %d, pominięte %d.",
+            path,
+            totals["read"],
+            totals["upserted"],
+            totals["modified"],
+            totals["skipped"],
+        )
+
+    if not args.no_categories and institution_uuids:
+        await refresh_categories_after_ingest(
+            repo, sorted(institution_uuids), store=evaluation_repository_from_args(args)
+        )
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"\nGotowe! Zaimportowano {total_read} rekordów w {elapsed:.1f} s "
+        f"({total_read / elapsed if elapsed else 0.0:.0f} rek/s)."
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,267 @@
+# app/scripts/ingest_radon_evaluations.py
+"""
+Ingest ewaluacji instytucji z RAD-on (/polon/evaluations) do magazynu
+`radon_evaluations` na wybranym backendzie (kolekcja MongoDB albo tabela SQLite).
+
+Endpoint RAD-on filtruje ewaluacje po nazwie instytucji, więc przy liście nazw
+(z pliku albo z impactów w repozytorium) instytucje są pobierane współbieżnie:
+każda paginowana seria zapytań działa w wątku (`asyncio.to_thread`), a liczbę
+równoległych instytucji ogranicza semafor. Bez listy nazw pobierany jest jeden
+paginowany strumień wszystkich ewaluacji. Zapis – partiami (upsert).
+
+Z --refresh-impacts po zapisie odświeżane są zdenormalizowane kategorie
+ewaluacyjne impactów (app/pipeline/evaluation_join.py) – tylko instytucji,
+których ewaluacje zostały pobrane.
+
+Użycie:
+    # Wszystkie ewaluacje (jeden strumień, bez filtra):
+    python -m app.scripts.ingest_radon_evaluations
+
+    # Instytucje z impactów w repozytorium, 16 instytucji naraz:
+    python -m app.scripts.ingest_radon_evaluations --from-impacts --concurrency 16
+
+    # Instytucje z pliku (jedna nazwa w wierszu):
+    python -m app.scripts.ingest_radon_evaluations --institution-names-file names.txt
+
+    # Ewaluacje + odświeżenie kategorii impactów w lokalnym SQLite:
+    python -m app.scripts.ingest_radon_evaluations --from-impacts --refresh-impacts --backend sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from app.analytics.institutions import InstitutionIndex, add_index_arguments, update_index_file
+from app.connectors.radon import RadonAPIError, RadonConnector
+from app.models import InstitutionEvaluationSchema
+from app.pipeline.evaluation_join import EvaluationCategoryIndex, refresh_evaluation_categories
+from app.repositories.base import BaseEvaluationRepository, BaseImpactRepository
+from app.repositories.factory import add_storage_arguments, evaluation_repository_from_args, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+
+# Liczba ewaluacji zapisywanych jednym bulk_write
+SAVE_BATCH_SIZE = 500
+
+
+def load_institution_names(path: str) -> List[str]:
+    """Wczytuje nazwy instytucji z pliku tekstowego – jedna nazwa w wierszu, bez powtórzeń."""
+    file_path = Path(path)
+    if not file_path.is_file():
+        raise FileNotFoundError(f"Institution names file not found: {file_path}")
+
+    names = (line.strip() for line in file_path.read_text(encoding="utf-8").splitlines())
+    return list(dict.fromkeys(name for name in names if name))
+
+
+async def institution_names_from_impacts(repo: BaseImpactRepository) -> List[str]:
+    """Unikalne nazwy instytucji z impactów w repozytorium (odczyt z projekcją)."""
+    names: Dict[str, None] = {}
+    async for doc in repo.iter_documents(fields=["institution_name"]):
+        name = (doc.get("institution_name") or "").strip()
+        if name:
+            names[name] = None
+    return list(names)
+
+
+class _Saver:
+    """
+    Buforuje ewaluacje i zapisuje je partiami; zlicza wyniki bulk_write
+    i zbiera dane do indeksu instytucji (nazwy, liczba okresów ewaluacji).
+    """
+
+    def __init__(self, store: BaseEvaluationRepository, batch_size: int = SAVE_BATCH_SIZE) -> None:
+        self.store = store
+        self.batch_size = batch_size
+        self.batch: List[InstitutionEvaluationSchema] = []
+        self.totals: Dict[str, int] = {"read": 0, "matched": 0, "modified": 0, "upserted": 0, "skipped": 0}
+        self.institution_index = InstitutionIndex()
+        self.periods: Dict[str, Set[str]] = {}
+
+    @property
+    def institutions(self) -> Set[str]:
+        return set(self.institution_index)
+
+    async def add(self, evaluations: List[InstitutionEvaluationSchema]) -> None:
+        self.batch.extend(evaluations)
+        self.institution_index.observe_evaluations(evaluations)
+        for evaluation in evaluations:
+            if evaluation.institution_uuid:
+                self.periods.setdefault(evaluation.institution_uuid, set()).add(evaluation.evaluation_period)
+        self.totals["read"] += len(evaluations)
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self.batch:
+            return
+        result = await self.store.save_many(self.batch)
+        for key, value in result.items():
+            self.totals[key] += value
+        self.batch = []
+
+
+async def ingest_institutions(
+    names: List[str],
+    connector: RadonConnector,
+    saver: _Saver,
+    page_size: int = 50,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> int:
+    """
+    Pobiera ewaluacje wskazanych instytucji współbieżnie (najwyżej `concurrency`
+    naraz) i zapisuje je w miarę kończenia się kolejnych instytucji.
+    Instytucja, dla której RAD-on nie odpowiada mimo ponowień, jest pomijana
+    (z błędem w logu), a pozostałe są pobierane dalej.
+
+    Zwraca liczbę pobranych ewaluacji.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    failed: List[str] = []
+
+    async def fetch(name: str) -> List[InstitutionEvaluationSchema]:
+        async with semaphore:
+            try:
+                return await asyncio.to_thread(
+                    lambda: list(connector.iter_evaluations(institution_name=name, page_size=page_size))
+                )
+            except RadonAPIError as e:
+                logger.error("Pominięto ewaluacje instytucji %r: %s", name, e)
+                failed.append(name)
+                return []
+
+    count = 0
+    tasks = [asyncio.create_task(fetch(name)) for name in names]
+    for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+        evaluations = await task
+        count += len(evaluations)
+        await saver.add(evaluations)
+        if done % 50 == 0:
+            logger.info("Pobrano ewaluacje %d/%d instytucji (%d rekordów)", done, len(names), count)
+
+    if failed:
+        logger.error("Nie pobrano ewaluacji %d z %d instytucji: %s", len(failed), len(names), ", ".join(failed))
+    return count
+
+
+async def ingest_all(connector: RadonConnector, saver: _Saver, page_size: int = 50) -> int:
+    """Jeden paginowany strumień wszystkich ewaluacji; strony pobierane w wątku."""
+    evaluations: Iterator[InstitutionEvaluationSchema] = iter(connector.iter_evaluations(page_size=page_size))
+
+    def next_page() -> List[InstitutionEvaluationSchema]:
+        return list(itertools.islice(evaluations, page_size))
+
+    count = 0
+    while True:
+        page = await asyncio.to_thread(next_page)
+        if not page:
+            break
+        count += len(page)
+        await saver.add(page)
+    return count
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Ingest ewaluacji instytucji z RAD-on do MongoDB (radon_evaluations).")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--institution-names-file",
+        type=str,
+        default=None,
+        help="Plik z nazwami instytucji (jedna w wierszu) – pobieranie współbieżne po institutionName.",
+    )
+    source.add_argument(
+        "--from-impacts",
+        action="store_true",
+        help="Nazwy instytucji z impactów w repozytorium (opcje --backend / --sqlite-path).",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Liczba instytucji pobieranych równolegle (domyślnie: {DEFAULT_CONCURRENCY}).",
+    )
+    parser.add_argument(
+        "--refresh-impacts",
+        action="store_true",
+        help="Po ingeście odśwież kategorie ewaluacyjne impactów pobranych instytucji w repozytorium.",
+    )
+    parser.add_argument("--page-size", type=int, default=50, help="Liczba rekordów pobierana w jednym wywołaniu API RAD-on.")
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="Bazowy URL API RAD-on (domyślnie https://radon.nauka.gov.pl/opendata).",
+    )
+    add_storage_arguments(parser)
+    add_index_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    connector = RadonConnector(base_url=args.base_url)
+    store = evaluation_repository_from_args(args)
+    await store.ensure_indexes()
+    saver = _Saver(store)
+
+    names: Optional[List[str]] = None
+    if args.institution_names_file:
+        names = load_institution_names(args.institution_names_file)
+    elif args.from_impacts:
+        names = await institution_names_from_impacts(repository_from_args(args))
+
+    if names is None:
+        count = await ingest_all(connector, saver, page_size=args.page_size)
+    else:
+        logger.info("Ingest ewaluacji dla %d instytucji (concurrency=%d)", len(names), args.concurrency)
+        count = await ingest_institutions(
+            names, connector, saver, page_size=args.page_size, concurrency=args.concurrency
+        )
+    await saver.flush()
+
+    logger.info(
+        "Zakończono ingest ewaluacji: %d rekordów w %.1fs (nowe: %d, zmienione: %d, pominięte: %d)",
+        count,
+        time.perf_counter() - started,
+        saver.totals["upserted"],
+        saver.totals["modified"],
+        saver.totals["skipped"],
+    )
+
+    if not args.no_institution_index and saver.periods:
+        for uuid, periods in saver.periods.items():
+            saver.institution_index.set_counts(uuid, evaluations=len(periods))
+        update_index_file(args.institution_index, saver.institution_index)
+
+    if args.refresh_impacts and saver.institutions:
+        institutions = sorted(saver.institutions)
+        evaluations = [
+            evaluation
+            async for evaluation in store.iter_evaluations({"institution_uuid": {"$in": institutions}})
+        ]
+        counts = await refresh_evaluation_categories(
+            repository_from_args(args), EvaluationCategoryIndex(evaluations), institution_uuids=institutions
+        )
+        logger.info(
+            "Odświeżono kategorie impactów %d instytucji: przeliczone %d, zmienione %d",
+            len(institutions),
+            counts["read"],
+            counts["changed"],
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,10 +6,27 @@ import argparse
 import asyncio
 import logging
 from pathlib import Path
-from typing import List
-
+from typing import List, Optional, Set
+
+from app.analytics.institutions import (
+    InstitutionIndex,
+    add_index_arguments,
+    refresh_impact_counts,
+    update_index_file,
+)
 from app.connectors.radon import RadonConnector
-from app.repositories.impact_repository import ImpactRepository
+from app.pipeline.beneficiaries import default_classifier
+from app.pipeline.dedup import IngestDeduplicator, add_dedup_arguments, deduplicator_from_args, finish_dedup
+from app.pipeline.evaluation_join import add_category_arguments, refresh_categories_after_ingest
+from app.pipeline.identifiers import tag_identifiers
+from app.pipeline.institution_summaries import add_summary_arguments, refresh_after_ingest
+from app.repositories.base import DERIVED_FIELDS, BaseImpactRepository
+from app.repositories.factory import (
+    add_storage_arguments,
+    evaluation_repository_from_args,
+    repository_from_args,
+    summary_repository_from_args,
+)
 from app.models import ImpactCaseSchema
 
 logger = logging.getLogger(__name__)
@@ -36,12 +53,23 @@ def load_institutions_from_file(path: str) -> List[str]:
 async def ingest_for_institution(
     institution_uuid: str,
     connector: RadonConnector,
-    repo: ImpactRepository,
+    repo: BaseImpactRepository,
     page_size: int = 50,
-) -> None:
+    classify_beneficiaries: bool = True,
+    extract_identifiers: bool = True,
+    institution_index: Optional[InstitutionIndex] = None,
+    dedup: Optional[IngestDeduplicator] = None,
+) -> int:
     """
     Pobiera wszystkie impacty dla instytucji wskazanej przez jej UUID
-    i zapisuje je do MongoDB.
+    i zapisuje je w repozytorium impactów (z `classify_beneficiaries` –
+    oznaczone kategoriami beneficjentów, z `extract_identifiers` – z DOI/ISBN/ISSN
+    z opisów osiągnięć). Z `institution_index` nazwy instytucji z impactów
+    trafiają do indeksu instytucji. Z `dedup` impacty już przetworzone w tym
+    przebiegu (np. wspólne dla kilku instytucji z listy) są pomijane.
+    Kategorie ewaluacyjne (DERIVED_FIELDS) zapisanych już impactów zostają.
+
+    Zwraca liczbę zapisanych impactów.
     """
     logger.info("Start ingestu impactów dla institutionUuid: %s", institution_uuid)
 
@@ -51,6 +79,10 @@ async def ingest_for_institution(
         institution_uuid=institution_uuid,
         page_size=page_size,
     ):
+        pending: Set[int] = set()
+        if dedup is not None and not dedup.candidate(impact, pending):
+            continue
+
         # Jeśli z jakiegoś powodu w rekordzie nie był ustawiony institution_uuid,
         # uzupełniamy go wartością, po której pytaliśmy.
         if not getattr(impact, "institution_uuid", None):
@@ -59,7 +91,23 @@ async def ingest_for_institution(
                 update={"institution_uuid": institution_uuid},
             )
 
-        await repo.save_one(impact)
+        if classify_beneficiaries:
+            default_classifier().tag(impact)
+
+        if extract_identifiers:
+            tag_identifiers(impact)
+
+        if institution_index is not None:
+            institution_index.observe(impact.institution_uuid, impact.institution_name)
+
+        try:
+            await repo.save_one(impact, preserve_fields=DERIVED_FIELDS)
+        except ValueError as e:
+            # Rekord bez impact_uuid – nie ma klucza zapisu
+            logger.warning("Pominięto impact z powodu błędu walidacji: %s", e)
+            continue
+        if dedup is not None:
+            dedup.commit(pending)
         count += 1
 
         if count % page_size == 0:
@@ -74,13 +122,14 @@ async def ingest_for_institution(
         count,
         institution_uuid,
     )
+    return count
 
 
 async def main() -> None:
     logging.basicConfig(level=logging.INFO)
 
     parser = argparse.ArgumentParser(
-        description="Ingest impactów z RAD-on do MongoDB dla wielu instytucji (po UUID)."
+        description="Ingest impactów z RAD-on do repozytorium dla wielu instytucji (po UUID)."
     )
     parser.add_argument(
         "--institutions-file",
@@ -94,6 +143,29 @@ async def main() -> None:
         default=50,
         help="Liczba rekordów pobierana w jednym wywołaniu API RAD-on.",
     )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="Bazowy URL API RAD-on (domyślnie https://radon.nauka.gov.pl/opendata).",
+    )
+
+    parser.add_argument(
+        "--no-beneficiaries",
+        action="store_true",
+        help="Nie oznaczaj impactów kategoriami beneficjentów przy zapisie.",
+    )
+    parser.add_argument(
+        "--no-identifiers",
+        action="store_true",
+        help="Nie wyodrębniaj identyfikatorów (DOI/ISBN/ISSN) z opisów osiągnięć przy zapisie.",
+    )
+
+    add_storage_arguments(parser)
+    add_index_arguments(parser)
+    add_summary_arguments(parser)
+    add_category_arguments(parser)
+    add_dedup_arguments(parser)
 
     args = parser.parse_args()
 
@@ -104,8 +176,10 @@ async def main() -> None:
         args.institutions_file,
     )
 
-    connector = RadonConnector()
-    repo = ImpactRepository()
+    connector = RadonConnector(base_url=args.base_url)
+    repo = repository_from_args(args)
+    index = None if args.no_institution_index else InstitutionIndex()
+    dedup = deduplicator_from_args(args)
 
     for inst_uuid in institutions:
         await ingest_for_institution(
@@ -113,7 +187,21 @@ async def main() -> None:
             connector=connector,
             repo=repo,
             page_size=args.page_size,
+            classify_beneficiaries=not args.no_beneficiaries,
+            extract_identifiers=not args.no_identifiers,
+            institution_index=index,
+            dedup=dedup,
         )
+    finish_dedup(dedup, args)
+
+    if index is not None:
+        await refresh_impact_counts(index, repo)
+        update_index_file(args.institution_index, index)
+
+    if not args.no_categories:
+        await refresh_categories_after_ingest(repo, institutions, store=evaluation_repository_from_args(args))
+    if not args.no_summaries:
+        await refresh_after_ingest(repo, institutions, store=summary_repository_from_args(args))
 
 
 if __name__ == "__main__":
@@ -5,9 +5,28 @@ from __future__ import annotations
 import argparse
 import asyncio
 import logging
-
+from typing import Optional, Set
+
+from app.analytics.institutions import (
+    InstitutionIndex,
+    add_index_arguments,
+    refresh_impact_counts,
+    update_index_file,
+)
 from app.connectors.radon import RadonConnector
-from app.repositories.impact_repository import ImpactRepository
+from app.pipeline.beneficiaries import default_classifier
+from app.pipeline.dedup import IngestDeduplicator, add_dedup_arguments, deduplicator_from_args, finish_dedup
+from app.pipeline.evaluation_join import add_category_arguments, refresh_categories_after_ingest
+from app.pipeline.identifiers import tag_identifiers
+from app.pipeline.institution_summaries import add_summary_arguments, refresh_after_ingest
+from app.repositories.base import DERIVED_FIELDS, BaseImpactRepository
+from app.repositories.factory import (
+    add_storage_arguments,
+    evaluation_repository_from_args,
+    get_impact_repository,
+    repository_from_args,
+    summary_repository_from_args,
+)
 from app.models import ImpactCaseSchema
 
 
@@ -17,13 +36,31 @@ logger = logging.getLogger(__name__)
 async def ingest_all_impacts(
     kind_code: str,
     page_size: int,
-) -> None:
+    connector: Optional[RadonConnector] = None,
+    repo: Optional[BaseImpactRepository] = None,
+    classify_beneficiaries: bool = True,
+    extract_identifiers: bool = True,
+    institution_index: Optional[InstitutionIndex] = None,
+    dedup: Optional[IngestDeduplicator] = None,
+    institution_uuids: Optional[Set[str]] = None,
+) -> int:
     """
     Pobiera wszystkie impacty z RAD-on dla zadanego kindCode
-    i zapisuje je do MongoDB.
+    i zapisuje je w repozytorium impactów.
+
+    Z `classify_beneficiaries` impacty są przed zapisem oznaczane kategoriami
+    beneficjentów (app/pipeline/beneficiaries.py), z `extract_identifiers` –
+    uzupełniane o identyfikatory z opisów osiągnięć (app/pipeline/identifiers.py),
+    a z `institution_index` – nazwy instytucji trafiają do indeksu instytucji. Do `institution_uuids` trafiają
+    UUID-y instytucji zapisanych impactów (np. do przeliczenia podsumowań).
+    Z `dedup` impacty już przetworzone w tym przebiegu (albo w serii ze wspólnym
+    stanem, np. po ingeście po instytucjach) są pomijane przed klasyfikacją i zapisem.
+    Kategorie ewaluacyjne (DERIVED_FIELDS) zapisanych już impactów zostają.
+
+    Zwraca liczbę zapisanych dokumentów.
     """
-    connector = RadonConnector()
-    repo = ImpactRepository()
+    connector = connector or RadonConnector()
+    repo = repo or get_impact_repository()
 
     logger.info(
         "Start ingestu impactów dla kindCode=%s (page_size=%d)",
@@ -33,7 +70,7 @@ async def ingest_all_impacts(
 
     count = 0
 
-    async def save_impact(impact: ImpactCaseSchema) -> None:
+    async def save_impact(impact: ImpactCaseSchema) -> bool:
         nonlocal count
 
         # Upewniamy się, że mamy institution_uuid (jeśli model go przewiduje),
@@ -48,34 +85,52 @@ async def ingest_all_impacts(
                     update={"institution_uuid": inst_uuid},
                 )
 
+        if classify_beneficiaries:
+            default_classifier().tag(impact)
+
+        if extract_identifiers:
+            tag_identifiers(impact)
+
+        if institution_index is not None:
+            institution_index.observe(impact.institution_uuid, impact.institution_name)
+
         try:
-            await repo.save_one(impact)
+            await repo.save_one(impact, preserve_fields=DERIVED_FIELDS)
             count += 1
+            if institution_uuids is not None and impact.institution_uuid:
+                institution_uuids.add(impact.institution_uuid)
             if count % page_size == 0:
                 logger.info("Zapisano łącznie %d impactów...", count)
         except ValueError as e:
             # np. jeśli source_record_id jest puste i repo nie może wygenerować _id
             logger.warning("Pominięto impact z powodu błędu walidacji: %s", e)
+            return False
+        return True
 
     # iter_all_impacts jest synchronicznym generatorem, ale zapis do Mongo jest async
     for impact in connector.iter_all_impacts(
         kind_code=kind_code,
         page_size=page_size,
     ):
-        await save_impact(impact)
+        pending: Set[int] = set()
+        if dedup is not None and not dedup.candidate(impact, pending):
+            continue
+        if await save_impact(impact) and dedup is not None:
+            dedup.commit(pending)
 
     logger.info(
         "Zakończono ingest wszystkich impactów dla kindCode=%s. Łącznie zapisano %d dokumentów.",
         kind_code,
         count,
     )
+    return count
 
 
 async def main() -> None:
     logging.basicConfig(level=logging.INFO)
 
     parser = argparse.ArgumentParser(
-        description="Ingest wszystkich impactów z RAD-on (po kindCode) do MongoDB."
+        description="Ingest wszystkich impactów z RAD-on (po kindCode) do repozytorium."
     )
     parser.add_argument(
         "--kind-code",
@@ -89,13 +144,58 @@ async def main() -> None:
         default=50,
         help="Liczba rekordów pobierana w jednym wywołaniu API RAD-on.",
     )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="Bazowy URL API RAD-on (domyślnie https://radon.nauka.gov.pl/opendata).",
+    )
+
+    parser.add_argument(
+        "--no-beneficiaries",
+        action="store_true",
+        help="Nie oznaczaj impactów kategoriami beneficjentów przy zapisie.",
+    )
+    parser.add_argument(
+        "--no-identifiers",
+        action="store_true",
+        help="Nie wyodrębniaj identyfikatorów (DOI/ISBN/ISSN) z opisów osiągnięć przy zapisie.",
+    )
+
+    add_storage_arguments(parser)
+    add_index_arguments(parser)
+    add_summary_arguments(parser)
+    add_category_arguments(parser)
+    add_dedup_arguments(parser)
 
     args = parser.parse_args()
 
+    repo = repository_from_args(args)
+    index = None if args.no_institution_index else InstitutionIndex()
+    institution_uuids: Set[str] = set()
+    dedup = deduplicator_from_args(args)
+
     await ingest_all_impacts(
         kind_code=args.kind_code,
         page_size=args.page_size,
+        connector=RadonConnector(base_url=args.base_url),
+        repo=repo,
+        classify_beneficiaries=not args.no_beneficiaries,
+        extract_identifiers=not args.no_identifiers,
+        institution_index=index,
+        institution_uuids=institution_uuids,
+        dedup=dedup,
     )
+    finish_dedup(dedup, args)
+
+    if index is not None:
+        await refresh_impact_counts(index, repo)
+        update_index_file(args.institution_index, index)
+
+    if not args.no_categories:
+        await refresh_categories_after_ingest(repo, sorted(institution_uuids), store=evaluation_repository_from_args(args))
+    if not args.no_summaries:
+        await refresh_after_ingest(repo, sorted(institution_uuids), store=summary_repository_from_args(args))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+# app/scripts/join_evaluations.py
+"""
+Odświeża zdenormalizowane kategorie ewaluacyjne impactów (evaluation_period,
+evaluation_category) na podstawie ewaluacji z kolekcji `radon_evaluations`
+albo ze zrzutów (app/pipeline/evaluation_join.py).
+
+Zapisywane są tylko impacty, których kategoria się zmieniła; z
+--institution-uuid odświeżane są wyłącznie wskazane instytucje.
+
+Użycie:
+    python -m app.scripts.join_evaluations
+    python -m app.scripts.join_evaluations --institution-uuid <uuid1> <uuid2>
+    python -m app.scripts.join_evaluations --evaluations evaluations.ndjson --backend sqlite
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from typing import List
+
+from app.dumps.readers import iter_model_dump
+from app.models import InstitutionEvaluationSchema
+from app.pipeline.evaluation_join import EvaluationCategoryIndex, refresh_evaluation_categories
+from app.repositories.factory import add_storage_arguments, evaluation_repository_from_args, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Denormalizacja kategorii ewaluacyjnych dyscyplin na impacty.")
+    parser.add_argument(
+        "--evaluations",
+        nargs="+",
+        default=None,
+        help="Zrzuty ewaluacji (JSON/NDJSON). Bez tej opcji – kolekcja MongoDB radon_evaluations.",
+    )
+    parser.add_argument(
+        "--institution-uuid",
+        nargs="+",
+        default=None,
+        help="Odśwież tylko impacty tych instytucji.",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Rozmiar partii zapisu (domyślnie: 500).")
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    evaluations: List[InstitutionEvaluationSchema] = []
+    if args.evaluations:
+        for path in args.evaluations:
+            evaluations.extend(iter_model_dump(path, InstitutionEvaluationSchema))
+    else:
+        query = {"institution_uuid": {"$in": args.institution_uuid}} if args.institution_uuid else {}
+        async for evaluation in evaluation_repository_from_args(args).iter_evaluations(query):
+            evaluations.append(evaluation)
+
+    index = EvaluationCategoryIndex(evaluations)
+    logger.info(
+        "Wczytano %d ewaluacji: %d instytucji, %d par instytucja–dyscyplina",
+        len(evaluations),
+        len(index.institutions),
+        len(index),
+    )
+
+    repo = repository_from_args(args)
+    await repo.ensure_indexes()
+    counts = await refresh_evaluation_categories(
+        repo, index, institution_uuids=args.institution_uuid, batch_size=args.batch_size
+    )
+
+    logger.info(
+        "Przeliczono %d impactów w %.1fs – zmienione: %d",
+        counts["read"],
+        time.perf_counter() - started,
+        counts["changed"],
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+# app/scripts/match_funding.py
+"""
+Dopasowuje nabory finansowania do podmiotów (app/analytics/funding_matching.py)
+i zapisuje propozycje jako raporty ImpactReportSchema (NDJSON, jeden podmiot
+na linię, propozycje w `recommended_funding`).
+
+Profile podmiotów powstają z impactów (repozytorium lub zrzuty) i opcjonalnie
+z produktów naukowych.
+
+Użycie:
+    python -m app.scripts.match_funding --opportunities calls.ndjson -o funding.ndjson
+
+    # Impacty ze zrzutu, produkty, tylko otwarte nabory, top 20:
+    python -m app.scripts.match_funding --opportunities calls.json -i impacts.parquet \\
+        --products products.ndjson --only-open -k 20 -o funding.ndjson
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from datetime import date
+from pathlib import Path
+from typing import Dict, List
+
+from app.analytics.funding_matching import (
+    DEFAULT_MIN_SCORE,
+    DEFAULT_TOP_K,
+    IMPACT_PROFILE_FIELDS,
+    EntityProfile,
+    FundingMatcher,
+    profiles_from_impacts,
+    profiles_from_products,
+)
+from app.dumps.readers import iter_dump, iter_model_dump, iter_product_dump
+from app.models import FundingOpportunitySchema, ImpactReportSchema
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Dopasowanie naborów finansowania do podmiotów.")
+    parser.add_argument(
+        "--opportunities",
+        nargs="+",
+        required=True,
+        help="Pliki z naborami (FundingOpportunitySchema, JSON/NDJSON).",
+    )
+    parser.add_argument(
+        "--input", "-i",
+        nargs="+",
+        default=None,
+        help="Zrzuty impactów (JSON/NDJSON/Parquet/Arrow). Bez tej opcji impacty są czytane z repozytorium.",
+    )
+    parser.add_argument("--skip-impacts", action="store_true", help="Profile tylko z produktów naukowych.")
+    parser.add_argument(
+        "--products",
+        nargs="+",
+        default=[],
+        help="Pliki z produktami naukowymi (ScientificProductSchema, JSON/NDJSON).",
+    )
+    parser.add_argument("--output", "-o", type=str, required=True, help="Plik wynikowy NDJSON (ImpactReportSchema).")
+    parser.add_argument("-k", type=int, default=DEFAULT_TOP_K, help=f"Liczba propozycji na podmiot (domyślnie: {DEFAULT_TOP_K}).")
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=DEFAULT_MIN_SCORE,
+        help=f"Minimalny wynik dopasowania 0–1 (domyślnie: {DEFAULT_MIN_SCORE}).",
+    )
+    parser.add_argument("--only-open", action="store_true", help="Pomiń nabory z terminem przed dzisiejszą datą.")
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+
+    opportunities: List[FundingOpportunitySchema] = []
+    for path in args.opportunities:
+        opportunities.extend(iter_model_dump(path, FundingOpportunitySchema))
+    matcher = FundingMatcher(opportunities)
+
+    profiles: Dict[str, EntityProfile] = {}
+    if not args.skip_impacts:
+        if args.input:
+            fields = set(IMPACT_PROFILE_FIELDS)
+            for path in args.input:
+                profiles_from_impacts((i.model_dump(include=fields) for i in iter_dump(path)), profiles)
+        else:
+            repo = repository_from_args(args)
+            profiles_from_impacts([doc async for doc in repo.iter_documents(fields=IMPACT_PROFILE_FIELDS)], profiles)
+    for path in args.products:
+        profiles_from_products(iter_product_dump(path), profiles)
+    logger.info("Profile podmiotów: %d", len(profiles))
+
+    suggestions = 0
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("w", encoding="utf-8") as f:
+        for profile, funding in matcher.recommend(
+            profiles.values(),
+            k=args.k,
+            min_score=args.min_score,
+            open_on=date.today() if args.only_open else None,
+        ):
+            report = ImpactReportSchema(
+                entity_id=profile.entity_id,
+                entity_type=profile.entity_type,
+                recommended_funding=funding,
+            )
+            f.write(report.model_dump_json())
+            f.write("\n")
+            suggestions += len(funding)
+
+    logger.info(
+        "Zapisano %d propozycji dla %d podmiotów w %.1fs → %s",
+        suggestions, len(profiles), time.perf_counter() - started, output,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+# app/scripts/tag_beneficiaries.py
+"""
+Backfill kategorii beneficjentów (app/pipeline/beneficiaries.py) dla impactów
+już zapisanych w repozytorium – np. po zmianie słowników słów kluczowych.
+
+Impacty są czytane strumieniowo i zapisywane partiami (bulk upsert); rekordy,
+których klasyfikacja się nie zmieniła, nie są modyfikowane.
+
+Użycie:
+    python -m app.scripts.tag_beneficiaries
+    python -m app.scripts.tag_beneficiaries --institution-uuid <uuid> --min-score 1
+    python -m app.scripts.tag_beneficiaries --backend sqlite --sqlite-path data/imeto.sqlite3
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from typing import Any, Dict, List
+
+from app.models import ImpactCaseSchema
+from app.pipeline.beneficiaries import DEFAULT_MIN_SCORE, BeneficiaryClassifier
+from app.repositories.factory import add_storage_arguments, repository_from_args
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Backfill kategorii beneficjentów impactów w repozytorium.")
+    parser.add_argument("--institution-uuid", type=str, default=None, help="Tylko impacty tej instytucji.")
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=DEFAULT_MIN_SCORE,
+        help=f"Minimalna ważona liczba trafień kategorii (domyślnie: {DEFAULT_MIN_SCORE}).",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Rozmiar partii zapisu (domyślnie: 500).")
+    add_storage_arguments(parser)
+
+    args = parser.parse_args()
+
+    repo = repository_from_args(args)
+    await repo.ensure_indexes()
+    classifier = BeneficiaryClassifier(min_score=args.min_score)
+
+    query: Dict[str, Any] = {"institution_uuid": args.institution_uuid} if args.institution_uuid else {}
+    totals = Counter()
+    categories = Counter()
+    batch: List[ImpactCaseSchema] = []
+    started = time.perf_counter()
+
+    async def flush() -> None:
+        result = await repo.save_many(batch)
+        totals.update(result)
+        batch.clear()
+
+    async for impact in repo.iter_impacts(query=query, batch_size=args.batch_size):
+        classifier.tag(impact)
+        categories.update(impact.beneficiary_categories)
+        totals["read"] += 1
+        batch.append(impact)
+        if len(batch) >= args.batch_size:
+            await flush()
+    if batch:
+        await flush()
+
+    logger.info(
+        "Sklasyfikowano %d impactów w %.1fs – zmienione: %d",
+        totals["read"],
+        time.perf_counter() - started,
+        totals["modified"],
+    )
+    for category, count in categories.most_common():
+        logger.info("  %-24s %d", category, count)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
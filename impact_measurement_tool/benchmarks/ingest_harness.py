@@ -0,0 +1,210 @@
+# benchmarks/ingest_harness.py
+"""
+Harness end-to-end: uruchamia lokalny fake RAD-on i przepuszcza przez niego
+skrypty ingestu (RadonConnector → ImpactCaseSchema → repozytorium impactów).
+
+Raportuje: liczbę rekordów, rekordy/s, liczbę stron, p50/p99 opóźnienia strony
+(mierzone po stronie klienta), szczytowe zużycie pamięci i statystyki serwera.
+Wynik jest zapisywany jako JSON. Przebieg, w którym zapisano inną liczbę
+rekordów niż oczekiwana (albo RAD-on nie odpowiedział mimo ponowień), jest
+oznaczany jako niepełny ("complete": false) i kończy się kodem wyjścia 1.
+
+Użycie:
+    # Sweep po kindCode, 5000 rekordów, 50 ms opóźnienia, 1% błędów:
+    python -m benchmarks.ingest_harness --scenario kind --records 5000 --latency-ms 50 --error-rate 0.01
+
+    # Ingest po instytucjach, zapis do SQLite albo prawdziwego MongoDB:
+    python -m benchmarks.ingest_harness --scenario institutions --backend sqlite
+    python -m benchmarks.ingest_harness --scenario institutions --backend mongo --mongo-uri mongodb://localhost:27017
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import resource
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.connectors.radon import RadonAPIError, RadonConnector
+from app.scripts.ingest_radon_impacts import ingest_for_institution
+from app.scripts.ingest_radon_impacts_all import ingest_all_impacts
+from benchmarks.radon_server import FakeRadonServer, add_server_arguments, server_from_args
+from benchmarks.storage import BENCH_BACKENDS, fresh_repository
+
+logger = logging.getLogger(__name__)
+
+
+class TimedRadonConnector(RadonConnector):
+    """RadonConnector, który zapisuje czas każdego wywołania strony API."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.page_latencies: List[float] = []
+
+    def get_impacts_page(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return super().get_impacts_page(*args, **kwargs)
+        finally:
+            self.page_latencies.append(time.perf_counter() - start)
+
+    def get_impact_description(self, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            return super().get_impact_description(*args, **kwargs)
+        finally:
+            self.page_latencies.append(time.perf_counter() - start)
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Percentyl metodą najbliższej rangi (q w zakresie 0–100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss: kilobajty na Linuksie, bajty na macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+async def run_scenario(
+    server: FakeRadonServer,
+    scenario: str,
+    page_size: int,
+    kind_code: str = "1",
+    backend: str = "memory",
+    mongo_uri: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Uruchamia jeden scenariusz ingestu przeciwko serwerowi i zwraca metryki."""
+    connector = TimedRadonConnector(base_url=server.base_url)
+    repo = await fresh_repository(backend, mongo_uri=mongo_uri)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    count = 0
+    error: Optional[str] = None
+    try:
+        if scenario == "kind":
+            count = await ingest_all_impacts(
+                kind_code=kind_code,
+                page_size=page_size,
+                connector=connector,
+                repo=repo,
+            )
+        elif scenario == "institutions":
+            for inst_uuid in server.dataset.impacts_by_institution:
+                count += await ingest_for_institution(
+                    institution_uuid=inst_uuid,
+                    connector=connector,
+                    repo=repo,
+                    page_size=page_size,
+                )
+        else:
+            raise ValueError(f"Nieznany scenariusz: {scenario}")
+    except RadonAPIError as e:
+        error = str(e)
+
+    elapsed = time.perf_counter() - start
+    _, peak_traced = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies_ms = [t * 1000.0 for t in connector.page_latencies]
+    expected = (
+        len(server.dataset.impacts_by_kind.get(kind_code, []))
+        if scenario == "kind"
+        else len(server.dataset.impacts)
+    )
+
+    return {
+        "scenario": scenario,
+        "backend": backend,
+        "page_size": page_size,
+        "records_expected": expected,
+        "records_ingested": count,
+        "complete": error is None and count == expected,
+        "error": error,
+        "request_errors": connector.request_errors,
+        "elapsed_s": elapsed,
+        "records_per_s": count / elapsed if elapsed else 0.0,
+        "pages": len(latencies_ms),
+        "page_latency_ms": {
+            "p50": percentile(latencies_ms, 50),
+            "p99": percentile(latencies_ms, 99),
+            "max": max(latencies_ms) if latencies_ms else None,
+        },
+        "peak_traced_mb": peak_traced / (1024 * 1024),
+        "peak_rss_mb": _peak_rss_mb(),
+        "server": server.stats.as_dict(),
+        "server_config": {
+            "latency_ms": server.config.latency_ms,
+            "latency_jitter_ms": server.config.latency_jitter_ms,
+            "error_rate": server.config.error_rate,
+            "max_page_size": server.config.max_page_size,
+        },
+    }
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end ingestu na lokalnym fake RAD-on.")
+    parser.add_argument(
+        "--scenario",
+        choices=("kind", "institutions"),
+        default="kind",
+        help="'kind' – ingest_radon_impacts_all, 'institutions' – ingest_radon_impacts.",
+    )
+    parser.add_argument("--page-size", type=int, default=50, help="resultNumbers w zapytaniach (domyślnie: 50).")
+    parser.add_argument("--kind-code", type=str, default="1", help="kindCode dla scenariusza 'kind'.")
+    parser.add_argument("--backend", choices=BENCH_BACKENDS, default="memory", help="Backend zapisu (domyślnie: memory).")
+    parser.add_argument("--mongo-uri", type=str, default=None, help="URI MongoDB dla --backend mongo.")
+    parser.add_argument("--output", "-o", type=str, default=None, help="Plik wynikowy JSON.")
+    add_server_arguments(parser)
+
+    args = parser.parse_args()
+
+    with server_from_args(args) as server:
+        report = asyncio.run(
+            run_scenario(
+                server,
+                scenario=args.scenario,
+                page_size=args.page_size,
+                kind_code=args.kind_code,
+                backend=args.backend,
+                mongo_uri=args.mongo_uri,
+            )
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+        print(f"Zapisano wyniki → {args.output}")
+    print(text)
+
+    if not report["complete"]:
+        logger.error(
+            "Niepełny przebieg: zapisano %d z %d rekordów%s",
+            report["records_ingested"],
+            report["records_expected"],
+            f" ({report['error']})" if report["error"] else "",
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
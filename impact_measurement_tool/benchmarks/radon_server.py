@@ -0,0 +1,308 @@
+# benchmarks/radon_server.py
+"""
+Lokalny zamiennik API RAD-on do testów obciążeniowych i benchmarków ingestu.
+
+Implementuje:
+- GET /opendata/polon/impacts     (kindCode, institutionUuid, resultNumbers, token),
+- GET /opendata/polon/evaluations (institutionName, resultNumbers, token),
+
+z odpowiedzią w formacie RAD-on: {"results": [...], "pagination": {"maxCount": N, "token": "..."}}.
+Dane pochodzą z pliku z nagranymi rekordami albo z generatora syntetycznego.
+Opóźnienie, odsetek błędów i maksymalny rozmiar strony są konfigurowalne.
+
+Użycie (samodzielny serwer):
+    python -m benchmarks.radon_server --port 8765 --records 5000 --latency-ms 80 --error-rate 0.01
+
+    python -m app.scripts.ingest_radon_impacts_all --base-url http://127.0.0.1:8765/opendata
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import SyntheticRadon, load_recorded_records
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ServerConfig:
+    """Parametry zachowania serwera."""
+
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    max_page_size: int = 100
+    seed: int = 42
+
+
+@dataclass
+class ServerStats:
+    """Liczniki zapytań obsłużonych przez serwer (bezpieczne wątkowo)."""
+
+    requests: int = 0
+    errors: int = 0
+    records_served: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, records: int = 0, error: bool = False) -> None:
+        with self._lock:
+            self.requests += 1
+            self.records_served += records
+            if error:
+                self.errors += 1
+
+    def as_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "records_served": self.records_served,
+            }
+
+
+def _encode_token(offset: int) -> str:
+    return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+
+def _decode_token(token: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(token.encode()).decode().split(":", 1)[1])
+    except (ValueError, IndexError):
+        return 0
+
+
+class RadonDataset:
+    """Rekordy impactów i ewaluacji z indeksami dla filtrów używanych przez connector."""
+
+    def __init__(self, impacts: List[Dict[str, Any]], evaluations: List[Dict[str, Any]]) -> None:
+        self.impacts = impacts
+        self.evaluations = evaluations
+
+        self.impacts_by_kind: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.impacts_by_institution: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for r in impacts:
+            self.impacts_by_kind[str(r.get("kindCode"))].append(r)
+            self.impacts_by_institution[str(r.get("institutionUuid"))].append(r)
+
+        self.evaluations_by_name: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for r in evaluations:
+            self.evaluations_by_name[str(r.get("institutionName"))].append(r)
+
+    @classmethod
+    def synthetic(cls, n_impacts: int, n_evaluations: Optional[int] = None, seed: int = 42) -> "RadonDataset":
+        source = SyntheticRadon(seed=seed)
+        n_evaluations = n_evaluations if n_evaluations is not None else 2 * len(source.institutions)
+        return cls(source.impact_records(n_impacts), source.evaluation_records(n_evaluations))
+
+    def select_impacts(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get("institutionUuid"):
+            selected = self.impacts_by_institution.get(params["institutionUuid"], [])
+            if params.get("kindCode"):
+                selected = [r for r in selected if str(r.get("kindCode")) == params["kindCode"]]
+            return selected
+        if params.get("kindCode"):
+            return self.impacts_by_kind.get(params["kindCode"], [])
+        return self.impacts
+
+    def select_evaluations(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if params.get("institutionName"):
+            return self.evaluations_by_name.get(params["institutionName"], [])
+        return self.evaluations
+
+
+class _RadonHandler(BaseHTTPRequestHandler):
+    server: "_RadonHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 – sygnatura z BaseHTTPRequestHandler
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    def do_GET(self) -> None:  # noqa: N802 – nazwa wymagana przez http.server
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        fake = self.server.fake
+
+        fake.sleep()
+
+        if fake.should_fail():
+            fake.stats.add(error=True)
+            self._send_json(fake.config.error_status, {"error": "injected failure"})
+            return
+
+        if url.path.endswith("/polon/impacts"):
+            selected = fake.dataset.select_impacts(params)
+        elif url.path.endswith("/polon/evaluations"):
+            selected = fake.dataset.select_evaluations(params)
+        else:
+            fake.stats.add(error=True)
+            self._send_json(404, {"error": f"unknown path {url.path}"})
+            return
+
+        try:
+            page_size = int(params.get("resultNumbers", 10))
+        except ValueError:
+            page_size = 10
+        page_size = max(1, min(page_size, fake.config.max_page_size))
+
+        offset = _decode_token(params["token"]) if params.get("token") else 0
+        page = selected[offset:offset + page_size]
+        next_offset = offset + len(page)
+
+        body = {
+            "results": page,
+            "pagination": {
+                "maxCount": len(selected),
+                "token": _encode_token(next_offset) if next_offset < len(selected) else None,
+            },
+        }
+        fake.stats.add(records=len(page))
+        self._send_json(200, body)
+
+    def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _RadonHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    fake: "FakeRadonServer"
+
+
+class FakeRadonServer:
+    """
+    Serwer HTTP udający RAD-on, uruchamiany w wątku w tle.
+
+    Użycie:
+        with FakeRadonServer(RadonDataset.synthetic(1000)) as server:
+            connector = RadonConnector(base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        dataset: RadonDataset,
+        config: Optional[ServerConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.dataset = dataset
+        self.config = config or ServerConfig()
+        self.stats = ServerStats()
+        self._rng = random.Random(self.config.seed)
+        self._rng_lock = threading.Lock()
+        self._httpd = _RadonHTTPServer((host, port), _RadonHandler)
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/opendata"
+
+    def sleep(self) -> None:
+        if not self.config.latency_ms and not self.config.latency_jitter_ms:
+            return
+        with self._rng_lock:
+            jitter = self._rng.uniform(-1.0, 1.0) * self.config.latency_jitter_ms
+        time.sleep(max(0.0, self.config.latency_ms + jitter) / 1000.0)
+
+    def should_fail(self) -> bool:
+        if self.config.error_rate <= 0:
+            return False
+        with self._rng_lock:
+            return self._rng.random() < self.config.error_rate
+
+    def start(self) -> "FakeRadonServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info("Fake RAD-on nasłuchuje na %s", self.base_url)
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "FakeRadonServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Wspólne opcje CLI serwera (używane też przez harness ingestu)."""
+    parser.add_argument("--records", type=int, default=2000, help="Liczba syntetycznych impactów (domyślnie: 2000).")
+    parser.add_argument(
+        "--fixtures",
+        type=str,
+        default=None,
+        help="Plik z nagranymi surowymi rekordami impactów (.json / .ndjson) zamiast danych syntetycznych.",
+    )
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Średnie opóźnienie odpowiedzi w ms.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Rozrzut opóźnienia (±) w ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Odsetek odpowiedzi z błędem (0–1).")
+    parser.add_argument("--max-page-size", type=int, default=100, help="Maksymalny rozmiar strony (resultNumbers).")
+    parser.add_argument("--seed", type=int, default=42, help="Ziarno danych i losowania błędów.")
+
+
+def server_from_args(args: argparse.Namespace, port: int = 0) -> FakeRadonServer:
+    if args.fixtures:
+        source = SyntheticRadon(seed=args.seed)
+        dataset = RadonDataset(
+            load_recorded_records(args.fixtures),
+            source.evaluation_records(2 * len(source.institutions)),
+        )
+    else:
+        dataset = RadonDataset.synthetic(args.records, seed=args.seed)
+
+    config = ServerConfig(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        max_page_size=args.max_page_size,
+        seed=args.seed,
+    )
+    return FakeRadonServer(dataset, config=config, port=port)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Lokalny zamiennik API RAD-on (impacts / evaluations).")
+    parser.add_argument("--port", type=int, default=8765, help="Port HTTP (domyślnie: 8765).")
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = server_from_args(args, port=args.port)
+    server.start()
+    print(f"Fake RAD-on: {server.base_url}  (Ctrl+C aby zakończyć)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats.as_dict()))
+
+
+if __name__ == "__main__":
+    main()
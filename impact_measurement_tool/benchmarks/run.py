@@ -0,0 +1,427 @@
+# benchmarks/run.py
+"""
+Benchmarki parsowania modeli, serializacji, eksportu i ścieżek repozytorium.
+
+Wyniki są zapisywane jako JSON (z metadanymi: commit, Python, platforma),
+więc można je porównywać między commitami.
+
+Użycie (z katalogu projektu):
+    # Domyślne rozmiary korpusu, wynik do pliku:
+    python -m benchmarks.run --output bench_results.json
+
+    # Wybrane benchmarki i rozmiary:
+    python -m benchmarks.run --filter models. --sizes 100,1000
+
+    # Porównanie z poprzednim wynikiem:
+    python -m benchmarks.run --compare bench_baseline.json
+
+    # Repozytorium w SQLite albo na prawdziwym MongoDB zamiast w pamięci:
+    python -m benchmarks.run --filter repository. --backend sqlite
+    python -m benchmarks.run --filter repository. --backend mongo --mongo-uri mongodb://localhost:27017
+
+    # Nagrane rekordy RAD-on zamiast syntetycznych:
+    python -m benchmarks.run --records recorded_impacts.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from app.dumps.writers import NdjsonImpactWriter, flatten_impact
+from app.models import ImpactCaseSchema, InstitutionEvaluationSchema
+from app.repositories.base import BaseImpactRepository
+from app.scripts.download_impacts import save_csv
+from benchmarks.storage import BENCH_BACKENDS, fresh_repository
+from benchmarks.synthetic import SyntheticRadon, load_recorded_records
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (100, 1000, 10000)
+
+# Funkcja mierzona: synchroniczna albo korutyna (bez argumentów)
+Measured = Callable[[], Union[Any, Awaitable[Any]]]
+
+# Fabryka benchmarku: zwraca funkcję mierzoną od razu albo (gdy przygotowanie
+# wymaga I/O, np. wypełnienia repozytorium) jako korutyna
+BenchFactory = Callable[["BenchContext"], Union[Measured, Awaitable[Measured]]]
+
+
+@dataclass
+class BenchContext:
+    """Dane wejściowe i konfiguracja wspólne dla wszystkich benchmarków jednego rozmiaru."""
+
+    size: int
+    records: List[Dict[str, Any]]
+    evaluations: List[Dict[str, Any]]
+    impacts: List[ImpactCaseSchema]
+    tmp_dir: Path
+    backend: str = "memory"
+    mongo_uri: Optional[str] = None
+
+    async def repository(self) -> BaseImpactRepository:
+        """Nowe, puste repozytorium wybranego backendu."""
+        return await fresh_repository(self.backend, mongo_uri=self.mongo_uri, tmp_dir=self.tmp_dir)
+
+
+@dataclass
+class BenchResult:
+    name: str
+    size: int
+    repeat: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    stdev_s: float
+    records_per_s: float
+
+
+# ========= Definicje benchmarków =========
+# Każda funkcja dostaje kontekst i zwraca bezargumentową funkcję do zmierzenia
+# (fabryki z asynchronicznym przygotowaniem są korutynami).
+
+
+def bench_impact_from_radon_record(ctx: BenchContext) -> Measured:
+    return lambda: [ImpactCaseSchema.from_radon_record(r) for r in ctx.records]
+
+
+def bench_impact_from_radon_records(ctx: BenchContext) -> Measured:
+    return lambda: ImpactCaseSchema.from_radon_records(ctx.records)
+
+
+def bench_impact_construct_unchecked(ctx: BenchContext) -> Measured:
+    return lambda: [ImpactCaseSchema.construct_from_radon_record(r) for r in ctx.records]
+
+
+def bench_evaluation_from_radon_record(ctx: BenchContext) -> Measured:
+    return lambda: [InstitutionEvaluationSchema.from_radon_record(r) for r in ctx.evaluations]
+
+
+def bench_model_dump(ctx: BenchContext) -> Measured:
+    return lambda: [impact.model_dump() for impact in ctx.impacts]
+
+
+def bench_model_dump_json(ctx: BenchContext) -> Measured:
+    return lambda: [impact.model_dump_json(exclude={"raw"}) for impact in ctx.impacts]
+
+
+def bench_json_dumps(ctx: BenchContext) -> Measured:
+    return lambda: [
+        json.dumps(impact.model_dump(exclude={"raw"}), ensure_ascii=False) for impact in ctx.impacts
+    ]
+
+
+def bench_flatten_impact(ctx: BenchContext) -> Measured:
+    return lambda: [flatten_impact(impact) for impact in ctx.impacts]
+
+
+def bench_save_csv(ctx: BenchContext) -> Measured:
+    path = ctx.tmp_dir / "bench.csv"
+    return lambda: save_csv(ctx.impacts, path)
+
+
+def bench_write_ndjson(ctx: BenchContext) -> Measured:
+    path = ctx.tmp_dir / "bench.ndjson"
+
+    def run() -> int:
+        with NdjsonImpactWriter(path) as writer:
+            return writer.write_all(ctx.impacts)
+
+    return run
+
+
+def bench_write_parquet(ctx: BenchContext) -> Measured:
+    from app.dumps.writers import ParquetImpactWriter
+
+    path = ctx.tmp_dir / "bench.parquet"
+
+    def run() -> int:
+        with ParquetImpactWriter(path) as writer:
+            return writer.write_all(ctx.impacts)
+
+    return run
+
+
+def bench_repository_save_one(ctx: BenchContext) -> Measured:
+    async def run() -> None:
+        repo = await ctx.repository()
+        for impact in ctx.impacts:
+            await repo.save_one(impact)
+
+    return run
+
+
+def bench_repository_save_many(ctx: BenchContext) -> Measured:
+    async def run() -> None:
+        repo = await ctx.repository()
+        for start in range(0, len(ctx.impacts), 500):
+            await repo.save_many(ctx.impacts[start:start + 500])
+
+    return run
+
+
+async def _filled_repository(ctx: BenchContext) -> BaseImpactRepository:
+    repo = await ctx.repository()
+    await repo.save_many(ctx.impacts)
+    return repo
+
+
+async def bench_repository_list_impacts(ctx: BenchContext) -> Measured:
+    repo = await _filled_repository(ctx)
+
+    async def run() -> None:
+        for skip in range(0, ctx.size, 50):
+            await repo.list_impacts(skip=skip, limit=50)
+
+    return run
+
+
+async def bench_repository_iter_impacts(ctx: BenchContext) -> Measured:
+    repo = await _filled_repository(ctx)
+
+    async def run() -> int:
+        count = 0
+        async for _ in repo.iter_impacts():
+            count += 1
+        return count
+
+    return run
+
+
+BENCHMARKS: Dict[str, BenchFactory] = {
+    "models.impact_from_radon_record": bench_impact_from_radon_record,
+    "models.impact_from_radon_records": bench_impact_from_radon_records,
+    "models.impact_construct_unchecked": bench_impact_construct_unchecked,
+    "models.evaluation_from_radon_record": bench_evaluation_from_radon_record,
+    "serialize.model_dump": bench_model_dump,
+    "serialize.model_dump_json": bench_model_dump_json,
+    "serialize.json_dumps": bench_json_dumps,
+    "export.flatten_impact": bench_flatten_impact,
+    "export.save_csv": bench_save_csv,
+    "export.ndjson_writer": bench_write_ndjson,
+    "export.parquet_writer": bench_write_parquet,
+    "repository.save_one": bench_repository_save_one,
+    "repository.save_many": bench_repository_save_many,
+    "repository.list_impacts": bench_repository_list_impacts,
+    "repository.iter_impacts": bench_repository_iter_impacts,
+}
+
+
+# ========= Pomiar =========
+
+
+async def measure(name: str, fn: Measured, size: int, repeat: int, warmup: int = 1) -> BenchResult:
+    """Uruchamia `fn` `warmup + repeat` razy i zwraca statystyki czasów (bez rozgrzewki)."""
+    is_async = inspect.iscoroutinefunction(fn)
+
+    async def call() -> None:
+        if is_async:
+            await fn()
+        else:
+            fn()
+
+    for _ in range(warmup):
+        await call()
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await call()
+        timings.append(time.perf_counter() - start)
+
+    median = statistics.median(timings)
+    return BenchResult(
+        name=name,
+        size=size,
+        repeat=repeat,
+        min_s=min(timings),
+        median_s=median,
+        mean_s=statistics.fmean(timings),
+        stdev_s=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        records_per_s=size / median if median else 0.0,
+    )
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmarks(
+    names: List[str],
+    sizes: List[int],
+    repeat: int,
+    seed: int = 42,
+    recorded: Optional[List[Dict[str, Any]]] = None,
+    backend: str = "memory",
+    mongo_uri: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Uruchamia wybrane benchmarki dla każdego rozmiaru i zwraca wynik gotowy do zapisu jako JSON."""
+    synthetic = SyntheticRadon(seed=seed)
+    results: List[BenchResult] = []
+
+    with tempfile.TemporaryDirectory(prefix="imeto-bench-") as tmp:
+        for size in sizes:
+            if recorded:
+                # Nagrane rekordy powtarzamy cyklicznie do żądanego rozmiaru
+                records = [recorded[i % len(recorded)] for i in range(size)]
+            else:
+                records = synthetic.impact_records(size)
+
+            ctx = BenchContext(
+                size=size,
+                records=records,
+                evaluations=synthetic.evaluation_records(size),
+                impacts=ImpactCaseSchema.from_radon_records(records),
+                tmp_dir=Path(tmp),
+                backend=backend,
+                mongo_uri=mongo_uri,
+            )
+
+            for name in names:
+                try:
+                    fn = BENCHMARKS[name](ctx)
+                    if inspect.isawaitable(fn):
+                        fn = await fn
+                except ImportError as e:
+                    logger.warning("Pominięto %s: %s", name, e)
+                    continue
+                result = await measure(name, fn, size=size, repeat=repeat)
+                results.append(result)
+                logger.info(
+                    "%-40s n=%-6d median=%.4fs  %.0f rek/s",
+                    name,
+                    size,
+                    result.median_s,
+                    result.records_per_s,
+                )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "seed": seed,
+            "recorded_input": bool(recorded),
+            "repository_backend": backend,
+        },
+        "results": [asdict(r) for r in results],
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """Zwraca linie tabeli porównania median (current / baseline)."""
+    base = {(r["name"], r["size"]): r for r in baseline.get("results", [])}
+    lines = [f"{'benchmark':<40} {'n':>6} {'baseline':>10} {'current':>10} {'ratio':>7}"]
+
+    for r in current["results"]:
+        b = base.get((r["name"], r["size"]))
+        if b is None:
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("nan")
+        lines.append(
+            f"{r['name']:<40} {r['size']:>6} {b['median_s']:>10.4f} {r['median_s']:>10.4f} {ratio:>7.2f}"
+        )
+
+    return lines
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)-8s %(name)s — %(message)s",
+    )
+
+    parser = argparse.ArgumentParser(description="Benchmarki IMeTo (modele, serializacja, repozytorium).")
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default=",".join(str(s) for s in DEFAULT_SIZES),
+        help="Rozmiary korpusu oddzielone przecinkami (domyślnie: 100,1000,10000).",
+    )
+    parser.add_argument(
+        "--filter",
+        type=str,
+        default=None,
+        help="Uruchom tylko benchmarki, których nazwa zawiera ten napis (np. 'models.').",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Liczba pomiarów na benchmark (domyślnie: 5).")
+    parser.add_argument("--seed", type=int, default=42, help="Ziarno generatora danych syntetycznych.")
+    parser.add_argument(
+        "--records",
+        type=str,
+        default=None,
+        help="Plik z nagranymi surowymi rekordami RAD-on (.json / .ndjson) zamiast danych syntetycznych.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=BENCH_BACKENDS,
+        default="memory",
+        help="Backend dla benchmarków repozytorium (domyślnie: memory).",
+    )
+    parser.add_argument(
+        "--mongo-uri",
+        type=str,
+        default=None,
+        help="URI MongoDB dla --backend mongo (domyślnie mongodb://localhost:27017).",
+    )
+    parser.add_argument("--output", "-o", type=str, default=None, help="Plik wynikowy JSON.")
+    parser.add_argument("--compare", type=str, default=None, help="Plik JSON z wynikiem bazowym do porównania.")
+    parser.add_argument("--list", action="store_true", help="Wypisz dostępne benchmarki i zakończ.")
+
+    args = parser.parse_args()
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+
+    names = [n for n in BENCHMARKS if not args.filter or args.filter in n]
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    recorded = load_recorded_records(args.records) if args.records else None
+
+    report = asyncio.run(
+        run_benchmarks(
+            names=names,
+            sizes=sizes,
+            repeat=args.repeat,
+            seed=args.seed,
+            recorded=recorded,
+            backend=args.backend,
+            mongo_uri=args.mongo_uri,
+        )
+    )
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Zapisano wyniki → {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        print("\n".join(compare(report, baseline)))
+
+
+if __name__ == "__main__":
+    main()
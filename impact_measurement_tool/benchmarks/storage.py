@@ -0,0 +1,52 @@
+# benchmarks/storage.py
+"""
+Świeże (puste) repozytoria impactów dla benchmarków i harnessu ingestu.
+
+- memory – InMemoryImpactRepository (domyślnie, bez zależności),
+- sqlite – nowy plik SQLite w katalogu tymczasowym,
+- mongo  – kolekcja `imeto_bench.radon_impacts` czyszczona przed użyciem.
+"""
+
+from __future__ import annotations
+
+import itertools
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from app.repositories.base import BaseImpactRepository
+
+BENCH_BACKENDS = ("memory", "sqlite", "mongo")
+
+_sqlite_files = itertools.count()
+
+
+async def fresh_repository(
+    backend: str = "memory",
+    mongo_uri: Optional[str] = None,
+    tmp_dir: Optional[Path] = None,
+) -> BaseImpactRepository:
+    """Tworzy puste repozytorium wybranego backendu."""
+    if backend == "memory":
+        from app.repositories.memory_impact_repository import InMemoryImpactRepository
+
+        return InMemoryImpactRepository()
+
+    if backend == "sqlite":
+        from app.repositories.sqlite_impact_repository import SqliteImpactRepository
+
+        directory = tmp_dir or Path(tempfile.mkdtemp(prefix="imeto-bench-"))
+        return SqliteImpactRepository(directory / f"bench-{next(_sqlite_files)}.sqlite3")
+
+    if backend == "mongo":
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        from app.repositories.impact_repository import ImpactRepository
+
+        collection = AsyncIOMotorClient(mongo_uri or "mongodb://localhost:27017")["imeto_bench"]["radon_impacts"]
+        await collection.drop()
+        repo = ImpactRepository(collection=collection)
+        await repo.ensure_indexes()
+        return repo
+
+    raise ValueError(f"Nieznany backend: {backend!r}. Dostępne: {', '.join(BENCH_BACKENDS)}.")
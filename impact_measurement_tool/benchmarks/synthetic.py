@@ -0,0 +1,187 @@
+# benchmarks/synthetic.py
+"""
+Deterministyczny generator syntetycznych rekordów RAD-on (impacty i ewaluacje).
+
+Rekordy mają strukturę i rząd wielkości pól zbliżony do odpowiedzi
+/polon/impacts i /polon/evaluations, więc nadają się do benchmarków
+parsowania, serializacji i zapisu. Ten sam `seed` daje te same dane.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+_WORDS_PL = (
+    "badania wpływ społeczny kultura edukacja administracja publiczna dziedzictwo "
+    "projekt analiza instytucja współpraca społeczność lokalna polityka wyniki "
+    "rozwój nauka historia literatura język archiwum muzeum ochrona zdrowie "
+    "środowisko gospodarka innowacja szkolenie wystawa publikacja raport"
+).split()
+
+_WORDS_EN = (
+    "research impact societal culture education public administration heritage "
+    "project analysis institution cooperation local community policy results "
+    "development science history literature language archive museum protection "
+    "health environment economy innovation training exhibition publication report"
+).split()
+
+_DISCIPLINES = [
+    ("historia", "DS010103N", "dziedzina nauk humanistycznych", "DZ0101N"),
+    ("literaturoznawstwo", "DS010106N", "dziedzina nauk humanistycznych", "DZ0101N"),
+    ("językoznawstwo", "DS010105N", "dziedzina nauk humanistycznych", "DZ0101N"),
+    ("nauki o polityce i administracji", "DS010510N", "dziedzina nauk społecznych", "DZ0105N"),
+    ("socjologia", "DS010514N", "dziedzina nauk społecznych", "DZ0105N"),
+    ("ekonomia i finanse", "DS010502N", "dziedzina nauk społecznych", "DZ0105N"),
+    ("nauki medyczne", "DS010302N", "dziedzina nauk medycznych i nauk o zdrowiu", "DZ0103N"),
+    ("informatyka techniczna i telekomunikacja", "DS010207N", "dziedzina nauk inżynieryjno-technicznych", "DZ0102N"),
+]
+
+_IMPACT_AREAS = [
+    "gospodarka",
+    "administracja publiczna",
+    "ochrona zdrowia",
+    "kultura i sztuka",
+    "środowisko naturalne",
+    "bezpieczeństwo i obronność",
+    "edukacja",
+]
+
+_CATEGORIES = ["A+", "A", "B+", "B", "C"]
+
+_PERIODS = ["2013-2016", "2017-2021"]
+
+
+class SyntheticRadon:
+    """
+    Źródło syntetycznych danych RAD-on.
+
+    `institutions` określa liczbę instytucji, między które rozkładane są impacty
+    (dzięki temu filtry po institutionUuid zwracają sensowne podzbiory).
+    """
+
+    def __init__(self, seed: int = 42, institutions: int = 50) -> None:
+        self.seed = seed
+        rng = random.Random(seed)
+        self.institutions = [
+            (str(uuid.UUID(int=rng.getrandbits(128))), f"Uniwersytet Syntetyczny nr {i}")
+            for i in range(institutions)
+        ]
+
+    @staticmethod
+    def _text(rng: random.Random, words: List[str], n_words: int) -> str:
+        return " ".join(rng.choice(words) for _ in range(n_words)).capitalize() + "."
+
+    def impact_record(self, i: int) -> Dict[str, Any]:
+        """Zwraca i-ty rekord impactu (camelCase, jak w API RAD-on)."""
+        rng = random.Random(self.seed * 1_000_003 + i)
+        inst_uuid, inst_name = self.institutions[i % len(self.institutions)]
+        disc_name, disc_code, dom_name, dom_code = rng.choice(_DISCIPLINES)
+
+        return {
+            "impactUuid": str(uuid.UUID(int=rng.getrandbits(128))),
+            "institutionName": inst_name,
+            "institutionUuid": inst_uuid,
+            "evaluationYear": str(rng.choice([2017, 2021, 2022])),
+            "disciplineName": disc_name,
+            "disciplineCode": disc_code,
+            "domainName": dom_name,
+            "domainCode": dom_code,
+            "kindCode": "1",
+            "kindName": "Opis wpływu",
+            "detailedKind": None,
+            "titlePl": self._text(rng, _WORDS_PL, 8),
+            "titleEn": self._text(rng, _WORDS_EN, 8),
+            "summaryPl": self._text(rng, _WORDS_PL, 60),
+            "summaryEn": self._text(rng, _WORDS_EN, 60),
+            "impactDescriptionPl": self._text(rng, _WORDS_PL, 450),
+            "impactDescriptionEn": self._text(rng, _WORDS_EN, 450),
+            "mainConclusionPl": self._text(rng, _WORDS_PL, 40),
+            "mainConclusionEn": self._text(rng, _WORDS_EN, 40),
+            "impactEvidence": [
+                {
+                    "descriptionPl": self._text(rng, _WORDS_PL, 30),
+                    "descriptionEn": self._text(rng, _WORDS_EN, 30),
+                }
+                for _ in range(rng.randint(1, 5))
+            ],
+            "achievements": [
+                {
+                    "bibliographicDescriptionPl": (
+                        f"Kowalski J., {self._text(rng, _WORDS_PL, 6)} "
+                        f"Wydawnictwo, {rng.randint(2010, 2021)}, doi:10.{rng.randint(1000, 9999)}/syn.{i}.{j}"
+                    ),
+                    "bibliographicDescriptionEn": None,
+                    "summaryPl": self._text(rng, _WORDS_PL, 40),
+                    "summaryEn": self._text(rng, _WORDS_EN, 40),
+                }
+                for j in range(rng.randint(1, 5))
+            ],
+            "entityNamePl": self._text(rng, _WORDS_PL, 3),
+            "entityNameEn": self._text(rng, _WORDS_EN, 3),
+            "entityRolePl": self._text(rng, _WORDS_PL, 12),
+            "entityRoleEn": self._text(rng, _WORDS_EN, 12),
+            "impactArea": rng.sample(_IMPACT_AREAS, rng.randint(1, 3)),
+            "otherImpactArea": None,
+            "isInterdisciplinary": rng.random() < 0.3,
+            "interdisciplinarityCharacteristicPl": None,
+            "interdisciplinarityCharacteristicEn": None,
+            "dataSource": "POLON",
+            "lastRefresh": str(1_700_000_000_000 + i),
+        }
+
+    def impact_records(self, n: int, start: int = 0) -> List[Dict[str, Any]]:
+        return [self.impact_record(i) for i in range(start, start + n)]
+
+    def iter_impact_records(self, n: int) -> Iterator[Dict[str, Any]]:
+        for i in range(n):
+            yield self.impact_record(i)
+
+    def evaluation_record(self, i: int) -> Dict[str, Any]:
+        """Zwraca i-ty rekord ewaluacji instytucji (camelCase, jak w API RAD-on)."""
+        rng = random.Random(self.seed * 7_000_003 + i)
+        inst_uuid, inst_name = self.institutions[i % len(self.institutions)]
+        period = _PERIODS[(i // len(self.institutions)) % len(_PERIODS)]
+
+        return {
+            "evaluationPeriod": period,
+            "disciplines": [
+                {
+                    "disciplineName": name,
+                    "disciplineCode": code,
+                    "domainName": dom_name,
+                    "domainCode": dom_code,
+                    "category": rng.choice(_CATEGORIES),
+                }
+                for name, code, dom_name, dom_code in rng.sample(_DISCIPLINES, rng.randint(1, 6))
+            ],
+            "lastRefresh": str(1_747_037_717_779 + i),
+            "institutionName": inst_name,
+            "id": f"eval-{i}",
+            "institutionUuid": inst_uuid,
+            "dataSource": "POLON",
+        }
+
+    def evaluation_records(self, n: int) -> List[Dict[str, Any]]:
+        return [self.evaluation_record(i) for i in range(n)]
+
+
+def load_recorded_records(path: Path | str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Wczytuje nagrane surowe rekordy RAD-on (tablica JSON, NDJSON lub odpowiedź
+    API z kluczem 'results') – do benchmarków na prawdziwych danych.
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+
+    if path.suffix.lower() in (".ndjson", ".jsonl"):
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    else:
+        data = json.loads(text)
+        records = data.get("results", []) if isinstance(data, dict) else data
+
+    records = [r for r in records if isinstance(r, dict)]
+    return records[:limit] if limit else records
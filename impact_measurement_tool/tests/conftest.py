@@ -0,0 +1,45 @@
+# tests/conftest.py
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from app.repositories import factory
+from app.repositories.base import BaseEvaluationRepository, BaseImpactRepository
+from app.repositories.memory_stores import InMemoryEvaluationRepository
+from app.repositories.sqlite_impact_repository import SqliteImpactRepository
+from app.repositories.sqlite_stores import SqliteEvaluationRepository
+from tests.helpers import BACKENDS, build_impact_repository
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    # Repozytoria używają asyncio.to_thread – testy tylko na asyncio
+    return "asyncio"
+
+
+@pytest.fixture(params=BACKENDS)
+def impact_repository(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[BaseImpactRepository]:
+    repo = build_impact_repository(request.param, tmp_path)
+    yield repo
+    if isinstance(repo, SqliteImpactRepository):
+        repo.close()
+
+
+@pytest.fixture(params=BACKENDS)
+def evaluation_repository(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[BaseEvaluationRepository]:
+    if request.param == "sqlite":
+        repo = SqliteEvaluationRepository(tmp_path / "evaluations.sqlite3")
+        yield repo
+        repo.close()
+    else:
+        yield InMemoryEvaluationRepository()
+
+
+@pytest.fixture
+def fresh_factory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Pusta pamięć podręczna repozytoriów fabryki na czas testu."""
+    monkeypatch.setattr(factory, "_REPOSITORIES", {})
@@ -0,0 +1,62 @@
+# tests/helpers.py
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, List
+
+from app.models import ImpactCaseSchema, InstitutionEvaluationSchema
+from app.repositories.base import BaseImpactRepository
+from app.repositories.memory_impact_repository import InMemoryImpactRepository
+from app.repositories.sqlite_impact_repository import SqliteImpactRepository
+
+BACKENDS = ("memory", "sqlite")
+
+
+def make_impact(i: int, **fields: Any) -> ImpactCaseSchema:
+    """Impact testowy: 3 instytucje, 2 dyscypliny, kategorie beneficjentów i identyfikatory zależne od `i`."""
+    doc = {
+        "impact_uuid": f"imp-{i:04d}",
+        "institution_uuid": f"inst-{i % 3}",
+        "institution_name": f"Uniwersytet {i % 3}",
+        "discipline_code": "DS010103N" if i % 2 else "DS010514N",
+        "title_pl": f"Tytuł {i}",
+        "beneficiary_categories": ["ngos", "students"] if i % 2 else ["ngos"],
+        "identifier_keys": [f"doi:10.1000/{i}"] + (["isbn:9788300000000"] if i % 5 == 0 else []),
+        "raw": {"impactUuid": f"imp-{i:04d}", "titlePl": f"Tytuł {i}"},
+    }
+    doc.update(fields)
+    return ImpactCaseSchema.model_validate(doc)
+
+
+def make_impacts(n: int, start: int = 0) -> List[ImpactCaseSchema]:
+    return [make_impact(i) for i in range(start, start + n)]
+
+
+def make_evaluation(i: int, period: str = "2017-2021", categories: tuple = ("A",)) -> InstitutionEvaluationSchema:
+    return InstitutionEvaluationSchema.model_validate(
+        {
+            "institution_name": f"Uniwersytet {i}",
+            "institution_uuid": f"inst-{i}",
+            "evaluation_record_id": f"eval-{i}-{period}",
+            "evaluation_period": period,
+            "period_start": int(period.split("-")[0]),
+            "period_end": int(period.split("-")[1]),
+            "disciplines": [
+                {
+                    "discipline_name": "historia",
+                    "discipline_code": f"DS0101{n:02d}N",
+                    "domain_name": "dziedzina nauk humanistycznych",
+                    "domain_code": "DZ0101N",
+                    "category": category,
+                }
+                for n, category in enumerate(categories)
+            ],
+        }
+    )
+
+
+def build_impact_repository(backend: str, tmp_path: Path) -> BaseImpactRepository:
+    if backend == "sqlite":
+        return SqliteImpactRepository(tmp_path / "impacts.sqlite3")
+    return InMemoryImpactRepository()
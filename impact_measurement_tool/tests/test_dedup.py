@@ -0,0 +1,141 @@
+# tests/test_dedup.py
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Callable, Set
+
+import pytest
+
+from app.pipeline.dedup import (
+    BloomFilter,
+    IngestDeduplicator,
+    Seen,
+    SeenSet,
+    add_dedup_arguments,
+    content_key,
+    deduplicator_from_args,
+    finish_dedup,
+)
+from tests.helpers import make_impact, make_impacts
+
+
+def _args(*argv: str) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    add_dedup_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def test_content_key_depends_on_uuid_and_raw_content() -> None:
+    impact = make_impact(1)
+    assert content_key(impact) == content_key(make_impact(1))
+    # Pola wyliczane nie wchodzą do klucza, jeśli jest surowy rekord
+    assert content_key(impact) == content_key(make_impact(1, evaluation_category="A"))
+    assert content_key(impact) != content_key(make_impact(1, raw={**impact.raw, "titlePl": "Inny"}))
+    assert content_key(impact) != content_key(make_impact(2, raw=impact.raw))
+    assert 0 <= content_key(impact) < 2 ** 64
+
+
+def test_records_without_uuid_are_keyed_by_content() -> None:
+    keyless = make_impact(1, impact_uuid=None, raw={})
+    assert content_key(keyless) == content_key(make_impact(1, impact_uuid=None, raw={}))
+    assert content_key(keyless) != content_key(make_impact(2, impact_uuid=None, raw={}))
+
+    # Deduplikacja nie przerywa ingestu – rekord trafia do zapisu, który go pominie
+    dedup = IngestDeduplicator()
+    pending: Set[int] = set()
+    assert dedup.candidate(keyless, pending)
+    assert not dedup.candidate(make_impact(1, impact_uuid=None, raw={}), pending)
+    assert dedup.candidate(make_impact(1), pending)
+
+
+@pytest.mark.parametrize("make_seen", [SeenSet, lambda: BloomFilter(1000)], ids=["set", "bloom"])
+def test_add_drops_repeated_records(make_seen: Callable[[], Seen]) -> None:
+    dedup = IngestDeduplicator(make_seen())
+    impacts = make_impacts(50)
+
+    assert all(dedup.add(impact) for impact in impacts)
+    assert not any(dedup.add(impact) for impact in make_impacts(50))
+    assert dedup.add(make_impact(0, raw={"impactUuid": "imp-0000", "titlePl": "Zmieniony"}))
+    assert (dedup.unique, dedup.duplicates, len(dedup.seen)) == (51, 50, 51)
+
+
+def test_candidate_changes_state_only_on_commit() -> None:
+    dedup = IngestDeduplicator()
+    pending: Set[int] = set()
+    page = make_impacts(5) + make_impacts(2)
+
+    assert [dedup.candidate(impact, pending) for impact in page] == [True] * 5 + [False] * 2
+    assert len(dedup.seen) == 0
+
+    # Zapis strony się nie udał – te same rekordy są nadal kandydatami
+    assert all(dedup.candidate(impact, set()) for impact in page[:5])
+
+    dedup.commit(pending)
+    assert (dedup.unique, len(dedup.seen)) == (5, 5)
+    assert not any(dedup.candidate(impact, set()) for impact in page[:5])
+
+
+def test_bloom_filter_sizing_and_false_positive_rate() -> None:
+    bloom = BloomFilter(capacity=2000, error_rate=0.01)
+    assert bloom.num_bits >= 2000 * 9
+    assert bloom.num_hashes == 7
+
+    for key in range(2000):
+        bloom.add(key)
+    # Bez fałszywych negatywów; fałszywe pozytywy w granicach error_rate
+    assert all(key in bloom for key in range(2000))
+    false_positives = sum(key in bloom for key in range(10 ** 6, 10 ** 6 + 20000))
+    assert false_positives < 20000 * 0.03
+
+
+def test_bloom_filter_rejects_invalid_parameters() -> None:
+    with pytest.raises(ValueError):
+        BloomFilter(0)
+    with pytest.raises(ValueError):
+        BloomFilter(100, error_rate=1.5)
+
+
+@pytest.mark.parametrize("make_seen", [SeenSet, lambda: BloomFilter(500, error_rate=0.001)], ids=["set", "bloom"])
+def test_state_round_trips_through_npz(tmp_path: Path, make_seen: Callable[[], Seen]) -> None:
+    seen = make_seen()
+    dedup = IngestDeduplicator(seen)
+    for impact in make_impacts(100):
+        dedup.add(impact)
+
+    path = tmp_path / "state" / "dedup.npz"
+    dedup.save(path)
+    assert path.is_file()
+    assert not path.with_name(path.name + ".tmp").exists()
+
+    loaded = IngestDeduplicator.load(path)
+    assert type(loaded.seen) is type(seen)
+    assert len(loaded.seen) == 100
+    if isinstance(seen, BloomFilter):
+        assert (loaded.seen.capacity, loaded.seen.error_rate, loaded.seen.bits) == (
+            seen.capacity,
+            seen.error_rate,
+            seen.bits,
+        )
+    assert not any(loaded.add(impact) for impact in make_impacts(100))
+    assert loaded.add(make_impact(100))
+
+
+def test_cli_helpers_pick_state_and_filter(tmp_path: Path) -> None:
+    assert deduplicator_from_args(_args("--no-dedup")) is None
+    assert isinstance(deduplicator_from_args(_args()).seen, SeenSet)
+    assert isinstance(deduplicator_from_args(_args("--bloom-capacity", "100")).seen, BloomFilter)
+
+    state = tmp_path / "dedup.npz"
+    args = _args("--dedup-state", str(state), "--bloom-capacity", "100")
+    dedup = deduplicator_from_args(args)
+    for impact in make_impacts(10):
+        dedup.add(impact)
+    finish_dedup(dedup, args)
+
+    # Kolejny skrypt serii wczytuje zapisany stan (także jego rodzaj)
+    resumed = deduplicator_from_args(_args("--dedup-state", str(state)))
+    assert isinstance(resumed.seen, BloomFilter)
+    assert len(resumed.seen) == 10
+    assert not resumed.add(make_impact(3))
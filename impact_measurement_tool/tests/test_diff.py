@@ -0,0 +1,90 @@
+# tests/test_diff.py
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app.dumps.diff import diff_dumps
+from tests.helpers import make_impact
+
+
+def _write_ndjson(path: Path, records: List[Dict[str, Any]]) -> Path:
+    path.write_text("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records), encoding="utf-8")
+    return path
+
+
+def _dump(i: int, **fields: Any) -> Dict[str, Any]:
+    return make_impact(i, **fields).model_dump(mode="json")
+
+
+def _diff(old: Path, new: Path, **kwargs: Any):
+    out = io.StringIO()
+    summary = diff_dumps(old, new, out, **kwargs)
+    changes = [json.loads(line) for line in out.getvalue().splitlines()]
+    return summary, {change["impact_uuid"]: change for change in changes}
+
+
+@pytest.fixture
+def dumps(tmp_path: Path):
+    old = [_dump(i) for i in range(10)]
+    new = (
+        [_dump(i) for i in range(10) if i not in (2, 5, 7)]
+        + [_dump(3, title_pl="Nowy tytuł", beneficiary_categories=["business"])]
+        + [_dump(7, title_pl="Inny tytuł")]
+        + [_dump(i) for i in (10, 11)]
+    )
+    # Kolejność rekordów w zrzucie nie ma znaczenia
+    new = [r for r in new if r["impact_uuid"] != "imp-0003" or r["title_pl"] != "Tytuł 3"][::-1]
+    return _write_ndjson(tmp_path / "old.ndjson", old), _write_ndjson(tmp_path / "new.ndjson", new)
+
+
+@pytest.mark.parametrize("partitions", [1, 4])
+def test_diff_reports_added_removed_and_modified(dumps, partitions: int) -> None:
+    summary, changes = _diff(*dumps, partitions=partitions)
+
+    assert {k: summary[k] for k in ("added", "removed", "modified")} == {"added": 2, "removed": 2, "modified": 2}
+    assert summary["fields"] == {"title_pl": 2, "beneficiary_categories": 1}
+
+    assert {uuid for uuid, c in changes.items() if c["op"] == "added"} == {"imp-0010", "imp-0011"}
+    assert {uuid for uuid, c in changes.items() if c["op"] == "removed"} == {"imp-0002", "imp-0005"}
+    assert changes["imp-0010"]["record"]["title_pl"] == "Tytuł 10"
+    assert "raw" not in changes["imp-0010"]["record"]
+    assert changes["imp-0002"] == {"op": "removed", "impact_uuid": "imp-0002"}
+
+    modified = changes["imp-0003"]
+    assert modified["op"] == "modified"
+    assert sorted(modified["fields"]) == ["beneficiary_categories", "title_pl"]
+    assert modified["new"] == {"title_pl": "Nowy tytuł", "beneficiary_categories": ["business"]}
+    assert "old" not in modified
+
+
+def test_diff_with_old_values(dumps) -> None:
+    _, changes = _diff(*dumps, with_old=True)
+    assert changes["imp-0007"]["fields"] == ["title_pl"]
+    assert changes["imp-0007"]["old"] == {"title_pl": "Tytuł 7"}
+    assert changes["imp-0007"]["new"] == {"title_pl": "Inny tytuł"}
+
+
+def test_identical_dumps_have_no_changes(tmp_path: Path) -> None:
+    records = [_dump(i) for i in range(5)]
+    old = _write_ndjson(tmp_path / "old.ndjson", records)
+    new = tmp_path / "new.json"
+    # Inny format i inny porządek kluczy – po normalizacji te same rekordy
+    new.write_text(json.dumps([dict(reversed(r.items())) for r in records]), encoding="utf-8")
+
+    summary, changes = _diff(old, new, partitions=3)
+    assert changes == {}
+    assert summary == {"added": 0, "removed": 0, "modified": 0, "unchanged": 5, "fields": {}}
+
+
+def test_ignored_fields_are_not_compared(tmp_path: Path) -> None:
+    old = _write_ndjson(tmp_path / "old.ndjson", [_dump(1)])
+    new = _write_ndjson(tmp_path / "new.ndjson", [_dump(1, title_pl="Zmieniony")])
+
+    summary, _ = _diff(old, new, ignored_fields=("raw", "title_pl"))
+    assert (summary["modified"], summary["unchanged"]) == (0, 1)
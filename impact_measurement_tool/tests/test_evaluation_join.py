@@ -0,0 +1,34 @@
+# tests/test_evaluation_join.py
+
+from __future__ import annotations
+
+import pytest
+
+from app.pipeline.evaluation_join import refresh_categories_after_ingest
+from app.repositories.base import DERIVED_FIELDS, BaseEvaluationRepository, BaseImpactRepository
+from tests.helpers import make_evaluation, make_impact
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ingested_impacts_get_categories_from_stored_evaluations(
+    impact_repository: BaseImpactRepository,
+    evaluation_repository: BaseEvaluationRepository,
+) -> None:
+    # Dyscyplina DS010103N (nieparzyste impacty) to czwarta pozycja ewaluacji
+    await evaluation_repository.save_many([make_evaluation(0, categories=("B", "B", "B", "A"))])
+    # inst-2 nie ma ewaluacji w magazynie – kategoria ze zrzutu zostaje
+    impacts = [make_impact(3), make_impact(6), make_impact(5, evaluation_period="2013-2016", evaluation_category="C")]
+    await impact_repository.save_many(impacts, preserve_fields=DERIVED_FIELDS)
+
+    await refresh_categories_after_ingest(impact_repository, ["inst-0", "inst-2"], store=evaluation_repository)
+
+    labels = {
+        impact.impact_uuid: (impact.evaluation_period, impact.evaluation_category)
+        async for impact in impact_repository.iter_impacts()
+    }
+    assert labels == {
+        "imp-0003": ("2017-2021", "A"),
+        "imp-0006": (None, None),
+        "imp-0005": ("2013-2016", "C"),
+    }
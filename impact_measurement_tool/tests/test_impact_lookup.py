@@ -0,0 +1,65 @@
+# tests/test_impact_lookup.py
+
+from __future__ import annotations
+
+from typing import Iterator
+
+import pytest
+
+from app.connectors.radon import RadonConnector
+from app.models import ImpactCaseSchema
+from app.pipeline.impact_lookup import ImpactLookup
+from app.repositories.memory_impact_repository import InMemoryImpactRepository
+from benchmarks.radon_server import FakeRadonServer, RadonDataset
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def server() -> Iterator[FakeRadonServer]:
+    with FakeRadonServer(RadonDataset.synthetic(300)) as server:
+        yield server
+
+
+async def test_unknown_uuid_without_hint_is_not_swept_by_default(server: FakeRadonServer) -> None:
+    uuid = server.dataset.impacts[-1]["impactUuid"]
+    lookup = ImpactLookup(InMemoryImpactRepository(), RadonConnector(base_url=server.base_url))
+
+    assert await lookup.get(uuid) is None
+    assert server.stats.requests == 0
+    assert lookup.stats["missing"] == 1
+
+
+async def test_sweep_is_opt_in(server: FakeRadonServer) -> None:
+    uuid = server.dataset.impacts[-1]["impactUuid"]
+    lookup = ImpactLookup(InMemoryImpactRepository(), RadonConnector(base_url=server.base_url), allow_sweep=True)
+
+    impact = await lookup.get(uuid)
+    assert impact is not None and impact.impact_uuid == uuid
+    assert server.stats.requests > 0
+
+
+async def test_refresh_uses_the_local_institution_hint(server: FakeRadonServer) -> None:
+    record = server.dataset.impacts[-1]
+    repo = InMemoryImpactRepository()
+    await repo.save_one(ImpactCaseSchema.from_radon_record({**record, "titlePl": "Stary tytuł"}))
+    lookup = ImpactLookup(repo, RadonConnector(base_url=server.base_url))
+
+    impact = await lookup.get(record["impactUuid"], refresh=True)
+    assert impact.title_pl == record["titlePl"]
+    assert lookup.stats["remote"] == 1
+
+
+async def test_sources_tell_local_from_remote_results(server: FakeRadonServer) -> None:
+    local, remote = server.dataset.impacts[0], server.dataset.impacts[-1]
+    repo = InMemoryImpactRepository()
+    await repo.save_many([ImpactCaseSchema.from_radon_record(local), ImpactCaseSchema.from_radon_record(remote)])
+    lookup = ImpactLookup(repo, RadonConnector(base_url=server.base_url))
+
+    # Pierwszy z repozytorium, drugi odświeżany z RAD-on, trzeci – nieznany
+    sources = {}
+    await lookup.get_many([local["impactUuid"]], sources=sources)
+    impacts = await lookup.get_many([remote["impactUuid"], "missing-uuid"], refresh=True, sources=sources)
+
+    assert set(impacts) == {remote["impactUuid"]}
+    assert sources == {local["impactUuid"]: "local", remote["impactUuid"]: "remote"}
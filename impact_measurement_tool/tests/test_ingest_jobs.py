@@ -0,0 +1,36 @@
+# tests/test_ingest_jobs.py
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.connectors.radon import RadonConnector
+from app.models.ingest_job import IngestJobKind, IngestJobRequest, IngestJobStatus
+from app.pipeline.ingest_jobs import IngestJobManager
+from app.repositories.memory_impact_repository import InMemoryImpactRepository
+from benchmarks.radon_server import FakeRadonServer, RadonDataset, ServerConfig
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_cancel_stops_connector_retries(tmp_path: Path) -> None:
+    repo = InMemoryImpactRepository()
+    with FakeRadonServer(RadonDataset.synthetic(10), ServerConfig(error_rate=1.0)) as server:
+        manager = IngestJobManager(
+            repo_factory=lambda: repo,
+            connector_factory=lambda: RadonConnector(base_url=server.base_url, max_retries=3, retry_backoff=0.2),
+            state_dir=str(tmp_path),
+        )
+        job = manager.submit(IngestJobRequest(kind=IngestJobKind.KIND_CODE, kind_code="1", refresh_summaries=False))
+        while server.stats.requests == 0:
+            await asyncio.sleep(0.01)
+
+        await manager.cancel(job.job_id)
+        assert job.status == IngestJobStatus.CANCELLED
+
+        # Bez sygnału cancel wątek connectora ponawiałby zapytania co 0.2s, 0.4s, ...
+        await asyncio.sleep(1.0)
+        assert server.stats.requests == 1
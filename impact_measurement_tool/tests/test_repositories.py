@@ -0,0 +1,298 @@
+# tests/test_repositories.py
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+from app.repositories.base import DERIVED_FIELDS, MULTI_VALUE_FIELDS, BaseImpactRepository
+from app.repositories.factory import (
+    get_evaluation_repository,
+    get_impact_repository,
+    get_report_repository,
+    get_summary_repository,
+)
+from app.repositories.memory_impact_repository import InMemoryImpactRepository
+from app.repositories.memory_stores import InMemoryEvaluationRepository, InMemoryInstitutionSummaryRepository
+from app.repositories.sqlite_impact_repository import SqliteImpactRepository
+from app.repositories.sqlite_stores import (
+    SqliteEvaluationRepository,
+    SqliteInstitutionSummaryRepository,
+    SqliteReportRepository,
+)
+from tests.helpers import BACKENDS, build_impact_repository, make_evaluation, make_impact, make_impacts
+
+pytestmark = pytest.mark.anyio
+
+
+async def _uuids(repo: BaseImpactRepository, query: Dict[str, Any] = None, batch_size: int = 500) -> List[str]:
+    return [impact.impact_uuid async for impact in repo.iter_impacts(query, batch_size=batch_size)]
+
+
+# ================== FABRYKA ==================
+
+
+@pytest.mark.usefixtures("fresh_factory")
+def test_factory_returns_one_instance_per_backend_and_path(tmp_path: Path) -> None:
+    memory = get_impact_repository(backend="memory")
+    assert isinstance(memory, InMemoryImpactRepository)
+    assert get_impact_repository(backend="memory") is memory
+
+    first = get_impact_repository(backend="sqlite", sqlite_path=str(tmp_path / "a.sqlite3"))
+    second = get_impact_repository(backend="sqlite", sqlite_path=str(tmp_path / "b.sqlite3"))
+    assert isinstance(first, SqliteImpactRepository)
+    assert first is not second
+    assert get_impact_repository(backend="sqlite", sqlite_path=str(tmp_path / "a.sqlite3")) is first
+
+
+@pytest.mark.usefixtures("fresh_factory")
+def test_factory_builds_every_store_on_the_same_backend(tmp_path: Path) -> None:
+    path = str(tmp_path / "imeto.sqlite3")
+    assert isinstance(get_summary_repository(backend="sqlite", sqlite_path=path), SqliteInstitutionSummaryRepository)
+    assert isinstance(get_evaluation_repository(backend="sqlite", sqlite_path=path), SqliteEvaluationRepository)
+    assert isinstance(get_report_repository(backend="sqlite", sqlite_path=path), SqliteReportRepository)
+    assert isinstance(get_summary_repository(backend="memory"), InMemoryInstitutionSummaryRepository)
+    assert isinstance(get_evaluation_repository(backend="memory"), InMemoryEvaluationRepository)
+
+    # Magazyny różnych rodzajów nie dzielą wpisu w pamięci podręcznej
+    assert get_summary_repository(backend="memory") is not get_evaluation_repository(backend="memory")
+
+
+@pytest.mark.usefixtures("fresh_factory")
+def test_factory_rejects_unknown_backend() -> None:
+    with pytest.raises(ValueError, match="Nieznany backend"):
+        get_impact_repository(backend="postgres")
+
+
+# ================== UPSERT ==================
+
+
+async def test_save_many_counts_inserted_updated_and_unchanged(impact_repository: BaseImpactRepository) -> None:
+    impacts = make_impacts(10)
+
+    assert await impact_repository.save_many(impacts) == {"matched": 0, "modified": 0, "upserted": 10, "skipped": 0}
+    assert await impact_repository.save_many(impacts) == {"matched": 10, "modified": 0, "upserted": 0, "skipped": 0}
+
+    changed = impacts[:3] + [make_impact(3, title_pl="Nowy tytuł")] + make_impacts(2, start=10)
+    assert await impact_repository.save_many(changed) == {"matched": 4, "modified": 1, "upserted": 2, "skipped": 0}
+    assert await impact_repository.count() == 12
+    assert (await impact_repository.get_by_impact_uuid("imp-0003")).title_pl == "Nowy tytuł"
+
+
+async def test_save_many_skips_impacts_without_key(impact_repository: BaseImpactRepository) -> None:
+    keyless = make_impact(0, impact_uuid=None, raw={})
+    counts = await impact_repository.save_many([keyless, make_impact(1)])
+    assert counts["skipped"] == 1
+    assert counts["upserted"] == 1
+
+
+async def test_preserve_fields_keep_derived_values_on_update(impact_repository: BaseImpactRepository) -> None:
+    await impact_repository.save_one(make_impact(0, evaluation_period="2017-2021", evaluation_category="A"))
+
+    # Ingest z RAD-on nie zna kategorii – nie może ich wyzerować
+    counts = await impact_repository.save_many([make_impact(0, title_pl="Zmieniony")], preserve_fields=DERIVED_FIELDS)
+    assert counts["modified"] == 1
+
+    impact = await impact_repository.get_by_impact_uuid("imp-0000")
+    assert impact.title_pl == "Zmieniony"
+    assert (impact.evaluation_period, impact.evaluation_category) == ("2017-2021", "A")
+
+    # Nowy dokument dostaje wartości pól zachowywanych z zapisu
+    await impact_repository.save_many([make_impact(1, evaluation_category="B")], preserve_fields=DERIVED_FIELDS)
+    assert (await impact_repository.get_by_impact_uuid("imp-0001")).evaluation_category == "B"
+
+
+# ================== TABELE POMOCNICZE SQLITE ==================
+
+
+def _side_table(repo: SqliteImpactRepository, field: str) -> List[tuple]:
+    return repo._conn.execute(
+        f"SELECT value, upsert_key FROM {repo.table}__{field} ORDER BY value, upsert_key"
+    ).fetchall()
+
+
+async def test_sqlite_side_tables_follow_list_fields(tmp_path: Path) -> None:
+    repo = SqliteImpactRepository(tmp_path / "impacts.sqlite3")
+    await repo.save_many([make_impact(1), make_impact(2)])
+
+    tables = {name for (name,) in repo._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {f"radon_impacts__{field}" for field in MULTI_VALUE_FIELDS} <= tables
+    assert _side_table(repo, "beneficiary_categories") == [
+        ("ngos", "imp-0001"),
+        ("ngos", "imp-0002"),
+        ("students", "imp-0001"),
+    ]
+
+    # Zmiana listy zastępuje wartości zamiast je dopisywać
+    await repo.save_one(make_impact(1, beneficiary_categories=["business"]))
+    assert _side_table(repo, "beneficiary_categories") == [("business", "imp-0001"), ("ngos", "imp-0002")]
+    assert await _uuids(repo, {"beneficiary_categories": "students"}) == []
+    repo.close()
+
+
+async def test_sqlite_side_tables_are_backfilled_for_older_files(tmp_path: Path) -> None:
+    path = tmp_path / "impacts.sqlite3"
+    repo = SqliteImpactRepository(path)
+    await repo.save_many(make_impacts(6))
+    repo._conn.execute("DROP TABLE radon_impacts__identifier_keys")
+    repo.close()
+
+    reopened = SqliteImpactRepository(path)
+    assert _side_table(reopened, "identifier_keys") == sorted(
+        [(f"doi:10.1000/{i}", f"imp-{i:04d}") for i in range(6)]
+        + [("isbn:9788300000000", "imp-0000"), ("isbn:9788300000000", "imp-0005")]
+    )
+    assert await _uuids(reopened, {"identifier_keys": "isbn:9788300000000"}) == ["imp-0000", "imp-0005"]
+    reopened.close()
+
+
+def test_sqlite_rejects_filters_on_nested_fields(tmp_path: Path) -> None:
+    repo = SqliteImpactRepository(tmp_path / "impacts.sqlite3")
+    with pytest.raises(ValueError):
+        repo._where({"achievements": []})
+    repo.close()
+
+
+# ================== FILTRY ==================
+
+FILTERS = [
+    {},
+    {"institution_uuid": "inst-1"},
+    {"discipline_code": "DS010514N"},
+    {"beneficiary_categories": "students"},
+    {"beneficiary_categories": "ngos", "institution_uuid": "inst-2"},
+    {"identifier_keys": "isbn:9788300000000"},
+    {"identifier_keys": "doi:10.1000/7"},
+    {"evaluation_category": "A"},
+    {"institution_uuid": "inst-9"},
+]
+
+
+@pytest.mark.parametrize("query", FILTERS)
+async def test_filters_give_the_same_results_on_every_backend(tmp_path: Path, query: Dict[str, Any]) -> None:
+    impacts = make_impacts(30) + [make_impact(30, evaluation_category="A")]
+    results = {}
+    for backend in BACKENDS:
+        repo = build_impact_repository(backend, tmp_path)
+        await repo.save_many(impacts)
+        results[backend] = await _uuids(repo, query)
+
+    expected = [
+        impact.impact_uuid
+        for impact in impacts
+        if all(
+            value in getattr(impact, name) if name in MULTI_VALUE_FIELDS else getattr(impact, name) == value
+            for name, value in query.items()
+        )
+    ]
+    assert results == {backend: expected for backend in BACKENDS}
+
+
+async def test_list_impacts_and_count_match_across_backends(tmp_path: Path) -> None:
+    pages = {}
+    for backend in BACKENDS:
+        repo = build_impact_repository(backend, tmp_path)
+        await repo.save_many(make_impacts(25))
+        page = await repo.list_impacts(skip=2, limit=4, institution_uuid="inst-0", beneficiary_category="ngos")
+        pages[backend] = ([impact.impact_uuid for impact in page], await repo.count(institution_uuid="inst-0"))
+
+    assert pages["memory"] == pages["sqlite"] == (["imp-0006", "imp-0009", "imp-0012", "imp-0015"], 9)
+
+
+async def test_evaluation_filters_give_the_same_results_on_every_backend(tmp_path: Path) -> None:
+    evaluations = [
+        make_evaluation(0, "2017-2021", ("A", "B")),
+        make_evaluation(0, "2013-2016", ("B",)),
+        make_evaluation(1, "2017-2021", ("A+",)),
+        make_evaluation(2, "2017-2021", ("C", "B")),
+    ]
+    queries = [
+        {},
+        {"evaluation_period": "2017-2021"},
+        {"disciplines.category": "B"},
+        {"institution_uuid": {"$in": ["inst-0", "inst-2"]}, "disciplines.category": "B"},
+        {"disciplines.category": {"$in": ["A+", "C"]}},
+    ]
+
+    results = {}
+    for backend in BACKENDS:
+        repo = (
+            SqliteEvaluationRepository(tmp_path / "evaluations.sqlite3")
+            if backend == "sqlite"
+            else InMemoryEvaluationRepository()
+        )
+        counts = await repo.save_many(evaluations)
+        assert counts == {"matched": 0, "modified": 0, "upserted": 4, "skipped": 0}
+        results[backend] = [
+            [(e.institution_uuid, e.evaluation_period) async for e in repo.iter_evaluations(query, batch_size=2)]
+            for query in queries
+        ] + [await repo.count(category="B"), await repo.count(evaluation_period="2013-2016")]
+
+    assert results["memory"] == results["sqlite"]
+    assert results["sqlite"][3] == [("inst-0", "2013-2016"), ("inst-0", "2017-2021"), ("inst-2", "2017-2021")]
+    assert results["sqlite"][-2:] == [3, 1]
+
+
+async def test_evaluation_store_updates_by_institution_and_period(evaluation_repository) -> None:
+    await evaluation_repository.save_many([make_evaluation(0), make_evaluation(1)])
+    counts = await evaluation_repository.save_many([make_evaluation(0), make_evaluation(1, categories=("B",))])
+    assert counts == {"matched": 2, "modified": 1, "upserted": 0, "skipped": 0}
+
+    [evaluation] = await evaluation_repository.get_for_institution("inst-1")
+    assert [d.category for d in evaluation.disciplines] == ["B"]
+
+
+# ================== STRONICOWANIE KEYSET ==================
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 5, 10, 11])
+async def test_sqlite_iter_rows_pages_by_rowid(tmp_path: Path, batch_size: int) -> None:
+    repo = SqliteImpactRepository(tmp_path / "impacts.sqlite3")
+    await repo.save_many(make_impacts(10))
+
+    fetches: List[tuple] = []
+    fetch = repo._fetch
+
+    def recording_fetch(sql: str, params: List[Any]) -> List[tuple]:
+        rows = fetch(sql, params)
+        fetches.append((params[-2], len(rows)))
+        return rows
+
+    repo._fetch = recording_fetch  # type: ignore[method-assign]
+
+    assert await _uuids(repo, batch_size=batch_size) == [f"imp-{i:04d}" for i in range(10)]
+    # Każda partia zaczyna się za ostatnim rowid poprzedniej; ostatnia jest niepełna
+    assert [after for after, _ in fetches] == [i * batch_size for i in range(len(fetches))]
+    assert len(fetches) == 10 // batch_size + 1
+    repo.close()
+
+
+async def test_sqlite_iter_rows_with_filter_and_gaps(tmp_path: Path) -> None:
+    repo = SqliteImpactRepository(tmp_path / "impacts.sqlite3")
+    await repo.save_many(make_impacts(20))
+    repo._conn.execute("DELETE FROM radon_impacts WHERE upsert_key IN ('imp-0001', 'imp-0004', 'imp-0007')")
+
+    expected = [f"imp-{i:04d}" for i in range(20) if i % 3 == 1 and i not in (1, 4, 7)]
+    assert await _uuids(repo, {"institution_uuid": "inst-1"}, batch_size=2) == expected
+
+    docs = [doc async for doc in repo.iter_documents({"beneficiary_categories": "students"}, ["impact_uuid", "identifier_keys"], batch_size=3)]
+    assert docs[0] == {"impact_uuid": "imp-0003", "identifier_keys": ["doi:10.1000/3"]}
+    assert [doc["impact_uuid"] for doc in docs] == [f"imp-{i:04d}" for i in range(3, 20, 2) if i != 7]
+    repo.close()
+
+
+def test_sqlite_rejects_invalid_table_name(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        SqliteImpactRepository(tmp_path / "impacts.sqlite3", table="impacts; DROP")
+
+
+def test_sqlite_file_is_shared_by_stores(tmp_path: Path) -> None:
+    path = tmp_path / "imeto.sqlite3"
+    SqliteImpactRepository(path).close()
+    SqliteEvaluationRepository(path).close()
+    with sqlite3.connect(path) as conn:
+        tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"radon_impacts", "radon_evaluations"} <= tables
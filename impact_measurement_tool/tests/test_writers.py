@@ -0,0 +1,52 @@
+# tests/test_writers.py
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from app.dumps.readers import iter_dump
+from app.dumps.writers import open_writer
+from tests.helpers import make_impacts
+
+SUFFIXES = (".json", ".ndjson", ".csv", ".parquet", ".arrows")
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_clean_exit_moves_complete_file_into_place(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"impacts{suffix}"
+    with open_writer(path) as writer:
+        writer.write_all(make_impacts(7))
+        assert not path.exists()
+
+    assert path.is_file()
+    assert not writer.tmp_path.exists()
+    if suffix != ".csv":
+        assert [impact.impact_uuid for impact in iter_dump(path)] == [f"imp-{i:04d}" for i in range(7)]
+
+
+@pytest.mark.parametrize("suffix", SUFFIXES)
+def test_exception_leaves_no_partial_file(tmp_path: Path, suffix: str) -> None:
+    path = tmp_path / f"impacts{suffix}"
+    with pytest.raises(RuntimeError):
+        with open_writer(path, flush_every=2) as writer:
+            writer.write_all(make_impacts(5))
+            raise RuntimeError("przerwany eksport")
+
+    assert not path.exists()
+    assert not writer.tmp_path.exists()
+
+
+def test_exception_keeps_previous_dump(tmp_path: Path) -> None:
+    path = tmp_path / "impacts.json"
+    with open_writer(path) as writer:
+        writer.write_all(make_impacts(3))
+
+    with pytest.raises(RuntimeError):
+        with open_writer(path) as writer:
+            writer.write_all(make_impacts(10))
+            raise RuntimeError("przerwany eksport")
+
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 3